@@ -4,28 +4,29 @@ import os
 # モジュールインポート用にカレントディレクトリをPythonパスに追加
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+import re
 import csv
 import time
-import subprocess
-import re
 import argparse
 import logging
-import datetime
-import ctypes
-import uiautomation as auto
 from src.automator.utils.focus import FocusManager
-from src.automator.utils.screenshot import capture_screenshot
+from src.automator.utils.screenshot import ScreenshotWriter
 from src.automator.core.element_finder import ElementFinder
 from src.automator.core.action_executor import ActionExecutor
+from src.automator.utils.data_source import iter_records, read_columns, ResultWriter
+from src.automator.utils.checkpoint import CheckpointManager
+from src.automator.utils.timing import TimingRecorder
+from src.automator.utils.compile_cache import CompileCache
+from src.automator.utils.log_pipeline import configure_logging
+from src.shared.backend import get_backend
+from src.shared.rpa_path import export_compiled, preload_compiled
+
+class AutomatorError(Exception):
+    """読み込みエラー・チェックポイントの不整合・実行の中断など、処理を続けられない場合の例外"""
 
-# 正確な座標を確保するためにHigh DPI Awarenessを有効化
-try:
-    auto.SetProcessDpiAwareness(2) # Process_PerMonitorDpiAware
-except Exception:
-    pass # サポートされていない場合は無視（例: 古いWindows）
 
 class Automator:
-    def __init__(self, action_files, log_file=None, log_level="INFO", dry_run=False, force_run=False, wait_time=None, legacy_mode=False):
+    def __init__(self, action_files, log_file=None, log_level="INFO", dry_run=False, force_run=False, wait_time=None, legacy_mode=False, checkpoint_file=None, checkpoint_interval=50, timing=False, timing_output=None, trace_output=None, backend=None, logger=None, log_json=None, screenshots=None, flight_recorder=None):
         self.actions = []
         self.variables = {}
         self.aliases = {}  # エイリアス名 -> RPAパス
@@ -34,32 +35,42 @@ class Automator:
         self.force_run = force_run
         self.wait_time = wait_time  # Noneはライブラリデフォルトを使用
         self.legacy_mode = legacy_mode
+        self._jump_cache = {}  # (開始インデックス, 種別) -> 対応するEnd位置
+        self._load_messages = []  # 読み込み時のログ (レベル, メッセージ, 引数)
+        self._data_cursor = None  # データ駆動モードの {"record": 番号, "output_offset": 位置}
+        self.timing_summary = timing or bool(timing_output)
+        self.timing_output = timing_output
+        self.trace_output = trace_output
+        self.timer = TimingRecorder(enabled=self.timing_summary or bool(trace_output))
+        self.on_action = None  # 通常アクションの終了ごとに結果の辞書を渡して呼ばれる関数（常駐モードの進行通知用）
         
-        # ロギング設定
-        level = getattr(logging, log_level.upper(), logging.INFO)
-        handlers = [logging.StreamHandler(sys.stdout)]
-        if log_file:
-            handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
-        
-        logging.basicConfig(
-            level=level,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=handlers,
-            force=True # 既に設定されている場合は再設定
-        )
-        self.logger = logging.getLogger(__name__)
+        # ロギング設定（loggerを渡した場合は呼び出し側の設定をそのまま使う）
+        # 書き込みはバックグラウンドのスレッドで行い、log_jsonを指定するとJSONLにも出力する
+        if logger is None:
+            configure_logging(log_level, log_file=log_file, json_file=log_json)
+        self.logger = logger or logging.getLogger(__name__)
         
         if self.legacy_mode:
             self.logger.info("=== LEGACY MODE ENABLED (Prioritizing Win32 API) ===")
 
+        # UIバックエンド（省略時はuiautomation。High DPI Awarenessもここで有効化される）
+        self.backend = backend or get_backend()
+
+        # スクリーンショット（エンコードと保存はバックグラウンドで行う）
+        self.screenshots = screenshots or ScreenshotWriter(backend=self.backend, logger=self.logger)
+        # フライトレコーダー（指定時のみ。アクションごとに対象ウィンドウの縮小画像を保持し、失敗時に書き出す）
+        self.flight_recorder = flight_recorder
+
         # FocusManager初期化
-        self.focus_manager = FocusManager(force_run=force_run, legacy_mode=legacy_mode)
+        self.focus_manager = FocusManager(force_run=force_run, legacy_mode=legacy_mode, backend=self.backend)
         
         # ElementFinder初期化
         self.element_finder = ElementFinder(
             logger=self.logger,
             aliases=self.aliases,
-            reverse_aliases=self.reverse_aliases
+            reverse_aliases=self.reverse_aliases,
+            timer=self.timer,
+            backend=self.backend
         )
         
         # ActionExecutor初期化
@@ -69,7 +80,10 @@ class Automator:
             focus_manager=self.focus_manager,
             dry_run=self.dry_run,
             force_run=self.force_run,
-            wait_time=self.wait_time
+            wait_time=self.wait_time,
+            timer=self.timer,
+            backend=self.backend,
+            screenshots=self.screenshots
         )
         
         # action_filesがリストであることを確保
@@ -81,58 +95,170 @@ class Automator:
         if self.dry_run:
             self.logger.info("=== DRY RUN MODE ENABLED ===")
 
+        # チェックポイント（指定時のみ有効）
+        self.checkpoint = CheckpointManager(checkpoint_file, checkpoint_interval) if checkpoint_file else None
+
     def load_aliases(self, alias_files):
         """1つ以上のCSVファイルからエイリアスを読み込む"""
         if isinstance(alias_files, str):
             alias_files = [alias_files]
             
         for alias_file in alias_files:
-            self.logger.info(f"Loading aliases from {alias_file}...")
+            self._log_load(logging.INFO, f"Loading aliases from {alias_file}...")
             try:
                 with open(alias_file, 'r', encoding='utf-8-sig') as f:
                     reader = csv.DictReader(f)
                     for row in reader:
-                        alias = row.get("AliasName")
-                        path = row.get("RPA_Path")
-                        if alias and path:
-                            if alias in self.aliases:
-                                self.logger.warning(f"Duplicate alias '{alias}' found in {alias_file}. Overwriting.")
-                            self.aliases[alias] = path
-                            self.reverse_aliases[path] = alias  # 逆引きを構築
+                        self._add_alias(row.get("AliasName"), row.get("RPA_Path"), alias_file)
             except Exception as e:
-                self.logger.error(f"Error loading aliases from {alias_file}: {e}")
-                sys.exit(1)
-        self.logger.info(f"Loaded {len(self.aliases)} aliases total.")
+                self.logger.error("Error loading aliases from %s: %s", alias_file, e)
+                raise AutomatorError(f"Error loading aliases from {alias_file}: {e}") from e
+        self._log_load(logging.INFO, f"Loaded {len(self.aliases)} aliases total.")
+
+    def _add_alias(self, alias, path, source):
+        if alias and path:
+            if alias in self.aliases:
+                self._log_load(logging.WARNING, f"Duplicate alias '{alias}' found in {source}. Overwriting.")
+            self.aliases[alias] = path
+            self.reverse_aliases[path] = alias  # 逆引きを構築
 
     def load_actions(self):
         for csv_file in self.action_files:
-            self.logger.info(f"Loading actions from {csv_file}...")
+            self._log_load(logging.INFO, f"Loading actions from {csv_file}...")
             try:
                 with open(csv_file, 'r', encoding='utf-8-sig') as f:
                     reader = csv.DictReader(f)
                     for row in reader:
-                        # エイリアスが存在する場合は解決
-                        key = row.get("Key", "")
-                        if key and key in self.aliases:
-                            self.logger.debug(f"Resolved alias '{key}' -> '{self.aliases[key]}'")
-                            row["Key"] = self.aliases[key]
-                        
-                        # アクションタイプを正規化
-                        act_type = row.get("Action", "")
-                        if act_type.upper() == "IF": row["Action"] = "If"
-                        elif act_type.upper() == "ELSE": row["Action"] = "Else"
-                        elif act_type.upper() == "ENDIF": row["Action"] = "EndIf"
-                        elif act_type.upper() == "LOOP": row["Action"] = "Loop"
-                        elif act_type.upper() == "ENDLOOP": row["Action"] = "EndLoop"
-                        
-                        self.actions.append(row)
-            except FileNotFoundError:
-                self.logger.error(f"File not found: {csv_file}")
-                sys.exit(1)
+                        self._add_action(row)
+            except FileNotFoundError as e:
+                self.logger.error("File not found: %s", csv_file)
+                raise AutomatorError(f"File not found: {csv_file}") from e
+            except Exception as e:
+                self.logger.error("Error loading actions from %s: %s", csv_file, e)
+                raise AutomatorError(f"Error loading actions from {csv_file}: {e}") from e
+        self._jump_cache.clear()
+        self._log_load(logging.INFO, f"Loaded {len(self.actions)} actions total.")
+
+    def _add_action(self, row):
+        """エイリアスを解決し、制御構文のアクション名を正規化して追加する"""
+        # エイリアスが存在する場合は解決
+        key = row.get("Key", "")
+        if key and key in self.aliases:
+            self._log_load(logging.DEBUG, "Resolved alias '%s' -> '%s'", key, self.aliases[key])
+            row["Key"] = self.aliases[key]
+        
+        # アクションタイプを正規化
+        act_type = row.get("Action", "")
+        if act_type.upper() == "IF": row["Action"] = "If"
+        elif act_type.upper() == "ELSE": row["Action"] = "Else"
+        elif act_type.upper() == "ENDIF": row["Action"] = "EndIf"
+        elif act_type.upper() == "LOOP": row["Action"] = "Loop"
+        elif act_type.upper() == "ENDLOOP": row["Action"] = "EndLoop"
+        
+        self.actions.append(row)
+
+    def _log_load(self, level, message, *args):
+        """読み込み時のログを出力し、コンパイルキャッシュから読み込んだときに再出力できるよう記録する"""
+        self.logger.log(level, message, *args)
+        self._load_messages.append((level, message, args))
+
+    def load_program(self, alias_files=None, cache=None):
+        """
+        エイリアスとアクションを読み込む。
+
+        cache（CompileCache）を指定した場合、ソースファイルの内容が前回と同じであれば
+        コンパイル結果（解決済みのアクション、ジャンプ表、RPAパスの解析結果）を1回の読み込みで復元する。
+        内容が変わっていれば通常どおり読み込み、キャッシュを作り直す。
+
+        Returns:
+            bool: キャッシュから読み込んだ場合True
+        """
+        if isinstance(alias_files, str):
+            alias_files = [alias_files]
+        alias_files = list(alias_files or [])
+
+        key = cache.key(alias_files, self.action_files) if cache else None
+        cache_path = cache.path_for(alias_files, self.action_files) if key else None
+        program = cache.load(cache_path, key) if key else None
+        if program is not None:
+            # ログは読み込み時と同じ内容を出力する
+            for level, message, args in program["messages"]:
+                self.logger.log(level, message, *args)
+            self.aliases.update(program["aliases"])
+            self.reverse_aliases.update(program["reverse_aliases"])
+            self.actions.extend(program["actions"])
+            self._jump_cache.clear()
+            self._jump_cache.update(program["jump_table"])
+            preload_compiled(program["compiled"])
+            self.logger.info("Using compile cache %s (sources unchanged).", cache_path)
+            return True
+
+        if alias_files:
+            self.load_aliases(alias_files)
+        self.load_actions()
+        self._jump_cache.update(self._build_jump_table())
+        if key:
+            program = {
+                "aliases": self.aliases,
+                "reverse_aliases": self.reverse_aliases,
+                "actions": self.actions,
+                "jump_table": self._jump_cache,
+                "compiled": self._compile_paths(),
+                "messages": self._load_messages,
+            }
+            try:
+                cache.save(cache_path, key, program)
+                self.logger.debug("Compile cache saved to %s", cache_path)
             except Exception as e:
-                self.logger.error(f"Error loading actions from {csv_file}: {e}")
-                sys.exit(1)
-        self.logger.info(f"Loaded {len(self.actions)} actions total.")
+                # キャッシュの保存に失敗しても実行は続ける
+                self.logger.warning("Failed to save compile cache: %s", e)
+        return False
+
+    def _compile_paths(self):
+        """アクションのKey（エイリアス解決済み）のうち、変数を含まないRPAパスを解析しておく"""
+        keys = (row.get("Key") or "" for row in self.actions)
+        return export_compiled(key for key in keys if "Control" in key and "{" not in key)
+
+    def _build_jump_table(self):
+        """
+        すべてのIf/Else/LoopについてfindMatchingEndの結果を1回の走査で求める。
+
+        結果は_scan_matching_endと同じ（IfはネストしたIfを除く最初のElseまたはEndIf、
+        ElseはEndIf、LoopはEndLoop。対応がなければ-1）。
+        """
+        table = {}
+        if_stack = []    # [Ifのインデックス（対応するIfがないElseはNone）, 同じ階層のElseのリスト]
+        loop_stack = []
+        for i, row in enumerate(self.actions):
+            act = row.get('Action', '')
+            if act == 'If':
+                if_stack.append([i, []])
+            elif act == 'Else':
+                if not if_stack:
+                    if_stack.append([None, []])
+                frame = if_stack[-1]
+                if frame[0] is not None and (frame[0], 'If') not in table:
+                    table[(frame[0], 'If')] = i
+                frame[1].append(i)
+            elif act == 'EndIf' and if_stack:
+                start, elses = if_stack.pop()
+                if start is not None:
+                    table.setdefault((start, 'If'), i)
+                for else_index in elses:
+                    table[(else_index, 'Else')] = i
+            elif act == 'Loop':
+                loop_stack.append(i)
+            elif act == 'EndLoop' and loop_stack:
+                table[(loop_stack.pop(), 'Loop')] = i
+
+        for start, elses in if_stack:
+            if start is not None:
+                table.setdefault((start, 'If'), -1)
+            for else_index in elses:
+                table[(else_index, 'Else')] = -1
+        for start in loop_stack:
+            table[(start, 'Loop')] = -1
+        return table
 
     def evaluate_condition(self, condition):
         """{status} == 'OK' のような条件文字列を評価する"""
@@ -148,11 +274,18 @@ class Automator:
             # CSVは信頼できると仮定。
             return eval(condition)
         except Exception as e:
-            self.logger.error(f"Condition evaluation failed: {condition} - {e}")
+            self.logger.error("Condition evaluation failed: %s - %s", condition, e)
             return False
 
     def find_matching_end(self, start_index, start_type):
         """指定された開始アクションに対応するEndIf/Else/EndLoopを見つける"""
+        # アクションは読み込み後に変化しないため、結果をキャッシュして再走査を避ける
+        cache_key = (start_index, start_type)
+        if cache_key not in self._jump_cache:
+            self._jump_cache[cache_key] = self._scan_matching_end(start_index, start_type)
+        return self._jump_cache[cache_key]
+
+    def _scan_matching_end(self, start_index, start_type):
         nesting = 0
         for i in range(start_index + 1, len(self.actions)):
             act = self.actions[i].get('Action', '')
@@ -175,15 +308,187 @@ class Automator:
                     if nesting == 0:
                         return i
                     nesting -= 1
+
+            elif start_type == 'Else':
+                # ElseからはEndIfのみを探す
+                if act == 'If':
+                    nesting += 1
+                elif act == 'EndIf':
+                    if nesting == 0:
+                        return i
+                    nesting -= 1
         return -1
 
-    def run(self):
-        i = 0
-        loop_stack = [] # (start_index, loop_info)を格納
+    def run(self, resume=False):
+        start_index = 0
+        loop_stack = None
+        if resume:
+            state = self._load_checkpoint()
+            if state:
+                start_index = state["index"]
+                loop_stack = state["loop_stack"]
+                self.variables = state["variables"]
+
+        completed, errors = self._run_actions(start_index, loop_stack)
+        self._flush_captures()
+        self.report_timing()
+        if not completed:
+            raise AutomatorError(errors[-1] if errors else "Execution stopped.")
+        if self.checkpoint:
+            self.checkpoint.clear()
+
+    def run_data(self, data_file, output_file, resume=False):
+        """
+        データ駆動モードで実行する。
+
+        読み込み済みのアクションをテンプレートとして、データファイルの各レコードごとに1回実行する。
+        レコードの列は変数としてセットされ、結果はレコードごとに出力ファイルへ書き出される。
+        失敗したレコードはFAILEDとして記録し、次のレコードへ進む。
+        """
+        self.logger.info("Data-driven mode: %s -> %s", data_file, output_file)
+        base_variables = dict(self.variables)
+        processed = 0
+        failed = 0
+
+        state = self._load_checkpoint() if resume else None
+        if state and state.get("record") is None:
+            self.logger.error("Checkpoint was not created in data-driven mode. Cannot resume.")
+            raise AutomatorError("Checkpoint was not created in data-driven mode. Cannot resume.")
+        resume_record = state["record"] if state else 1
+        resume_offset = state["output_offset"] if state else None
+
+        columns = list(base_variables) + read_columns(data_file) + self._assigned_variables()
+        with ResultWriter(output_file, resume_offset=resume_offset, columns=columns, logger=self.logger) as writer:
+            for record_no, record in enumerate(iter_records(data_file), 1):
+                if record_no < resume_record:
+                    continue
+
+                self._data_cursor = {"record": record_no, "output_offset": writer.tell()}
+                start_index = 0
+                loop_stack = None
+                if state and record_no == resume_record:
+                    # 中断したレコードは保存時点の位置・変数から再開
+                    self.logger.info("=== Record %s (resumed at action %s) ===", record_no, state['index'] + 1)
+                    start_index = state["index"]
+                    loop_stack = state["loop_stack"]
+                    self.variables = state["variables"]
+                else:
+                    self.logger.info("=== Record %s ===", record_no)
+                    self.variables = dict(base_variables)
+                    self.variables.update(record)
+
+                completed, errors = self._run_actions(start_index, loop_stack)
+                status = "OK" if completed and not errors else "FAILED"
+                if status == "FAILED":
+                    failed += 1
+                writer.write(record_no, status, errors[-1] if errors else "", self.variables)
+                processed += 1
+
+        self._data_cursor = None
+        self.variables = base_variables
+        if self.checkpoint:
+            self.checkpoint.clear()
+        self._flush_captures()
+        self.logger.info("Processed %s records (%s failed). Results saved to %s", processed, failed, output_file)
+        self.report_timing()
+
+    def _assigned_variables(self):
+        """アクションが値を設定する変数名（変数を含む名前は除く）。データ駆動モードの結果の列に使う"""
+        names = []
+        for row in self.actions:
+            act, value = row.get("Action", ""), (row.get("Value") or "").strip()
+            if act == "SetVariable":
+                match = re.match(r"(\w+)\s*=", value)
+                name = match.group(1) if match else ""
+            elif act in ("GetProperty", "GetDateTime"):
+                name = value.split("=", 1)[0].strip()
+            elif act in ("GetValue", "GetClipboard"):
+                name = value
+            else:
+                continue
+            if name and "{" not in name and name not in names:
+                names.append(name)
+        return names
+
+    def _flush_captures(self):
+        """バックグラウンドで保存中のスクリーンショット・フライトレコーダーの書き出しを待つ。"""
+        self.screenshots.flush()
+        if self.flight_recorder:
+            self.flight_recorder.flush()
+
+    def report_timing(self):
+        """計測が有効な場合、サマリー表をログ出力し、生データ・トレースをエクスポートする"""
+        if not self.timer.enabled:
+            return
+        if self.timing_summary:
+            self.logger.info("=== Timing Summary ===\n" + self.timer.summary())
+        if self.trace_output:
+            self.timer.export_trace(self.trace_output)
+            self.logger.info("Trace saved to %s (open in https://ui.perfetto.dev or chrome://tracing)", self.trace_output)
+        if self.timing_output:
+            self.timer.export(self.timing_output)
+            self.logger.info("Timing records saved to %s", self.timing_output)
+
+    def _load_checkpoint(self):
+        """再開用にチェックポイントを読み込み、アクション定義との整合性を確認する"""
+        if not self.checkpoint:
+            self.logger.error("--resume requires a checkpoint file (--checkpoint).")
+            raise AutomatorError("--resume requires a checkpoint file (--checkpoint).")
+        try:
+            state = self.checkpoint.load()
+        except Exception as e:
+            self.logger.error("Failed to load checkpoint %s: %s", self.checkpoint.path, e)
+            raise AutomatorError(f"Failed to load checkpoint {self.checkpoint.path}: {e}") from e
+        if state is None:
+            self.logger.warning("No checkpoint found at %s. Starting from the beginning.", self.checkpoint.path)
+            return None
+        if state.get("action_count") != len(self.actions):
+            message = (f"Checkpoint does not match the loaded actions "
+                       f"({state.get('action_count')} saved, {len(self.actions)} loaded). Cannot resume.")
+            self.logger.error(message)
+            raise AutomatorError(message)
+        self.logger.info("Resuming from checkpoint: action %s, record %s", state['index'] + 1, state.get('record'))
+        return state
+
+    def _save_checkpoint(self, index, loop_stack):
+        state = {
+            "action_files": self.action_files,
+            "action_count": len(self.actions),
+            "index": index,
+            "loop_stack": loop_stack,
+            "variables": self.variables,
+            "record": None,
+            "output_offset": None,
+        }
+        if self._data_cursor:
+            state.update(self._data_cursor)
+        try:
+            self.checkpoint.save(state)
+        except Exception as e:
+            # チェックポイント失敗で実行自体は止めない
+            self.logger.warning("Failed to save checkpoint: %s", e)
+
+    def _run_actions(self, start_index=0, loop_stack=None):
+        """
+        アクションリストを実行する。
+
+        Args:
+            start_index: 実行を開始するアクション位置（再開時）
+            loop_stack: 再開時のループスタック
+
+        Returns:
+            tuple: (最後まで実行したか, 発生したエラーメッセージのリスト)
+        """
+        i = start_index
+        loop_stack = list(loop_stack or []) # (start_index, loop_info)を格納
+        errors = []
         
         while i < len(self.actions):
+            if self.checkpoint and self.checkpoint.tick():
+                self._save_checkpoint(i, loop_stack)
+
             action = self.actions[i]
-            self.logger.info(f"--- Action {i+1} ---")
+            self.logger.info("--- Action %d ---", i + 1, extra={"action_index": i + 1})
             target_app = action.get('TargetApp', '')
             key = action.get('Key', '')
             act_type = action.get('Action', '')
@@ -197,13 +502,13 @@ class Automator:
                     for var_name, var_val in self.variables.items():
                         value = value.replace(f"{{{var_name}}}", str(var_val))
 
-            self.logger.info(f"Target: {target_app}, Action: {act_type}, Value: {value}")
+            self.logger.info("Target: %s, Action: %s, Value: %s", target_app, act_type, value)
             
             # --- 制御フロー ---
             if act_type == 'If':
                 condition = value
                 result = self.evaluate_condition(condition)
-                self.logger.info(f"Condition '{condition}' evaluated to: {result}")
+                self.logger.info("Condition '%s' evaluated to: %s", condition, result)
                 
                 if result:
                     # 次のアクションに続行（Trueブロック）
@@ -213,7 +518,8 @@ class Automator:
                     jump_to = self.find_matching_end(i, 'If')
                     if jump_to == -1:
                         self.logger.error("Missing matching EndIf/Else for If")
-                        break
+                        errors.append(f"Action {i+1}: Missing matching EndIf/Else for If")
+                        return False, errors
                     
                     # Elseにジャンプした場合、Elseブロックの次を実行する必要がある（i = jump_to + 1）
                     # しかし待て、Elseにジャンプした場合、次の反復で'Else'アクションを処理する？
@@ -236,27 +542,15 @@ class Automator:
                 # Elseブロック内にいる（概念的に）、EndIfを検索する。
                 # しかし待て、'Else'は'If'と同じネストレベルにある。
                 
-                # 前方にスキャンしてEndIfを検索
-                jump_to = self.find_matching_end(i, 'If') # Ifロジックを再利用？いいえ、IfロジックはElse/EndIfを探す。
-                # EndIfのみを探すファインダが必要。
-                
-                nesting = 0
-                found = -1
-                for j in range(i + 1, len(self.actions)):
-                    act = self.actions[j].get('Action', '')
-                    if act == 'If':
-                        nesting += 1
-                    elif act == 'EndIf':
-                        if nesting == 0:
-                            found = j
-                            break
-                        nesting -= 1
+                # 前方にスキャンしてEndIfを検索（ネストを尊重）
+                found = self.find_matching_end(i, 'Else')
                 
                 if found != -1:
                     i = found + 1
                 else:
                     self.logger.error("Missing matching EndIf for Else")
-                    break
+                    errors.append(f"Action {i+1}: Missing matching EndIf for Else")
+                    return False, errors
                 continue
 
             elif act_type == 'EndIf':
@@ -333,7 +627,8 @@ class Automator:
                     jump_to = self.find_matching_end(i, 'Loop')
                     if jump_to == -1:
                         self.logger.error("Missing matching EndLoop")
-                        break
+                        errors.append(f"Action {i+1}: Missing matching EndLoop")
+                        return False, errors
                     i = jump_to + 1
                 continue
 
@@ -348,54 +643,507 @@ class Automator:
                 continue
 
             # --- 通常アクション ---
-            try:
-                self.execute_action(target_app, key, act_type, value)
-            except Exception as e:
-                self.logger.error(f"Action failed: {e}")
-                capture_screenshot(f"error_action_{i+1}", dry_run=self.dry_run)
+            started = time.perf_counter()
+            error = None
+            with self.timer.action(i + 1, act_type, self.reverse_aliases.get(key, "")) as span:
+                try:
+                    self.execute_action(target_app, key, act_type, value)
+                    failed = False
+                except Exception as e:
+                    error = str(e)
+                    self.logger.error("Action failed: %s", e, extra={"action_index": i + 1, "action": act_type})
+                    errors.append(f"Action {i+1}: {e}")
+                    span.set(status="error")
+                    with self.timer.phase("screenshot"):
+                        self.screenshots.capture(f"error_action_{i+1}", window=self.action_executor.last_window,
+                                                 element=self.action_executor.last_element,
+                                                 dry_run=self.dry_run, error_shot=True)
+                    failed = True
+            if self.flight_recorder and not self.dry_run:
+                if failed:
+                    self.flight_recorder.dump(f"error_action_{i+1}")
+                elif self.action_executor.last_window is not None:
+                    self.flight_recorder.record(self.action_executor.last_window, i + 1, act_type)
+            if self.on_action:
+                self.on_action({
+                    "index": i + 1,
+                    "action": act_type,
+                    "target": target_app,
+                    "alias": self.reverse_aliases.get(key, ""),
+                    "status": "ERROR" if failed else "OK",
+                    "error": error,
+                    "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                })
+            if failed:
                 if not self.force_run:
                     self.logger.error("Stopping execution due to error. Use --force-run to continue on errors.")
-                    sys.exit(1)
+                    if self.checkpoint:
+                        # 失敗したアクションから再開できるように保存
+                        self._save_checkpoint(i, loop_stack)
+                    return False, errors
             
             i += 1
 
+        return True, errors
+
+    def execute_action(self, target_app, key, act_type, value):
+        """単一アクションをActionExecutorに委譲して実行"""
+        return self.action_executor.execute(target_app, key, act_type, value, self.variables)
 
 
+ACTION_FIELDS = ("TargetApp", "Key", "Action", "Value")
 
 
+class Program:
+    """
+    読み込み済みのアクション列（エイリアス解決・制御構文の正規化済み、If/Else/Loopのジャンプ表付き）。
 
+    Engine.load() / Engine.compile() で作成し、Engine.run() で何度でも実行できる。
+    実行中に変更されないため、複数の実行で共有してよい。
+    """
 
+    def __init__(self, actions, aliases, reverse_aliases, jump_table):
+        self.actions = actions
+        self.aliases = aliases
+        self.reverse_aliases = reverse_aliases
+        self.jump_table = jump_table
 
-    def execute_action(self, target_app, key, act_type, value):
-        """単一アクションをActionExecutorに委譲して実行"""
-        return self.action_executor.execute(target_app, key, act_type, value, self.variables)
+    def __len__(self):
+        return len(self.actions)
+
+    def __repr__(self):
+        return f"<Program {len(self.actions)} actions, {len(self.aliases)} aliases>"
+
+
+class RunResult:
+    """Engine.run() の結果。"""
+
+    def __init__(self, completed, errors, variables, actions, elapsed_ms):
+        self.completed = completed      # 最後まで実行したか
+        self.errors = errors            # エラーメッセージのリスト（"Action N: ..."）
+        self.variables = variables      # 実行後の変数
+        self.actions = actions          # 通常アクションごとの結果の辞書（index, action, target, alias, status, error, elapsed_ms）
+        self.elapsed_ms = elapsed_ms
+
+    @property
+    def status(self):
+        return "OK" if self.completed else "FAILED"
+
+    def to_dict(self):
+        return {
+            "status": self.status,
+            "errors": self.errors,
+            "variables": self.variables,
+            "actions": self.actions,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+        }
+
+    def __repr__(self):
+        return f"<RunResult {self.status} {len(self.actions)} actions, {len(self.errors)} errors>"
+
+
+class Engine:
+    """
+    Pythonから利用するための実行エンジン。
+
+    1回作成して使い回す。バックエンド、ウィンドウの検索結果、コンパイルキャッシュ、
+    RPAパスの解析結果は実行間で共有される。CLIと異なり、
+    - ロギングの設定は変更しない（loggerに出力するだけで、ハンドラ・レベルは呼び出し側が設定する）
+    - 読み込みエラーはAutomatorErrorを送出する（プロセスを終了しない）
+    - アクションの失敗はRunResultに記録する（force_run=Falseの場合はその時点で実行を止める）
+
+    例:
+        engine = Engine(backend=backend)
+        program = engine.compile([("メモ帳", "input", "Input", "{name}")], aliases={"input": "EditControl(...)"})
+        result = engine.run(program, {"name": "山田"})
+    """
+
+    def __init__(self, backend=None, logger=None, cache=None, dry_run=False, force_run=False, wait_time=None,
+                 legacy_mode=False, window_cache=None, screenshots=None, flight_recorder=None):
+        """
+        Engine初期化。
+
+        Args:
+            backend: UIBackendインスタンス（省略時は既定のバックエンド。最初のUI操作で生成される）
+            logger: ログの出力先（省略時は "automator" ロガー）
+            cache: Engine.load() で使用するCompileCache（省略時はキャッシュしない）
+            dry_run / force_run / wait_time / legacy_mode: CLIの同名オプションと同じ
+            window_cache: TargetApp -> ウィンドウ要素の辞書（複数のEngineで共有する場合に指定）
+            screenshots: エラー時のスクリーンショットに使用するScreenshotWriter（省略時は画面全体をPNGで保存）
+            flight_recorder: FlightRecorder（省略時は記録しない。実行ごとに保持している画像を破棄する）
+        """
+        self.backend = backend or get_backend()
+        self.logger = logger or logging.getLogger("automator")
+        self.cache = cache
+        self.dry_run = dry_run
+        self.force_run = force_run
+        self.wait_time = wait_time
+        self.legacy_mode = legacy_mode
+        self.window_cache = {} if window_cache is None else window_cache
+        self.screenshots = screenshots or ScreenshotWriter(backend=self.backend, logger=self.logger)
+        self.flight_recorder = flight_recorder
+
+    def load(self, action_files, alias_files=None):
+        """
+        CSVファイルからプログラムを読み込む。
+
+        Raises:
+            AutomatorError: ファイルが読み込めない場合
+        """
+        app = self._automator(action_files)
+        app.load_program(alias_files, cache=self.cache)
+        return Program(app.actions, app.aliases, app.reverse_aliases, dict(app._jump_cache))
+
+    def compile(self, actions, aliases=None):
+        """
+        Pythonのリストからプログラムを作成する。
+
+        Args:
+            actions: アクションのリスト。各要素は {"TargetApp", "Key", "Action", "Value"} の辞書、
+                     または (TargetApp, Key, Action[, Value]) のタプル・リスト
+            aliases: エイリアス名 -> RPAパスの辞書
+
+        Raises:
+            AutomatorError: アクションの形式が不正な場合
+        """
+        app = self._automator([])
+        for alias, path in (aliases or {}).items():
+            app._add_alias(alias, path, "<program>")
+        for number, action in enumerate(actions, 1):
+            app._add_action(self._action_row(number, action))
+        return Program(app.actions, app.aliases, app.reverse_aliases, app._build_jump_table())
+
+    def run(self, program, variables=None, on_action=None):
+        """
+        プログラムを実行する。
+
+        Args:
+            program: Program
+            variables: 実行開始時の変数（呼び出し元の辞書は変更しない）
+            on_action: 通常アクションの終了ごとに結果の辞書を渡して呼ばれる関数
+
+        Returns:
+            RunResult
+        """
+        app = self._automator([])
+        app.aliases.update(program.aliases)
+        app.reverse_aliases.update(program.reverse_aliases)
+        app.actions = program.actions
+        app._jump_cache.update(program.jump_table)
+        app.variables.update(variables or {})
+        events = []
+
+        def record(event):
+            events.append(event)
+            if on_action:
+                on_action(event)
+
+        app.on_action = record
+        if self.flight_recorder:
+            self.flight_recorder.clear()
+        start = time.perf_counter()
+        completed, errors = app._run_actions()
+        app._flush_captures()
+        return RunResult(completed, errors, dict(app.variables), events, (time.perf_counter() - start) * 1000)
+
+    def _automator(self, action_files):
+        app = Automator(
+            action_files,
+            dry_run=self.dry_run,
+            force_run=self.force_run,
+            wait_time=self.wait_time,
+            legacy_mode=self.legacy_mode,
+            backend=self.backend,
+            logger=self.logger,
+            screenshots=self.screenshots,
+            flight_recorder=self.flight_recorder
+        )
+        app.element_finder.window_cache = self.window_cache
+        return app
+
+    @staticmethod
+    def _action_row(number, action):
+        if isinstance(action, dict):
+            row = {field: action.get(field, "") for field in ACTION_FIELDS}
+        elif isinstance(action, (list, tuple)) and 3 <= len(action) <= len(ACTION_FIELDS):
+            row = dict(zip(ACTION_FIELDS, list(action) + [""] * (len(ACTION_FIELDS) - len(action))))
+        else:
+            raise AutomatorError(f"Invalid action {number}: expected a dict or (TargetApp, Key, Action[, Value]), got {action!r}")
+        if not row["Action"]:
+            raise AutomatorError(f"Invalid action {number}: Action is empty")
+        return {field: "" if value is None else str(value) for field, value in row.items()}
+
+
+class JobRunner:
+    """
+    常駐モード（serve）でジョブを実行する。
+
+    バックエンド（初期化済みのUI Automation）、コンパイルキャッシュ、RPAパスの解析結果は
+    ジョブ間で共有し、ジョブごとのオプションでEngineを作成して実行する。
+    ウィンドウのキャッシュはレーンごとに持つ（レーンはそれぞれのスレッド・COMアパートメントで実行され、
+    別のアパートメントで取得した要素を使い回さないため）。
+    ログはレーンごとのロガーに出力し、サーバーのログとクライアントの両方に送る。
+    エラー時のスクリーンショットは screenshot_dir に保存する。
+    """
+
+    def __init__(self, backend, cache=None, screenshot_dir="errors"):
+        self.backend = backend
+        self.cache = cache
+        self.screenshot_dir = screenshot_dir
+        self.window_caches = {}  # レーン名 -> {TargetApp -> ウィンドウ要素}
+
+    def __call__(self, job, lane, emit):
+        from src.automator.utils.job_server import MessageLogHandler
+
+        logger = logging.getLogger(f"automator.lane.{lane}")
+        logger.setLevel(getattr(logging, str(job.get("log_level", "INFO")).upper(), logging.INFO))
+        handler = MessageLogHandler(emit)
+        logger.addHandler(handler)
+        try:
+            engine = Engine(
+                backend=self.backend,
+                logger=logger,
+                cache=self.cache,
+                dry_run=job.get("dry_run", False),
+                force_run=job.get("force_run", False),
+                wait_time=job.get("wait_time"),
+                legacy_mode=job.get("legacy", False),
+                window_cache=self.window_caches.setdefault(lane, {}),
+                screenshots=ScreenshotWriter(backend=self.backend, directory=self.screenshot_dir, logger=logger)
+            )
+            program = engine.load(job.get("action_files") or [], job.get("aliases"))
+            result = engine.run(program, job.get("variables"), on_action=lambda event: emit({"type": "action", **event}))
+        except AutomatorError as e:
+            return {"status": "FAILED", "errors": [str(e)], "variables": {}}
+        finally:
+            logger.removeHandler(handler)
+        return {
+            "status": result.status,
+            "errors": result.errors,
+            "variables": {name: str(value) for name, value in result.variables.items()},
+        }
+
+
+def serve_main(argv):
+    """automator.py serve: ジョブを受け付ける常駐プロセスを起動する"""
+    from src.automator.utils.job_server import JobServer
+
+    parser = argparse.ArgumentParser(prog="automator.py serve",
+                                     description="Keep a warm automator process and run jobs submitted with 'automator.py submit'.")
+    parser.add_argument("--address", help="Named pipe (Windows) or Unix socket path to listen on (default: per-user address).")
+    parser.add_argument("--connection-file", help="File where the address and auth key are written for clients (default: per-user file in the temp directory).")
+    parser.add_argument("--max-lanes", type=int, default=4, help="Maximum number of lanes. Jobs in the same lane run one at a time; lanes run in parallel (default: 4).")
+    parser.add_argument("--log-file", help="Path to the server log file.")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="Server logging level.")
+    parser.add_argument("--log-json", help="Also write structured log records (one JSON object per line) to this file.")
+    parser.add_argument("--cache-dir", help="Directory for the compiled alias/action cache (default: per-user cache directory, %%LOCALAPPDATA%%\\automator\\cache on Windows, ~/.cache/automator elsewhere).")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-read and re-parse the alias and action files.")
+    parser.add_argument("--screenshot-dir", default="errors", help="Directory for error screenshots taken by jobs (default: errors).")
+    parser.add_argument("--fake-tree", help="Serve jobs against an in-memory UI tree loaded from this JSON or snapshot file.")
+    parser.add_argument("--fake-latency", help="Latency injected per fake backend call (requires --fake-tree).")
+    args = parser.parse_args(argv)
+    if args.fake_latency and not args.fake_tree:
+        parser.error("--fake-latency requires --fake-tree")
+
+    configure_logging(args.log_level, log_file=args.log_file, json_file=args.log_json,
+                      fmt='%(asctime)s - %(levelname)s - [%(threadName)s] %(message)s')
+    logger = logging.getLogger("automator.serve")
+
+    if args.fake_tree:
+        from src.shared.backend.fake import FakeBackend, parse_latency
+        try:
+            latency = parse_latency(args.fake_latency)
+        except ValueError as e:
+            parser.error(str(e))
+        backend = FakeBackend.from_file(args.fake_tree, latency=latency)
+    else:
+        backend = get_backend()
+    # uiautomation / comtypesの読み込みとDPI設定をジョブの受け付け前に済ませる
+    backend.get_root()
+    logger.info("Backend '%s' initialized.", backend.name)
+
+    cache = None if args.no_cache else CompileCache(args.cache_dir, memory=True)
+    server = JobServer(JobRunner(backend, cache, screenshot_dir=args.screenshot_dir), address=args.address, connection_file=args.connection_file,
+                       max_lanes=args.max_lanes, worker_context=backend.thread_context, logger=logger)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Interrupted.")
+    except (OSError, RuntimeError) as e:
+        logger.error("Cannot start server: %s", e)
+        return 1
+    return 0
+
+
+def submit_main(argv):
+    """automator.py submit: 常駐プロセスにジョブを投入し、結果を待つ"""
+    import json
+    from src.automator.utils.job_server import submit
+
+    parser = argparse.ArgumentParser(prog="automator.py submit",
+                                     description="Submit a job to a running 'automator.py serve' process and wait for the result.")
+    parser.add_argument("csv_files", nargs='*', help="Path to the actions CSV file(s).")
+    parser.add_argument("--aliases", nargs='+', help="Path to the aliases CSV file(s).")
+    parser.add_argument("--var", action="append", default=[], metavar="NAME=VALUE", help="Set a variable before the job starts (repeatable).")
+    parser.add_argument("--lane", default="default", help="Lane to run the job in (default: 'default'). Jobs in the same lane run one at a time.")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="Logging level for the job.")
+    parser.add_argument("--dry-run", action="store_true", help="Run in dry-run mode (no side effects).")
+    parser.add_argument("--force-run", action="store_true", help="Continue execution even if errors occur.")
+    parser.add_argument("--wait-time", type=float, help="Wait time (in seconds) after each action.")
+    parser.add_argument("--legacy", action="store_true", help="Enable legacy mode.")
+    parser.add_argument("--connection-file", help="Connection file written by the server (default: per-user file in the temp directory).")
+    parser.add_argument("--json", action="store_true", help="Print every message from the server as a JSON line.")
+    parser.add_argument("--status", action="store_true", help="Print the server status and exit.")
+    parser.add_argument("--shutdown", action="store_true", help="Stop the server after its queued jobs finish.")
+    args = parser.parse_args(argv)
+
+    if args.status or args.shutdown:
+        request = {"type": "status" if args.status else "shutdown"}
+    elif not args.csv_files:
+        parser.error("the following arguments are required: csv_files")
+    else:
+        variables = {}
+        for item in args.var:
+            name, sep, value = item.partition("=")
+            if not sep or not name.strip():
+                parser.error(f"--var must be NAME=VALUE: {item!r}")
+            variables[name.strip()] = value
+        request = {"type": "job", "job": {
+            # サーバーの作業ディレクトリに依存しないよう絶対パスで渡す
+            "action_files": [os.path.abspath(p) for p in args.csv_files],
+            "aliases": [os.path.abspath(p) for p in args.aliases or []],
+            "variables": variables,
+            "lane": args.lane,
+            "log_level": args.log_level,
+            "dry_run": args.dry_run,
+            "force_run": args.force_run,
+            "wait_time": args.wait_time,
+            "legacy": args.legacy,
+        }}
+
+    def show(message):
+        if args.json:
+            print(json.dumps(message, ensure_ascii=False), flush=True)
+        elif message["type"] == "log":
+            print(f"{message['level']} - {message['message']}", flush=True)
+
+    try:
+        final = submit(request, args.connection_file, on_message=show)
+    except ConnectionError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 2
+
+    if not args.json:
+        if final["type"] == "result":
+            print(f"Job {final['job_id']} ({final['lane']}): {final['status']} in {final['elapsed_ms']:.0f} ms")
+            for error in final.get("errors", []):
+                print(f"  {error}")
+        elif final["type"] == "error":
+            print(f"Error: {final['message']}", file=sys.stderr)
+        else:
+            print(json.dumps(final, ensure_ascii=False, indent=2))
+    if final["type"] == "error" or (final["type"] == "result" and final["status"] != "OK"):
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Automator: Execute UI automation from CSV.")
+    # サブコマンド（serve / submit）はアクション実行の引数より先に判定する
+    if len(sys.argv) > 1 and sys.argv[1] in ("serve", "submit"):
+        sys.exit((serve_main if sys.argv[1] == "serve" else submit_main)(sys.argv[2:]))
+
+    parser = argparse.ArgumentParser(description="Automator: Execute UI automation from CSV.",
+                                     epilog="Subcommands: 'automator.py serve' keeps a warm process that runs jobs; "
+                                            "'automator.py submit' sends a job to it and waits for the result.")
     parser.add_argument("csv_files", nargs='+', default=["actions.csv"], help="Path to the actions CSV file(s).")
     parser.add_argument("--aliases", nargs='+', help="Path to the aliases CSV file(s).")
     parser.add_argument("--log-file", help="Path to the log file.")
     parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"], help="Logging level.")
+    parser.add_argument("--log-json", help="Also write structured log records (one JSON object per line) to this file.")
     parser.add_argument("--dry-run", action="store_true", help="Run in dry-run mode (no side effects).")
     parser.add_argument("--force-run", action="store_true", help="Continue execution even if errors occur.")
     parser.add_argument("--wait-time", type=float, help="Wait time (in seconds) after each action. If not specified, uses library default.")
     parser.add_argument("--legacy", action="store_true", help="Enable legacy mode for better compatibility with Win32 applications.")
+    parser.add_argument("--data", help="Data file (CSV or JSONL) for data-driven mode. Actions run once per record, with columns as variables.")
+    parser.add_argument("--data-output", help="Output file for per-record results in data-driven mode (.csv or .jsonl).")
+    parser.add_argument("--checkpoint", help="Path to the checkpoint file. Enables periodic saving of execution state.")
+    parser.add_argument("--checkpoint-interval", type=int, default=50, help="Save a checkpoint every N actions (default: 50).")
+    parser.add_argument("--resume", action="store_true", help="Resume from the last checkpoint (requires --checkpoint).")
+    parser.add_argument("--timing", action="store_true", help="Measure each action phase and print a p50/p95/max summary at the end.")
+    parser.add_argument("--timing-output", help="Export raw timing records to a CSV or JSON file (implies --timing).")
+    parser.add_argument("--trace", help="Write a Chrome/Perfetto trace-event JSON file of the run.")
+    parser.add_argument("--fake-tree", help="Run headless against an in-memory UI tree loaded from this JSON or snapshot file instead of the live desktop.")
+    parser.add_argument("--fake-latency", help="Latency injected per fake backend call, e.g. '0.01' or 'find=0.05,property=0.001' (requires --fake-tree).")
+    parser.add_argument("--cache-dir", help="Directory for the compiled alias/action cache (default: per-user cache directory, %%LOCALAPPDATA%%\\automator\\cache on Windows, ~/.cache/automator elsewhere).")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-read and re-parse the alias and action files.")
+    parser.add_argument("--screenshot-region", default="screen", choices=["screen", "window", "element"], help="Area captured on errors and by the Screenshot action (default: screen).")
+    parser.add_argument("--screenshot-format", default="png", choices=["png", "bmp"], help="Screenshot file format (default: png).")
+    parser.add_argument("--screenshot-compression", type=int, default=6, choices=range(10), metavar="0-9", help="PNG compression level (default: 6).")
+    parser.add_argument("--skip-identical-screenshots", action="store_true", help="Do not save an error screenshot identical to the previous one.")
+    parser.add_argument("--flight-recorder", type=int, default=0, metavar="N", help="Keep low-resolution captures of the target window after the last N actions and save them to errors/ when an action fails.")
+    parser.add_argument("--flight-recorder-memory", type=float, default=16, metavar="MB", help="Memory cap for the flight recorder captures (default: 16 MB).")
+    parser.add_argument("--flight-recorder-scale", type=int, default=4, help="Downscale factor for flight recorder captures (default: 4).")
     
     args = parser.parse_args()
+    if args.resume and not args.checkpoint:
+        parser.error("--resume requires --checkpoint")
+    if args.fake_latency and not args.fake_tree:
+        parser.error("--fake-latency requires --fake-tree")
+    
+    backend = None
+    if args.fake_tree:
+        from src.shared.backend.fake import FakeBackend, parse_latency
+        try:
+            latency = parse_latency(args.fake_latency)
+        except ValueError as e:
+            parser.error(str(e))
+        backend = FakeBackend.from_file(args.fake_tree, latency=latency)
+    
+    screenshots = ScreenshotWriter(
+        backend=backend,
+        region=args.screenshot_region,
+        image_format=args.screenshot_format,
+        compression=args.screenshot_compression,
+        skip_identical=args.skip_identical_screenshots
+    )
+    
+    flight_recorder = None
+    if args.flight_recorder > 0:
+        from src.automator.utils.flight_recorder import FlightRecorder
+        flight_recorder = FlightRecorder(
+            backend=backend,
+            frames=args.flight_recorder,
+            max_bytes=int(args.flight_recorder_memory * 1024 * 1024),
+            scale=args.flight_recorder_scale
+        )
     
     app = Automator(
         args.csv_files, 
         log_file=args.log_file, 
         log_level=args.log_level, 
+        log_json=args.log_json,
         dry_run=args.dry_run, 
         force_run=args.force_run, 
         wait_time=args.wait_time,
-        legacy_mode=args.legacy
+        legacy_mode=args.legacy,
+        checkpoint_file=args.checkpoint,
+        checkpoint_interval=args.checkpoint_interval,
+        timing=args.timing,
+        timing_output=args.timing_output,
+        trace_output=args.trace,
+        backend=backend,
+        screenshots=screenshots,
+        flight_recorder=flight_recorder
     )
     
-    if args.aliases:
-        app.load_aliases(args.aliases)
-        
-    app.load_actions()
-    app.run()
+    try:
+        app.load_program(args.aliases, cache=None if args.no_cache else CompileCache(args.cache_dir))
+        if args.data:
+            import datetime
+            data_output = args.data_output or f"results_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+            app.run_data(args.data, data_output, resume=args.resume)
+        else:
+            app.run(resume=args.resume)
+    except AutomatorError:
+        # 内容はログに出力済み
+        sys.exit(1)
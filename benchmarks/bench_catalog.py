@@ -0,0 +1,65 @@
+"""
+エイリアスカタログのベンチマーク
+
+合成コントロールツリー全体のエイリアスカタログ（AliasCatalog）を生成し、
+ツリーの走査とパス生成に掛かる時間を計測する。比較として、一部の要素について
+要素ごとにPathGenerator.get_rpa_pathを呼んだ場合の時間を計測し、全要素分に換算する。
+
+使い方:
+    python benchmarks/bench_catalog.py
+    python benchmarks/bench_catalog.py --depth 5 --fanout 9 --filter interactive
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from synthetic_tree import build_desktop
+from src.inspector.core.catalog import AliasCatalog, FILTERS
+from src.inspector.core.path_generator import PathGenerator
+from src.shared.snapshot import Snapshot, walk_tree
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark whole-window alias catalogue generation.")
+    parser.add_argument("--depth", type=int, default=5, help="Depth of the tree under the target window.")
+    parser.add_argument("--fanout", type=int, default=9, help="Number of children per node (5 x 9 is about 66k nodes).")
+    parser.add_argument("--filter", choices=FILTERS, default="all", help="Elements to include in the catalogue.")
+    parser.add_argument("--sample", type=int, default=200, help="Elements to time with per-element get_rpa_path.")
+    args = parser.parse_args()
+
+    backend, window, node_count = build_desktop(args.depth, args.fanout, windows=0)
+    elements = [element for element, _ in backend.walk(window)]
+    print(f"Synthetic tree: depth={args.depth}, fanout={args.fanout}, nodes={node_count}, filter={args.filter}")
+
+    for mode in ("modern", "legacy"):
+        catalog = AliasCatalog(mode=mode, element_filter=args.filter)
+        builder, walk_ms = timed(lambda: walk_tree(backend, window, patterns=catalog.needs_patterns))
+        with Snapshot.from_bytes(builder.to_bytes()) as snapshot:
+            entries, build_ms = timed(lambda: catalog.build(snapshot))
+
+        # 要素ごとのget_rpa_path（兄弟のスナップショットは既定のSiblingCacheで再利用される）
+        generator = PathGenerator(mode=mode, backend=backend)
+        sample = random.Random(0).sample(elements[1:], min(args.sample, node_count - 1))
+        _, sample_ms = timed(lambda: [generator.get_rpa_path(element) for element in sample])
+        per_element_ms = sample_ms / len(sample) * len(entries)
+
+        print(f"  {mode:<7} walk {walk_ms:>9.1f} ms  paths {build_ms:>9.1f} ms  "
+              f"({len(entries)} entries, {(walk_ms + build_ms) / max(1, len(entries)) * 1000:.1f} us/entry)")
+        print(f"  {'':<7} per-element get_rpa_path: {sample_ms / len(sample):.3f} ms/element "
+              f"(~{per_element_ms / 1000:.1f} s for {len(entries)} entries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+コンパイルキャッシュのベンチマーク
+
+多数のエイリアスとアクション（If/Loopを含む）のCSVを生成し、
+キャッシュなしの読み込み、キャッシュの作成、キャッシュからの読み込みに掛かる時間を計測する。
+
+使い方:
+    python benchmarks/bench_compile_cache.py
+    python benchmarks/bench_compile_cache.py --aliases 20000 --actions 5000
+"""
+
+import argparse
+import csv
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from automator import Automator
+from src.automator.utils.compile_cache import CompileCache
+from src.shared.backend.fake import FakeBackend
+
+
+def write_sources(directory, alias_count, action_count, seed=0):
+    """エイリアスCSV（2ファイルに分割）とアクションCSVを生成する。"""
+    rng = random.Random(seed)
+    alias_files = [os.path.join(directory, f"aliases_{i}.csv") for i in range(2)]
+    for index, path in enumerate(alias_files):
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["AliasName", "RPA_Path"])
+            for n in range(index, alias_count, 2):
+                writer.writerow([f"alias_{n}", f"PaneControl(Name='Pane {n % 50}', searchDepth=1) -> "
+                                               f"GroupControl(AutomationId='group{n % 300}') -> "
+                                               f"ButtonControl(Name='Button {n}', foundIndex={n % 3 + 1})"])
+
+    action_file = os.path.join(directory, "actions.csv")
+    with open(action_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["TargetApp", "Key", "Action", "Value"])
+        open_blocks = []
+        for _ in range(action_count):
+            roll = rng.random()
+            if roll < 0.05:
+                block = rng.choice(["IF", "LOOP"])
+                open_blocks.append(block)
+                writer.writerow(["", "", block, "1 == 1" if block == "IF" else "2"])
+            elif roll < 0.1 and open_blocks:
+                writer.writerow(["", "", "ENDIF" if open_blocks.pop() == "IF" else "ENDLOOP", ""])
+            else:
+                writer.writerow(["App", f"alias_{rng.randrange(alias_count)}", "Click", ""])
+        for block in reversed(open_blocks):
+            writer.writerow(["", "", "ENDIF" if block == "IF" else "ENDLOOP", ""])
+    return alias_files, action_file
+
+
+def load(alias_files, action_file, cache):
+    app = Automator([action_file], backend=FakeBackend())
+    start = time.perf_counter()
+    from_cache = app.load_program(alias_files, cache=cache)
+    return (time.perf_counter() - start) * 1000, from_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark loading aliases/actions with and without the compile cache.")
+    parser.add_argument("--aliases", type=int, default=5000, help="Number of aliases.")
+    parser.add_argument("--actions", type=int, default=2000, help="Number of actions.")
+    parser.add_argument("--iterations", type=int, default=5, help="Iterations per measurement.")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        alias_files, action_file = write_sources(directory, args.aliases, args.actions)
+        cache = CompileCache(os.path.join(directory, "cache"))
+        print(f"Sources: {args.aliases} aliases in {len(alias_files)} files, {args.actions} actions")
+        logging.disable(logging.CRITICAL)
+
+        cold = sorted(load(alias_files, action_file, None)[0] for _ in range(args.iterations))
+        build_ms, _ = load(alias_files, action_file, cache)
+        warm = []
+        for _ in range(args.iterations):
+            elapsed, from_cache = load(alias_files, action_file, cache)
+            if not from_cache:
+                sys.exit("Cache was not used on an unchanged source")
+            warm.append(elapsed)
+        warm.sort()
+        size = sum(os.path.getsize(os.path.join(cache.cache_dir, name)) for name in os.listdir(cache.cache_dir))
+
+        print(f"  parse (no cache)       {cold[len(cold) // 2]:>10.1f} ms  (median of {args.iterations})")
+        print(f"  parse + write cache    {build_ms:>10.1f} ms  ({size:,} bytes)")
+        print(f"  load from cache        {warm[len(warm) // 2]:>10.1f} ms  (median of {args.iterations})")
+    finally:
+        logging.disable(logging.NOTSET)
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
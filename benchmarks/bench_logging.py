@@ -0,0 +1,90 @@
+"""
+ロギングのオーバーヘッドのベンチマーク
+
+SetVariableだけを繰り返すループ（UI操作なし）を実行し、ログ出力の構成ごとに
+1秒あたりのアクション数を比較する。ログはテキストファイル（とJSONL）に書き込み、
+コンソールへの出力は破棄する。
+
+    sync        呼び出し元のスレッドで書き込む（キューなし）
+    background  QueueListenerのスレッドで書き込む（既定）
+    jsonl       background + JSONLファイル
+    warning     background、レベルWARNING（INFOのログは組み立てない）
+
+使い方:
+    python benchmarks/bench_logging.py
+    python benchmarks/bench_logging.py --iterations 20000 --level DEBUG
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from automator import Engine
+from src.automator.utils.log_pipeline import configure_logging
+from src.shared.backend.fake import FakeBackend
+
+
+CONFIGS = [
+    ("sync", {"background": False}),
+    ("background", {}),
+    ("jsonl", {"json": True}),
+    ("warning", {"level": "WARNING"}),
+]
+
+
+def run(program, directory, name, level, background=True, json=False):
+    """1つの構成でプログラムを実行し、(経過秒, 出力を書き終えるまでの秒, 書き込んだバイト数) を返す。"""
+    log_file = os.path.join(directory, f"{name}.log")
+    json_file = os.path.join(directory, f"{name}.jsonl") if json else None
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        pipeline = configure_logging(level, log_file=log_file, json_file=json_file, stream=devnull, background=background)
+        engine = Engine(backend=FakeBackend(), wait_time=0)
+        start = time.perf_counter()
+        result = engine.run(program)
+        elapsed = time.perf_counter() - start
+        pipeline.stop()
+        drained = time.perf_counter() - start
+    if result.status != "OK":
+        sys.exit(f"{name}: run failed: {result.errors}")
+    size = sum(os.path.getsize(path) for path in (log_file, json_file) if path)
+    return elapsed, drained, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark logging overhead in a tight SetVariable loop.")
+    parser.add_argument("--iterations", type=int, default=5000, help="Loop iterations (2 actions each).")
+    parser.add_argument("--level", default="INFO", choices=["DEBUG", "INFO"], help="Log level for the non-warning configurations.")
+    args = parser.parse_args()
+
+    program = Engine(backend=FakeBackend()).compile([
+        ("", "", "Loop", str(args.iterations)),
+        ("", "", "SetVariable", "value = 'x'"),
+        ("", "", "EndLoop"),
+    ])
+    actions = args.iterations * 2
+
+    directory = tempfile.mkdtemp()
+    try:
+        print(f"{actions:,} actions ({args.iterations:,} x Loop/SetVariable), level {args.level}")
+        baseline = None
+        for name, options in CONFIGS:
+            level = options.get("level", args.level)
+            elapsed, drained, size = run(program, directory, name, level,
+                                         background=options.get("background", True), json=options.get("json", False))
+            rate = actions / elapsed
+            baseline = baseline or rate
+            print(f"  {name:<11} {rate:>12,.0f} actions/s  x{rate / baseline:>5.2f}  "
+                  f"run {elapsed * 1000:>8.1f} ms  flushed {drained * 1000:>8.1f} ms  {size:>12,} bytes")
+    finally:
+        configure_logging("WARNING")
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
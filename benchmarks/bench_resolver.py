@@ -0,0 +1,118 @@
+"""
+オフライン解決のベンチマーク
+
+合成ツリーのスナップショットに対して、多数のRPAパス（PathGeneratorで生成したパスと、
+セグメントを間引いてフォールバックが必要になるパス）をSnapshotResolverで解決し、
+同じパスをFakeBackend上のElementFinderで解決した場合と比較する。
+MultiPathMatcherによる一括照合（validate-aliasesで使用）も計測する。
+結果（見つかったノードとフォールバック段階）が一致しない場合はエラー終了する。
+
+使い方:
+    python benchmarks/bench_resolver.py
+    python benchmarks/bench_resolver.py --paths 5000 --latency find=0.0005
+"""
+
+import argparse
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from synthetic_tree import build_desktop
+from src.automator.core.element_finder import ElementFinder
+from src.automator.utils.timing import TimingRecorder
+from src.inspector.core.path_generator import PathGenerator
+from src.shared.backend.fake import parse_latency
+from src.shared.multi_matcher import MultiPathMatcher
+from src.shared.resolver import SnapshotResolver
+from src.shared.snapshot import Snapshot, capture_snapshot
+
+
+def build_paths(backend, window, count, seed=0):
+    """PathGeneratorのパスと、中間セグメントを間引いたパスを生成する。"""
+    rng = random.Random(seed)
+    nodes = [element for element, depth in backend.walk(window) if depth > 0]
+    generators = [PathGenerator(mode="modern", backend=backend), PathGenerator(mode="legacy", backend=backend)]
+    paths = []
+    for _ in range(count):
+        path = rng.choice(generators).get_rpa_path(rng.choice(nodes))
+        segments = path.split(" -> ")
+        if len(segments) > 2 and rng.random() < 0.3:
+            # 中間のセグメントを1つ削除（深度+1または再帰フォールバックが必要になる）
+            del segments[rng.randrange(1, len(segments) - 1)]
+        paths.append(" -> ".join(segments))
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline path resolution against a snapshot.")
+    parser.add_argument("--depth", type=int, default=4, help="Depth of the tree under the target window.")
+    parser.add_argument("--fanout", type=int, default=8, help="Number of children per node.")
+    parser.add_argument("--duplicate-density", type=float, default=0.3, help="Fraction of siblings with duplicate names.")
+    parser.add_argument("--paths", type=int, default=2000, help="Number of paths to resolve.")
+    parser.add_argument("--latency", help="Latency injected per backend call for the live comparison.")
+    args = parser.parse_args()
+
+    backend, window, node_count = build_desktop(args.depth, args.fanout, args.duplicate_density, windows=0)
+    paths = build_paths(backend, window, args.paths)
+    path = os.path.join(tempfile.mkdtemp(), "bench.uisnap")
+    try:
+        capture_snapshot(backend, window, path)
+        print(f"Synthetic tree: depth={args.depth}, fanout={args.fanout}, nodes={node_count}, paths={len(paths)}")
+
+        with Snapshot(path) as snapshot:
+            start = time.perf_counter()
+            resolver = SnapshotResolver(snapshot)
+            index_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            offline = [resolver.resolve(p) for p in paths]
+            offline_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            matcher = MultiPathMatcher(snapshot)
+            matched = matcher.match(paths)
+            multi_ms = (time.perf_counter() - start) * 1000
+            multi_mismatches = [p for p, o in zip(paths, offline) if (matched[p].node, matched[p].fallbacks) != (o.node, o.fallbacks)]
+
+        # ライブ検索（フォールバック段階はタイマーのsegmentフェーズから取得）
+        backend.latency = parse_latency(args.latency) or {}
+        logger = logging.getLogger("bench")
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        order = {id(element): index for index, (element, _) in enumerate(backend.walk(window))}
+        live = []
+        start = time.perf_counter()
+        for p in paths:
+            timer = TimingRecorder(enabled=True)
+            element = ElementFinder(logger=logger, timer=timer, backend=backend).find_element_by_path(window, p)
+            fallbacks = [r["fallback"] for r in timer.records if r["phase"] == "segment" and r["status"] == "ok"]
+            live.append((order[id(element)] if element is not None else None, fallbacks))
+        live_ms = (time.perf_counter() - start) * 1000
+
+        mismatches = [(p, o, l) for p, o, l in zip(paths, offline, live) if (o.node, o.fallbacks) != l]
+        found = sum(1 for o in offline if o.found)
+        fallback_paths = sum(1 for o in offline if any(o.fallbacks))
+        print(f"  found {found}/{len(paths)}, with fallback {fallback_paths}")
+        print(f"  index build            {index_ms:>10.1f} ms")
+        print(f"  offline resolve        {offline_ms:>10.1f} ms  ({offline_ms * 1000 / len(paths):.1f} us/path)")
+        print(f"  multi-path match       {multi_ms:>10.1f} ms  ({matcher.passes} passes, {matcher.queries} queries)")
+        print(f"  live finder (fake)     {live_ms:>10.1f} ms  ({live_ms * 1000 / len(paths):.1f} us/path, "
+              f"latency={args.latency or 0})")
+        if mismatches:
+            for p, o, l in mismatches[:5]:
+                print(f"  MISMATCH {p}: offline={o.node} {o.fallbacks} live={l[0]} {l[1]}")
+            sys.exit(f"{len(mismatches)} paths resolved differently offline")
+        if multi_mismatches:
+            sys.exit(f"{len(multi_mismatches)} paths matched differently by MultiPathMatcher")
+        print("  offline results match the live finder")
+    finally:
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    main()
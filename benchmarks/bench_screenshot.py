@@ -0,0 +1,98 @@
+"""
+エラー時スクリーンショットのベンチマーク
+
+--force-run で失敗し続けるアクションをFakeBackend上で実行し、スクリーンショットの
+構成ごとに、アクション1回あたりの所要時間（アクションのスレッドが止まる時間）と、
+最後の画像を書き終えるまでの時間を比較する。
+
+    sync        取得のたびにエンコード・保存を待つ（従来の動作に相当）
+    background  エンコード・保存をバックグラウンドで行う（既定）
+    skip        background + 直前と同じ画像を保存しない
+    window      background + 対象ウィンドウの範囲のみ
+
+使い方:
+    python benchmarks/bench_screenshot.py
+    python benchmarks/bench_screenshot.py --failures 50 --desktop 3840x2160 --compression 1
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from automator import Engine
+from src.automator.utils.screenshot import ScreenshotWriter
+from src.shared.backend.fake import FakeBackend, Rect
+
+
+class SyncScreenshotWriter(ScreenshotWriter):
+    """取得のたびに書き込みの完了を待つ（比較用）。"""
+
+    def capture(self, *args, **kwargs):
+        path = super().capture(*args, **kwargs)
+        self.flush()
+        return path
+
+
+CONFIGS = [
+    ("sync", SyncScreenshotWriter, {}),
+    ("background", ScreenshotWriter, {}),
+    ("skip", ScreenshotWriter, {"skip_identical": True}),
+    ("window", ScreenshotWriter, {"region": "window"}),
+]
+
+
+def build_backend(width, height):
+    backend = FakeBackend()
+    backend.root.rect = Rect(0, 0, width, height)
+    backend.add_element(backend.root, "WindowControl", "Bench App", rect=Rect(100, 100, 1060, 820))
+    return backend
+
+
+def run(directory, writer_class, options, failures, width, height, compression):
+    backend = build_backend(width, height)
+    writer = writer_class(backend=backend, directory=directory, compression=compression, **options)
+    engine = Engine(backend=backend, force_run=True, wait_time=0, screenshots=writer)
+    program = engine.compile([("Bench App", "ButtonControl(Name='Missing')", "Click")] * failures)
+    events = []
+    start = time.perf_counter()
+    engine.run(program, on_action=events.append)  # 最後にflushされる
+    total = time.perf_counter() - start
+    writer.close()
+    size = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+    per_action = sorted(event["elapsed_ms"] for event in events)
+    return statistics.median(per_action), per_action[int(len(per_action) * 0.95) - 1], total, writer.stats, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark error screenshots taken in a --force-run failure loop.")
+    parser.add_argument("--failures", type=int, default=20, help="Number of failing actions.")
+    parser.add_argument("--desktop", default="5760x1080", help="Fake virtual desktop size WxH (default: three 1080p monitors).")
+    parser.add_argument("--compression", type=int, default=6, help="PNG compression level.")
+    args = parser.parse_args()
+    width, height = (int(n) for n in args.desktop.lower().split("x"))
+
+    logging.disable(logging.CRITICAL)
+    root = tempfile.mkdtemp()
+    try:
+        print(f"{args.failures} failing actions, desktop {width}x{height}, PNG level {args.compression}")
+        for name, writer_class, options in CONFIGS:
+            directory = os.path.join(root, name)
+            p50, p95, total, stats, size = run(directory, writer_class, options, args.failures, width, height,
+                                               args.compression)
+            print(f"  {name:<11} action p50 {p50:>8.1f} ms  p95 {p95:>8.1f} ms  total {total * 1000:>9.1f} ms  "
+                  f"saved {stats['saved']:>3}  skipped {stats['skipped']:>3}  dropped {stats['dropped']:>3}  {size:>12,} bytes")
+    finally:
+        logging.disable(logging.NOTSET)
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+検索エンジンのベンチマーク
+
+合成コントロールツリー（インメモリのFakeBackend）上で
+ElementFinder / PathGenerator の主要操作を計測し、結果をJSONに保存する。
+ライブのウィンドウは不要で、Linuxでも実行できる。
+
+使い方:
+    python benchmarks/bench_search.py
+    python benchmarks/bench_search.py --depth 5 --fanout 6 --duplicate-density 0.5
+    python benchmarks/bench_search.py --latency find=0.0005,property=0.00005
+    python benchmarks/bench_search.py --compare benchmarks/results/search_20250101_000000_abc1234.json
+"""
+
+import argparse
+import datetime
+import itertools
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from synthetic_tree import build_desktop, deepest_leaves, lineage, TARGET_WINDOW
+from src.automator.core.element_finder import ElementFinder
+from src.inspector.core.path_generator import PathGenerator
+from src.inspector.core.segment_cache import SegmentCache
+from src.shared.backend.base import MAX_SEARCH_DEPTH
+from src.shared.backend.fake import parse_latency
+
+
+def found_index(backend, origin, node, props, search_depth):
+    """originからsearch_depth以内で、propsに一致する要素中のnodeの順番（1始まり）を返す。"""
+    count = 0
+    for ctrl, depth in backend.walk(origin, max_depth=search_depth):
+        if depth == 0:
+            continue
+        if ctrl.control_type == props[0] and ctrl.name == props[1]:
+            count += 1
+            if ctrl is node:
+                return count
+    raise ValueError("node is not reachable from origin")
+
+
+def segment(backend, origin, node, search_depth=1, index_depth=None):
+    """
+    パスセグメント文字列を生成する。
+
+    Args:
+        backend: FakeBackendインスタンス
+        origin: 検索の起点
+        node: 対象ノード
+        search_depth: パスに書き込むsearchDepth
+        index_depth: foundIndexを計算する探索深度（フォールバックで見つかる深度）
+    """
+    index_depth = index_depth or search_depth
+    props = (node.control_type, node.name)
+    index = found_index(backend, origin, node, props, index_depth)
+    parts = [f"Name='{node.name}'"]
+    if index > 1:
+        parts.append(f"foundIndex={index}")
+    parts.append(f"searchDepth={search_depth}")
+    return f"{node.control_type}({', '.join(parts)})"
+
+
+def measure(backend, func, iterations):
+    """funcを繰り返し実行し、所要時間と呼び出し回数の統計を返す。"""
+    func()  # ウォームアップ
+    durations = []
+    backend.calls.clear()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    durations.sort()
+    return {
+        "iterations": iterations,
+        "min_ms": round(durations[0], 4),
+        "median_ms": round(statistics.median(durations), 4),
+        "mean_ms": round(statistics.fmean(durations), 4),
+        "p95_ms": round(durations[max(0, int(len(durations) * 0.95) - 1)], 4),
+        "calls_per_op": sum(backend.calls.values()) // iterations,
+    }
+
+
+def build_cases(backend, window, finder, leaf):
+    chain = lineage(leaf, window)
+
+    # 直接ヒット: すべてのセグメントがsearchDepth=1で見つかる
+    direct_parts = []
+    parent = window
+    for node in chain:
+        direct_parts.append(segment(backend, parent, node))
+        parent = node
+    direct_path = " -> ".join(direct_parts)
+
+    # 深度+1フォールバック: 2段目を飛ばし、3段目をsearchDepth=1で指定する
+    skip_parts = [segment(backend, window, chain[0]), segment(backend, chain[0], chain[2], 1, 2)]
+    parent = chain[2]
+    for node in chain[3:]:
+        skip_parts.append(segment(backend, parent, node))
+        parent = node
+    fallback_path = " -> ".join(skip_parts)
+
+    # 再帰フォールバック: 葉をウィンドウ直下として指定する
+    recursive_path = segment(backend, window, leaf, 1, MAX_SEARCH_DEPTH)
+
+    for path in (direct_path, fallback_path, recursive_path):
+        if finder.find_element_by_path(window, path) is None:
+            raise RuntimeError(f"Benchmark path does not resolve: {path}")
+
+    # ウォームアップ後は兄弟要素のスナップショット（SiblingCache）から計算される
+    modern = PathGenerator(mode="modern", backend=backend)
+    legacy = PathGenerator(mode="legacy", backend=backend)
+
+    # uncached: 毎回スナップショットを破棄し、セグメントのメモも使わない（兄弟要素の走査を毎回行う）
+    def uncached(mode):
+        generator = PathGenerator(mode=mode, backend=backend, segment_cache=SegmentCache(max_entries=0))
+        def run():
+            generator.sibling_cache.invalidate()
+            return generator.get_rpa_path(leaf)
+        return run
+
+    # cold: 毎回SiblingCacheとSegmentCacheを破棄する（系譜の収集とすべてのセグメントの生成を計測）
+    cold = PathGenerator(mode="legacy", backend=backend)
+    def cold_path():
+        cold.invalidate()
+        return cold.get_rpa_path(leaf)
+
+    # new-leaf: 同じ親の下の別の要素を順にクリックする（祖先のセグメントはメモから再利用され、葉だけが生成される）
+    clicker = PathGenerator(mode="legacy", backend=backend)
+    siblings = itertools.cycle(leaf.parent.children)
+
+    return {
+        "find_window/exact": lambda: finder.find_window(TARGET_WINDOW),
+        "find_window/partial": lambda: finder.find_window("Synthetic"),
+        "find_window/regex": lambda: finder.find_window("regex:Synth.*App"),
+        "find_element_by_path/direct": lambda: finder.find_element_by_path(window, direct_path),
+        "find_element_by_path/depth_plus_1": lambda: finder.find_element_by_path(window, fallback_path),
+        "find_element_by_path/recursive": lambda: finder.find_element_by_path(window, recursive_path),
+        "find_element_by_position/right": lambda: finder._find_element_by_position(leaf, window, "right"),
+        "find_element_by_position/up": lambda: finder._find_element_by_position(leaf, window, "up"),
+        "get_rpa_path/modern": lambda: modern.get_rpa_path(leaf),
+        "get_rpa_path/legacy": lambda: legacy.get_rpa_path(leaf),
+        "get_rpa_path/modern/uncached": uncached("modern"),
+        "get_rpa_path/legacy/uncached": uncached("legacy"),
+        "get_rpa_path/cold": cold_path,
+        "get_rpa_path/new-leaf": lambda: clicker.get_rpa_path(next(siblings)),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=BENCH_DIR, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def compare(results, baseline_file):
+    with open(baseline_file, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print(f"\nComparison with {baseline_file} (median, ratio < 1.0 is faster):")
+    for name, stats in results.items():
+        if name in baseline:
+            ratio = stats["median_ms"] / baseline[name]["median_ms"] if baseline[name]["median_ms"] else float("inf")
+            print(f"  {name:<40} {baseline[name]['median_ms']:>10.3f} -> {stats['median_ms']:>10.3f} ms  x{ratio:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the element search engine on synthetic control trees.")
+    parser.add_argument("--depth", type=int, default=4, help="Depth of the tree under the target window.")
+    parser.add_argument("--fanout", type=int, default=8, help="Number of children per node.")
+    parser.add_argument("--duplicate-density", type=float, default=0.3, help="Fraction of siblings with duplicate names.")
+    parser.add_argument("--id-density", type=float, default=0.5, help="Fraction of nodes with an AutomationId.")
+    parser.add_argument("--windows", type=int, default=20, help="Number of other top-level windows.")
+    parser.add_argument("--latency", help="Latency injected per backend call, e.g. '0.0001' or 'find=0.0005,property=0.00005'.")
+    parser.add_argument("--iterations", type=int, default=20, help="Iterations per case.")
+    parser.add_argument("--filter", help="Only run cases whose name contains this string.")
+    parser.add_argument("--output", help="Output JSON file (default: benchmarks/results/search_<timestamp>_<commit>.json).")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against.")
+    args = parser.parse_args()
+
+    if args.depth < 3:
+        parser.error("--depth must be at least 3 for the fallback cases")
+
+    try:
+        latency = parse_latency(args.latency)
+    except ValueError as e:
+        parser.error(str(e))
+    backend, window, node_count = build_desktop(args.depth, args.fanout, args.duplicate_density,
+                                                args.id_density, args.windows, latency=latency)
+
+    logger = logging.getLogger("bench")
+    logger.addHandler(logging.NullHandler())
+    logger.setLevel(logging.CRITICAL)
+    logger.propagate = False
+    finder = ElementFinder(logger=logger, backend=backend)
+
+    # 重複名を持つ葉を優先して対象にする（foundIndex計算を含めるため）
+    leaves = deepest_leaves(window)
+    leaf = next((n for n in reversed(leaves) if n.name.endswith("-0") and n is not n.parent.children[0]
+                 and not n.automation_id), leaves[-1])
+
+    print(f"Synthetic tree: depth={args.depth}, fanout={args.fanout}, nodes={node_count}, "
+          f"duplicate_density={args.duplicate_density}, windows={args.windows}, latency={args.latency or 0}")
+
+    results = {}
+    for name, func in build_cases(backend, window, finder, leaf).items():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(backend, func, args.iterations)
+        stats = results[name]
+        print(f"  {name:<40} median {stats['median_ms']:>10.3f} ms  p95 {stats['p95_ms']:>10.3f} ms  "
+              f"calls/op {stats['calls_per_op']:>8}")
+
+    commit = git_commit()
+    output = args.output
+    if not output:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(os.path.join(BENCH_DIR, "results"), exist_ok=True)
+        output = os.path.join(BENCH_DIR, "results", f"search_{timestamp}_{commit}.json")
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                "commit": commit,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "params": {
+                    "depth": args.depth, "fanout": args.fanout, "duplicate_density": args.duplicate_density,
+                    "id_density": args.id_density, "windows": args.windows, "nodes": node_count,
+                    "latency": args.latency or "",
+                },
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+スナップショットのベンチマーク
+
+合成コントロールツリーからスナップショットを作成し、書き込み・読み込み（mmap）・
+全文字列のデコード・列の走査に掛かる時間とファイルサイズを計測する。
+
+使い方:
+    python benchmarks/bench_snapshot.py
+    python benchmarks/bench_snapshot.py --depth 5 --fanout 10
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from synthetic_tree import build_desktop
+from src.shared.snapshot import Snapshot, capture_snapshot
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark snapshot capture and loading.")
+    parser.add_argument("--depth", type=int, default=5, help="Depth of the tree under the target window.")
+    parser.add_argument("--fanout", type=int, default=10, help="Number of children per node.")
+    parser.add_argument("--iterations", type=int, default=20, help="Iterations for the load measurements.")
+    args = parser.parse_args()
+
+    backend, window, node_count = build_desktop(args.depth, args.fanout, windows=0)
+    path = os.path.join(tempfile.mkdtemp(), "bench.uisnap")
+    try:
+        count, capture_ms = timed(lambda: capture_snapshot(backend, window, path))
+        size = os.path.getsize(path)
+        print(f"Synthetic tree: depth={args.depth}, fanout={args.fanout}, nodes={count}")
+        print(f"  capture+write          {capture_ms:>10.1f} ms  ({size:,} bytes, {size / count:.1f} bytes/node)")
+
+        def load():
+            Snapshot(path).close()
+
+        def decode_all():
+            with Snapshot(path) as snapshot:
+                for string_id in range(snapshot.string_count):
+                    snapshot.string(string_id)
+
+        def scan_depth():
+            with Snapshot(path) as snapshot:
+                return max(snapshot.depth)
+
+        for name, func in (("open (mmap)", load), ("open + decode strings", decode_all),
+                           ("open + scan depth column", scan_depth)):
+            durations = sorted(timed(func)[1] for _ in range(args.iterations))
+            print(f"  {name:<22} {durations[len(durations) // 2]:>10.3f} ms  (median of {args.iterations})")
+    finally:
+        os.remove(path)
+        os.rmdir(os.path.dirname(path))
+
+
+if __name__ == "__main__":
+    main()
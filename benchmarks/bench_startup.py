@@ -0,0 +1,156 @@
+"""
+起動時間のベンチマーク
+
+各エントリポイントを新しいプロセスで `python -X importtime` 付きで起動し、
+モジュールの読み込み時間（importtimeのself時間の合計）とプロセス全体の所要時間を計測する。
+UIに触れないコマンドで重いモジュール（uiautomation, comtypes, ctypes, keyboard など）が
+読み込まれていないことも確認し、読み込まれていればエラー終了する。
+結果はJSONに保存し、--compare で以前の結果と比較できる。
+
+使い方:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --iterations 20 --top 15
+    python benchmarks/bench_startup.py --compare benchmarks/results/startup_20250101_000000_abc1234.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+
+from bench_search import git_commit
+
+# UIに触れないコマンドで読み込まれてはならないモジュール
+HEAVY_MODULES = ("uiautomation", "comtypes", "ctypes", "keyboard", "subprocess", "tempfile")
+
+
+def build_cases(directory):
+    """(ケース名, 引数) の一覧を返す。ドライランはウィンドウを使用しないアクションのみで構成する。"""
+    actions = os.path.join(directory, "startup_actions.csv")
+    with open(actions, "w", encoding="utf-8") as f:
+        f.write("TargetApp,Key,Action,Value\n,,SetVariable,status = OK\n,,Wait,0\n")
+    return {
+        "automator --help": ["automator.py", "--help"],
+        "automator dry-run (no UI)": ["automator.py", actions, "--dry-run", "--no-cache"],
+        "inspector --help": ["inspector.py", "--help"],
+        "snapshot --help": ["snapshot.py", "--help"],
+    }
+
+
+def parse_importtime(stderr):
+    """
+    -X importtime の出力を解析する。
+
+    Returns:
+        dict: モジュール名 -> (self時間us, 累積時間us)
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def run_case(args, iterations):
+    walls = []
+    imports = []
+    modules = {}
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-X", "importtime"] + args, cwd=ROOT_DIR,
+                                capture_output=True, text=True, encoding="utf-8")
+        walls.append((time.perf_counter() - start) * 1000)
+        if result.returncode != 0:
+            sys.exit(f"{' '.join(args)} failed:\n{result.stderr[-2000:]}")
+        modules = parse_importtime(result.stderr)
+        imports.append(sum(self_us for self_us, _ in modules.values()) / 1000)
+    return {
+        "median_ms": statistics.median(walls),
+        "min_ms": min(walls),
+        "import_ms": statistics.median(imports),
+        "modules": len(modules),
+        "heavy": sorted(name for name in modules if name.split(".")[0] in HEAVY_MODULES),
+    }, modules
+
+
+def compare(results, baseline_file):
+    with open(baseline_file, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    print(f"\nComparison with {baseline_file} (median wall time, ratio < 1.0 is faster):")
+    for name, stats in results.items():
+        if name in baseline:
+            ratio = stats["median_ms"] / baseline[name]["median_ms"] if baseline[name]["median_ms"] else float("inf")
+            print(f"  {name:<30} {baseline[name]['median_ms']:>8.1f} -> {stats['median_ms']:>8.1f} ms  x{ratio:.2f}  "
+                  f"(imports {baseline[name]['import_ms']:.1f} -> {stats['import_ms']:.1f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold-start cost of the entry points with -X importtime.")
+    parser.add_argument("--iterations", type=int, default=10, help="Process launches per case.")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest top-level imports to list per case.")
+    parser.add_argument("--output", help="Output JSON file (default: benchmarks/results/startup_<timestamp>_<commit>.json).")
+    parser.add_argument("--compare", help="Baseline JSON file to compare against.")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    try:
+        baseline_ms = run_case(["-c", "pass"], args.iterations)[0]["median_ms"]
+        print(f"Interpreter startup (python -c pass): {baseline_ms:.1f} ms")
+        results = {}
+        heavy = {}
+        for name, case_args in build_cases(directory).items():
+            stats, modules = run_case(case_args, args.iterations)
+            results[name] = stats
+            print(f"  {name:<30} median {stats['median_ms']:>8.1f} ms  imports {stats['import_ms']:>8.1f} ms  "
+                  f"modules {stats['modules']:>4}")
+            slowest = sorted(((cumulative, module) for module, (_, cumulative) in modules.items()
+                              if "." not in module), reverse=True)[:args.top]
+            print("    " + ", ".join(f"{module} {cumulative / 1000:.1f}" for cumulative, module in slowest))
+            if stats["heavy"]:
+                heavy[name] = stats["heavy"]
+    finally:
+        for name in os.listdir(directory):
+            os.remove(os.path.join(directory, name))
+        os.rmdir(directory)
+
+    commit = git_commit()
+    output = args.output
+    if not output:
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        os.makedirs(os.path.join(BENCH_DIR, "results"), exist_ok=True)
+        output = os.path.join(BENCH_DIR, "results", f"startup_{timestamp}_{commit}.json")
+
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "meta": {
+                "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                "commit": commit,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "interpreter_ms": baseline_ms,
+            },
+            "results": results,
+        }, f, indent=2)
+    print(f"Results saved to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+    if heavy:
+        for name, modules in heavy.items():
+            print(f"  {name}: heavy modules imported at startup: {', '.join(modules)}")
+        sys.exit("Heavy modules were imported by commands that do not touch the UI")
+
+
+if __name__ == "__main__":
+    main()
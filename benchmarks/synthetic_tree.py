@@ -0,0 +1,99 @@
+"""
+合成コントロールツリーの生成
+
+深さ・分岐数・重複名の密度を指定して、ベンチマーク用のウィンドウツリーを組み立てる。
+乱数シードを固定しているため、同じパラメータからは常に同じツリーが生成される。
+"""
+
+import random
+
+from src.shared.backend.fake import FakeBackend, Rect
+
+
+CONTAINER_TYPES = ["PaneControl", "GroupControl", "ListControl", "ToolBarControl"]
+LEAF_TYPES = ["ButtonControl", "ListItemControl", "EditControl", "TextControl"]
+
+TARGET_WINDOW = "Synthetic App"
+
+
+def build_desktop(depth=4, fanout=8, duplicate_density=0.3, id_density=0.5, windows=20, seed=0, latency=None):
+    """
+    合成デスクトップを持つFakeBackendを生成する。
+
+    Args:
+        depth: ターゲットウィンドウ配下のツリーの深さ
+        fanout: 各ノードの子の数
+        duplicate_density: 兄弟間で名前が重複する（foundIndexが必要になる）割合
+        id_density: AutomationIdを持つノードの割合
+        windows: ダミーのトップレベルウィンドウ数（ターゲットは最後に追加）
+        seed: 乱数シード
+        latency: FakeBackendに注入する呼び出しごとの遅延
+
+    Returns:
+        tuple: (バックエンド, ターゲットウィンドウ, 全ノード数)
+    """
+    rng = random.Random(seed)
+    backend = FakeBackend(latency=latency)
+    backend.root.rect = Rect(0, 0, 3840, 2160)
+
+    for i in range(windows):
+        window = backend.add_element(None, "WindowControl", f"Other Window {i}", class_name="OtherWindow",
+                                     rect=Rect(0, 0, 800, 600))
+        backend.add_element(window, "ButtonControl", "OK", rect=Rect(10, 10, 60, 30))
+
+    target = backend.add_element(None, "WindowControl", TARGET_WINDOW, automation_id="MainWindow",
+                                 class_name="SyntheticWindow", rect=Rect(0, 0, fanout ** depth * 40, depth * 40 + 40))
+    count = 1
+
+    # (親, 現在の深さ, 左端x) を幅優先で展開し、葉が横一列に並ぶように矩形を割り当てる
+    queue = [(target, 1, 0)]
+    while queue:
+        parent, level, left = queue.pop(0)
+        span = fanout ** (depth - level) * 40
+        container = level < depth
+        for index in range(fanout):
+            types = CONTAINER_TYPES if container else LEAF_TYPES
+            control_type = types[index % len(types)]
+            if index > 0 and rng.random() < duplicate_density:
+                name = f"Item {level}-0"
+            else:
+                name = f"Item {level}-{index}"
+            automation_id = f"id_{count}" if rng.random() < id_density else ""
+            x = left + index * span
+            rect = Rect(x, level * 40, x + span, level * 40 + 30)
+            node = backend.add_element(parent, control_type, name, automation_id=automation_id,
+                                       class_name=f"Synthetic{control_type}", rect=rect)
+            count += 1
+            if container:
+                queue.append((node, level + 1, x))
+
+    return backend, target, count
+
+
+def deepest_leaves(window):
+    """最も深い位置にある葉ノードを前順で返す。"""
+    leaves = []
+    stack = [(window, 0)]
+    max_depth = 0
+    while stack:
+        node, level = stack.pop()
+        children = node.children
+        if not children:
+            if level > max_depth:
+                leaves = [node]
+                max_depth = level
+            elif level == max_depth:
+                leaves.append(node)
+        for child in reversed(children):
+            stack.append((child, level + 1))
+    return leaves
+
+
+def lineage(node, window):
+    """windowの直下からnodeまでのノード列を返す。"""
+    chain = []
+    while node is not None and node is not window:
+        chain.append(node)
+        node = node.parent
+    chain.reverse()
+    return chain
@@ -1,35 +1,48 @@
-import uiautomation as auto
 import time
-import keyboard
 import argparse
 import csv
 import datetime
 import sys
 import io
-import ctypes
 import os
-
-# 正確な座標を確保するためにHigh DPI Awarenessを有効化
-try:
-    auto.SetProcessDpiAwareness(2) # Process_PerMonitorDpiAware
-except Exception:
-    pass
+from collections import deque
 
 # インポート用にsrcをパスに追加（automator.pyと同じ）
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from src.inspector.core import PathGenerator
-from src.inspector.utils import ClickHandler, OutputHandler
+from src.inspector.core import PathGenerator, AliasCatalog
+from src.inspector.utils import ClickHandler, OutputHandler, PathWorker
+from src.shared.backend import get_backend
+from src.shared.backend.base import MAX_SEARCH_DEPTH
+from src.shared.backend.identity import ElementRef
+from src.shared.backend.input_events import CLICK, ESCAPE
+
+# recorded_itemsに保持する直近のアイテム数（記録したアイテムはOutputHandlerがファイルに追記する）
+RECENT_ITEMS = 20
+
+# この秒数以内に同じ要素を続けてクリックした場合は1回とみなす（ダブルクリック等）
+DEBOUNCE_SECONDS = 0.5
 
 
 class Inspector:
-    def __init__(self, mode="modern", output="clipboard"):
+    def __init__(self, mode="modern", output="clipboard", backend=None):
         self.mode = mode
         self.output = output
-        self.recorded_items = []
-        self.path_generator = PathGenerator(mode=mode)
-        self.click_handler = ClickHandler()
-        self.output_handler = OutputHandler(output_mode=output)
+        self.recorded_items = deque(maxlen=RECENT_ITEMS)  # 直近の記録（確認用）
+        # UIバックエンド（既定はuiautomation）
+        self.backend = backend or get_backend()
+        # fastestモードは候補の生成・比較にmodernモードのPathGeneratorを使う
+        self.path_generator = PathGenerator(mode="modern" if mode == "fastest" else mode, backend=self.backend)
+        self.path_optimizer = None
+        if mode == "fastest":
+            from src.inspector.core.path_optimizer import PathOptimizer
+            self.path_optimizer = PathOptimizer(backend=self.backend, path_generator=self.path_generator)
+        self.last_candidate = None  # fastestモードで最後に選んだ候補
+        self.click_handler = ClickHandler(backend=self.backend)
+        self.output_handler = OutputHandler(output_mode=output, backend=self.backend)
+        # クリックした要素の解析・パス生成はワーカースレッドで行う（クリックの検出ループを止めない）
+        # キューが空になるたびに記録済みのアイテムを書き出す（次のクリックを待つ間に失われないように）
+        self.path_worker = PathWorker(self.process_capture, backend=self.backend, on_idle=self.output_handler.flush)
         print(f"UI Inspector initialized (Mode: {mode}, Output: {output})")
 
 
@@ -37,19 +50,37 @@ class Inspector:
     def get_rpa_path(self, control):
         """
         コントロールの堅牢なRPAパスを生成する
-        PathGeneratorに委譲
+        PathGeneratorに委譲（fastestモードではPathOptimizerが選んだ最速の候補）
         """
+        if self.path_optimizer is not None:
+            self.last_candidate = self.path_optimizer.best(control)
+            if self.last_candidate is not None:
+                return self.last_candidate.path
+            print("  Warning: No candidate resolved uniquely; using the chained path.")
         return self.path_generator.get_rpa_path(control)
 
+    def describe_path(self, path):
+        """パスの表示用文字列（fastestモードでは実測した解決時間を付ける）"""
+        candidate = self.last_candidate
+        if self.path_optimizer is None or candidate is None or candidate.path != path:
+            return path
+        if candidate.seconds is None:
+            return f"{path}  [{candidate.strategy}, ~{candidate.cost} elements]"
+        return f"{path}  [{candidate.strategy}, resolved in {candidate.seconds * 1000:.2f} ms]"
+
     def run(self):
         print("UI Inspector started.")
         
-        if self.output == "interactive_alias":
-            self.run_interactive()
-        else:
-            self.run_normal()
-
-        self.finalize()
+        # 中断（Ctrl+C等）された場合も、それまでの記録を出力する
+        try:
+            if self.output == "interactive_alias":
+                self.run_interactive()
+            else:
+                self.run_normal()
+        finally:
+            self.path_worker.close()
+            self.click_handler.close()
+            self.finalize()
 
     def run_interactive(self):
         print("Interactive Alias Mode")
@@ -79,50 +110,59 @@ class Inspector:
                 continue
             
             control, x, y = result
-            path = self.get_rpa_path(control)
-            print(f"  >> Captured: {path}")
-            
-            self.recorded_items.append({
-                "AliasName": alias_name,
-                "RPA_Path": path
-            })
+            self.path_worker.submit(control, x, y, alias=alias_name)
+
+        # 解析中のクリックを待ってから終了する
+        self.path_worker.drain()
 
     def run_normal(self):
         print("Hover over an element and CLICK (Left or Right Click) to inspect/record.")
         print("Press 'ESC' to finish and output.")
         print("-" * 50)
 
-        last_element = None
+        last_ref = None  # 最後にクリックした要素（RuntimeIdは比較が必要になったときに1回だけ取得）
+        last_clicked = 0.0
         
+        # 次のクリック・ESCまでブロックして待つ（解析はPathWorkerが行う）
         while True:
-            if keyboard.is_pressed('esc'):
+            event = self.click_handler.next_event()
+            if event.kind == ESCAPE:
                 print("\nFinishing...")
                 break
-                
-            # 左クリック (0x01) または右クリック (0x02) をチェック
-            if (ctypes.windll.user32.GetAsyncKeyState(0x01) & 0x8000) or \
-               (ctypes.windll.user32.GetAsyncKeyState(0x02) & 0x8000):
-                x, y = auto.GetCursorPos()
-                control = auto.ControlFromPoint(x, y)
-                
-                if control:
-                    # デバウンス
-                    if not last_element or not auto.ControlsAreSame(control, last_element):
-                        self.inspect_element(control, x, y)
-                        last_element = control
-                        while (ctypes.windll.user32.GetAsyncKeyState(0x01) & 0x8000) or \
-                              (ctypes.windll.user32.GetAsyncKeyState(0x02) & 0x8000):
-                            time.sleep(0.05)
-                else:
-                    time.sleep(0.1)
-            else:
-                last_element = None 
-                time.sleep(0.05)
+            if event.kind != CLICK:
+                continue
+
+            control = self.backend.element_from_point(event.x, event.y)
+            if not control:
+                continue
+
+            # デバウンス（ダブルクリック等、同じ要素への続けてのクリックは1回とみなす）
+            now = time.monotonic()
+            control_ref = ElementRef(self.backend, control)
+            repeated = (last_ref is not None and now - last_clicked < DEBOUNCE_SECONDS
+                        and control_ref == last_ref)
+            last_ref, last_clicked = control_ref, now
+            if not repeated:
+                self.path_worker.submit(control, event.x, event.y)
+
+        self.path_worker.drain()
 
     def wait_for_click(self):
         """左または右クリックを待機。ClickHandlerに委譲"""
         return self.click_handler.wait_for_click()
 
+    def process_capture(self, capture):
+        """ワーカースレッドでクリックした要素を解析する（PathWorkerのhandler）"""
+        if capture.alias is None:
+            self.inspect_element(capture.control, capture.x, capture.y)
+            return
+        path = self.get_rpa_path(capture.control)
+        print(f"  >> Captured '{capture.alias}': {self.describe_path(path)}")
+        self.record({
+            "AliasName": capture.alias,
+            "RPA_Path": path
+        })
+
     def inspect_element(self, control, x, y):
         print(f"\n[Clicked at {x}, {y}] Inspecting...")
         
@@ -135,34 +175,98 @@ class Inspector:
         # TargetApp（ウィンドウ名）を取得
         # TopLevelControlのNameをTargetApp識別子として使用
         # AutomatorのFind_windowで使用される'Name'または'RegexName'に対応
-        root = control.GetTopLevelControl()
+        root = self.backend.get_top_level(control)
         target_app = root.Name if root else "Unknown"
         print(f"  TargetApp: {target_app}")
         
         # パス生成
         rpa_path = self.get_rpa_path(control)
-        print(f"  RPA_Path: {rpa_path}")
+        print(f"  RPA_Path: {self.describe_path(rpa_path)}")
         
         # 記録
         if self.output in ["csv", "clipboard", "alias"]:
-            self.recorded_items.append({
+            self.record({
                 "TargetApp": target_app,
                 "Key": rpa_path,
                 "Action": "",
                 "Value": ""
             })
-            print(f"  -> Recorded ({len(self.recorded_items)} items)")
+            print(f"  -> Recorded ({self.output_handler.count} items)")
+
+    def record(self, item):
+        """アイテムを記録する。出力ファイルへの追記はOutputHandlerに委譲"""
+        self.recorded_items.append(item)
+        self.output_handler.record(item)
 
     def finalize(self):
         """記録されたアイテムを出力。OutputHandlerに委譲"""
-        self.output_handler.finalize(self.recorded_items)
+        self.output_handler.finalize()
+
+def run_catalog(args):
+    """ウィンドウ（またはスナップショット）を1回走査し、全要素のエイリアス定義をCSVに書き出す。"""
+    from src.shared.rpa_path import window_matches
+    from src.shared.snapshot import Snapshot, walk_tree
+
+    catalog = AliasCatalog(mode=args.mode, element_filter=args.filter)
+    start = time.perf_counter()
+    if args.snapshot:
+        snapshot = Snapshot(args.snapshot)
+        window_name = snapshot.string(snapshot.name[0])
+        if args.catalog and not window_matches(args.catalog, window_name):
+            snapshot.close()
+            print(f"Window '{args.catalog}' does not match the snapshot window '{window_name}'.")
+            return 1
+    else:
+        from src.automator.core.element_finder import ElementFinder
+        if args.fake_tree:
+            from src.shared.backend.fake import FakeBackend
+            backend = FakeBackend.from_file(args.fake_tree)
+        else:
+            backend = get_backend()
+        window = ElementFinder(backend=backend).find_window(args.catalog)
+        if window is None:
+            print(f"Window '{args.catalog}' not found.")
+            return 1
+        window_name = window.Name
+        max_depth = args.max_depth if args.max_depth is not None else MAX_SEARCH_DEPTH
+        # パターンはinteractiveフィルタの場合のみ取得する
+        builder = walk_tree(backend, window, max_depth, patterns=catalog.needs_patterns)
+        snapshot = Snapshot.from_bytes(builder.to_bytes(), name=f"<live: {window_name}>")
+    walk_ms = (time.perf_counter() - start) * 1000
+
+    with snapshot:
+        start = time.perf_counter()
+        entries = catalog.build(snapshot)
+        build_ms = (time.perf_counter() - start) * 1000
+
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    filename = args.catalog_file or f"inspector_{timestamp}_catalog.csv"
+    catalog.write(entries, filename)
+    print(f"Catalogued {len(entries)} of {snapshot.node_count - 1} elements in '{window_name}' "
+          f"({'load' if args.snapshot else 'walk'}: {walk_ms:.1f}ms, paths: {build_ms:.1f}ms)")
+    print(f"Saved alias definition to {filename}")
+    return 0
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="UI Inspector for Automator")
-    parser.add_argument("--mode", choices=["modern", "legacy"], default="modern", help="Inspection mode")
+    parser.add_argument("--mode", choices=["modern", "legacy", "fastest"], default="modern",
+                        help="Inspection mode (fastest = compare candidate paths and keep the quickest to resolve)")
     parser.add_argument("--output", choices=["normal", "csv", "clipboard", "alias", "interactive_alias"], default="clipboard", help="Output mode")
+    parser.add_argument("--catalog", metavar="TARGET_APP",
+                        help="Walk this window once and write an alias CSV for every element instead of inspecting clicks.")
+    parser.add_argument("--filter", choices=["all", "interactive"], default="all",
+                        help="Catalog: elements to include (interactive = actionable patterns or control types).")
+    parser.add_argument("--catalog-file", help="Catalog: output alias CSV (default: inspector_<timestamp>_catalog.csv).")
+    parser.add_argument("--snapshot", help="Catalog: read the tree from this snapshot file instead of the live window.")
+    parser.add_argument("--max-depth", type=int, help="Catalog: maximum depth to walk below the window (default: unlimited).")
+    parser.add_argument("--fake-tree", help="Catalog: walk an in-memory tree (JSON or snapshot) instead of the live desktop.")
     
     args = parser.parse_args()
+
+    if args.catalog or args.snapshot:
+        if args.mode == "fastest":
+            parser.error("--catalog supports --mode modern or legacy")
+        sys.exit(run_catalog(args))
     
     inspector = Inspector(mode=args.mode, output=args.output)
     inspector.run()
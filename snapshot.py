@@ -0,0 +1,243 @@
+import sys
+import os
+
+# インポート用にsrcをパスに追加（automator.pyと同じ）
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import csv
+import logging
+import time
+from collections import Counter
+
+from src.automator.core.element_finder import ElementFinder
+from src.shared.backend import get_backend
+from src.shared.backend.base import MAX_SEARCH_DEPTH
+from src.shared.snapshot import Snapshot, capture_snapshot, walk_tree
+from src.shared.resolver import SnapshotResolver
+from src.shared.multi_matcher import MultiPathMatcher
+from src.shared.rpa_path import compile_path
+
+
+def _backend(args):
+    if args.fake_tree:
+        from src.shared.backend.fake import FakeBackend
+        return FakeBackend.from_file(args.fake_tree)
+    return get_backend()
+
+
+def command_capture(args):
+    backend = _backend(args)
+    finder = ElementFinder(logger=logging.getLogger("snapshot"), backend=backend)
+
+    window = finder.find_window(args.target_app)
+    if window is None:
+        print(f"Window '{args.target_app}' not found.")
+        return 1
+
+    output = args.output or "snapshot.uisnap"
+    max_depth = args.max_depth if args.max_depth is not None else MAX_SEARCH_DEPTH
+    print(f"Capturing '{window.Name}'...")
+    start = time.perf_counter()
+    count = capture_snapshot(backend, window, output, max_depth,
+                             metadata={"target_app": args.target_app, "window": window.Name})
+    elapsed = time.perf_counter() - start
+    print(f"Saved {count} nodes to {output} ({os.path.getsize(output):,} bytes, {elapsed:.2f}s)")
+    return 0
+
+
+def command_info(args):
+    start = time.perf_counter()
+    with Snapshot(args.snapshot) as snapshot:
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"File: {args.snapshot} ({os.path.getsize(args.snapshot):,} bytes, loaded in {elapsed:.2f}ms)")
+        for key, value in snapshot.metadata.items():
+            print(f"  {key}: {value}")
+        print(f"  nodes: {snapshot.node_count}")
+        print(f"  max depth: {max(snapshot.depth) if snapshot.node_count else 0}")
+
+        types = Counter(snapshot.string(type_id) for type_id in snapshot.control_type)
+        print("  control types:")
+        for name, count in types.most_common(args.top):
+            print(f"    {name:<30} {count:>8}")
+    return 0
+
+
+def command_resolve(args):
+    with Snapshot(args.snapshot) as snapshot:
+        resolver = SnapshotResolver(snapshot)
+        if args.target_app and not resolver.matches_window(args.target_app):
+            window = snapshot.string(snapshot.name[0])
+            print(f"Window '{args.target_app}' does not match the snapshot window '{window}'.")
+            return 1
+
+        failures = 0
+        for path in args.paths:
+            result = resolver.resolve(path)
+            if result.found:
+                node = snapshot.node(result.node)
+                fallbacks = ",".join(str(f) for f in result.fallbacks)
+                print(f"FOUND     {path}\n          -> #{result.node} {node['ControlType']} Name='{node['Name']}' "
+                      f"AutomationId='{node['AutomationId']}' (fallback: {fallbacks})")
+            else:
+                failures += 1
+                reason = result.error or f"not found: {result.failed_segment}"
+                print(f"NOT FOUND {path}\n          -> {reason}")
+    return 1 if failures else 0
+
+
+def read_aliases(alias_files):
+    """エイリアスCSVを読み込む（Automator.load_aliasesと同じく、後のファイルの定義が優先される）。"""
+    aliases = {}
+    for alias_file in alias_files:
+        with open(alias_file, 'r', encoding='utf-8-sig') as f:
+            for row in csv.DictReader(f):
+                alias = row.get("AliasName")
+                path = row.get("RPA_Path")
+                if alias and path:
+                    aliases[alias] = path
+    return aliases
+
+
+def _open_tree(args):
+    """検証対象のツリー（スナップショット、またはウィンドウを1回走査した結果）を開く。"""
+    if args.snapshot:
+        snapshot = Snapshot(args.snapshot)
+        if args.target_app and not SnapshotResolver(snapshot).matches_window(args.target_app):
+            window = snapshot.string(snapshot.name[0])
+            snapshot.close()
+            raise LookupError(f"Window '{args.target_app}' does not match the snapshot window '{window}'.")
+        return snapshot
+
+    backend = _backend(args)
+    window = ElementFinder(logger=logging.getLogger("snapshot"), backend=backend).find_window(args.target_app)
+    if window is None:
+        raise LookupError(f"Window '{args.target_app}' not found.")
+    max_depth = args.max_depth if args.max_depth is not None else MAX_SEARCH_DEPTH
+    # パターンは照合に使わないため取得しない
+    builder = walk_tree(backend, window, max_depth, patterns=False)
+    return Snapshot.from_bytes(builder.to_bytes({"target_app": args.target_app, "window": window.Name}),
+                               name=f"<live: {window.Name}>")
+
+
+def command_validate_aliases(args):
+    try:
+        aliases = read_aliases(args.aliases)
+    except Exception as e:
+        print(f"Error loading aliases: {e}")
+        return 1
+
+    start = time.perf_counter()
+    try:
+        snapshot = _open_tree(args)
+    except LookupError as e:
+        print(e)
+        return 1
+    load_ms = (time.perf_counter() - start) * 1000
+
+    with snapshot:
+        start = time.perf_counter()
+        for path in set(aliases.values()):
+            try:
+                compile_path(path)
+            except ValueError:
+                pass  # 照合結果でINVALIDとして報告する
+        compile_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        matcher = MultiPathMatcher(snapshot)
+        results = matcher.match(list(aliases.values()))
+        match_ms = (time.perf_counter() - start) * 1000
+
+        rows = []
+        for alias, path in aliases.items():
+            result = results[path]
+            if result.error:
+                status, detail = "INVALID", result.error
+            elif not result.found:
+                status, detail = "UNRESOLVED", f"not found: {result.failed_segment}"
+            elif result.ambiguous:
+                status = "AMBIGUOUS"
+                detail = "; ".join(f"{count} matches for {text}" for text, count in result.ambiguous)
+            elif any(result.fallbacks):
+                status, detail = "FALLBACK", "resolved only by fallback"
+            else:
+                status, detail = "OK", ""
+            if result.found:
+                node = snapshot.node(result.node)
+                target = f"#{result.node} {node['ControlType']} Name='{node['Name']}'"
+            else:
+                target = ""
+            rows.append({"AliasName": alias, "RPA_Path": path, "Status": status, "Node": target,
+                         "Fallbacks": ",".join(str(f) for f in result.fallbacks), "Detail": detail,
+                         "fallbacks": result.fallbacks, "ambiguous": result.ambiguous})
+
+        source = args.snapshot or snapshot.path
+        print(f"Validated {len(aliases)} aliases against {source} ({snapshot.node_count} nodes)")
+        print(f"  {'walk' if not args.snapshot else 'load'}: {load_ms:.1f}ms  compile: {compile_ms:.1f}ms  "
+              f"match: {match_ms:.1f}ms ({matcher.passes} passes, {matcher.queries} queries, {matcher.tests} node tests)")
+
+    unresolved = [row for row in rows if row["Status"] in ("INVALID", "UNRESOLVED")]
+    ambiguous = [row for row in rows if row["ambiguous"]]
+    fallback = [row for row in rows if row["Node"] and any(row["fallbacks"])]
+    for title, group, describe in (
+            ("Unresolved", unresolved, lambda row: row["Detail"]),
+            ("Ambiguous", ambiguous, lambda row: "; ".join(f"{count} matches for {text}" for text, count in row["ambiguous"])),
+            ("Fallback only", fallback, lambda row: f"fallback {row['Fallbacks']} -> {row['Node']}")):
+        if group:
+            print(f"{title} ({len(group)}):")
+            for row in group:
+                print(f"  {row['AliasName']:<24} {row['RPA_Path']}\n  {'':<24} -> {describe(row)}")
+    print(f"OK: {sum(1 for row in rows if row['Status'] == 'OK')}, unresolved: {len(unresolved)}, "
+          f"ambiguous: {len(ambiguous)}, fallback only: {len(fallback)}")
+
+    if args.output:
+        with open(args.output, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=["AliasName", "RPA_Path", "Status", "Node", "Fallbacks", "Detail"],
+                                    extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"Report saved to {args.output}")
+
+    if unresolved or (args.strict and (ambiguous or fallback)):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Capture a window's UI tree to a snapshot file for offline use.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    capture = subparsers.add_parser("capture", help="Walk a window once and save its control tree.")
+    capture.add_argument("target_app", help="Window name (same matching as TargetApp, e.g. 'regex:.*Notepad').")
+    capture.add_argument("-o", "--output", help="Output snapshot file (default: snapshot.uisnap).")
+    capture.add_argument("--max-depth", type=int, help="Maximum depth to walk below the window (default: unlimited).")
+    capture.add_argument("--fake-tree", help="Capture from an in-memory tree (JSON or snapshot) instead of the live desktop.")
+    capture.set_defaults(func=command_capture)
+
+    info = subparsers.add_parser("info", help="Show the contents of a snapshot file.")
+    info.add_argument("snapshot", help="Snapshot file.")
+    info.add_argument("--top", type=int, default=10, help="Number of control types to list (default: 10).")
+    info.set_defaults(func=command_info)
+
+    resolve = subparsers.add_parser("resolve", help="Resolve RPA paths offline against a snapshot.")
+    resolve.add_argument("snapshot", help="Snapshot file.")
+    resolve.add_argument("paths", nargs="+", help="RPA paths relative to the snapshot window.")
+    resolve.add_argument("--target-app", help="Also check that this TargetApp matches the snapshot window.")
+    resolve.set_defaults(func=command_resolve)
+
+    validate = subparsers.add_parser("validate-aliases",
+                                     help="Match every alias in one walk of a window (or a snapshot) and report problems.")
+    validate.add_argument("aliases", nargs="+", help="Alias CSV file(s) (AliasName, RPA_Path).")
+    validate.add_argument("--snapshot", help="Validate against this snapshot file instead of a live window.")
+    validate.add_argument("--target-app", help="Window to walk (required without --snapshot; checked against the snapshot otherwise).")
+    validate.add_argument("--max-depth", type=int, help="Maximum depth to walk below the window (default: unlimited).")
+    validate.add_argument("--fake-tree", help="Walk an in-memory tree (JSON or snapshot) instead of the live desktop.")
+    validate.add_argument("--output", help="Write the per-alias report to this CSV file.")
+    validate.add_argument("--strict", action="store_true", help="Also exit with 1 when aliases are ambiguous or need a fallback.")
+    validate.set_defaults(func=command_validate_aliases)
+
+    args = parser.parse_args()
+    if args.command == "validate-aliases" and not args.snapshot and not args.target_app:
+        parser.error("validate-aliases requires --snapshot or --target-app")
+    sys.exit(args.func(args))
@@ -6,17 +6,17 @@ automator.pyのexecute_actionメソッドから抽出。
 """
 
 import time
-import subprocess
-import datetime
 import re
-import uiautomation as auto
-from src.automator.utils.screenshot import capture_screenshot
+from src.automator.utils.screenshot import ScreenshotWriter
+from src.automator.utils.log_pipeline import LazyProperty
+from src.automator.utils.timing import TimingRecorder
+from src.shared.backend import get_backend
 
 
 class ActionExecutor:
     """アクション実行を担当するクラス"""
     
-    def __init__(self, logger, element_finder, focus_manager, dry_run, force_run, wait_time=None):
+    def __init__(self, logger, element_finder, focus_manager, dry_run, force_run, wait_time=None, timer=None, backend=None, screenshots=None):
         """
         ActionExecutorの初期化
         
@@ -27,6 +27,9 @@ class ActionExecutor:
             dry_run: Dry-runモードフラグ
             force_run: Force-runモードフラグ
             wait_time: アクション後の待機時間（秒）
+            timer: TimingRecorderインスタンス（省略時は計測しない）
+            backend: UIBackendインスタンス（省略時は既定のバックエンド）
+            screenshots: ScreenshotWriterインスタンス（省略時は画面全体をPNGで保存）
         """
         self.logger = logger
         self.element_finder = element_finder
@@ -34,6 +37,12 @@ class ActionExecutor:
         self.dry_run = dry_run
         self.force_run = force_run
         self.wait_time = wait_time
+        self.timer = timer or TimingRecorder(enabled=False)
+        self.backend = backend or get_backend()
+        self.screenshots = screenshots or ScreenshotWriter(backend=self.backend, logger=logger)
+        # 直前のアクションで見つかったウィンドウ・要素（エラー時のスクリーンショットの範囲に使用）
+        self.last_window = None
+        self.last_element = None
     
     def execute(self, target_app, key, act_type, value, variables):
         """
@@ -46,29 +55,36 @@ class ActionExecutor:
             value: アクションの値
             variables: 変数辞書（参照渡し）
         """
+        self.last_window = self.last_element = None
+
         # Launch と Wait はウィンドウ不要
-        if act_type == "Launch":
-            return self._execute_launch(value)
-        elif act_type == "Wait":
-            return self._execute_wait(value)
-        elif act_type == "SetVariable":
-            return self._execute_set_variable(value, variables)
+        if act_type in ("Launch", "Wait", "SetVariable"):
+            with self.timer.phase("body", target=act_type):
+                if act_type == "Launch":
+                    return self._execute_launch(value)
+                elif act_type == "Wait":
+                    return self._execute_wait(value)
+                else:
+                    return self._execute_set_variable(value, variables)
         
         # Focus はウィンドウが必要だが要素は不要
         if act_type == "Focus":
             window = self.element_finder.find_window(target_app)
+            self.last_window = window
             if not window:
                 if self.dry_run:
-                    self.logger.warning(f"[Dry-run] Window '{target_app}' not found. Subsequent actions might fail.")
+                    self.logger.warning("[Dry-run] Window '%s' not found. Subsequent actions might fail.", target_app)
                     return
                 raise Exception(f"Window '{target_app}' not found.")
-            return self._execute_focus(window, target_app)
+            with self.timer.phase("body", target=act_type):
+                return self._execute_focus(window, target_app)
         
         # 以下のアクションは要素が必要
         window = self.element_finder.find_window(target_app)
+        self.last_window = window
         if not window:
             if self.dry_run:
-                self.logger.warning(f"[Dry-run] Window '{target_app}' not found. Subsequent actions might fail.")
+                self.logger.warning("[Dry-run] Window '%s' not found. Subsequent actions might fail.", target_app)
                 return
             raise Exception(f"Window '{target_app}' not found.")
         
@@ -78,13 +94,18 @@ class ActionExecutor:
             if not element:
                 key_display = self.element_finder.format_path_with_alias(key)
                 if self.dry_run:
-                    self.logger.warning(f"[Dry-run] Element not found for key: {key_display}")
+                    self.logger.warning("[Dry-run] Element not found for key: %s", key_display)
                     return
                 raise Exception(f"Element not found for key: {key_display}")
+            self.last_element = element
             if self.dry_run:
-                self.logger.info(f"[Dry-run] Element found: {element.Name} ({element.ControlTypeName})")
+                self.logger.info("[Dry-run] Element found: %s (%s)", LazyProperty(element, "Name"), LazyProperty(element, "ControlTypeName"))
         
-        # アクションタイプに応じて処理
+        with self.timer.phase("body", target=act_type):
+            return self._dispatch(target_app, window, element, key, act_type, value, variables)
+
+    def _dispatch(self, target_app, window, element, key, act_type, value, variables):
+        """要素を必要とするアクションをアクションタイプに応じて実行"""
         if act_type == "Click":
             return self._execute_click(element)
         elif act_type == "Input":
@@ -98,7 +119,7 @@ class ActionExecutor:
         elif act_type == "GetProperty":
             return self._execute_get_property(element, value, variables)
         elif act_type == "Screenshot":
-            return self._execute_screenshot(element, value)
+            return self._execute_screenshot(window, element if key else None, value)
         elif act_type == "FocusElement":
             return self._execute_focus_element(element, key)
         elif act_type == "GetValue":
@@ -128,33 +149,41 @@ class ActionExecutor:
         raise NotImplementedError(f"Action type '{act_type}' not yet implemented in ActionExecutor")
 
     
+    def _post_action_wait(self):
+        """--wait-time指定時のアクション後待機"""
+        if self.wait_time is not None:
+            with self.timer.phase("post_wait"):
+                time.sleep(self.wait_time)
+
     def _execute_launch(self, value):
         """Launchアクション - アプリケーションを起動"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would launch: {value}")
+            self.logger.info("[Dry-run] Would launch: %s", value)
             return
-        self.logger.info(f"Launching {value}...")
+        self.logger.info("Launching %s...", value)
+        import subprocess  # 起動時の読み込みを避けるため、使用時にインポート
         subprocess.Popen(value, shell=True)
     
     def _execute_wait(self, value):
         """Waitアクション - 指定秒数待機"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would wait: {value} seconds")
+            self.logger.info("[Dry-run] Would wait: %s seconds", value)
             return
-        self.logger.info(f"Waiting {value} seconds...")
-        time.sleep(float(value))
+        self.logger.info("Waiting %s seconds...", value)
+        with self.timer.phase("wait"):
+            time.sleep(float(value))
     
     def _execute_focus(self, window, target_app):
         """Focusアクション - ウィンドウにフォーカス"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would focus window: {target_app}")
+            self.logger.info("[Dry-run] Would focus window: %s", target_app)
             return
-        window.SetFocus()
+        self.backend.set_focus(window)
     
     def _execute_set_variable(self, value, variables):
         """SetVariableアクション - 変数を設定"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would set variable: {value}")
+            self.logger.info("[Dry-run] Would set variable: %s", value)
             return
         
         # "変数名 = 式" の形式を解析
@@ -173,114 +202,105 @@ class ActionExecutor:
         try:
             result = eval(expression)
             variables[var_name] = result
-            self.logger.info(f"Set variable '{var_name}' to '{result}'")
+            self.logger.info("Set variable '%s' to '%s'", var_name, result)
         except Exception as e:
             raise Exception(f"Failed to evaluate expression '{expression}': {e}")
     
     def _execute_click(self, element):
         """Clickアクション - 要素をクリック"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would click element: {element.Name}")
+            self.logger.info("[Dry-run] Would click element: %s", LazyProperty(element, "Name"))
             return
         
-        self.logger.info(f"Clicking element '{element.Name}'...")
+        self.logger.info("Clicking element '%s'...", LazyProperty(element, "Name"))
         
         # まずInvokePatternを試す、Clickにフォールバック
         try:
-            invoke = element.GetPattern(auto.PatternId.InvokePattern)
+            invoke = self.backend.get_pattern(element, "InvokePattern")
             if invoke:
                 self.logger.debug("Using InvokePattern...")
                 invoke.Invoke()
-                if self.wait_time is not None:
-                    time.sleep(self.wait_time)
+                self._post_action_wait()
             else:
-                if self.wait_time is not None:
-                    element.Click(waitTime=self.wait_time)
-                else:
-                    element.Click()
+                self.backend.click(element, self.wait_time)
         except Exception as e:
-            self.logger.warning(f"Invoke failed, falling back to Click: {e}")
-            if self.wait_time is not None:
-                element.Click(waitTime=self.wait_time)
-            else:
-                element.Click()
+            self.logger.warning("Invoke failed, falling back to Click: %s", e)
+            self.backend.click(element, self.wait_time)
     
     def _execute_input(self, element, value, key):
         """Inputアクション - テキスト入力"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would input text '{value}' into element: {element.Name}")
+            self.logger.info("[Dry-run] Would input text '%s' into element: %s", value, LazyProperty(element, "Name"))
             return
         
-        self.logger.info(f"Inputting text: {value}")
+        self.logger.info("Inputting text: %s", value)
         success = False
         
         # まずValuePatternを試す
         try:
-            pattern = element.GetPattern(auto.PatternId.ValuePattern)
+            pattern = self.backend.get_pattern(element, "ValuePattern")
             if pattern:
                 self.logger.debug("Using ValuePattern.SetValue()...")
-                element.SetValue(value)
+                pattern.SetValue(value)
                 success = True
         except Exception as e:
-            self.logger.debug(f"SetValue failed: {e}")
+            self.logger.debug("SetValue failed: %s", e)
         
         if not success:
             self.logger.debug("Fallback to SendKeys...")
             # Win32 APIフォールバックでフォーカス設定
             key_display = self.element_finder.format_path_with_alias(key) if key else element.Name
             self.focus_manager.set_focus_with_fallback(element, key_display)
-            auto.SendKeys(value)
+            self.backend.send_keys(value)
     
     def _execute_invoke(self, element, key):
         """Invokeアクション - 要素を実行"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would invoke element: {element.Name}")
+            self.logger.info("[Dry-run] Would invoke element: %s", LazyProperty(element, "Name"))
             return
         
-        self.logger.info(f"Invoking element '{element.Name}'...")
+        self.logger.info("Invoking element '%s'...", LazyProperty(element, "Name"))
         
         # Win32 APIフォールバックでフォーカス設定（レガシーアプリサポート）
         key_display = self.element_finder.format_path_with_alias(key) if key else element.Name
         self.focus_manager.set_focus_with_fallback(element, key_display)
         
         # Invokeを実行
-        pattern = element.GetPattern(auto.PatternId.InvokePattern)
+        pattern = self.backend.get_pattern(element, "InvokePattern")
         if pattern:
             pattern.Invoke()
-            if self.wait_time is not None:
-                time.sleep(self.wait_time)
+            self._post_action_wait()
         else:
             # Invokeがサポートされていない場合はToggleにフォールバック（例: チェックボックス）
-            toggle = element.GetPattern(auto.PatternId.TogglePattern)
+            toggle = self.backend.get_pattern(element, "TogglePattern")
             if toggle:
                 self.logger.info("Invoke pattern not found, using Toggle pattern...")
                 toggle.Toggle()
-                if self.wait_time is not None:
-                    time.sleep(self.wait_time)
+                self._post_action_wait()
             else:
                 raise Exception("Element does not support Invoke or Toggle pattern")
     
     def _execute_sendkeys(self, value):
         """SendKeysアクション - キー送信"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would send keys: {value}")
+            self.logger.info("[Dry-run] Would send keys: %s", value)
             return
         
-        self.logger.info(f"Sending keys: {value}")
-        auto.SendKeys(value)
+        self.logger.info("Sending keys: %s", value)
+        self.backend.send_keys(value)
     
     def _execute_select(self, element, value):
         """Selectアクション - 要素を選択"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would select element: {element.Name} (Value: {value})")
+            self.logger.info("[Dry-run] Would select element: %s (Value: %s)", LazyProperty(element, "Name"), value)
             return
         
         if value:
             # 値が指定されている: 要素をコンテナとして扱い、子アイテムを選択
-            self.logger.info(f"Selecting item '{value}' in '{element.Name}'...")
+            self.logger.info("Selecting item '%s' in '%s'...", value, LazyProperty(element, "Name"))
             
             # コンボボックスの場合は先に展開を試す
-            expand = element.GetPattern(auto.PatternId.ExpandCollapsePattern)
+            expand = self.backend.get_pattern(element, "ExpandCollapsePattern")
             if expand:
                 try:
                     expand.Expand()
@@ -289,48 +309,43 @@ class ActionExecutor:
                     pass
             
             # 子アイテムを検索
-            item = element.ListItemControl(Name=value)
-            if not item.Exists(maxSearchSeconds=1):
-                item = element.TreeItemControl(Name=value)
+            item = self.backend.find(element, {"ControlTypeName": "ListItemControl", "Name": value}, timeout=1)
+            if item is None:
+                item = self.backend.find(element, {"ControlTypeName": "TreeItemControl", "Name": value}, timeout=1)
             
-            if not item.Exists(maxSearchSeconds=1):
-                item = element.Control(Name=value, searchDepth=1)
+            if item is None:
+                item = self.backend.find(element, {"Name": value, "searchDepth": 1}, timeout=1)
             
-            if not item.Exists(maxSearchSeconds=1):
+            if item is None:
                 raise Exception(f"Item '{value}' not found in '{element.Name}'")
             
             # 可能であればスクロールして表示
-            scroll = item.GetPattern(auto.PatternId.ScrollItemPattern)
+            scroll = self.backend.get_pattern(item, "ScrollItemPattern")
             if scroll:
                 scroll.ScrollIntoView()
             
             # アイテムを選択
-            sel_item = item.GetPattern(auto.PatternId.SelectionItemPattern)
+            sel_item = self.backend.get_pattern(item, "SelectionItemPattern")
             if sel_item:
                 sel_item.Select()
-                if self.wait_time is not None:
-                    time.sleep(self.wait_time)
+                self._post_action_wait()
             else:
                 self.logger.warning("Item does not support SelectionItemPattern, trying Click...")
-                if self.wait_time is not None:
-                    item.Click(waitTime=self.wait_time)
-                else:
-                    item.Click()
+                self.backend.click(item, self.wait_time)
         else:
             # 値なし: 要素自体を選択
-            self.logger.info(f"Selecting element '{element.Name}'...")
-            sel_item = element.GetPattern(auto.PatternId.SelectionItemPattern)
+            self.logger.info("Selecting element '%s'...", LazyProperty(element, "Name"))
+            sel_item = self.backend.get_pattern(element, "SelectionItemPattern")
             if sel_item:
                 sel_item.Select()
-                if self.wait_time is not None:
-                    time.sleep(self.wait_time)
+                self._post_action_wait()
             else:
                 raise Exception("Element does not support SelectionItemPattern")
     
     def _execute_get_property(self, element, value, variables):
         """GetPropertyアクション - 要素のプロパティを取得"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would get property from element: {element.Name}")
+            self.logger.info("[Dry-run] Would get property from element: %s", LazyProperty(element, "Name"))
             variables[value] = "[DryRunValue]"
             return
         
@@ -349,16 +364,17 @@ class ActionExecutor:
         variables[var_name] = prop_value
         
         elem_desc = element.Name or element.ControlTypeName or "element"
-        self.logger.info(f"Got {prop_name} = '{prop_value}' from '{elem_desc}', stored in '{var_name}'")
+        self.logger.info("Got %s = '%s' from '%s', stored in '%s'", prop_name, prop_value, elem_desc, var_name)
     
-    def _execute_screenshot(self, element, value):
+    def _execute_screenshot(self, window, element, value):
         """Screenshotアクション - スクリーンショット撮影"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would take screenshot: {value}")
+            self.logger.info("[Dry-run] Would take screenshot: %s", value)
             return
         
-        self.logger.info(f"Taking screenshot: {value}")
-        capture_screenshot(value, dry_run=self.dry_run)
+        self.logger.info("Taking screenshot: %s", value)
+        with self.timer.phase("screenshot", target=value):
+            self.screenshots.capture(value, window=window, element=element, dry_run=self.dry_run)
     
     def _execute_focus_element(self, element, key):
         """FocusElementアクション - 要素にフォーカス"""
@@ -369,68 +385,68 @@ class ActionExecutor:
             element_desc = key if key else f"{element.ControlTypeName} (AutomationId: {element.AutomationId or 'N/A'})"
         
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would focus element: {element_desc}")
+            self.logger.info("[Dry-run] Would focus element: %s", element_desc)
             return
         
-        self.logger.info(f"Focusing element '{element_desc}'...")
+        self.logger.info("Focusing element '%s'...", element_desc)
         
         # Win32 APIフォールバックでフォーカス設定
         success = self.focus_manager.set_focus_with_fallback(element, element_desc)
         
         if success:
-            self.logger.info(f"✓ Focus successfully set on '{element_desc}'")
+            self.logger.info("✓ Focus successfully set on '%s'", element_desc)
 
     def _execute_get_value(self, element, value, variables):
         """GetValueアクション - 要素の値を取得して変数に格納"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would get value from element: {element.Name} and store in '{value}'")
+            self.logger.info("[Dry-run] Would get value from element: %s and store in '%s'", LazyProperty(element, "Name"), value)
             variables[value] = "[DryRunValue]"
             return
 
         val = element.Name
         try:
-            pattern = element.GetPattern(auto.PatternId.ValuePattern)
+            pattern = self.backend.get_pattern(element, "ValuePattern")
             if pattern:
                 val = pattern.Value
         except Exception as e:
-            self.logger.warning(f"Failed to get ValuePattern: {e}")
+            self.logger.warning("Failed to get ValuePattern: %s", e)
 
         if not val or val == element.Name:
             try:
-                pattern = element.GetPattern(auto.PatternId.TextPattern)
+                pattern = self.backend.get_pattern(element, "TextPattern")
                 if pattern:
                     val = pattern.DocumentRange.GetText(-1)
             except Exception as e:
-                self.logger.warning(f"Failed to get TextPattern: {e}")
+                self.logger.warning("Failed to get TextPattern: %s", e)
         
-        self.logger.info(f"Got value: '{val}'. Storing in variable '{value}'")
+        self.logger.info("Got value: '%s'. Storing in variable '%s'", val, value)
         variables[value] = val
 
     def _execute_set_clipboard(self, value):
         """SetClipboardアクション - クリップボードに値を設定"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would set clipboard to: {value}")
+            self.logger.info("[Dry-run] Would set clipboard to: %s", value)
             return
 
         text_to_copy = value.replace("{ENTER}", "\r\n")
-        self.logger.info(f"Setting clipboard: {text_to_copy}")
-        auto.SetClipboardText(text_to_copy)
+        self.logger.info("Setting clipboard: %s", text_to_copy)
+        self.backend.set_clipboard_text(text_to_copy)
 
     def _execute_get_clipboard(self, value, variables):
         """GetClipboardアクション - クリップボードの値を取得して変数に格納"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would get clipboard text and store in '{value}'")
+            self.logger.info("[Dry-run] Would get clipboard text and store in '%s'", value)
             variables[value] = "[DryRunClipboard]"
             return
 
-        val = auto.GetClipboardText()
-        self.logger.info(f"Got clipboard text: '{val}'. Storing in variable '{value}'")
+        val = self.backend.get_clipboard_text()
+        self.logger.info("Got clipboard text: '%s'. Storing in variable '%s'", val, value)
         variables[value] = val
 
     def _execute_get_datetime(self, value, variables):
         """GetDateTimeアクション - 現在日時を取得して変数に格納"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would get current date/time based on: {value}")
+            self.logger.info("[Dry-run] Would get current date/time based on: %s", value)
             return
 
         if "=" in value:
@@ -461,6 +477,7 @@ class ActionExecutor:
             fmt = fmt.replace("mm", "%M")
             fmt = fmt.replace("ss", "%S")
             
+            import datetime
             now = datetime.datetime.now()
             if offset != 0:
                 now = now + datetime.timedelta(days=offset)
@@ -468,22 +485,22 @@ class ActionExecutor:
             formatted_date = now.strftime(fmt)
             
             if offset != 0:
-                self.logger.info(f"Got date/time: '{formatted_date}' (offset: {offset:+d} days). Storing in variable '{var_name}'")
+                self.logger.info("Got date/time: '%s' (offset: %+d days). Storing in variable '%s'", formatted_date, offset, var_name)
             else:
-                self.logger.info(f"Got date/time: '{formatted_date}'. Storing in variable '{var_name}'")
+                self.logger.info("Got date/time: '%s'. Storing in variable '%s'", formatted_date, var_name)
             variables[var_name] = formatted_date
         else:
-            self.logger.warning(f"Invalid GetDateTime format: {value}. Expected 'variable = format'")
+            self.logger.warning("Invalid GetDateTime format: %s. Expected 'variable = format'", value)
 
     def _execute_verify_value(self, element, value):
         """VerifyValueアクション - 要素の値を検証"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would verify value of element: {element.Name} against '{value}'")
+            self.logger.info("[Dry-run] Would verify value of element: %s against '%s'", LazyProperty(element, "Name"), value)
             return
 
         current_val = element.Name
         try:
-            pattern = element.GetPattern(auto.PatternId.ValuePattern)
+            pattern = self.backend.get_pattern(element, "ValuePattern")
             if pattern and pattern.Value:
                 current_val = pattern.Value
         except Exception:
@@ -491,90 +508,93 @@ class ActionExecutor:
 
         if not current_val:
             try:
-                pattern = element.GetPattern(auto.PatternId.TextPattern)
+                pattern = self.backend.get_pattern(element, "TextPattern")
                 if pattern:
                     current_val = pattern.DocumentRange.GetText(-1)
             except Exception:
                 pass
             
         if current_val == value:
-            self.logger.info(f"Verification PASSED: Value is '{current_val}'")
+            self.logger.info("Verification PASSED: Value is '%s'", current_val)
         else:
-            self.logger.error(f"Verification FAILED: Expected '{value}', got '{current_val}'")
+            self.logger.error("Verification FAILED: Expected '%s', got '%s'", value, current_val)
             raise Exception(f"Verification failed. Expected '{value}', got '{current_val}'")
 
     def _execute_wait_until_visible(self, window, key, value):
         """WaitUntilVisibleアクション - 要素が表示されるまで待機"""
         timeout = float(value) if value else 10.0
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would wait until element is visible: {key} (Timeout: {timeout}s)")
+            self.logger.info("[Dry-run] Would wait until element is visible: %s (Timeout: %ss)", key, timeout)
             return
 
-        self.logger.info(f"Waiting until visible: {key} (Timeout: {timeout}s)...")
+        self.logger.info("Waiting until visible: %s (Timeout: %ss)...", key, timeout)
         start_time = time.time()
         while time.time() - start_time < timeout:
             try:
                 found = self.element_finder.find_element_by_path(window, key)
-                if found and found.Exists(maxSearchSeconds=0):
-                    self.logger.info(f"Element became visible.")
+                if found and self.backend.exists(found):
+                    self.logger.info("Element became visible.")
                     return
             except:
                 pass
-            time.sleep(0.5)
+            with self.timer.phase("wait"):
+                time.sleep(0.5)
         raise Exception(f"Timeout waiting for element to be visible: {key}")
 
     def _execute_wait_until_enabled(self, window, key, value):
         """WaitUntilEnabledアクション - 要素が有効になるまで待機"""
         timeout = float(value) if value else 10.0
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would wait until element is enabled: {key} (Timeout: {timeout}s)")
+            self.logger.info("[Dry-run] Would wait until element is enabled: %s (Timeout: %ss)", key, timeout)
             return
 
-        self.logger.info(f"Waiting until enabled: {key} (Timeout: {timeout}s)...")
+        self.logger.info("Waiting until enabled: %s (Timeout: %ss)...", key, timeout)
         start_time = time.time()
         while time.time() - start_time < timeout:
             try:
                 found = self.element_finder.find_element_by_path(window, key)
-                if found and found.Exists(maxSearchSeconds=0) and found.IsEnabled:
-                    self.logger.info(f"Element became enabled.")
+                if found and self.backend.exists(found) and found.IsEnabled:
+                    self.logger.info("Element became enabled.")
                     return
             except:
                 pass
-            time.sleep(0.5)
+            with self.timer.phase("wait"):
+                time.sleep(0.5)
         raise Exception(f"Timeout waiting for element to be enabled: {key}")
 
     def _execute_wait_until_gone(self, window, key, value):
         """WaitUntilGoneアクション - 要素が消えるまで待機"""
         timeout = float(value) if value else 10.0
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would wait until element is gone: {key} (Timeout: {timeout}s)")
+            self.logger.info("[Dry-run] Would wait until element is gone: %s (Timeout: %ss)", key, timeout)
             return
 
-        self.logger.info(f"Waiting until gone: {key} (Timeout: {timeout}s)...")
+        self.logger.info("Waiting until gone: %s (Timeout: %ss)...", key, timeout)
         start_time = time.time()
         while time.time() - start_time < timeout:
             try:
                 found = self.element_finder.find_element_by_path(window, key)
-                if not found or not found.Exists(maxSearchSeconds=0):
-                    self.logger.info(f"Element is gone.")
+                if not found or not self.backend.exists(found):
+                    self.logger.info("Element is gone.")
                     return
             except:
                 # findが例外を発生させた場合（例: 親が消えた）、要素は消えている
-                self.logger.info(f"Element is gone (exception).")
+                self.logger.info("Element is gone (exception).")
                 return
-            time.sleep(0.5)
+            with self.timer.phase("wait"):
+                time.sleep(0.5)
         raise Exception(f"Timeout waiting for element to be gone: {key}")
 
     def _execute_verify_variable(self, key, value, variables):
         """VerifyVariableアクション - 変数の値を検証"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would verify variable '{key}' against '{value}'")
+            self.logger.info("[Dry-run] Would verify variable '%s' against '%s'", key, value)
             return
 
         var_name = key
         expected_val = value
         actual_val = variables.get(var_name, '')
-        self.logger.info(f"Verifying variable '{var_name}': Expected='{expected_val}', Actual='{actual_val}'")
+        self.logger.info("Verifying variable '%s': Expected='%s', Actual='%s'", var_name, expected_val, actual_val)
         
         expected_normalized = expected_val.replace('\\r', '\r').replace('\\n', '\n')
         actual_normalized = str(actual_val).replace('\r\n', '\n')
@@ -587,34 +607,34 @@ class ActionExecutor:
     def _execute_paste(self, element):
         """Pasteアクション - クリップボードから貼り付け"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would paste from clipboard to element: {element.Name}")
+            self.logger.info("[Dry-run] Would paste from clipboard to element: %s", LazyProperty(element, "Name"))
             return
 
         self.logger.info("Pasting from clipboard...")
-        element.SetFocus()
+        self.backend.set_focus(element)
         time.sleep(0.5)
-        auto.SendKeys('{Ctrl}v')
+        self.backend.send_keys('{Ctrl}v')
 
     def _execute_exit(self, window, target_app):
         """Exitアクション - ウィンドウを閉じる"""
         if self.dry_run:
-            self.logger.info(f"[Dry-run] Would exit window: {target_app}")
+            self.logger.info("[Dry-run] Would exit window: %s", target_app)
             return
 
-        self.logger.info(f"Exiting {target_app}...")
+        self.logger.info("Exiting %s...", target_app)
         try:
             # まずWindowPattern.Close()を試す（最もクリーンな方法）
-            pattern = window.GetPattern(auto.PatternId.WindowPattern)
+            pattern = self.backend.get_pattern(window, "WindowPattern")
             if pattern:
                 pattern.Close()
-                self.logger.info(f"Closed {target_app} using WindowPattern.Close()")
+                self.logger.info("Closed %s using WindowPattern.Close()", target_app)
             else:
                 # フォールバック: フォーカスを設定して特定のウィンドウにAlt+F4を送信
-                self.logger.info(f"WindowPattern not available, using SendKeys method")
-                window.SetFocus()
+                self.logger.info("WindowPattern not available, using SendKeys method")
+                self.backend.set_focus(window)
                 time.sleep(0.1)  # フォーカスが設定されるまで少し待機
-                # auto.SendKeys()の代わりにwindow.SendKeys()を使用して特定のウィンドウに送信
-                window.SendKeys('{Alt}{F4}')
-                self.logger.info(f"Sent Alt+F4 to {target_app}")
+                # 全体へのSendKeysではなく、特定のウィンドウに送信
+                self.backend.send_keys('{Alt}{F4}', window)
+                self.logger.info("Sent Alt+F4 to %s", target_app)
         except Exception as e:
-            self.logger.error(f"Failed to exit window: {e}")
+            self.logger.error("Failed to exit window: %s", e)
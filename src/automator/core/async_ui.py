@@ -0,0 +1,332 @@
+"""
+AsyncUI - asyncioからUI操作を行うためのファサード
+
+UIA（COM）の呼び出しはブロッキングで、要素は作成したスレッドのアパートメントに属する。
+そのため実際の処理は、COMを初期化した専用のワーカースレッド（UIWorker）で行い、
+コルーチンはその結果（concurrent.futures.Future）を待つだけにする。
+
+- 各ワーカーは要求キューを持ち、検索・アクション実行などの要求を順に処理する。
+- 待機（wait_until）は要求ごとにスレッドを割り当てず、ワーカーが期限順のヒープで管理し、
+  期限の来た条件を1回ずつ確認する（見つかるまで待たない検索）。数千件の待機も1スレッドで多重化できる。
+- 同じウィンドウ（TargetApp）の操作は常に同じワーカーに割り当てるため、取得した要素は
+  同じTargetAppを指定した後続の操作でそのまま使用できる。
+
+例:
+    async with AsyncUI(workers=2) as ui:
+        await ui.wait_until("注文フォーム", "ButtonControl(Name='送信')", "enabled", timeout=30)
+        await ui.execute("注文フォーム", "ButtonControl(Name='送信')", "Click")
+"""
+
+import asyncio
+import concurrent.futures
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+
+from src.automator.core.element_finder import ElementFinder
+from src.automator.core.action_executor import ActionExecutor
+from src.automator.utils.focus import FocusManager
+from src.shared.backend import get_backend
+
+
+# wait_untilで指定できる条件
+CONDITIONS = ("exists", "visible", "enabled", "gone")
+
+# ActionExecutorの待機アクション -> wait_untilの条件
+WAIT_ACTIONS = {"WaitUntilVisible": "visible", "WaitUntilEnabled": "enabled", "WaitUntilGone": "gone"}
+
+_STOP = object()
+
+
+class _Poll:
+    """ワーカーが定期的に確認する条件（check()がNone以外を返すと完了）。"""
+
+    __slots__ = ("future", "check", "deadline", "interval", "description")
+
+    def __init__(self, future, check, deadline, interval, description):
+        self.future = future
+        self.check = check
+        self.deadline = deadline
+        self.interval = interval
+        self.description = description
+
+
+class UIWorker:
+    """COMを初期化した専用スレッドで、要求キューの処理と待機条件のポーリングを行う。"""
+
+    def __init__(self, backend, name="ui-worker"):
+        self.backend = backend
+        self.name = name
+        self.requests = queue.SimpleQueue()
+        self.processed = 0  # 処理した要求の数
+        self.checks = 0     # 条件を確認した回数
+        self._polls = []    # (次の確認時刻, 連番, _Poll) のヒープ（ワーカースレッドのみが操作する）
+        self._sequence = itertools.count()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self):
+        """待機中の条件の数"""
+        return len(self._polls)
+
+    def submit(self, fn, *args, **kwargs):
+        """fnをワーカースレッドで実行し、結果のFutureを返す。"""
+        future = concurrent.futures.Future()
+        self.requests.put((future, fn, args, kwargs))
+        return future
+
+    def poll(self, check, timeout, interval, description=""):
+        """
+        check()がNone以外を返すまで、interval秒ごとにワーカースレッドで確認する。
+
+        Returns:
+            concurrent.futures.Future: check()の戻り値。timeout秒以内に満たされなければTimeoutError
+        """
+        future = concurrent.futures.Future()
+        deadline = time.monotonic() + timeout
+        self.requests.put(_Poll(future, check, deadline, interval, description))
+        return future
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def stop(self):
+        """待機中の条件を取り消し、キューの要求を処理してからスレッドを終了する。"""
+        self.requests.put(_STOP)
+        self._thread.join()
+
+    # --- ワーカースレッド ---
+    def _run(self):
+        with self.backend.thread_context():
+            while True:
+                timeout = None
+                if self._polls:
+                    timeout = max(0, self._polls[0][0] - time.monotonic())
+                try:
+                    item = self.requests.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+
+                if item is _STOP:
+                    break
+                if isinstance(item, _Poll):
+                    # 登録時に1回確認し、満たされていなければヒープに入れる
+                    self._check(item, time.monotonic())
+                elif item is not None:
+                    self._call(*item)
+                self._run_due_polls()
+
+            for _, _, poll in self._polls:
+                poll.future.cancel()
+            self._polls.clear()
+            # 停止後に投入された要求も取り消す
+            while True:
+                try:
+                    item = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    (item.future if isinstance(item, _Poll) else item[0]).cancel()
+
+    def _call(self, future, fn, args, kwargs):
+        if not future.set_running_or_notify_cancel():
+            return
+        self.processed += 1
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    def _run_due_polls(self):
+        now = time.monotonic()
+        while self._polls and self._polls[0][0] <= now:
+            _, _, poll = heapq.heappop(self._polls)
+            self._check(poll, now)
+
+    def _check(self, poll, now):
+        if poll.future.cancelled():
+            return
+        self.checks += 1
+        try:
+            result = poll.check()
+        except Exception as e:
+            poll.future.set_exception(e)
+            return
+        if result is not None:
+            poll.future.set_result(result)
+        elif now >= poll.deadline:
+            poll.future.set_exception(TimeoutError(f"Timed out waiting for {poll.description}"))
+        else:
+            due = min(now + poll.interval, poll.deadline)
+            heapq.heappush(self._polls, (due, next(self._sequence), poll))
+
+
+class AsyncUI:
+    """UI操作をawaitできるメソッドとして提供するファサード。"""
+
+    def __init__(self, backend=None, workers=1, logger=None, aliases=None, dry_run=False, force_run=False,
+                 wait_time=None, legacy_mode=False, poll_interval=0.25):
+        """
+        AsyncUI初期化。
+
+        Args:
+            backend: UIBackendインスタンス（省略時は既定のバックエンド）
+            workers: ワーカースレッドの数（異なるウィンドウの操作を並行して行う場合に増やす）
+            logger: Loggerインスタンス（ロギングの設定は変更しない）
+            aliases: エイリアス名 -> RPAパスの辞書（keyにエイリアス名を指定できる）
+            dry_run / force_run / wait_time / legacy_mode: ActionExecutorに渡すオプション
+            poll_interval: wait_untilの既定の確認間隔（秒）
+        """
+        self.backend = backend or get_backend()
+        self.logger = logger or logging.getLogger(__name__)
+        self.aliases = dict(aliases or {})
+        self.reverse_aliases = {path: alias for alias, path in self.aliases.items()}
+        self.dry_run = dry_run
+        self.force_run = force_run
+        self.wait_time = wait_time
+        self.legacy_mode = legacy_mode
+        self.poll_interval = poll_interval
+        self.workers = [UIWorker(self.backend, name=f"ui-worker-{i + 1}") for i in range(max(1, workers))]
+        self._components = {}  # ワーカー名 -> (ElementFinder, ActionExecutor)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """ワーカースレッドを終了する（待機中のwait_untilは取り消される）。"""
+        await asyncio.get_running_loop().run_in_executor(None, self._stop_workers)
+
+    def _stop_workers(self):
+        for worker in self.workers:
+            worker.stop()
+
+    # --- 公開API ---
+    async def call(self, fn, *args, target_app=None, **kwargs):
+        """任意の関数を（target_appに対応する）ワーカースレッドで実行する。"""
+        return await asyncio.wrap_future(self._worker(target_app).submit(fn, *args, **kwargs))
+
+    async def find(self, target_app, key=None, timeout=0):
+        """
+        ウィンドウ、またはその配下の要素を検索する。
+
+        Args:
+            target_app: ウィンドウ名（TargetAppと同じ指定方法）
+            key: RPAパスまたはエイリアス名（省略時はウィンドウを返す）
+            timeout: 0より大きい場合、見つかるまで最大timeout秒待つ（wait_untilと同様に多重化される）
+
+        Returns:
+            要素。見つからなければNone
+        """
+        if timeout > 0:
+            try:
+                return await self.wait_until(target_app, key, "exists", timeout=timeout)
+            except TimeoutError:
+                return None
+        return await self.call(self._probe, target_app, key, "exists", target_app=target_app)
+
+    async def wait_until(self, target_app, key=None, condition="exists", timeout=10.0, interval=None):
+        """
+        要素が条件を満たすまで待つ。
+
+        Args:
+            condition: "exists"（存在する）/ "visible"（画面内に表示されている）/ "enabled"（有効）/ "gone"（存在しない）
+            timeout: 最大待機秒数
+            interval: 確認間隔（省略時はpoll_interval）
+
+        Returns:
+            条件を満たした要素（"gone" の場合はTrue）
+
+        Raises:
+            TimeoutError: timeout秒以内に条件を満たさなかった場合
+        """
+        if condition not in CONDITIONS:
+            raise ValueError(f"Unknown condition '{condition}' (expected one of: {', '.join(CONDITIONS)})")
+        if self.dry_run:
+            self.logger.info("[Dry-run] Would wait until %s is %s (Timeout: %ss)", key or target_app, condition, timeout)
+            return True
+        description = f"{self._describe(target_app, key)} to be {condition} ({timeout}s)"
+        future = self._worker(target_app).poll(lambda: self._probe(target_app, key, condition), timeout,
+                                               interval or self.poll_interval, description)
+        return await asyncio.wrap_future(future)
+
+    async def execute(self, target_app, key, action, value="", variables=None):
+        """
+        アクションを1件実行する（CSVの1行と同じ指定。Valueの {変数名} は置換される）。
+
+        Wait と WaitUntilVisible / WaitUntilEnabled / WaitUntilGone はワーカーをブロックしないよう
+        asyncio.sleep / wait_until で待つ。
+
+        Returns:
+            dict: 実行後の変数（variablesを指定した場合はその辞書を更新して返す）
+        """
+        variables = {} if variables is None else variables
+        value = "" if value is None else str(value)
+        if action not in ("If", "Loop", "SetVariable") and "{" in value:
+            for name, var_value in variables.items():
+                value = value.replace(f"{{{name}}}", str(var_value))
+        if action == "Wait" and not self.dry_run:
+            self.logger.info("Waiting %s seconds...", value)
+            await asyncio.sleep(float(value))
+            return variables
+        if action in WAIT_ACTIONS:
+            try:
+                await self.wait_until(target_app, key, WAIT_ACTIONS[action], timeout=float(value) if value else 10.0)
+            except TimeoutError:
+                raise Exception(f"Timeout waiting for element to be {WAIT_ACTIONS[action]}: {key}")
+            return variables
+        await self.call(self._execute, target_app, key, action, value, variables, target_app=target_app)
+        return variables
+
+    def stats(self):
+        """ワーカーごとの処理件数・確認回数・待機中の条件数を返す。"""
+        return {worker.name: {"processed": worker.processed, "checks": worker.checks, "pending": worker.pending}
+                for worker in self.workers}
+
+    # --- ワーカースレッドで実行される処理 ---
+    def _worker(self, target_app):
+        # 要素はワーカーのアパートメントに属するため、同じウィンドウは常に同じワーカーで扱う
+        return self.workers[hash(target_app or "") % len(self.workers)]
+
+    def _finder_and_executor(self):
+        name = threading.current_thread().name
+        components = self._components.get(name)
+        if components is None:
+            finder = ElementFinder(logger=self.logger, aliases=self.aliases, reverse_aliases=self.reverse_aliases,
+                                   backend=self.backend, window_cache={})
+            focus = FocusManager(force_run=self.force_run, legacy_mode=self.legacy_mode, backend=self.backend)
+            executor = ActionExecutor(logger=self.logger, element_finder=finder, focus_manager=focus,
+                                      dry_run=self.dry_run, force_run=self.force_run, wait_time=self.wait_time,
+                                      backend=self.backend)
+            components = self._components[name] = (finder, executor)
+        return components
+
+    def _probe(self, target_app, key, condition):
+        """待たずに1回だけ確認する。条件を満たせば要素（goneはTrue）、満たさなければNone"""
+        finder, _ = self._finder_and_executor()
+        element = finder.find_window(target_app, wait=False)
+        if element is not None and key:
+            element = finder.find_element_by_path(element, self.aliases.get(key, key), wait=False)
+        present = element is not None and self.backend.exists(element)
+        if condition == "gone":
+            return None if present else True
+        if not present:
+            return None
+        if condition == "visible" and element.IsOffscreen:
+            return None
+        if condition == "enabled" and not element.IsEnabled:
+            return None
+        return element
+
+    def _execute(self, target_app, key, action, value, variables):
+        _, executor = self._finder_and_executor()
+        return executor.execute(target_app, self.aliases.get(key, key) if key else key, action, value, variables)
+
+    def _describe(self, target_app, key):
+        return f"'{key}' in '{target_app}'" if key else f"window '{target_app}'"
@@ -5,14 +5,17 @@ UI要素の検索と取得操作を処理。
 """
 
 import logging
-import re
-import uiautomation as auto
+from src.automator.utils.log_pipeline import LazyProperty
+from src.automator.utils.timing import TimingRecorder
+from src.shared.backend import get_backend
+from src.shared.backend.identity import ElementRef
+from src.shared.rpa_path import compile_path, window_conditions
 
 
 class ElementFinder:
     """UI要素の検索とプロパティ取得を管理する。"""
     
-    def __init__(self, logger=None, aliases=None, reverse_aliases=None):
+    def __init__(self, logger=None, aliases=None, reverse_aliases=None, timer=None, backend=None, window_cache=None):
         """
         ElementFinder初期化。
         
@@ -20,10 +23,16 @@ class ElementFinder:
             logger: Loggerインスタンス
             aliases: エイリアスマッピングの辞書
             reverse_aliases: エイリアス用の逆引き辞書
+            timer: TimingRecorderインスタンス（省略時は計測しない）
+            backend: UIBackendインスタンス（省略時は既定のバックエンド）
+            window_cache: TargetApp -> ウィンドウ要素の辞書（常駐プロセスでジョブ間で共有する。省略時はキャッシュしない）
         """
         self.logger = logger or logging.getLogger(__name__)
         self.aliases = aliases or {}
         self.reverse_aliases = reverse_aliases or {}
+        self.timer = timer or TimingRecorder(enabled=False)
+        self.backend = backend or get_backend()
+        self.window_cache = window_cache
     
     def format_path_with_alias(self, rpa_path):
         """エラーメッセージ用にエイリアス名でRPA_PATHをフォーマット。"""
@@ -32,111 +41,92 @@ class ElementFinder:
             return f"'{alias}' ({rpa_path})"
         return rpa_path
     
-    def find_window(self, target_app):
-        """アプリケーション名でウィンドウを検索。"""
-        self.logger.debug(f"Searching for window '{target_app}'...")
-        
-        # 明示的な正規表現モード
-        if target_app.startswith("regex:"):
-            pattern = target_app[6:] # 'regex:' を除去
-            self.logger.debug(f"Using regex pattern: {pattern}")
-            win = auto.WindowControl(searchDepth=1, RegexName=pattern)
-            if win.Exists(maxSearchSeconds=1):
-                return win
-            return None
+    def find_window(self, target_app, wait=True):
+        """
+        アプリケーション名でウィンドウを検索。
 
-        # 標準モード（まず完全一致、次に部分一致の正規表現フォールバック）
-        win = auto.WindowControl(searchDepth=1, Name=target_app)
-        if win.Exists(maxSearchSeconds=1):
+        wait=Falseの場合は見つかるまで待たずに1回だけ確認する（非同期APIのポーリング用）。
+        """
+        with self.timer.phase("window_lookup", target=target_app) as span:
+            if self.window_cache is not None:
+                # キャッシュしたウィンドウはまだ存在する場合のみ再利用する
+                win = self.window_cache.get(target_app)
+                if win is not None and self.backend.exists(win):
+                    span.set(status="cached")
+                    return win
+            win = self._find_window(target_app, timeout=1 if wait else 0)
+            if win is None:
+                span.set(status="miss")
+            elif self.window_cache is not None:
+                self.window_cache[target_app] = win
             return win
+
+    def _find_window(self, target_app, timeout=1):
+        self.logger.debug("Searching for window '%s'...", target_app)
         
-        # フォールバック: RegexNameを使用した部分一致
-        safe_name = re.escape(target_app)
-        win = auto.WindowControl(searchDepth=1, RegexName=f".*{safe_name}.*")
-        if win.Exists(maxSearchSeconds=1):
-            return win
-            
+        # "regex:" は正規表現のみ、標準モードはまず完全一致、次に部分一致の正規表現フォールバック
+        for conditions in window_conditions(target_app):
+            self.logger.debug("Window conditions: %s", conditions)
+            search_params = {"ControlTypeName": "WindowControl", "searchDepth": 1}
+            search_params.update(conditions)
+            win = self.backend.find(None, search_params, timeout=timeout)
+            if win is not None:
+                return win
         return None
     
-    def find_element_by_path(self, root, path_string):
-        """パス文字列で要素を検索。"""
-        parts = [p.strip() for p in path_string.split('->')]
-        current = root
-        
-        for part in parts:
-            if not part:
-                continue
-            
-            match = re.match(r"(\w+)(?:\((.*)\))?", part)
-            if not match:
-                self.logger.error(f"Invalid path part format: {part}")
-                return None
-            
-            control_type = match.group(1)
-            props_str = match.group(2)
-            
-            search_params = {"ControlTypeName": control_type}
-            found_index = 1
-
-            if props_str:
-                name_match = re.search(r"\bName='([^']*)'", props_str)
-                regex_name_match = re.search(r"\bRegexName='([^']*)'", props_str)
-                id_match = re.search(r"\bAutomationId='([^']*)'", props_str)
-                class_match = re.search(r"\bClassName='([^']*)'", props_str)
-                index_match = re.search(r"\bfoundIndex=(\d+)", props_str)
-                depth_match = re.search(r"\bsearchDepth=(\d+)", props_str)
-                
-                if name_match:
-                    search_params["Name"] = name_match.group(1)
-                if regex_name_match:
-                    search_params["RegexName"] = regex_name_match.group(1)
-                if id_match:
-                    search_params["AutomationId"] = id_match.group(1)
-                if class_match:
-                    search_params["ClassName"] = class_match.group(1)
-                if index_match:
-                    found_index = int(index_match.group(1))
-                if depth_match:
-                    search_params["searchDepth"] = int(depth_match.group(1))
-
-            self.logger.debug(f"Searching descendant: {search_params} (Index: {found_index}) under {current.Name}...")
-            
-            target = current.Control(
-                foundIndex=found_index,
-                **search_params
-            )
-            
-            if not target.Exists(maxSearchSeconds=2):
-                # フォールバック: 検索深度を1増やして試す
-                current_depth = search_params.get("searchDepth", 1)
-                self.logger.warning(f"Element not found at depth {current_depth}. Trying depth {current_depth + 1}...")
-                search_params["searchDepth"] = current_depth + 1
-                self.logger.debug(f"Fallback 1 params: {search_params}")
-                target = current.Control(
-                    foundIndex=found_index,
-                    **search_params
-                )
+    def find_element_by_path(self, root, path_string, wait=True):
+        """
+        パス文字列で要素を検索。
 
-            if not target.Exists(maxSearchSeconds=1):
-                # フォールバック2: 再帰検索を試す（深度を無視）
-                self.logger.warning(f"Element not found at depth {current_depth + 1}. Trying recursive search...")
-                if "searchDepth" in search_params:
-                    del search_params["searchDepth"]
-                
-                self.logger.debug(f"Fallback 2 params: {search_params}")
-                target = current.Control(
-                    foundIndex=found_index,
-                    **search_params
-                )
+        wait=Falseの場合はフォールバックの各段階で待たずに1回だけ確認し、
+        フォールバックのログはDEBUGで出力する（非同期APIのポーリング用）。
+        """
+        fallback_level = logging.WARNING if wait else logging.DEBUG
+        try:
+            segments = compile_path(path_string)
+        except ValueError as e:
+            self.logger.error(str(e))
+            return None
+        
+        current = root
+        for segment in segments:
+            with self.timer.phase("segment", target=segment.text) as span:
+                target = None
+                current_depth = segment.search_depth or 1
+                for fallback, search_params, timeout in segment.attempts():
+                    if fallback == 0:
+                        self.logger.debug("Searching descendant: %s (Index: %s) under %s...", search_params, segment.found_index, LazyProperty(current, "Name"))
+                    elif fallback == 1:
+                        # フォールバック: 検索深度を1増やして試す
+                        self.logger.log(fallback_level, "Element not found at depth %s. Trying depth %s...", current_depth, current_depth + 1)
+                        self.logger.debug("Fallback 1 params: %s", search_params)
+                    else:
+                        # フォールバック2: 再帰検索を試す（深度を無視）
+                        self.logger.log(fallback_level, "Element not found at depth %s. Trying recursive search...", current_depth + 1)
+                        self.logger.debug("Fallback 2 params: %s", search_params)
+                    
+                    target = self._attempt(current, search_params, segment.found_index, fallback, timeout if wait else 0)
+                    if target is not None:
+                        break
                 
-            if not target.Exists(maxSearchSeconds=1):
-                self.logger.warning(f"Not found: {part}")
-                return None
+                if target is None:
+                    span.set(fallback=fallback, status="miss")
+                    self.logger.log(fallback_level, "Not found: %s", segment.text)
+                    return None
+                span.set(fallback=fallback)
             
             current = target
             
         return current
     
+    def _attempt(self, parent, search_params, found_index, fallback, max_seconds):
+        """1段階分の検索（トレース上はsegment内のattemptとして記録）。見つからなければNone"""
+        with self.timer.phase("attempt", fallback=fallback) as span:
+            found = self.backend.find(parent, search_params, found_index, timeout=max_seconds)
+            if found is None:
+                span.set(status="miss")
+            return found
+    
     def get_element_property(self, element, prop_name):
         """要素からプロパティ値を取得。"""
         try:
@@ -161,13 +151,13 @@ class ElementFinder:
             # パターンベースのプロパティ
             elif prop_name == 'Value':
                 try:
-                    pattern = element.GetPattern(auto.PatternId.ValuePattern)
+                    pattern = self.backend.get_pattern(element, "ValuePattern")
                     return pattern.Value if pattern else ''
                 except Exception:
                     return ''
             elif prop_name == 'Text':
                 try:
-                    pattern = element.GetPattern(auto.PatternId.TextPattern)
+                    pattern = self.backend.get_pattern(element, "TextPattern")
                     if pattern:
                         return pattern.DocumentRange.GetText(-1)
                 except Exception:
@@ -175,7 +165,7 @@ class ElementFinder:
                 return element.Name or ''
             elif prop_name == 'IsChecked':
                 try:
-                    pattern = element.GetPattern(auto.PatternId.TogglePattern)
+                    pattern = self.backend.get_pattern(element, "TogglePattern")
                     if pattern:
                         state = pattern.ToggleState
                         return 'True' if state == 1 else 'False'  # 1 = On, 0 = Off
@@ -183,15 +173,15 @@ class ElementFinder:
                     return ''
             elif prop_name == 'IsSelected':
                 try:
-                    pattern = element.GetPattern(auto.PatternId.SelectionItemPattern)
+                    pattern = self.backend.get_pattern(element, "SelectionItemPattern")
                     return str(pattern.IsSelected) if pattern else ''
                 except Exception:
                     return ''
             else:
-                self.logger.warning(f"Unknown property: {prop_name}")
+                self.logger.warning("Unknown property: %s", prop_name)
                 return ''
         except Exception as e:
-            self.logger.warning(f"Failed to get property '{prop_name}': {e}")
+            self.logger.warning("Failed to get property '%s': %s", prop_name, e)
             return ''
     
     def get_relative_element(self, element, window, direction):
@@ -200,22 +190,22 @@ class ElementFinder:
             if direction == 'self':
                 return element
             elif direction == 'parent':
-                parent = element.GetParentControl()
+                parent = self.backend.get_parent(element)
                 return parent if parent else None
             elif direction == 'next':
-                sibling = element.GetNextSiblingControl()
+                sibling = self.backend.get_next_sibling(element)
                 return sibling if sibling else None
             elif direction in ['prev', 'previous']:
-                sibling = element.GetPreviousSiblingControl()
+                sibling = self.backend.get_previous_sibling(element)
                 return sibling if sibling else None
             elif direction in ['left', 'right', 'up', 'down', 'above', 'below']:
                 # 座標ベースの検索
                 return self._find_element_by_position(element, window, direction)
             else:
-                self.logger.warning(f"Unknown direction: {direction}")
+                self.logger.warning("Unknown direction: %s", direction)
                 return None
         except Exception as e:
-            self.logger.warning(f"Failed to get {direction} element: {e}")
+            self.logger.warning("Failed to get %s element: %s", direction, e)
             return None
     
     def _find_element_by_position(self, element, window, direction):
@@ -225,23 +215,15 @@ class ElementFinder:
         center_y = rect.top + rect.height() // 2
         
         # ウィンドウ内の全コントロールを取得
-        all_controls = []
-        def collect_controls(ctrl):
-            all_controls.append(ctrl)
-            for child in ctrl.GetChildren():
-                collect_controls(child)
-        
         try:
-            collect_controls(window)
+            all_controls = [ctrl for ctrl, _ in self.backend.walk(window)]
         except Exception as e:
-            self.logger.debug(f"Error collecting controls: {e}")
+            self.logger.debug("Error collecting controls: %s", e)
             return None
         
         # 最も近い要素をフィルタリングして検索
         candidates = []
         for ctrl in all_controls:
-            if ctrl == element:
-                continue
             try:
                 ctrl_rect = ctrl.BoundingRectangle
                 ctrl_center_x = ctrl_rect.left + ctrl_rect.width() // 2
@@ -271,7 +253,11 @@ class ElementFinder:
                 continue
         
         # 最も近い要素を返す
-        if candidates:
-            candidates.sort(key=lambda x: x[0])
-            return candidates[0][1]
+        # 走査で得た要素は別のラッパーのため、基準の要素自身かどうかはRuntimeIdで判定する
+        # （全要素と比較せず、位置の条件を満たした候補だけを近い順に確認する）
+        candidates.sort(key=lambda x: x[0])
+        target = ElementRef(self.backend, element)
+        for _, ctrl in candidates:
+            if ElementRef(self.backend, ctrl) != target:
+                return ctrl
         return None
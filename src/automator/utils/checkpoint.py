@@ -0,0 +1,95 @@
+"""
+チェックポイントユーティリティ
+
+長時間実行のインタプリタ状態（命令位置、ループスタック、変数、データ行カーソル）を
+小さなJSONファイルに定期保存し、--resumeで再開できるようにする。
+書き込みは一時ファイル + os.replace によるアトミック置換で行う。
+"""
+
+import json
+import logging
+import os
+import time
+
+
+CHECKPOINT_VERSION = 1
+
+
+class CheckpointManager:
+    """インタプリタ状態のチェックポイント保存・読み込みを管理する。"""
+
+    def __init__(self, path, interval=50):
+        """
+        CheckpointManager初期化。
+
+        Args:
+            path: チェックポイントファイルのパス
+            interval: 保存間隔（実行したアクション数）。大きいほどI/Oが減る
+        """
+        self.path = path
+        self.interval = max(1, int(interval))
+        self.logger = logging.getLogger(__name__)
+        self._steps = 0
+
+    def tick(self):
+        """
+        アクション1件分カウントし、保存すべきタイミングならTrueを返す。
+        """
+        self._steps += 1
+        if self._steps >= self.interval:
+            self._steps = 0
+            return True
+        return False
+
+    def save(self, state):
+        """
+        状態をアトミックに書き込む。
+
+        Args:
+            state: JSONシリアライズ可能な状態辞書（変換できない値は文字列化）
+        """
+        data = dict(state)
+        data["version"] = CHECKPOINT_VERSION
+        data["saved_at"] = time.time()
+
+        import tempfile  # 保存時のみ使用（起動時の読み込みを避ける）
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".checkpoint_", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        self._steps = 0
+        self.logger.debug("Checkpoint saved: index=%s, record=%s", state.get('index'), state.get('record'))
+
+    def load(self):
+        """
+        保存された状態を読み込む。
+
+        Returns:
+            dict: 状態辞書。ファイルがない場合はNone
+
+        Raises:
+            ValueError: バージョンが一致しない場合
+        """
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {data.get('version')}")
+        # JSONではタプルがリストになるため、ループスタックを元の形式に戻す
+        data["loop_stack"] = [(entry[0], entry[1]) for entry in data.get("loop_stack", [])]
+        return data
+
+    def clear(self):
+        """正常終了時にチェックポイントを削除する。"""
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,138 @@
+"""
+コンパイルキャッシュユーティリティ
+
+エイリアスCSVとアクションCSVの読み込み結果（エイリアスを解決し、制御構文を正規化した
+アクション、If/Else/Loopのジャンプ表、RPAパスの解析結果）をディスクに保存し、
+次回以降の起動で1回の読み込みで復元する。
+
+キャッシュキーはソースファイルの内容のハッシュ（ファイルの種別・順序を含む）で、
+いずれかのファイルが編集されるとキーが変わり、透過的に再構築される。
+キャッシュファイルはソースファイルの組み合わせごとに1つで、再構築時に上書きされる。
+
+ファイル形式: キー（16進数）+ 改行 + marshal。
+marshalは組み込み型（dict, list, tuple, str, int）のみを扱い、pickleより高速に復元できる。
+形式はPythonのバージョンに依存するため、marshalのバージョンをキーに含める。
+
+保存先は既定でユーザーごとのキャッシュディレクトリ（default_cache_dir()）とし、作業ディレクトリには書き込まない。
+
+常駐プロセス（automator.py serve）では memory=True とし、読み込んだ内容をプロセス内にも保持して
+同じソースのジョブではファイルの読み込みと復元を省略する（キーの計算は毎回行う）。
+"""
+
+import logging
+import marshal
+import os
+import sys
+
+
+CACHE_VERSION = 1
+
+
+def default_cache_dir():
+    """
+    ユーザーごとのキャッシュディレクトリを返す。
+
+    Windowsでは %LOCALAPPDATA%\\automator\\cache、それ以外では $XDG_CACHE_HOME/automator（既定は ~/.cache/automator）。
+    """
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+        return os.path.join(base, "automator", "cache")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "automator")
+
+
+class CompileCache:
+    """エイリアス・アクションのコンパイル結果のキャッシュを管理する。"""
+
+    def __init__(self, cache_dir=None, memory=False):
+        """
+        CompileCache初期化。
+
+        Args:
+            cache_dir: キャッシュファイルを保存するディレクトリ（存在しなければ保存時に作成）。
+                       省略時は default_cache_dir()
+            memory: Trueの場合、読み込み・保存した内容をプロセス内にも保持する
+        """
+        self.cache_dir = cache_dir or default_cache_dir()
+        self.logger = logging.getLogger(__name__)
+        self._memory = {} if memory else None  # キャッシュファイルのパス -> (キー, 内容)
+
+    def key(self, alias_files, action_files):
+        """
+        ソースファイルの内容からキャッシュキーを計算する。
+
+        Returns:
+            str: キー。読み込めないファイルがある場合はNone（キャッシュを使用しない）
+        """
+        import hashlib
+
+        digest = hashlib.sha256(f"v{CACHE_VERSION}:{marshal.version}:{sys.version_info[:2]}".encode())
+        try:
+            for role, files in (("aliases", alias_files), ("actions", action_files)):
+                for path in files:
+                    with open(path, "rb") as f:
+                        content = f.read()
+                    digest.update(f"\0{role}\0{len(content)}\0".encode())
+                    digest.update(content)
+        except OSError:
+            return None
+        return digest.hexdigest()
+
+    def path_for(self, alias_files, action_files):
+        """ソースファイルの組み合わせに対応するキャッシュファイルのパスを返す。"""
+        import hashlib
+
+        names = "\0".join(os.path.abspath(p) for p in list(alias_files) + ["->"] + list(action_files))
+        return os.path.join(self.cache_dir, hashlib.sha1(names.encode("utf-8")).hexdigest()[:16] + ".cache")
+
+    def load(self, path, key):
+        """
+        キャッシュを読み込む。
+
+        Returns:
+            dict: 保存した内容。ファイルがない、またはキーが一致しない場合はNone
+        """
+        if self._memory is not None:
+            entry = self._memory.get(path)
+            if entry is not None and entry[0] == key:
+                return entry[1]
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        header_end = data.find(b"\n")
+        if data[:header_end].decode("ascii", "replace") != key:
+            return None
+        try:
+            program = marshal.loads(memoryview(data)[header_end + 1:])
+        except Exception as e:
+            self.logger.warning("Ignoring unreadable compile cache %s: %s", path, e)
+            return None
+        if self._memory is not None:
+            self._memory[path] = (key, program)
+        return program
+
+    def save(self, path, key, program):
+        """
+        キャッシュをアトミックに書き込む（一時ファイル + os.replace）。
+
+        Args:
+            program: 組み込み型のみで構成された辞書
+        """
+        import tempfile
+
+        directory = os.path.dirname(path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".cache_", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(key.encode("ascii") + b"\n")
+                marshal.dump(program, f)
+            os.replace(tmp_path, path)
+            if self._memory is not None:
+                self._memory[path] = (key, program)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
@@ -0,0 +1,132 @@
+"""
+データソースユーティリティ
+
+データ駆動実行用のレコード読み込み（CSV/JSONL）と結果の逐次書き出しを処理。
+レコードはジェネレータで1行ずつ読み込むため、件数に関係なくメモリ使用量は一定。
+"""
+
+import csv
+import json
+import logging
+import os
+
+
+JSONL_EXTENSIONS = (".jsonl", ".ndjson")
+
+
+def _is_jsonl(path):
+    return os.path.splitext(path)[1].lower() in JSONL_EXTENSIONS
+
+
+def iter_records(data_file):
+    """
+    データファイルからレコードを1件ずつ生成する。
+
+    Args:
+        data_file: データファイルのパス（.csv または .jsonl/.ndjson）
+
+    Yields:
+        dict: 列名 -> 値 のレコード
+    """
+    if _is_jsonl(data_file):
+        with open(data_file, 'r', encoding='utf-8-sig') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError(f"Line {line_no} in {data_file} is not a JSON object")
+                yield record
+    else:
+        with open(data_file, 'r', encoding='utf-8-sig', newline='') as f:
+            for row in csv.DictReader(f):
+                yield row
+
+
+def read_columns(data_file):
+    """
+    データファイルの列名を返す（CSVはヘッダー行。JSONLはレコードごとに列が異なるため空のリスト）。
+    """
+    if _is_jsonl(data_file):
+        return []
+    with open(data_file, 'r', encoding='utf-8-sig', newline='') as f:
+        return next(csv.reader(f), None) or []
+
+
+class ResultWriter:
+    """レコードごとの実行結果をファイルへ逐次書き出す（CSV または JSONL）。"""
+
+    def __init__(self, output_file, resume_offset=None, columns=None, logger=None):
+        """
+        ResultWriter初期化。
+
+        Args:
+            output_file: 出力ファイルのパス（拡張子で形式を判定）
+            resume_offset: 再開時のバイト位置。指定時はその位置以降を切り捨てて追記する
+            columns: 事前に分かっている変数の列名（入力の列・プログラムが設定する変数）。
+                     CSVのヘッダーは最初のレコードの変数とこの列名で確定する
+            logger: 警告の出力先（省略時はモジュールのロガー）
+        """
+        self.output_file = output_file
+        self.jsonl = _is_jsonl(output_file)
+        self.columns = list(columns or [])
+        self.logger = logger or logging.getLogger(__name__)
+        self._writer = None
+        self._dropped = set()
+        fieldnames = None
+
+        if resume_offset is not None and os.path.exists(output_file):
+            if resume_offset > 0 and not self.jsonl:
+                # 既存ヘッダーを引き継ぐ
+                with open(output_file, 'r', encoding='utf-8', newline='') as f:
+                    fieldnames = next(csv.reader(f), None)
+            self._file = open(output_file, 'r+', newline='', encoding='utf-8')
+            # チェックポイント以降に書かれた結果は再実行されるため破棄する
+            self._file.truncate(resume_offset)
+            self._file.seek(resume_offset)
+        else:
+            self._file = open(output_file, 'w', newline='', encoding='utf-8')
+
+        if fieldnames:
+            self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore', restval='')
+
+    def write(self, record_no, status, error, variables):
+        """1レコード分の結果を書き出してフラッシュする。"""
+        if self.jsonl:
+            entry = {"Record": record_no, "Status": status, "Error": error, "Variables": variables}
+            self._file.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        else:
+            row = {"Record": record_no, "Status": status, "Error": error}
+            for name, val in variables.items():
+                if name not in row:
+                    row[name] = val
+            if self._writer is None:
+                # 列は最初のレコードの変数と事前に分かっている列名で確定する
+                fieldnames = list(row.keys()) + [name for name in self.columns if name not in row]
+                self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore', restval='')
+                self._writer.writeheader()
+            self._warn_dropped(record_no, row)
+            self._writer.writerow(row)
+        self._file.flush()
+
+    def _warn_dropped(self, record_no, row):
+        """ヘッダーにない列は書き出せないため、列ごとに1回警告する。"""
+        missing = [name for name in row if name not in self._writer.fieldnames and name not in self._dropped]
+        if missing:
+            self._dropped.update(missing)
+            self.logger.warning("Record %s: columns %s are not in the header of %s and were not written.",
+                                record_no, ", ".join(missing), self.output_file)
+
+    def tell(self):
+        """書き込み済みのバイト位置を返す（チェックポイント用）。"""
+        return self._file.tell()
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,194 @@
+"""
+フライトレコーダー
+
+アクションごとに対象ウィンドウの縮小画像を取得し、直近のN枚をメモリ上に保持する。
+アクションが失敗したときだけ、保持している画像を errors/ に書き出す
+（失敗の数アクション前からの画面の変化を確認できる）。
+
+画面の取得・縮小・圧縮はバックグラウンドのスレッドで行い、アクションのスレッドは
+ウィンドウの位置を読むだけで待たない。取得が追いつかない場合は、まだ取得を始めていない
+要求を新しい要求で置き換える。保持する画像は枚数と合計サイズ（圧縮後）の両方で制限する。
+"""
+
+import logging
+import os
+import threading
+import time
+import zlib
+from collections import deque
+from src.automator.utils.screenshot import rgb_scanlines, png_file
+from src.shared.backend import get_backend
+
+
+DEFAULT_FRAMES = 20
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+class Frame:
+    """保持している1枚の画像（PNGの画像データを圧縮した状態）。"""
+
+    __slots__ = ("index", "action", "captured_at", "width", "height", "data")
+
+    def __init__(self, index, action, captured_at, width, height, data):
+        self.index = index
+        self.action = action
+        self.captured_at = captured_at
+        self.width = width
+        self.height = height
+        self.data = data
+
+
+class FlightRecorder:
+    """直近のアクション後の画面をリングバッファに保持し、失敗時に書き出す。"""
+
+    def __init__(self, backend=None, frames=DEFAULT_FRAMES, max_bytes=DEFAULT_MAX_BYTES, scale=4, compression=1,
+                 directory="errors", logger=None):
+        """
+        FlightRecorder初期化。
+
+        Args:
+            backend: UIBackendインスタンス（省略時は既定のバックエンド）
+            frames: 保持する画像の枚数
+            max_bytes: 保持する画像（圧縮後）の合計サイズの上限
+            scale: 縮小率（縦横とも 1/scale にする）
+            compression: 圧縮レベル（0〜9）
+            directory: 書き出し先ディレクトリ
+            logger: ロガー
+        """
+        if frames < 1:
+            raise ValueError(f"Number of frames must be at least 1: {frames}")
+        if scale < 1:
+            raise ValueError(f"Scale must be at least 1: {scale}")
+        self.backend = backend or get_backend()
+        self.frames = frames
+        self.max_bytes = max_bytes
+        self.scale = scale
+        self.compression = compression
+        self.directory = directory
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = {"recorded": 0, "replaced": 0, "evicted": 0, "dumps": 0, "failed": 0}
+        self.buffer = deque()   # Frame（古い順）
+        self.buffer_bytes = 0
+        self._queue = deque()   # ("capture", 矩形, 番号, 種別, 時刻) / ("dump", パス)
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+
+    def record(self, window, index, action):
+        """
+        アクションの後の画面の取得を要求する（取得はバックグラウンドで行う）。
+
+        Args:
+            window: 対象のウィンドウ（この範囲を取得する）
+            index: アクション番号
+            action: アクション種別
+        """
+        try:
+            rect = window.BoundingRectangle
+        except Exception as e:
+            self.logger.debug("Flight recorder: window rectangle unavailable: %s", e)
+            return
+        if rect.right <= rect.left or rect.bottom <= rect.top:
+            return
+        request = ("capture", rect, index, action, time.time())
+        with self._cond:
+            if self._queue and self._queue[-1][0] == "capture":
+                # 取得が追いついていない場合は、まだ始めていない要求を置き換える
+                self._queue[-1] = request
+                self.stats["replaced"] += 1
+            else:
+                self._queue.append(request)
+            self._start()
+
+    def dump(self, name_prefix):
+        """
+        保持している画像の書き出しを要求する（これまでに要求した取得を終えてから書き出す）。
+
+        Returns:
+            str: 書き出し先のディレクトリ
+        """
+        path = f"{self.directory}/{name_prefix}_{time.strftime('%Y%m%d_%H%M%S')}_flight"
+        with self._cond:
+            self._queue.append(("dump", path))
+            self._start()
+        return path
+
+    def clear(self):
+        """保持している画像を破棄する。"""
+        with self._cond:
+            self.buffer.clear()
+            self.buffer_bytes = 0
+
+    def flush(self, timeout=None):
+        """要求した取得・書き出しをすべて終えるまで待つ。終えた場合はTrueを返す。"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def close(self):
+        """要求を処理し終えてからバックグラウンドのスレッドを停止する。"""
+        self.flush()
+        with self._cond:
+            thread = self._thread
+            self._stopping = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
+
+    def _start(self):
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="FlightRecorder", daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def _run(self):
+        # UIAの呼び出しはスレッドごとの初期化が必要
+        with self.backend.thread_context():
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._queue or self._stopping)
+                    if not self._queue:
+                        self._thread = None
+                        return
+                    request = self._queue.popleft()
+                    self._busy = True
+                try:
+                    if request[0] == "capture":
+                        self._capture(*request[1:])
+                    else:
+                        self._dump(request[1])
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    self.logger.warning("Flight recorder %s failed: %s", request[0], e)
+                finally:
+                    with self._cond:
+                        self._busy = False
+                        self._cond.notify_all()
+
+    def _capture(self, rect, index, action, captured_at):
+        image = self.backend.grab_screen(rect)
+        width, height, raw = rgb_scanlines(image, self.scale)
+        frame = Frame(index, action, captured_at, width, height, zlib.compress(raw, self.compression))
+        with self._cond:
+            self.buffer.append(frame)
+            self.buffer_bytes += len(frame.data)
+            self.stats["recorded"] += 1
+            # 新しい画像は上限を超えていても1枚は残す
+            while len(self.buffer) > 1 and (len(self.buffer) > self.frames or self.buffer_bytes > self.max_bytes):
+                self.buffer_bytes -= len(self.buffer.popleft().data)
+                self.stats["evicted"] += 1
+
+    def _dump(self, path):
+        with self._cond:
+            frames = list(self.buffer)
+        if not frames:
+            self.logger.info("Flight recorder: no frames to save")
+            return
+        os.makedirs(path, exist_ok=True)
+        for number, frame in enumerate(frames, 1):
+            name = f"{number:02d}_action_{frame.index}_{frame.action}.png"
+            with open(os.path.join(path, name), "wb") as f:
+                f.write(png_file(frame.width, frame.height, frame.data))
+        self.stats["dumps"] += 1
+        self.logger.info("Flight recorder: %d frames saved to %s", len(frames), path)
@@ -5,24 +5,25 @@
 """
 
 import logging
-import ctypes
-import uiautomation as auto
+from src.shared.backend import get_backend
 
 
 class FocusManager:
     """フォールバックメカニズムを使用してUI要素のフォーカスを管理する。"""
     
-    def __init__(self, force_run=False, legacy_mode=False):
+    def __init__(self, force_run=False, legacy_mode=False, backend=None):
         """
         FocusManager初期化。
         
         Args:
             force_run: Trueの場合、フォーカス失敗時でも実行を続行
             legacy_mode: Trueの場合、Win32 API SetFocusを優先
+            backend: UIBackendインスタンス（省略時は既定のバックエンド）
         """
         self.force_run = force_run
         self.legacy_mode = legacy_mode
         self.logger = logging.getLogger(__name__)
+        self.backend = backend or get_backend()
     
     def set_focus_win32(self, element):
         """
@@ -37,15 +38,14 @@ class FocusManager:
         try:
             hwnd = element.NativeWindowHandle
             if hwnd:
-                user32 = ctypes.windll.user32
-                user32.SetFocus(hwnd)
-                self.logger.info(f"Focus set using Win32 API (HWND: {hwnd})")
+                self.backend.set_native_focus(hwnd)
+                self.logger.info("Focus set using Win32 API (HWND: %s)", hwnd)
                 return True
             else:
                 self.logger.warning("No NativeWindowHandle available for Win32 SetFocus")
                 return False
         except Exception as e:
-            self.logger.warning(f"Win32 SetFocus failed: {e}")
+            self.logger.warning("Win32 SetFocus failed: %s", e)
             return False
     
     def set_focus_with_fallback(self, element, element_desc="element"):
@@ -66,22 +66,22 @@ class FocusManager:
             if self.set_focus_win32(element):
                 return
             
-            self.logger.warning(f"Win32 SetFocus failed for {element_desc}, falling back to UI Automation")
+            self.logger.warning("Win32 SetFocus failed for %s, falling back to UI Automation", element_desc)
             try:
-                element.SetFocus()
-                self.logger.info(f"Focus set on {element_desc} using UI Automation (Fallback)")
+                self.backend.set_focus(element)
+                self.logger.info("Focus set on %s using UI Automation (Fallback)", element_desc)
                 return
             except Exception as e:
-                self.logger.warning(f"UI Automation SetFocus failed for {element_desc}: {e}")
+                self.logger.warning("UI Automation SetFocus failed for %s: %s", element_desc, e)
                 
         else:
             # 標準モード: UI Automation優先
             try:
-                element.SetFocus()
-                self.logger.info(f"Focus set on {element_desc} using UI Automation")
+                self.backend.set_focus(element)
+                self.logger.info("Focus set on %s using UI Automation", element_desc)
                 return
             except Exception as e:
-                self.logger.warning(f"UI Automation SetFocus failed for {element_desc}: {e}")
+                self.logger.warning("UI Automation SetFocus failed for %s: %s", element_desc, e)
             
             # Win32 APIにフォールバック
             if self.set_focus_win32(element):
@@ -90,6 +90,6 @@ class FocusManager:
         # 両方のメソッドが失敗
         error_msg = f"Failed to set focus on {element_desc} (both UI Automation and Win32 API failed)"
         if self.force_run:
-            self.logger.warning(f"{error_msg}. Continuing due to --force-run flag.")
+            self.logger.warning("%s. Continuing due to --force-run flag.", error_msg)
         else:
             raise RuntimeError(error_msg)
@@ -0,0 +1,329 @@
+"""
+ジョブサーバーユーティリティ
+
+常駐プロセス（automator.py serve）がローカルのソケット（Windowsでは名前付きパイプ）で
+ジョブを受け付け、レーンごとのワーカースレッドで実行し、進行状況と結果を逐次返す。
+
+- 通信はmultiprocessing.connectionで行い、接続時に認証キーで相互認証する。
+  メッセージはJSON（UTF-8）で、pickleは使用しない。
+- サーバーは起動時に接続情報（アドレス・認証キー）を接続ファイル（所有者のみ読み書き可）に書き出し、
+  クライアント（automator.py submit）はこれを読んで接続する。
+- 同じレーンのジョブは投入順に1件ずつ実行され、異なるレーンのジョブは並行して実行される。
+- クライアントが途中で切断してもジョブは最後まで実行される。
+
+リクエスト:
+    {"type": "job", "job": {...}}   ジョブを投入（job["lane"] で実行レーンを指定。省略時は "default"）
+    {"type": "status"}              レーンごとの待ち件数・処理件数を取得
+    {"type": "shutdown"}            投入済みのジョブを終えてから停止
+
+ジョブに対するレスポンス:
+    {"type": "accepted", "job_id", "lane", "position"}
+    ハンドラが送るイベント（"log", "action" など）
+    {"type": "result", "job_id", "lane", "status", "elapsed_ms", ...}   最後のメッセージ
+    {"type": "error", "message"}                                        受け付けられなかった場合
+"""
+
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+import time
+
+
+# これらの種別のメッセージでレスポンスが終わる
+FINAL_TYPES = ("result", "error", "status", "shutdown")
+
+# 接続後、リクエストを受信するまで待つ秒数
+REQUEST_TIMEOUT = 5
+
+
+def _user():
+    import getpass
+    try:
+        return getpass.getuser()
+    except Exception:
+        return "default"
+
+
+def default_address():
+    """既定の待ち受けアドレス（Windowsは名前付きパイプ、それ以外はUnixドメインソケット）を返す。"""
+    if sys.platform == "win32":
+        return rf"\\.\pipe\automator-{_user()}"
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), f"automator-{_user()}.sock")
+
+
+def default_connection_file():
+    """既定の接続ファイルのパスを返す。"""
+    import tempfile
+    return os.path.join(tempfile.gettempdir(), f"automator-{_user()}.json")
+
+
+def send_message(conn, message):
+    conn.send_bytes(json.dumps(message, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+def recv_message(conn):
+    return json.loads(conn.recv_bytes().decode("utf-8"))
+
+
+class MessageLogHandler(logging.Handler):
+    """ログレコードを {"type": "log"} メッセージとしてクライアントに送るハンドラ。"""
+
+    def __init__(self, emit):
+        super().__init__()
+        self._emit = emit
+
+    def emit(self, record):
+        try:
+            self._emit({"type": "log", "level": record.levelname, "message": record.getMessage(),
+                        "time": record.created})
+        except Exception:
+            self.handleError(record)
+
+
+class _Lane:
+    def __init__(self, name):
+        self.name = name
+        self.queue = queue.Queue()
+        self.busy = False
+        self.completed = 0
+        self.thread = None
+
+
+class JobServer:
+    """ローカル接続でジョブを受け付け、レーンごとに実行するサーバー。"""
+
+    def __init__(self, handler, address=None, connection_file=None, max_lanes=4, worker_context=None, logger=None):
+        """
+        JobServer初期化。
+
+        Args:
+            handler: handler(job, lane, emit) -> dict。ジョブを実行し、結果メッセージに含める項目を返す。
+                     emit(message) で途中経過をクライアントに送れる
+            address: 待ち受けアドレス（省略時は default_address()）
+            connection_file: 接続ファイルのパス（省略時は default_connection_file()）
+            max_lanes: 同時に存在できるレーン数の上限
+            worker_context: ワーカースレッドの実行中に有効にするコンテキストマネージャを返す関数
+                            （UIBackend.thread_context など）
+            logger: Loggerインスタンス
+        """
+        self.handler = handler
+        self.address = address or default_address()
+        self.connection_file = connection_file or default_connection_file()
+        self.max_lanes = max_lanes
+        self.worker_context = worker_context
+        self.logger = logger or logging.getLogger(__name__)
+        self._lanes = {}
+        self._next_id = 1
+        self.failed = 0
+
+    def serve_forever(self):
+        """shutdownリクエストを受けるまで接続を受け付ける。"""
+        from multiprocessing import AuthenticationError
+        from multiprocessing.connection import Listener
+
+        self._check_address()
+        authkey = os.urandom(32)
+        listener = Listener(self.address, authkey=authkey)
+        try:
+            self._write_connection_file(authkey)
+            self.logger.info("Serving on %s (connection file: %s)", self.address, self.connection_file)
+            while True:
+                try:
+                    conn = listener.accept()
+                except (AuthenticationError, EOFError, OSError) as e:
+                    self.logger.warning("Rejected connection: %s", e)
+                    continue
+                if not self._handle(conn):
+                    break
+        finally:
+            listener.close()
+            self._stop_lanes()
+            self._remove_connection_file()
+            self.logger.info("Server stopped.")
+
+    def status(self):
+        return {
+            "pid": os.getpid(),
+            "address": self.address,
+            "failed": self.failed,
+            "lanes": {name: {"queued": lane.queue.qsize(), "busy": lane.busy, "completed": lane.completed}
+                      for name, lane in self._lanes.items()},
+        }
+
+    # --- 接続処理 ---
+    def _handle(self, conn):
+        """1つの接続のリクエストを処理する。Falseを返すと停止する。"""
+        try:
+            if not conn.poll(REQUEST_TIMEOUT):
+                self.logger.warning("Connection closed: no request received")
+                conn.close()
+                return True
+            request = recv_message(conn)
+        except (EOFError, OSError, ValueError) as e:
+            self.logger.warning("Invalid request: %s", e)
+            conn.close()
+            return True
+
+        kind = request.get("type")
+        if kind == "job":
+            self._enqueue(conn, request.get("job") or {})
+            return True
+        if kind == "status":
+            self._reply(conn, {"type": "status", **self.status()})
+            return True
+        if kind == "shutdown":
+            pending = sum(lane.queue.qsize() + lane.busy for lane in self._lanes.values())
+            self.logger.info("Shutdown requested (%s jobs pending).", pending)
+            self._reply(conn, {"type": "shutdown", "pending": pending})
+            return False
+        self._reply(conn, {"type": "error", "message": f"Unknown request type: {kind!r}"})
+        return True
+
+    def _reply(self, conn, message):
+        try:
+            send_message(conn, message)
+        except (OSError, ValueError):
+            pass
+        conn.close()
+
+    def _enqueue(self, conn, job):
+        name = str(job.get("lane") or "default")
+        lane = self._lanes.get(name)
+        if lane is None:
+            if len(self._lanes) >= self.max_lanes:
+                self._reply(conn, {"type": "error",
+                                   "message": f"Too many lanes (max {self.max_lanes}): cannot create lane '{name}'"})
+                return
+            lane = self._lanes[name] = _Lane(name)
+            lane.thread = threading.Thread(target=self._run_lane, args=(lane,), name=f"lane-{name}", daemon=True)
+            lane.thread.start()
+
+        job_id = self._next_id
+        self._next_id += 1
+        position = lane.queue.qsize() + lane.busy
+        try:
+            send_message(conn, {"type": "accepted", "job_id": job_id, "lane": name, "position": position})
+        except (OSError, ValueError):
+            conn.close()
+            return
+        self.logger.info("Job %s accepted on lane '%s' (position %s).", job_id, name, position)
+        lane.queue.put((job_id, job, conn))
+
+    # --- ワーカー ---
+    def _run_lane(self, lane):
+        import contextlib
+
+        with (self.worker_context or contextlib.nullcontext)():
+            while True:
+                item = lane.queue.get()
+                if item is None:
+                    break
+                lane.busy = True
+                try:
+                    self._run_job(lane, *item)
+                finally:
+                    lane.busy = False
+                    lane.completed += 1
+
+    def _run_job(self, lane, job_id, job, conn):
+        def emit(message):
+            try:
+                send_message(conn, message)
+            except (OSError, ValueError):
+                pass  # クライアントが切断してもジョブは続ける
+
+        start = time.perf_counter()
+        try:
+            result = self.handler(job, lane.name, emit)
+        except Exception as e:
+            self.logger.error("Job %s crashed: %s", job_id, e)
+            result = {"status": "ERROR", "errors": [str(e)]}
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if result.get("status") != "OK":
+            self.failed += 1
+        emit({"type": "result", "job_id": job_id, "lane": lane.name, "elapsed_ms": round(elapsed_ms, 1), **result})
+        conn.close()
+        self.logger.info("Job %s finished on lane '%s': %s (%.0f ms)", job_id, lane.name, result.get('status'), elapsed_ms)
+
+    def _stop_lanes(self):
+        # 停止の印は投入済みのジョブの後に入るため、待ちのジョブはすべて実行される
+        for lane in self._lanes.values():
+            lane.queue.put(None)
+        for lane in self._lanes.values():
+            lane.thread.join()
+
+    # --- 接続情報 ---
+    def _check_address(self):
+        """前回異常終了したサーバーのソケットファイルが残っていれば削除する。"""
+        if self.address.startswith("\\\\") or not os.path.exists(self.address):
+            return
+        import socket
+        with socket.socket(socket.AF_UNIX) as sock:
+            try:
+                sock.connect(self.address)
+            except OSError:
+                os.remove(self.address)
+                return
+        raise RuntimeError(f"Another server is already listening on {self.address}")
+
+    def _write_connection_file(self, authkey):
+        directory = os.path.dirname(os.path.abspath(self.connection_file))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self.connection_file + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"address": self.address, "authkey": authkey.hex(), "pid": os.getpid()}, f)
+        os.replace(tmp_path, self.connection_file)
+
+    def _remove_connection_file(self):
+        # 別のサーバーが上書きした接続ファイルは削除しない
+        try:
+            with open(self.connection_file, "r", encoding="utf-8") as f:
+                owner = json.load(f).get("pid")
+            if owner == os.getpid():
+                os.remove(self.connection_file)
+        except (OSError, ValueError):
+            pass
+
+
+def submit(request, connection_file=None, on_message=None):
+    """
+    サーバーにリクエストを送り、レスポンスの最後のメッセージを返す。
+
+    Args:
+        request: リクエスト（{"type": "job", "job": {...}} など）
+        connection_file: 接続ファイルのパス（省略時は default_connection_file()）
+        on_message: 受信したメッセージごとに呼ばれる関数
+
+    Raises:
+        ConnectionError: サーバーが起動していない、または接続・認証に失敗した場合
+    """
+    from multiprocessing import AuthenticationError
+    from multiprocessing.connection import Client
+
+    connection_file = connection_file or default_connection_file()
+    try:
+        with open(connection_file, "r", encoding="utf-8") as f:
+            info = json.load(f)
+    except FileNotFoundError:
+        raise ConnectionError(f"No automator server is running (connection file not found: {connection_file})")
+    try:
+        conn = Client(info["address"], authkey=bytes.fromhex(info["authkey"]))
+    except (AuthenticationError, EOFError, OSError) as e:
+        raise ConnectionError(f"Cannot connect to automator server at {info['address']}: {e}") from e
+
+    with conn:
+        send_message(conn, request)
+        while True:
+            try:
+                message = recv_message(conn)
+            except (EOFError, OSError) as e:
+                raise ConnectionError("Server closed the connection before sending a result") from e
+            if on_message:
+                on_message(message)
+            if message.get("type") in FINAL_TYPES:
+                return message
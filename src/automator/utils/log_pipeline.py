@@ -0,0 +1,147 @@
+"""
+ログ出力パイプライン
+
+ルートロガーにはQueueHandlerだけを設定し、コンソール・ログファイル・JSONLへの書き込みは
+バックグラウンドのQueueListenerスレッドで行う。アクションを実行するスレッドはファイルI/Oや
+JSONのエンコードを待たない。
+
+メッセージの組み立て（%書式の引数の展開）はキューに入れる時点で呼び出し元のスレッドで行う。
+引数にはUIA要素のプロパティ（COM呼び出し）を含むことがあり、要素を作成したスレッド以外から
+参照できないため。引数をLazyPropertyで渡すと、そのレベルのログが無効な場合はプロパティを読まない。
+
+    logger.debug("Searching under %s...", LazyProperty(element, "Name"))
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import time
+
+
+DEFAULT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# LogRecordの標準属性（これ以外の属性はextraとしてJSONに出力する）
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_active = None
+
+
+class LazyProperty:
+    """ログの引数として渡し、メッセージを組み立てるときに初めて属性を読む。"""
+
+    __slots__ = ("obj", "name")
+
+    def __init__(self, obj, name):
+        self.obj = obj
+        self.name = name
+
+    def __str__(self):
+        try:
+            return str(getattr(self.obj, self.name))
+        except Exception as e:
+            return f"<{self.name} unavailable: {e}>"
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """1レコードを1行のJSONに整形する（time, level, logger, thread, message と extra で渡した項目）。"""
+
+    def format(self, record):
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class LogPipeline:
+    """設定したハンドラと、バックグラウンドで書き込むQueueListener。"""
+
+    def __init__(self, handlers, background=True):
+        self.handlers = handlers
+        self.queue = None
+        self.listener = None
+        self._running = False
+        if background:
+            self.queue = queue.SimpleQueue()
+            self.listener = logging.handlers.QueueListener(self.queue, *handlers, respect_handler_level=True)
+
+    def root_handlers(self):
+        """ルートロガーに設定するハンドラ"""
+        if self.listener is None:
+            return list(self.handlers)
+        return [logging.handlers.QueueHandler(self.queue)]
+
+    def start(self):
+        if self.listener is not None and not self._running:
+            self.listener.start()
+            self._running = True
+
+    def stop(self):
+        """キューに残っているレコードを書き出してから、ハンドラを閉じる。"""
+        if self._running:
+            self.listener.stop()
+            self._running = False
+        for handler in self.handlers:
+            handler.close()
+
+
+def configure_logging(level="INFO", log_file=None, json_file=None, stream=None, fmt=DEFAULT_FORMAT, background=True):
+    """
+    ルートロガーを設定する（既存の設定は置き換え、前回のパイプラインは停止する）。
+
+    Args:
+        level: ログレベル名
+        log_file: テキストのログファイル（省略時は出力しない）
+        json_file: JSONLのログファイル（省略時は出力しない）
+        stream: コンソール出力先（省略時はsys.stdout）
+        fmt: コンソール・テキストファイルの書式
+        background: Falseの場合はキューを使わず、呼び出し元のスレッドで書き込む
+
+    Returns:
+        LogPipeline（プロセス終了時に自動で停止される）
+    """
+    global _active
+    if _active is not None:
+        _active.stop()
+
+    formatter = logging.Formatter(fmt)
+    handlers = [logging.StreamHandler(stream or sys.stdout)]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    if json_file:
+        json_handler = logging.FileHandler(json_file, encoding='utf-8')
+        json_handler.setFormatter(JsonLinesFormatter())
+        handlers.append(json_handler)
+
+    pipeline = LogPipeline(handlers, background=background)
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    for handler in pipeline.root_handlers():
+        root.addHandler(handler)
+    root.setLevel(getattr(logging, str(level).upper(), logging.INFO))
+    pipeline.start()
+
+    if _active is None:
+        atexit.register(_stop_active)
+    _active = pipeline
+    return pipeline
+
+
+def _stop_active():
+    if _active is not None:
+        _active.stop()
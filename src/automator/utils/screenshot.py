@@ -2,42 +2,225 @@
 スクリーンショットユーティリティ
 
 スクリーンショット撮影機能を処理。
+
+ScreenshotWriterは画面の取得（ピクセルのコピー）だけを呼び出し元のスレッドで行い、
+画像のエンコードとファイルへの書き込みはバックグラウンドのスレッドで行う。
+書き込み待ちの画像の合計サイズには上限があり、超えた場合は新しい画像を破棄する
+（アクションの実行をエンコードで待たせない）。
 """
 
+import hashlib
 import logging
 import os
-import datetime
-import uiautomation as auto
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from src.shared.backend import get_backend
+
+
+REGIONS = ("screen", "window", "element")
+FORMATS = ("png", "bmp")
+DEFAULT_MAX_PENDING_BYTES = 128 * 1024 * 1024
+
+
+class ScreenshotWriter:
+    """スクリーンショットを取得し、バックグラウンドでエンコードして保存する。"""
+
+    def __init__(self, backend=None, directory="errors", region="screen", image_format="png", compression=6,
+                 skip_identical=False, max_pending_bytes=DEFAULT_MAX_PENDING_BYTES, logger=None):
+        """
+        ScreenshotWriter初期化。
+
+        Args:
+            backend: UIBackendインスタンス（省略時は既定のバックエンド）
+            directory: 保存先ディレクトリ
+            region: 取得範囲。"screen"（画面全体）/ "window"（対象ウィンドウ）/ "element"（対象要素）。
+                    対象が見つかっていない場合は1つ広い範囲を取得する
+            image_format: "png" または "bmp"
+            compression: PNGの圧縮レベル（0〜9）
+            skip_identical: Trueの場合、直前のエラー時スクリーンショットと同じ画像は保存しない
+            max_pending_bytes: 書き込み待ちの画像（未圧縮）の合計サイズの上限
+            logger: ロガー
+        """
+        if region not in REGIONS:
+            raise ValueError(f"Unknown screenshot region: {region} (expected one of {', '.join(REGIONS)})")
+        if image_format not in FORMATS:
+            raise ValueError(f"Unknown screenshot format: {image_format} (expected one of {', '.join(FORMATS)})")
+        if not 0 <= compression <= 9:
+            raise ValueError(f"Compression level must be between 0 and 9: {compression}")
+        self.backend = backend or get_backend()
+        self.directory = directory
+        self.region = region
+        self.image_format = image_format
+        self.compression = compression
+        self.skip_identical = skip_identical
+        self.max_pending_bytes = max_pending_bytes
+        self.logger = logger or logging.getLogger(__name__)
+        self.stats = {"queued": 0, "saved": 0, "skipped": 0, "dropped": 0, "failed": 0}
+        self._pending = deque()     # (パス, ScreenImage, エラー時のスクリーンショットか)
+        self._pending_bytes = 0     # キューにある画像と、エンコード中の画像の合計
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._last_error_shot = None  # (幅, 高さ, ダイジェスト, パス)
+
+    def capture(self, name_prefix, window=None, element=None, dry_run=False, error_shot=False):
+        """
+        画面を取得して書き込みキューに入れる。
+
+        Args:
+            name_prefix: ファイル名のプレフィックス
+            window / element: 対象のウィンドウ・要素（regionが "window" / "element" の場合に範囲として使用）
+            dry_run: Trueの場合、撮影せずにログ出力のみ
+            error_shot: エラー時のスクリーンショット（skip_identicalの比較対象）
+
+        Returns:
+            str: 保存先のパス（書き込みはバックグラウンドで行われる）。dry-run・取得失敗・破棄の場合はNone
+        """
+        if dry_run:
+            self.logger.info("[Dry-run] Would capture screenshot: %s", name_prefix)
+            return None
+
+        try:
+            image = self.backend.grab_screen(self._region_rect(window, element))
+            os.makedirs(self.directory, exist_ok=True)
+        except Exception as e:
+            self.logger.error("Failed to capture screenshot: %s", e)
+            return None
+
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        path = f"{self.directory}/{name_prefix}_{timestamp}.{self.image_format}"
+        size = len(image.pixels)
+        with self._cond:
+            # キューが空なら上限を超える大きさの画像も受け付ける
+            if self._pending_bytes and self._pending_bytes + size > self.max_pending_bytes:
+                self.stats["dropped"] += 1
+                self.logger.warning("Screenshot dropped (%.1f MB waiting to be written): %s",
+                                    self._pending_bytes / (1024 * 1024), path)
+                return None
+            self._pending.append((path, image, error_shot))
+            self._pending_bytes += size
+            self.stats["queued"] += 1
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name="ScreenshotWriter", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+        return path
+
+    def flush(self, timeout=None):
+        """キューにあるスクリーンショットをすべて書き終えるまで待つ。書き終えた場合はTrueを返す。"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending_bytes == 0, timeout)
+
+    def close(self):
+        """書き込みを終えてからバックグラウンドのスレッドを停止する（以降のcaptureで再度起動する）。"""
+        self.flush()
+        with self._cond:
+            thread = self._thread
+            self._stopping = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
 
+    def _region_rect(self, window, element):
+        """regionに応じた取得範囲を返す（Noneは画面全体）。"""
+        if self.region == "element" and element is not None:
+            target = element
+        elif self.region != "screen" and window is not None:
+            target = window
+        else:
+            return None
+        rect = target.BoundingRectangle
+        if rect.right <= rect.left or rect.bottom <= rect.top:
+            # 最小化されている等で大きさがない場合は画面全体
+            return None
+        return rect
 
-def capture_screenshot(name_prefix, dry_run=False):
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or self._stopping)
+                if not self._pending:
+                    self._thread = None
+                    return
+                path, image, error_shot = self._pending.popleft()
+            try:
+                self._write(path, image, error_shot)
+            except Exception as e:
+                self.stats["failed"] += 1
+                self.logger.error("Failed to save screenshot %s: %s", path, e)
+            finally:
+                with self._cond:
+                    self._pending_bytes -= len(image.pixels)
+                    self._cond.notify_all()
+
+    def _write(self, path, image, error_shot):
+        if error_shot and self.skip_identical:
+            digest = hashlib.blake2b(image.pixels, digest_size=16).digest()
+            last = self._last_error_shot
+            if last and last[:3] == (image.width, image.height, digest):
+                self.stats["skipped"] += 1
+                self.logger.info("Screenshot skipped (identical to %s): %s", last[3], path)
+                return
+            self._last_error_shot = (image.width, image.height, digest, path)
+
+        data = _encode_png(image, self.compression) if self.image_format == "png" else _encode_bmp(image)
+        with open(path, "wb") as f:
+            f.write(data)
+        self.stats["saved"] += 1
+        self.logger.info("Screenshot saved to: %s", path)
+
+
+def _encode_png(image, level):
+    """ScreenImageを24ビットRGBのPNGにエンコードする。"""
+    width, height, raw = rgb_scanlines(image)
+    return png_file(width, height, zlib.compress(raw, level))
+
+
+def rgb_scanlines(image, step=1):
     """
-    画面全体のスクリーンショットを撮影。
-    
+    ScreenImageをPNGの画像データ（各行の先頭にフィルタ種別0を付けたRGB）に変換する。
+
     Args:
-        name_prefix: スクリーンショットファイル名のプレフィックス
-        dry_run: Trueの場合、撮影せずにログ出力のみ
-        
+        image: ScreenImage
+        step: 縦横ともにstepピクセルごとに1ピクセルを取り出す（縮小）
+
     Returns:
-        str: 保存されたスクリーンショットのパス、失敗/dry-runの場合はNone
+        (幅, 高さ, 画像データ)
     """
-    logger = logging.getLogger(__name__)
-    
-    if dry_run:
-        logger.info(f"[Dry-run] Would capture screenshot: {name_prefix}")
-        return None
-    
-    try:
-        if not os.path.exists("errors"):
-            os.makedirs("errors")
-        
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"errors/{name_prefix}_{timestamp}.png"
-        
-        # 全画面キャプチャ
-        auto.GetRootControl().CaptureToImage(filename)
-        logger.info(f"Screenshot saved to: {filename}")
-        return filename
-    except Exception as e:
-        logger.error(f"Failed to capture screenshot: {e}")
-        return None
+    width, height, bgra = image.width, image.height, image.pixels
+    out_width = (width + step - 1) // step
+    src_stride = width * 4
+    rows = []
+    for top in range(0, height * src_stride, src_stride * step):
+        row = bgra[top:top + src_stride]
+        rgb = bytearray(out_width * 3)
+        rgb[0::3] = row[2::4 * step]
+        rgb[1::3] = row[1::4 * step]
+        rgb[2::3] = row[0::4 * step]
+        rows.append(b"\x00")
+        rows.append(rgb)
+    return out_width, len(rows) // 2, b"".join(rows)
+
+
+def png_file(width, height, idat):
+    """圧縮済みの画像データ（zlib）からPNGファイルの内容を組み立てる。"""
+    return (b"\x89PNG\r\n\x1a\n"
+            + _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + _png_chunk(b"IDAT", idat)
+            + _png_chunk(b"IEND", b""))
+
+
+def _png_chunk(tag, data):
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", zlib.crc32(tag + data))
+
+
+def _encode_bmp(image):
+    """ScreenImageを32ビットのBMP（上から下の行順）にエンコードする。"""
+    header_size = 14 + 40
+    return (struct.pack("<2sIHHI", b"BM", header_size + len(image.pixels), 0, 0, header_size)
+            + struct.pack("<IiiHHIIiiII", 40, image.width, -image.height, 1, 32, 0, len(image.pixels), 2835, 2835, 0, 0)
+            + image.pixels)
@@ -0,0 +1,242 @@
+"""
+タイミング計測ユーティリティ
+
+アクションごとのフェーズ（ウィンドウ検索、パスセグメント検索とフォールバック段階、
+アクション本体、アクション後待機、スクリーンショット）の所要時間を記録し、
+実行終了時にアクション種別・エイリアス・フェーズ別のサマリー（p50/p95/max）を生成する。
+記録はChrome/Perfettoのトレースイベント形式でも出力できる。
+
+計測中はタプルをリストに追加するだけで、辞書への変換や集計は出力時に行う。
+無効時は共有のダミーSpanを返すだけなので、計測コストはほぼゼロ。
+"""
+
+import csv
+import json
+import math
+import os
+import threading
+import time
+
+
+class _Span:
+    """1フェーズ分の計測区間。withブロックの終了時にイベントを追加する。"""
+
+    __slots__ = ("recorder", "phase", "detail", "start", "local")
+
+    def __init__(self, recorder, phase, detail):
+        self.recorder = recorder
+        self.phase = phase
+        self.detail = detail
+        self.start = 0.0
+        self.local = recorder._local
+
+    def set(self, **detail):
+        """計測中に判明した情報（フォールバック段階など）を追加する。"""
+        self.detail.update(detail)
+
+    def __enter__(self):
+        local = self.local
+        local.depth = getattr(local, "depth", 0) + 1
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        local = self.local
+        local.depth -= 1
+        if exc_type is not None and "status" not in self.detail:
+            self.detail["status"] = "error"
+        # (開始, 終了, フェーズ, 付加情報, 深さ, アクション情報, スレッドID)
+        self.recorder._events.append((self.start, end, self.phase, self.detail, local.depth,
+                                      getattr(local, "action", None), threading.get_ident()))
+        return False
+
+
+class _ActionSpan(_Span):
+    """アクション全体の計測区間。終了時に現在のアクション情報をクリアする。"""
+
+    __slots__ = ()
+
+    def __exit__(self, exc_type, exc, tb):
+        result = super().__exit__(exc_type, exc, tb)
+        self.local.action = None
+        return result
+
+
+class _NullSpan:
+    """計測無効時に使用するダミーSpan。"""
+
+    def set(self, **detail):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def percentile(sorted_values, q):
+    """ソート済みリストのパーセンタイル（nearest-rank方式）を返す。"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class TimingRecorder:
+    """フェーズごとの所要時間を記録する。"""
+
+    FIELDS = ["action", "action_type", "alias", "phase", "target", "fallback", "status",
+              "depth", "thread", "start_ms", "duration_ms"]
+
+    def __init__(self, enabled=False):
+        """
+        TimingRecorder初期化。
+
+        Args:
+            enabled: Falseの場合、phase()/action()は何も記録しない
+        """
+        self.enabled = enabled
+        self._events = []
+        self._local = threading.local()  # スレッドごとのネスト深さと現在のアクション
+        self._t0 = time.perf_counter()
+        self._thread_names = {}
+
+    def action(self, index, act_type, alias=""):
+        """
+        アクション全体の計測区間を開始する。ブロック内のフェーズはこのアクションに紐付く。
+
+        Args:
+            index: アクション番号（1始まり）
+            act_type: アクション種別
+            alias: Keyに対応するエイリアス名（なければ空）
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        self._local.action = (index, act_type, alias)
+        self._register_thread()
+        return _ActionSpan(self, "action", {})
+
+    def phase(self, name, **detail):
+        """
+        フェーズの計測区間を返す。
+
+        Args:
+            name: フェーズ名（window_lookup, segment, attempt, body, wait, post_wait, screenshot など）
+            **detail: target（検索対象）などの付加情報
+        """
+        if not self.enabled:
+            return _NULL_SPAN
+        self._register_thread()
+        return _Span(self, name, detail)
+
+    def _register_thread(self):
+        ident = threading.get_ident()
+        if ident not in self._thread_names:
+            self._thread_names[ident] = threading.current_thread().name
+
+    @property
+    def records(self):
+        """記録済みイベントを辞書のリストに変換して返す（開始時刻順）。"""
+        result = []
+        for start, end, phase, detail, depth, action, thread in sorted(self._events, key=lambda e: e[0]):
+            index, act_type, alias = action or ("", "", "")
+            result.append({
+                "action": index,
+                "action_type": act_type,
+                "alias": alias,
+                "phase": phase,
+                "target": detail.get("target", ""),
+                "fallback": detail.get("fallback", ""),
+                "status": detail.get("status", "ok"),
+                "depth": depth,
+                "thread": thread,
+                "start_ms": round((start - self._t0) * 1000, 3),
+                "duration_ms": round((end - start) * 1000, 3),
+            })
+        return result
+
+    def summary(self):
+        """
+        アクション種別・エイリアス・フェーズ別の集計表を文字列で返す。
+        """
+        records = self.records
+        lines = []
+        sections = [
+            ("Action type", lambda r: r["action_type"] if r["phase"] == "action" else None),
+            ("Alias", lambda r: r["alias"] if r["phase"] == "action" and r["alias"] else None),
+            ("Phase", lambda r: (f"segment[fallback={r['fallback']}]" if r["phase"] == "segment" else r["phase"])
+                      if r["phase"] not in ("action", "attempt") else None),
+        ]
+        for title, key_func in sections:
+            groups = {}
+            for record in records:
+                group = key_func(record)
+                if group is not None:
+                    groups.setdefault(group, []).append(record["duration_ms"])
+            if not groups:
+                continue
+
+            width = max(len(title), max(len(str(name)) for name in groups))
+            lines.append(f"{title:<{width}}  {'count':>6}  {'p50(ms)':>10}  {'p95(ms)':>10}  {'max(ms)':>10}  {'total(ms)':>11}")
+            lines.append("-" * (width + 57))
+            for name, durations in sorted(groups.items(), key=lambda item: -sum(item[1])):
+                durations.sort()
+                lines.append(f"{str(name):<{width}}  {len(durations):>6}  {percentile(durations, 0.5):>10.1f}  "
+                             f"{percentile(durations, 0.95):>10.1f}  {durations[-1]:>10.1f}  {sum(durations):>11.1f}")
+            lines.append("")
+        return "\n".join(lines)
+
+    def export(self, path):
+        """
+        生の計測記録をファイルへ出力する（拡張子 .json ならJSON、それ以外はCSV）。
+        """
+        records = self.records
+        if os.path.splitext(path)[1].lower() == ".json":
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(records, f, ensure_ascii=False, indent=1)
+        else:
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=self.FIELDS)
+                writer.writeheader()
+                writer.writerows(records)
+
+    def export_trace(self, path):
+        """
+        Chrome/Perfettoで読み込めるトレースイベント形式（JSON）で出力する。
+
+        各イベントは完了イベント（ph="X"）として出力され、同一スレッド内の区間は
+        時刻の包含関係によってネスト表示される。スレッドごとに別トラックになる。
+        """
+        pid = os.getpid()
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "automator"}}]
+        for ident, name in self._thread_names.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": ident, "args": {"name": name}})
+
+        for start, end, phase, detail, depth, action, thread in self._events:
+            args = {key: val for key, val in detail.items() if val != ""}
+            if phase == "action":
+                index, act_type, alias = action
+                name = f"#{index} {act_type}"
+                args.update({"action": index, "alias": alias})
+            elif detail.get("target"):
+                name = f"{phase}: {detail['target']}"
+            else:
+                name = phase
+            events.append({
+                "name": name,
+                "cat": phase,
+                "ph": "X",
+                "ts": round((start - self._t0) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": pid,
+                "tid": thread,
+                "args": args,
+            })
+
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False, default=str)
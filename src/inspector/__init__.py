@@ -3,7 +3,8 @@ Inspector package - UI要素調査ツール
 """
 
 from .core.path_generator import PathGenerator
+from .core.catalog import AliasCatalog
 from .utils.click_handler import ClickHandler
 from .utils.output_handler import OutputHandler
 
-__all__ = ['PathGenerator', 'ClickHandler', 'OutputHandler']
+__all__ = ['PathGenerator', 'AliasCatalog', 'ClickHandler', 'OutputHandler']
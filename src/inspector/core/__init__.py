@@ -3,5 +3,6 @@ Inspector Core - RPAパス生成
 """
 
 from .path_generator import PathGenerator
+from .catalog import AliasCatalog
 
-__all__ = ['PathGenerator']
+__all__ = ['PathGenerator', 'AliasCatalog']
@@ -0,0 +1,187 @@
+"""
+AliasCatalog - ウィンドウ全体のエイリアス定義を1回の走査で生成する
+
+inspector.pyで要素を1つずつクリックする代わりに、ウィンドウのツリー（スナップショット）から
+すべての要素（またはフィルタに一致する要素）のRPAパスをまとめて生成する。
+
+スナップショットのノードは前順で格納されているため、親は子より先に処理される。
+親ごとに直接の子を1回だけ順に調べ、検索条件ごとの出現数を数えながらfoundIndexを決め、
+親のパスにセグメントを1つ連結する。祖先のセグメントとfoundIndexを要素ごとに計算し直さないため、
+全体の処理量はノード数に比例する。
+
+生成されるパスはPathGenerator.get_rpa_pathと同じ形式（セグメントの条件・foundIndex・searchDepth=1）。
+modernモードのAutomationIdだけのパスは、AutomationIdがウィンドウ内で一意な場合のみ使用する
+（重複する場合はget_rpa_pathと違い、別の要素に解決されないようチェーンパスを出力する）。
+"""
+
+import csv
+import re
+from collections import Counter
+
+from src.inspector.core.path_generator import segment_criteria, format_segment
+from src.shared.backend.base import PATTERN_NAMES
+
+
+FILTERS = ("all", "interactive")
+
+# 操作対象とみなすパターンとコントロールタイプ（"interactive" フィルタ）
+INTERACTIVE_PATTERNS = ("InvokePattern", "ValuePattern", "TogglePattern", "SelectionItemPattern",
+                        "ExpandCollapsePattern")
+INTERACTIVE_TYPES = frozenset([
+    "ButtonControl", "CheckBoxControl", "ComboBoxControl", "DataItemControl", "EditControl", "HyperlinkControl",
+    "ListItemControl", "MenuItemControl", "RadioButtonControl", "SliderControl", "SpinnerControl",
+    "SplitButtonControl", "TabItemControl", "TreeItemControl",
+])
+
+_INTERACTIVE_MASK = sum(1 << PATTERN_NAMES.index(name) for name in INTERACTIVE_PATTERNS)
+_ALIAS_UNSAFE = re.compile(r"[^\w]+")
+_ALIAS_LABEL_LENGTH = 40
+
+# 兄弟の出現数を数える条件の種類（segment_criteriaが選ぶ条件の組み合わせ）
+_ANY, _AUTOMATION_ID, _NAME, _CLASS_NAME, _NAME_CLASS_NAME = range(5)
+
+
+def _count_key(kind, key):
+    """条件の組み合わせに対応する出現数のキー"""
+    control_type, name, automation_id, class_name = key
+    if kind == _AUTOMATION_ID:
+        return control_type, kind, automation_id
+    if kind == _NAME:
+        return control_type, kind, name
+    if kind == _CLASS_NAME:
+        return control_type, kind, class_name
+    if kind == _NAME_CLASS_NAME:
+        return control_type, kind, name, class_name
+    return control_type, kind
+
+
+class CatalogEntry:
+    """カタログの1行。"""
+
+    __slots__ = ("alias", "path", "node")
+
+    def __init__(self, alias, path, node):
+        self.alias = alias
+        self.path = path
+        self.node = node  # スナップショットのノード番号
+
+
+class AliasCatalog:
+    def __init__(self, mode="modern", element_filter="all"):
+        """
+        Args:
+            mode: "modern" (AutomationId/Name優先) or "legacy" (ClassName/foundIndex)
+            element_filter: "all"（すべての要素）または "interactive"（操作可能な要素のみ）
+        """
+        if element_filter not in FILTERS:
+            raise ValueError(f"Unknown catalog filter: {element_filter} (expected one of {', '.join(FILTERS)})")
+        self.mode = mode
+        self.element_filter = element_filter
+
+    @property
+    def needs_patterns(self):
+        """フィルタにサポートパターンが必要か（不要ならツリーの走査でパターンを取得しない）"""
+        return self.element_filter == "interactive"
+
+    def build(self, snapshot):
+        """
+        スナップショットのウィンドウ配下の要素ごとにエイリアス名とRPAパスを生成する。
+
+        Args:
+            snapshot: Snapshot（ノード0が対象ウィンドウ）
+
+        Returns:
+            list[CatalogEntry]: 前順の一覧（ウィンドウ自身は含まない）
+        """
+        count = snapshot.node_count
+        control_type = snapshot.control_type
+        name = snapshot.name
+        automation_id = snapshot.automation_id
+        class_name = snapshot.class_name
+        string = snapshot.string
+
+        # AutomationIdだけのパスを使えるのは (ControlType, AutomationId) がウィンドウ内で一意な場合
+        unique_ids = None
+        if self.mode == "modern":
+            ids = Counter((control_type[i], automation_id[i]) for i in range(1, count) if automation_id[i])
+            unique_ids = {key for key, n in ids.items() if n == 1}
+
+        chains = [""] * count  # ウィンドウからのチェーンパス
+        paths = [None] * count   # 出力するパス（フィルタで除外した要素はNone）
+        labels = [None] * count
+        for parent in range(count):
+            if snapshot.subtree[parent] == 1:
+                continue  # 子がない
+            prefix = chains[parent] + " -> " if parent else ""
+            seen = Counter()
+            for child in snapshot.children(parent):
+                # 文字列表のIDで比較する（同じ文字列は同じID）
+                key = (control_type[child], name[child], automation_id[child], class_name[child])
+                for kind in self._kinds:
+                    seen[_count_key(kind, key)] += 1
+                kind = self._criteria_kind(key)
+                found_index = seen[_count_key(kind, key)]
+
+                ctype = string(key[0])
+                criteria, _ = segment_criteria(self.mode, ctype, string(key[1]), string(key[2]), string(key[3]))
+                chains[child] = prefix + format_segment(self.mode, ctype, criteria, found_index, chained=True)
+
+                if not self._included(snapshot, child):
+                    continue
+                if kind == _AUTOMATION_ID and (key[0], key[2]) in unique_ids:
+                    paths[child] = format_segment(self.mode, ctype, criteria, 1, chained=False)
+                else:
+                    paths[child] = chains[child]
+                labels[child] = (ctype, string(key[1]) or string(key[2]))
+
+        # エイリアス名の連番は前順で付ける
+        aliases = Counter()
+        return [CatalogEntry(self._alias(*labels[i], aliases), paths[i], i) for i in range(1, count) if paths[i]]
+
+    def write(self, entries, path):
+        """エイリアスCSV（AliasName, RPA_Path）として書き出す。"""
+        with open(path, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(["AliasName", "RPA_Path"])
+            writer.writerows((entry.alias, entry.path) for entry in entries)
+
+    @property
+    def _kinds(self):
+        """出現数を数える条件の組み合わせ（子は自分が一致するすべての組み合わせに数えられる）"""
+        if self.mode == "modern":
+            return (_ANY, _AUTOMATION_ID, _NAME, _CLASS_NAME)
+        return (_ANY, _NAME, _CLASS_NAME, _NAME_CLASS_NAME)
+
+    def _criteria_kind(self, key):
+        """segment_criteriaが選ぶ条件の組み合わせ（IDの0は空文字列）"""
+        _, name, automation_id, class_name = key
+        if self.mode == "modern":
+            if automation_id:
+                return _AUTOMATION_ID
+            if name:
+                return _NAME
+            return _CLASS_NAME if class_name else _ANY
+        if name and class_name:
+            return _NAME_CLASS_NAME
+        if name:
+            return _NAME
+        return _CLASS_NAME if class_name else _ANY
+
+    def _included(self, snapshot, index):
+        if self.element_filter == "all":
+            return True
+        return (bool(snapshot.patterns[index] & _INTERACTIVE_MASK)
+                or snapshot.string(snapshot.control_type[index]) in INTERACTIVE_TYPES)
+
+    @staticmethod
+    def _alias(control_type, label, aliases):
+        """コントロールタイプとName（なければAutomationId）からエイリアス名を作る（重複には連番を付ける）。"""
+        base = control_type[:-len("Control")] if control_type.endswith("Control") else control_type
+        label = _ALIAS_UNSAFE.sub("_", label).strip("_")[:_ALIAS_LABEL_LENGTH]
+        alias = f"{base}_{label}" if label else base
+        candidate = alias
+        while candidate in aliases:
+            aliases[alias] += 1
+            candidate = f"{alias}_{aliases[alias]}"
+        aliases[candidate] = 1
+        return candidate
@@ -5,23 +5,35 @@ inspector.pyから抽出。
 modernモードとlegacyモードでパス生成方法を切り替える。
 """
 
-import uiautomation as auto
+from src.inspector.core.segment_cache import SegmentCache
+from src.inspector.core.sibling_cache import SiblingCache
+from src.shared.backend import get_backend
+from src.shared.backend.identity import ElementRef
 
 
 class PathGenerator:
-    def __init__(self, mode="modern"):
+    def __init__(self, mode="modern", backend=None, sibling_cache=None, segment_cache=None):
         """
         Args:
             mode: "modern" (AutomationId/Name優先) or "legacy" (ClassName/foundIndex)
+            backend: UIBackendインスタンス（省略時は既定のバックエンド）
+            sibling_cache: foundIndex計算用のSiblingCache（省略時はTTL 2秒で作成）
+            segment_cache: 祖先のセグメントのメモ（省略時はセッションの間保持するSegmentCacheを作成）
         """
         self.mode = mode
+        self.backend = backend or get_backend()
+        self.segment_cache = segment_cache if segment_cache is not None else SegmentCache()
+        self.sibling_cache = sibling_cache or SiblingCache(self.backend)
+        if self.sibling_cache.on_change is None:
+            # 親の子の並びが変わったら、その親の子のセグメントを破棄する
+            self.sibling_cache.on_change = self.segment_cache.invalidate_children
     
     def get_rpa_path(self, control):
         """
         コントロールの堅牢なRPAパスを生成する
         パフォーマンスと一意性を向上させるためにチェーンパス（親 -> 子）を使用
         """
-        root = control.GetTopLevelControl()
+        root = self.backend.get_top_level(control)
         if not root:
             return self._generate_segment(control, None)
 
@@ -31,66 +43,88 @@ class PathGenerator:
         # Modernモードの最適化: AutomationIdが利用可能な場合は直接使用
         if self.mode == "modern" and control.AutomationId:
              # controlがrootかどうかをチェック
-             if auto.ControlsAreSame(control, root):
+             if ElementRef(self.backend, control) == ElementRef(self.backend, root):
                  return ""
              return self._generate_segment(control, None)
 
+        return self._chained_path(control, root)
+
+    def get_chained_path(self, control):
+        """
+        AutomationIdだけのパスを使わず、常にウィンドウからのチェーンパスを生成する
+        （PathOptimizerの候補・解決先の特定に使用）
+        """
+        root = self.backend.get_top_level(control)
+        if not root:
+            return self._generate_segment(control, None)
+        return self._chained_path(control, root)
+
+    def invalidate(self):
+        """UIの構造が変わったことが分かっている場合に、保持しているセグメントと兄弟要素を破棄する。"""
+        self.segment_cache.invalidate()
+        self.sibling_cache.invalidate()
+
+    def _chained_path(self, control, root):
+        """rootの直下からcontrolまでの各要素のセグメントを連結する"""
+        # 要素の同一性はRuntimeIdで比較する（rootとの比較、セグメントのメモ、foundIndexの計算に使用）
+        # ElementRefは要素ごとにRuntimeIdを1回だけ取得する
+        root = ElementRef.of(self.backend, root)
+
+        # 系譜収集: controlから親をたどり、最後に反転する（[Rootの子, ..., Parent, Control]）
         lineage = []
-        current = control
+        current = ElementRef.of(self.backend, control)
         depth_safety = 0
-        while current and depth_safety < 50:
-            if auto.ControlsAreSame(current, root):
+        while current.element and depth_safety < 50:
+            if current == root:
                 break
-            lineage.insert(0, current)
+            lineage.append(current)
             try:
-                current = current.GetParentControl()
+                current = ElementRef(self.backend, self.backend.get_parent(current.element))
             except Exception as e:
                 print(f"Warning: GetParentControl failed: {e}")
                 break
             depth_safety += 1
+        lineage.reverse()
         
         # パスセグメントを生成
+        # 祖先のセグメントはSegmentCacheから再利用し、対象（葉）のセグメントだけを毎回計算する。
+        # 再利用する前に親の子のスナップショットを確かめる（期限切れなら読み直し、並びが変わっていれば
+        # on_changeでその親の子のセグメントが破棄される）。祖先のName/AutomationIdもスナップショットと比較する。
         path_segments = []
         parent = root
-        for item in lineage:
-            segment = self._generate_segment(item, parent)
+        last = len(lineage) - 1
+        for position, item in enumerate(lineage):
+            segment = None
+            if position < last:
+                segment = self.segment_cache.get(item.runtime_id, parent.runtime_id, self._segment_props(parent, item))
+            if segment is None:
+                segment = self._generate_segment(item, parent)
+                self.segment_cache.put(item.runtime_id, parent.runtime_id, segment, self._segment_props(parent, item))
             path_segments.append(segment)
             parent = item
             
         return " -> ".join(path_segments)
     
+    def _segment_props(self, parent, item):
+        """SegmentCacheの比較に使う要素のプロパティ（親のスナップショットにない場合はNone）"""
+        try:
+            info = self.sibling_cache.lookup(parent, item)
+        except Exception:
+            return None
+        return (info.name, info.automation_id) if info is not None else None
+
     def _generate_segment(self, control, parent):
-        """親に相対する単一パスセグメント（Type(Props)）を生成する"""
-        control_type = control.ControlTypeName
-        name = control.Name
-        automation_id = control.AutomationId
-        class_name = control.ClassName
-        
-        criteria = []
-        search_params = {"ControlTypeName": control_type}
-        
-        # 1. 戦略: AutomationId (Modern)
-        if self.mode == "modern" and automation_id:
-            criteria.append(f"AutomationId='{automation_id}'")
-            search_params["AutomationId"] = automation_id
-            
-        # 2. 戦略: Name (Modern/Legacyで安定している場合)
-        # legacyモードでは、Nameが動的に見える場合はスキップするかもしれないが、今のところ存在すれば含める。
-        elif name:
-            # シングルクォートをエスケープ
-            safe_name = name.replace("'", "\\'")
-            criteria.append(f"Name='{safe_name}'")
-            search_params["Name"] = name
-            
-        # 3. 戦略: ClassName (Legacy)
-        if self.mode == "legacy" and class_name:
-            criteria.append(f"ClassName='{class_name}'")
-            search_params["ClassName"] = class_name
-            
-        # 4. 戦略: 他に何もない場合はClassNameにフォールバック
-        if not criteria and class_name:
-            criteria.append(f"ClassName='{class_name}'")
-            search_params["ClassName"] = class_name
+        """
+        親に相対する単一パスセグメント（Type(Props)）を生成する
+
+        Args:
+            control: 要素またはElementRef
+            parent: 親の要素またはElementRef（Noneの場合はfoundIndexを計算しない）
+        """
+        element = control.element if isinstance(control, ElementRef) else control
+        control_type = element.ControlTypeName
+        criteria, search_params = segment_criteria(
+            self.mode, control_type, element.Name, element.AutomationId, element.ClassName)
 
         # 親に相対するfoundIndexを計算
         # これはツリー全体を検索するよりもはるかに高速。
@@ -98,37 +132,12 @@ class PathGenerator:
         
         if parent:
             try:
-                count = 0
-                found = False
-                
-                # maxDepth=1でWalkControlを使用し、直接の子ノードのみを検索。
-                # これにより、深いサブツリー（大規模なリストなど）の走査を回避。
-                # 注: WalkControl(root, maxDepth=1)はroot、その後子ノードを生成する。
-                # 最初の1つ（親自身）をスキップする。
-                
-                gen = auto.WalkControl(parent, maxDepth=1)
-                next(gen) # 親をスキップ
-                
-                for ctrl, depth in gen:
-                    # マッチングチェック
-                    is_match = (ctrl.ControlTypeName == control_type)
-                    if is_match and "AutomationId" in search_params:
-                        is_match = (ctrl.AutomationId == search_params["AutomationId"])
-                    if is_match and "Name" in search_params:
-                        is_match = (ctrl.Name == search_params["Name"])
-                    if is_match and "ClassName" in search_params:
-                        is_match = (ctrl.ClassName == search_params["ClassName"])
-                    
-                    if is_match:
-                        count += 1
-                        if auto.ControlsAreSame(ctrl, control):
-                            found_index = count
-                            found = True
-                            break
-                
-                if not found:
-                    # フォールバック: 階層が動的に変わった場合、直接の子ではないかもしれない？
-                    pass
+                # 親の直接の子のプロパティはSiblingCacheに保持し、同じ親の兄弟を読み直さない。
+                # 要素の同一性はRuntimeIdで比較する。
+                index = self.sibling_cache.found_index(parent, control, search_params)
+                if index is not None:
+                    found_index = index
+                # 見つからない場合: 階層が動的に変わり、直接の子ではなくなった可能性がある（1のまま）
 
             except Exception as e:
                 # これは一時的な要素（メニューが閉じるなど）でよく発生する。
@@ -136,14 +145,53 @@ class PathGenerator:
                 print(f"    Warning: Index calculation skipped (defaulting to 1). Reason: {e}")
                 found_index = 1
 
-        # パス文字列を構築
-        props = criteria
-        if found_index > 1 or self.mode == "legacy":
-             props.append(f"foundIndex={found_index}")
-        
-        # チェーンしている場合（親が存在）、searchDepth=1を強制
-        if parent:
-            props.append("searchDepth=1")
-        
-        props_str = ", ".join(props)
-        return f"{control_type}({props_str})"
+        return format_segment(self.mode, control_type, criteria, found_index, chained=bool(parent))
+
+
+def segment_criteria(mode, control_type, name, automation_id, class_name):
+    """
+    セグメントに使う条件を選ぶ。
+
+    Returns:
+        (条件の文字列リスト, foundIndexの計算に使う検索パラメータ)
+    """
+    criteria = []
+    search_params = {"ControlTypeName": control_type}
+
+    # 1. 戦略: AutomationId (Modern)
+    if mode == "modern" and automation_id:
+        criteria.append(f"AutomationId='{automation_id}'")
+        search_params["AutomationId"] = automation_id
+
+    # 2. 戦略: Name (Modern/Legacyで安定している場合)
+    # legacyモードでは、Nameが動的に見える場合はスキップするかもしれないが、今のところ存在すれば含める。
+    elif name:
+        # シングルクォートをエスケープ
+        safe_name = name.replace("'", "\\'")
+        criteria.append(f"Name='{safe_name}'")
+        search_params["Name"] = name
+
+    # 3. 戦略: ClassName (Legacy)
+    if mode == "legacy" and class_name:
+        criteria.append(f"ClassName='{class_name}'")
+        search_params["ClassName"] = class_name
+
+    # 4. 戦略: 他に何もない場合はClassNameにフォールバック
+    if not criteria and class_name:
+        criteria.append(f"ClassName='{class_name}'")
+        search_params["ClassName"] = class_name
+
+    return criteria, search_params
+
+
+def format_segment(mode, control_type, criteria, found_index, chained):
+    """条件とfoundIndexからセグメント文字列（Type(Props)）を組み立てる。"""
+    props = list(criteria)
+    if found_index > 1 or mode == "legacy":
+        props.append(f"foundIndex={found_index}")
+
+    # チェーンしている場合（親が存在）、searchDepth=1を強制
+    if chained:
+        props.append("searchDepth=1")
+
+    return f"{control_type}({', '.join(props)})"
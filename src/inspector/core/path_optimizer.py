@@ -0,0 +1,224 @@
+"""
+PathOptimizer - 解決コストを比較して最速のRPAパスを選ぶ
+
+PathGeneratorは固定の規則（AutomationId、なければName、なければClassName）で条件を選び、
+ウィンドウからのチェーンパスを生成する。PathOptimizerは1つの要素について複数の候補を生成し、
+解決にかかるコストを比較して、対象の要素に一意に（フォールバックなしで）解決される最も安いパスを選ぶ。
+
+候補:
+    automation_id:  AutomationIdだけでウィンドウ全体を検索
+    name:           Nameだけでウィンドウ全体を検索
+    anchored:       AutomationIdを持つ最も近い祖先を起点に、その配下を検索
+    anchored_chain: 同じ祖先を起点に、そこからのチェーンパス
+    chained:        PathGenerator.get_chained_path（ウィンドウからのチェーンパス）
+
+候補のfoundIndexと一意性は、ウィンドウを1回走査したスナップショット上で求める
+（SnapshotResolverで解決し、対象のノードにフォールバックなしで解決されることを確認する）。
+コストは、検索で調べる要素数の見積もり（コストモデル）と、ライブのツリーでの実測時間で比較する。
+"""
+
+import logging
+import time
+
+from src.automator.core.element_finder import ElementFinder
+from src.inspector.core.path_generator import PathGenerator, segment_criteria, format_segment
+from src.shared.backend.identity import ElementRef
+from src.shared.resolver import SnapshotResolver
+from src.shared.snapshot import Snapshot, walk_tree
+
+STRATEGIES = ("automation_id", "name", "anchored", "anchored_chain", "chained")
+
+# 1セグメントごとの検索呼び出しの固定コスト（調べる要素数に換算）
+SEGMENT_OVERHEAD = 2
+
+# 実測時間がこの割合以内の差の候補は同じ速さとみなす
+TIME_TOLERANCE = 0.2
+
+
+class PathCandidate:
+    """候補のパスと、そのコスト。"""
+
+    __slots__ = ("strategy", "path", "cost", "seconds", "valid")
+
+    def __init__(self, strategy, path, cost, seconds=None, valid=True):
+        """
+        Args:
+            strategy: 候補の種類（STRATEGIESのいずれか）
+            path: RPAパス
+            cost: 検索で調べる要素数の見積もり
+            seconds: ライブのツリーで解決にかかった時間（計測しない場合はNone）
+            valid: 対象の要素にフォールバックなしで解決されるか
+        """
+        self.strategy = strategy
+        self.path = path
+        self.cost = cost
+        self.seconds = seconds
+        self.valid = valid
+
+    def __repr__(self):
+        return f"PathCandidate({self.strategy!r}, {self.path!r}, cost={self.cost}, seconds={self.seconds})"
+
+
+class PathOptimizer:
+    def __init__(self, backend=None, path_generator=None, repeat=5):
+        """
+        Args:
+            backend: UIBackendインスタンス（省略時はpath_generatorのバックエンド）
+            path_generator: chained候補の生成に使うPathGenerator（省略時はmodernモードで作成）
+            repeat: ライブのツリーで各候補を解決する回数（最短時間を使用）。0の場合は計測せずコストモデルで比較する
+        """
+        self.path_generator = path_generator or PathGenerator(mode="modern", backend=backend)
+        self.backend = backend or self.path_generator.backend
+        self.repeat = repeat
+        logger = logging.getLogger(__name__)
+        self.finder = ElementFinder(logger=logger, backend=self.backend)
+
+    def best(self, control):
+        """
+        最も安い候補を返す。
+
+        Returns:
+            PathCandidate: 有効な候補がない場合はNone
+        """
+        candidates = self.candidates(control)
+        return candidates[0] if candidates and candidates[0].valid else None
+
+    def candidates(self, control):
+        """
+        候補を生成してコストを求め、安い順（有効な候補が先）に返す。
+
+        Returns:
+            list[PathCandidate]: controlがウィンドウ自身またはウィンドウに属さない場合は空
+        """
+        root = self.backend.get_top_level(control)
+        control_ref = ElementRef(self.backend, control)
+        if not root or control_ref == ElementRef(self.backend, root):
+            return []
+
+        chain = self.path_generator.get_chained_path(control)
+        builder = walk_tree(self.backend, root, patterns=False)
+        with Snapshot.from_bytes(builder.to_bytes()) as snapshot:
+            resolver = SnapshotResolver(snapshot)
+            target = resolver.resolve(chain).node
+            if target is None:
+                # 走査中にツリーが変わった等で特定できない場合は、チェーンパスのみ
+                candidates = [PathCandidate("chained", chain, None, valid=False)]
+            else:
+                candidates = []
+                seen = set()
+                for strategy, segments in self._generate(snapshot, target, chain):
+                    path = " -> ".join(text for text, _ in segments)
+                    if path in seen:
+                        continue
+                    seen.add(path)
+                    resolution = resolver.resolve(path)
+                    candidates.append(PathCandidate(
+                        strategy, path, sum(cost for _, cost in segments),
+                        valid=resolution.node == target and not any(resolution.fallbacks)))
+
+        if self.repeat > 0:
+            for candidate in candidates:
+                if candidate.valid:
+                    self._measure(root, control_ref, candidate)
+
+        # 実測時間の差が誤差の範囲の候補は、コストモデル・候補の種類の順で比較する
+        times = [c.seconds for c in candidates if c.valid and c.seconds is not None]
+        limit = min(times) * (1 + TIME_TOLERANCE) if times else None
+        candidates.sort(key=lambda c: (not c.valid, limit is not None and (c.seconds is None or c.seconds > limit),
+                                       c.cost if c.cost is not None else 0, STRATEGIES.index(c.strategy),
+                                       c.seconds or 0))
+        return candidates
+
+    def _generate(self, snapshot, target, chain):
+        """(種類, [(セグメント, コスト)]) を生成する。"""
+        string = snapshot.string
+        control_type = string(snapshot.control_type[target])
+        name = string(snapshot.name[target])
+        automation_id = string(snapshot.automation_id[target])
+        class_name = string(snapshot.class_name[target])
+
+        if automation_id:
+            yield "automation_id", [self._segment(snapshot, 0, target, ("", automation_id, ""), chained=False)]
+        if name:
+            yield "name", [self._segment(snapshot, 0, target, (name, "", ""), chained=False)]
+
+        lineage = []  # ウィンドウの直下から対象まで
+        node = target
+        while node > 0:
+            lineage.append(node)
+            node = snapshot.parent[node]
+        lineage.reverse()
+
+        anchor = next((node for node in reversed(lineage[:-1]) if snapshot.automation_id[node]), None)
+        if anchor is not None:
+            anchor_segment = self._segment(snapshot, 0, anchor, ("", string(snapshot.automation_id[anchor]), ""),
+                                           chained=False)
+            yield "anchored", [anchor_segment,
+                               self._segment(snapshot, anchor, target, (name, automation_id, class_name),
+                                             chained=False)]
+            segments = [anchor_segment]
+            parent = anchor
+            for node in lineage[lineage.index(anchor) + 1:]:
+                segments.append(self._segment(snapshot, parent, node, self._properties(snapshot, node), chained=True))
+                parent = node
+            yield "anchored_chain", segments
+
+        costs = [self._scan_cost(snapshot, parent, node, chained=True)
+                 for parent, node in zip([0] + lineage[:-1], lineage)]
+        yield "chained", [(chain, sum(costs))]
+
+    @staticmethod
+    def _properties(snapshot, node):
+        return (snapshot.string(snapshot.name[node]), snapshot.string(snapshot.automation_id[node]),
+                snapshot.string(snapshot.class_name[node]))
+
+    def _segment(self, snapshot, origin, node, properties, chained):
+        """
+        originから検索してnodeに解決されるセグメントと、そのコストを返す。
+
+        Args:
+            properties: 条件の候補 (Name, AutomationId, ClassName)。segment_criteria（modern）で選ぶ
+            chained: Trueの場合はsearchDepth=1（originの直接の子）
+        """
+        control_type = snapshot.string(snapshot.control_type[node])
+        name, automation_id, class_name = properties
+        criteria, search_params = segment_criteria("modern", control_type, name, automation_id, class_name)
+
+        # foundIndex: 検索範囲（前順）のうち、nodeまでに条件に一致する要素の数
+        max_depth = snapshot.depth[origin] + 1 if chained else None
+        required = [(column, snapshot.string_ids(search_params[key]))
+                    for key, column in (("ControlTypeName", snapshot.control_type), ("Name", snapshot.name),
+                                        ("AutomationId", snapshot.automation_id), ("ClassName", snapshot.class_name))
+                    if key in search_params]
+        found_index = 0
+        for candidate in range(origin + 1, node + 1):
+            if max_depth is not None and snapshot.depth[candidate] > max_depth:
+                continue
+            if all(column[candidate] == string_id for column, string_id in required):
+                found_index += 1
+
+        text = format_segment("modern", control_type, criteria, found_index, chained)
+        return text, self._scan_cost(snapshot, origin, node, chained)
+
+    @staticmethod
+    def _scan_cost(snapshot, origin, node, chained):
+        """
+        検索で調べる要素数の見積もり（前順で対象に到達するまでの要素数。searchDepth=1は対象までの兄弟の数）
+        に、セグメントごとの固定コストを加えたもの
+        """
+        if not chained:
+            return node - origin + SEGMENT_OVERHEAD
+        return sum(1 for child in snapshot.children(origin) if child <= node) + SEGMENT_OVERHEAD
+
+    def _measure(self, root, control_ref, candidate):
+        """ライブのツリーで解決し、最短時間を記録する（別の要素に解決された場合は無効にする）。"""
+        best = None
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            element = self.finder.find_element_by_path(root, candidate.path, wait=False)
+            elapsed = time.perf_counter() - start
+            if element is None or ElementRef(self.backend, element) != control_ref:
+                candidate.valid = False
+                return
+            best = elapsed if best is None else min(best, elapsed)
+        candidate.seconds = best
@@ -0,0 +1,86 @@
+"""
+SegmentCache - 要素ごとに生成したパスセグメントのメモ
+
+対話的なエイリアス作成では、同じパネルの下の要素を続けてクリックすることが多く、
+クリックごとに同じ祖先のセグメント（foundIndexの計算を含む）が生成し直される。
+生成したセグメントを要素のRuntimeIdをキーとしてセッションの間保持し、
+クリックごとに新しく計算するのは対象（葉）のセグメントだけにする。
+
+セグメントは親要素の直接の子の並びと要素自身のName/AutomationIdに依存するため、次の場合に破棄する。
+    - 要素の親が保存時と異なる（別の親の下に移動した）
+    - 要素のプロパティ（Name/AutomationId）が保存時と異なる
+    - SiblingCacheが親の子を読み直した結果が前回と異なる（その親の子のセグメントをすべて破棄）
+    - invalidate() が呼ばれた
+"""
+
+import time
+from collections import OrderedDict
+
+
+class SegmentCache:
+    """要素のRuntimeId -> (親のRuntimeId, セグメント, 要素のプロパティ)。"""
+
+    def __init__(self, max_entries=10000, ttl=None, clock=time.monotonic):
+        """
+        Args:
+            max_entries: 保持するセグメント数の上限（超えた場合は最も古く使われたものから破棄）。0の場合は保持しない
+            ttl: セグメントの保持期間（秒）。Noneの場合は構造の変化を検出するまで保持する
+            clock: 現在時刻（秒）を返す関数
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = {"hits": 0, "misses": 0, "invalidated": 0}
+        self._entries = OrderedDict()  # RuntimeId -> (親のRuntimeId, セグメント, 期限, プロパティ)
+        self._children = {}            # 親のRuntimeId -> 子のRuntimeIdの集合
+
+    def get(self, element_id, parent_id, props=None):
+        """
+        保持しているセグメントを返す（親・プロパティが異なる、期限切れの場合はNone）。
+
+        Args:
+            props: 要素の現在のプロパティ（put() に渡したものと比較する）
+        """
+        entry = self._entries.get(element_id)
+        if (entry is None or entry[0] != parent_id or entry[3] != props
+                or (entry[2] is not None and entry[2] <= self.clock())):
+            self.stats["misses"] += 1
+            return None
+        self.stats["hits"] += 1
+        self._entries.move_to_end(element_id)
+        return entry[1]
+
+    def put(self, element_id, parent_id, segment, props=None):
+        if self.max_entries <= 0:
+            return
+        self._discard(element_id)
+        expires = self.clock() + self.ttl if self.ttl is not None else None
+        self._entries[element_id] = (parent_id, segment, expires, props)
+        self._children.setdefault(parent_id, set()).add(element_id)
+        while len(self._entries) > self.max_entries:
+            self._discard(next(iter(self._entries)))
+
+    def invalidate_children(self, parent_id):
+        """parentの直接の子のセグメントを破棄する（SiblingCacheが子の並びの変化を検出したときに呼ばれる）。"""
+        for element_id in list(self._children.get(parent_id, ())):
+            self._discard(element_id)
+            self.stats["invalidated"] += 1
+
+    def invalidate(self):
+        """すべてのセグメントを破棄する。"""
+        self.stats["invalidated"] += len(self._entries)
+        self._entries.clear()
+        self._children.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _discard(self, element_id):
+        entry = self._entries.pop(element_id, None)
+        if entry is None:
+            return
+        siblings = self._children.get(entry[0])
+        if siblings is not None:
+            siblings.discard(element_id)
+            if not siblings:
+                del self._children[entry[0]]
@@ -0,0 +1,142 @@
+"""
+SiblingCache - 親要素ごとの直接の子のスナップショット
+
+PathGeneratorのfoundIndex計算では、親の直接の子すべてについて ControlTypeName /
+AutomationId / Name / ClassName を読む。同じリストやツールバーの項目を続けて調べると
+同じ兄弟の走査が繰り返されるため、親のRuntimeIdをキーとして子のプロパティを短時間保持し、
+インデックスの計算をメモリ上の走査にする。
+
+保持期間（TTL）の間に子が追加・削除された場合、インデックスが古い状態で計算されることがある。
+対象の要素がスナップショットにない場合は、その場で作り直す。
+作り直した子の並びが前回と異なる場合は on_change に親のRuntimeIdを通知する
+（PathGeneratorはSegmentCacheに保持しているその親の子のセグメントを破棄する）。
+PathGeneratorは祖先のセグメントを再利用する前に lookup() で親のスナップショットを確かめる
+（期限切れの場合はここで読み直され、並びの変化が on_change で通知される）。
+"""
+
+import time
+from collections import OrderedDict
+
+from src.shared.backend.identity import ElementRef
+
+
+class SiblingInfo:
+    """子要素1つ分のプロパティ。"""
+
+    __slots__ = ("control_type", "automation_id", "name", "class_name", "runtime_id")
+
+    def __init__(self, control_type, automation_id, name, class_name, runtime_id):
+        self.control_type = control_type
+        self.automation_id = automation_id
+        self.name = name
+        self.class_name = class_name
+        self.runtime_id = runtime_id
+
+    def matches(self, search_params):
+        """ControlTypeNameと、search_paramsに含まれるAutomationId / Name / ClassNameが一致するか"""
+        return (self.control_type == search_params["ControlTypeName"]
+                and self.automation_id == search_params.get("AutomationId", self.automation_id)
+                and self.name == search_params.get("Name", self.name)
+                and self.class_name == search_params.get("ClassName", self.class_name))
+
+
+class SiblingCache:
+    """親のRuntimeId -> 子のプロパティ一覧（TTL付き）。"""
+
+    def __init__(self, backend, ttl=2.0, max_parents=256, clock=time.monotonic, on_change=None):
+        """
+        Args:
+            backend: UIBackendインスタンス
+            ttl: スナップショットの保持期間（秒）。0以下の場合はキャッシュしない
+            max_parents: 保持する親の数の上限（超えた場合は最も古く使われたものから破棄）
+            clock: 現在時刻（秒）を返す関数
+            on_change: 子の並びが前回の読み取りと異なる（または前回の読み取りがない）場合に、
+                       親のRuntimeIdを引数として呼ばれる関数
+        """
+        self.backend = backend
+        self.ttl = ttl
+        self.max_parents = max_parents
+        self.clock = clock
+        self.on_change = on_change
+        self.stats = {"hits": 0, "misses": 0, "refreshes": 0}
+        self._entries = OrderedDict()  # RuntimeId -> (期限, [SiblingInfo])
+
+    def found_index(self, parent, control, search_params):
+        """
+        parentの直接の子のうち、search_paramsに一致する要素の中でのcontrolの順番（1始まり）を返す。
+
+        Args:
+            parent, control: 要素またはElementRef（ElementRefの場合は取得済みのRuntimeIdを使う）
+
+        Returns:
+            int: foundIndex。controlが親の直接の子でない場合はNone
+        """
+        parent = ElementRef.of(self.backend, parent)
+        control_id = ElementRef.of(self.backend, control).runtime_id
+        index = self._index_in(self._children(parent), control_id, search_params)
+        if index is None and self.ttl > 0:
+            # スナップショットの後に追加された要素かもしれないので、作り直して探す
+            self.stats["refreshes"] += 1
+            index = self._index_in(self._children(parent, refresh=True), control_id, search_params)
+        return index
+
+    def lookup(self, parent, control):
+        """
+        parentのスナップショット（期限切れの場合は読み直す）から、controlのプロパティを返す。
+
+        Returns:
+            SiblingInfo: controlがスナップショットにない場合はNone
+        """
+        parent = ElementRef.of(self.backend, parent)
+        control_id = ElementRef.of(self.backend, control).runtime_id
+        for child in self._children(parent):
+            if child.runtime_id == control_id:
+                return child
+        return None
+
+    def invalidate(self, parent=None):
+        """parentのスナップショット（省略時はすべて）を破棄する。"""
+        if parent is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(ElementRef.of(self.backend, parent).runtime_id, None)
+
+    def _children(self, parent, refresh=False):
+        parent_id = parent.runtime_id
+        now = self.clock()
+        entry = self._entries.get(parent_id)
+        if entry and not refresh and entry[0] > now:
+            self.stats["hits"] += 1
+            self._entries.move_to_end(parent_id)
+            return entry[1]
+
+        self.stats["misses"] += 1
+        children = [
+            SiblingInfo(child.ControlTypeName, child.AutomationId, child.Name, child.ClassName,
+                        self.backend.get_runtime_id(child))
+            for child in self.backend.get_children(parent.element)
+        ]
+        if self.on_change is not None and (entry is None or _signature(entry[1]) != _signature(children)):
+            self.on_change(parent_id)
+        if self.ttl > 0:
+            self._entries[parent_id] = (now + self.ttl, children)
+            self._entries.move_to_end(parent_id)
+            while len(self._entries) > self.max_parents:
+                self._entries.popitem(last=False)
+        return children
+
+    @staticmethod
+    def _index_in(children, control_id, search_params):
+        count = 0
+        for child in children:
+            if child.matches(search_params):
+                count += 1
+                if child.runtime_id == control_id:
+                    return count
+        return None
+
+
+def _signature(children):
+    """子の並びの比較用（RuntimeIdとプロパティ）"""
+    return [(child.runtime_id, child.control_type, child.automation_id, child.name, child.class_name)
+            for child in children]
@@ -4,5 +4,6 @@ Inspector Utils - 入力処理・出力処理
 
 from .click_handler import ClickHandler
 from .output_handler import OutputHandler
+from .path_worker import PathWorker
 
-__all__ = ['ClickHandler', 'OutputHandler']
+__all__ = ['ClickHandler', 'OutputHandler', 'PathWorker']
@@ -3,37 +3,57 @@ ClickHandler - マウス/キーボード入力処理を担当するクラス
 
 inspector.pyから抽出。
 左クリック・右クリックの検出とESCキー検出を処理。
+
+入力はバックエンドの入力ソース（Windowsでは低レベルフック）からイベントとして受け取り、
+次のイベントまでブロックして待つ（ポーリングしないため、待機中はCPUを使わない）。
 """
 
-import time
-import keyboard
-import ctypes
-import uiautomation as auto
+from src.shared.backend import get_backend
+from src.shared.backend.input_events import CLICK, ESCAPE
 
 
 class ClickHandler:
-    def __init__(self):
-        """ClickHandler初期化"""
-        pass
-    
+    def __init__(self, backend=None, events=None):
+        """
+        ClickHandler初期化
+
+        Args:
+            backend: UIBackendインスタンス（省略時は既定のバックエンド）
+            events: 入力ソース（省略時は最初の待機でbackend.input_source()を開始）
+        """
+        self.backend = backend or get_backend()
+        self.events = events
+
+    def next_event(self, timeout=None):
+        """
+        次のクリックまたはESCを待機する。
+
+        Returns:
+            InputEvent: timeout秒以内にイベントがなければNone
+        """
+        if self.events is None:
+            self.events = self.backend.input_source()
+            self.events.start()
+        return self.events.next_event(timeout)
+
     def wait_for_click(self):
         """
         左または右クリックを待機し、(control, x, y)を返す。
         ESCが押された場合はNoneを返す。
         """
+        if self.events is not None:
+            # 待機を始める前の入力（エイリアス名の入力中のクリック等）は無視する
+            self.events.clear()
+
         while True:
-            if keyboard.is_pressed('esc'):
+            event = self.next_event()
+            if event.kind == ESCAPE:
                 return None
-            
-            # 左クリック (0x01) または右クリック (0x02) をチェック
-            if (ctypes.windll.user32.GetAsyncKeyState(0x01) & 0x8000) or \
-               (ctypes.windll.user32.GetAsyncKeyState(0x02) & 0x8000):
-                x, y = auto.GetCursorPos()
-                control = auto.ControlFromPoint(x, y)
-                # 複数登録を回避するためにリリースを待つ
-                while (ctypes.windll.user32.GetAsyncKeyState(0x01) & 0x8000) or \
-                      (ctypes.windll.user32.GetAsyncKeyState(0x02) & 0x8000):
-                    time.sleep(0.05)
-                return control, x, y
-            
-            time.sleep(0.05)
+            if event.kind == CLICK:
+                control = self.backend.element_from_point(event.x, event.y)
+                return control, event.x, event.y
+
+    def close(self):
+        """入力ソースを停止する（フックを外す）。"""
+        if self.events is not None:
+            self.events.stop()
@@ -3,68 +3,133 @@ OutputHandler - 出力処理を担当するクラス
 
 inspector.pyから抽出。
 CSV/clipboard/alias形式での出力を処理。
+
+記録したアイテムはその都度出力ファイルに追記し（ヘッダーは最初の1回のみ）、
+batch_size件ごと、または前回からflush_interval秒経過した時点でディスクに書き出す。
+Inspectorが異常終了しても、それまでに書き出したアイテムはファイルに残る。
+record()・flush()はバックグラウンドの解析スレッド（PathWorker）から、finalize()はメインスレッドから
+呼ばれるため、ファイルの操作はロックで直列化する。
+clipboard出力も同じ形式のファイル（inspector_<日時>_clipboard.csv）に追記し、
+終了時にその内容をクリップボードにコピーしてからファイルを削除する。
 """
 
 import csv
 import datetime
-import io
-import uiautomation as auto
+import os
+import threading
+import time
+from src.shared.backend import get_backend
+
+
+CSV_FIELDS = ["TargetApp", "Key", "Action", "Value"]
+ALIAS_FIELDS = ["AliasName", "RPA_Path"]
 
 
 class OutputHandler:
-    def __init__(self, output_mode="clipboard"):
+    def __init__(self, output_mode="clipboard", backend=None, batch_size=10, flush_interval=1.0, directory="."):
         """
         Args:
             output_mode: "csv", "clipboard", "alias", or "interactive_alias"
+            backend: UIBackendインスタンス（省略時は既定のバックエンド）
+            batch_size: ディスクに書き出すまでに溜めるアイテム数
+            flush_interval: 溜めたアイテムをディスクに書き出すまでの最大秒数（poll()・record()で確認）
+            directory: 出力ファイルの作成先
         """
         self.output_mode = output_mode
-    
-    def finalize(self, recorded_items):
+        self.backend = backend or get_backend()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.directory = directory
+        self.path = None    # 出力ファイル（最初のアイテムを記録したときに作成）
+        self.count = 0      # 記録したアイテム数
+        self._file = None
+        self._writer = None
+        self._pending = 0   # ディスクに書き出していないアイテム数
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+
+    def record(self, item):
         """
-        出力モードに基づいて記録されたアイテムを処理して出力。
-        
+        アイテムを出力ファイルに追記する。
+
         Args:
-            recorded_items: 記録されたアイテムのリスト（辞書）
+            item: TargetApp/Key/Action/Value、またはAliasName/RPA_Pathの辞書
+        """
+        if self.output_mode in ["alias", "interactive_alias"] and "AliasName" not in item:
+            # 通常モードアイテム（KeyをRPA_Pathに変換）
+            item = {"AliasName": "", "RPA_Path": item["Key"]}
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._writer.writerow(item)
+            self.count += 1
+            self._pending += 1
+            if self._pending >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def poll(self):
+        """書き出していないアイテムがあり、flush_intervalが経過していれば書き出す（待機中に呼ぶ）。"""
+        with self._lock:
+            if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+
+    def flush(self):
+        """追記したアイテムをディスクに書き出す。"""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            self._pending = 0
+            self._last_flush = time.monotonic()
+
+    def finalize(self, recorded_items=None):
         """
-        if not recorded_items:
+        出力ファイルを閉じ、出力モードに基づいて結果を出力。
+
+        Args:
+            recorded_items: record()を経由せずに渡すアイテムのリスト（先に追記される）
+        """
+        for item in recorded_items or ():
+            self.record(item)
+        self.close()
+
+        if not self.count:
             print("No items recorded.")
             return
 
         if self.output_mode == "csv":
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"inspector_{timestamp}.csv"
-            with open(filename, "w", newline="", encoding="utf-8-sig") as f:
-                writer = csv.DictWriter(f, fieldnames=["TargetApp", "Key", "Action", "Value"])
-                writer.writeheader()
-                writer.writerows(recorded_items)
-            print(f"Saved to {filename}")
-            
+            print(f"Saved to {self.path}")
+
         elif self.output_mode == "clipboard":
-            # CSV文字列を生成
-            output = io.StringIO()
-            writer = csv.DictWriter(output, fieldnames=["TargetApp", "Key", "Action", "Value"])
-            writer.writeheader()
-            writer.writerows(recorded_items)
-            csv_content = output.getvalue()
-            
-            auto.SetClipboardText(csv_content)
+            # 追記したファイルからCSV文字列を作成
+            with open(self.path, "r", newline="", encoding="utf-8-sig") as f:
+                csv_content = f.read()
+            self.backend.set_clipboard_text(csv_content)
+            os.remove(self.path)
             print("Copied CSV content to clipboard.")
 
         elif self.output_mode in ["alias", "interactive_alias"]:
-            timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"inspector_{timestamp}_alias.csv"
-            with open(filename, "w", newline="", encoding="utf-8-sig") as f:
-                writer = csv.DictWriter(f, fieldnames=["AliasName", "RPA_Path"])
-                writer.writeheader()
-                
-                alias_items = []
-                for item in recorded_items:
-                    if "AliasName" in item:
-                        # 対話型モードアイテム
-                        alias_items.append(item)
-                    else:
-                        # 通常モードアイテム（KeyをRPA_Pathに変換）
-                        alias_items.append({"AliasName": "", "RPA_Path": item["Key"]})
-                
-                writer.writerows(alias_items)
-            print(f"Saved alias definition to {filename}")
+            print(f"Saved alias definition to {self.path}")
+
+    def close(self):
+        """出力ファイルを書き出して閉じる。"""
+        with self._lock:
+            if self._file is not None:
+                self.flush()
+                self._file.close()
+                self._file = None
+                self._writer = None
+
+    def _open(self):
+        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        if self.output_mode in ["alias", "interactive_alias"]:
+            filename, fields = f"inspector_{timestamp}_alias.csv", ALIAS_FIELDS
+        elif self.output_mode == "clipboard":
+            filename, fields = f"inspector_{timestamp}_clipboard.csv", CSV_FIELDS
+        else:
+            filename, fields = f"inspector_{timestamp}.csv", CSV_FIELDS
+        self.path = os.path.join(self.directory, filename) if self.directory != "." else filename
+        self._file = open(self.path, "w", newline="", encoding="utf-8-sig")
+        self._writer = csv.DictWriter(self._file, fieldnames=fields)
+        self._writer.writeheader()
+        self.flush()
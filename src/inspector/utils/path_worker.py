@@ -0,0 +1,138 @@
+"""
+PathWorker - クリックした要素の解析をバックグラウンドで行うワーカー
+
+クリックの検出ループは、要素・座標・時刻を取得（Capture）してキューに入れるだけですぐに戻り、
+プロパティの読み取り・パスの生成（トップレベルまでの走査・foundIndexの計算）は
+ワーカースレッドで行う。解析中も次のクリックを検出でき、連続したクリックを取りこぼさない。
+
+ワーカーは1つのスレッドでキューを先頭から処理するため、結果はクリックした順に出力される。
+UIAの要素はスレッドごとにCOMを初期化すれば別のスレッドから使用できる（backend.thread_context()）。
+"""
+
+import threading
+import time
+from collections import deque
+
+
+class Capture:
+    """クリックの検出時に取得した情報。"""
+
+    __slots__ = ("index", "control", "x", "y", "timestamp", "alias")
+
+    def __init__(self, index, control, x, y, timestamp, alias=None):
+        """
+        Args:
+            index: クリックの連番（1から）
+            control: クリックした要素
+            x, y: クリックした座標
+            timestamp: クリックを検出した時刻（time.monotonic()）
+            alias: 対話モードで入力したエイリアス名
+        """
+        self.index = index
+        self.control = control
+        self.x = x
+        self.y = y
+        self.timestamp = timestamp
+        self.alias = alias
+
+
+class PathWorker:
+    """Captureをキューの順にhandlerで処理するバックグラウンドのスレッド。"""
+
+    def __init__(self, handler, backend, name="PathWorker", on_idle=None):
+        """
+        Args:
+            handler: Captureを受け取って解析・出力する関数（ワーカースレッドで呼ばれる）
+            backend: UIBackendインスタンス（ワーカースレッドの初期化に使用）
+            name: スレッド名
+            on_idle: キューが空になったときにワーカースレッドで呼ばれる関数（出力の書き出し等）
+        """
+        self.handler = handler
+        self.on_idle = on_idle
+        self.backend = backend
+        self.name = name
+        self.stats = {"submitted": 0, "processed": 0, "failed": 0, "max_latency": 0.0}
+        self._queue = deque()
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread = None
+        self._stopping = False
+        self._count = 0
+
+    @property
+    def pending(self):
+        """キューに入っている（解析を終えていない）クリックの数"""
+        with self._cond:
+            return len(self._queue) + self._busy
+
+    def submit(self, control, x, y, alias=None):
+        """
+        クリックした要素の解析を要求し、すぐに戻る。
+
+        Returns:
+            Capture: キューに入れた情報
+        """
+        with self._cond:
+            self._count += 1
+            capture = Capture(self._count, control, x, y, time.monotonic(), alias)
+            self._queue.append(capture)
+            self.stats["submitted"] += 1
+            self._start()
+        return capture
+
+    def drain(self, timeout=None):
+        """キューのクリックをすべて処理し終えるまで待つ。終えた場合はTrueを返す。"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._queue and not self._busy, timeout)
+
+    def close(self):
+        """キューを処理し終えてからスレッドを停止する。"""
+        self.drain()
+        with self._cond:
+            thread = self._thread
+            self._stopping = True
+            self._cond.notify_all()
+        if thread is not None:
+            thread.join()
+
+    def _start(self):
+        if self._thread is None:
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        self._cond.notify_all()
+
+    def _run(self):
+        try:
+            with self.backend.thread_context():
+                while True:
+                    with self._cond:
+                        self._cond.wait_for(lambda: self._queue or self._stopping)
+                        if not self._queue:
+                            self._thread = None
+                            return
+                        capture = self._queue.popleft()
+                        self._busy = True
+                    try:
+                        self.handler(capture)
+                        self.stats["processed"] += 1
+                        if self.on_idle is not None and not self._queue:
+                            self.on_idle()
+                    except Exception as e:
+                        self.stats["failed"] += 1
+                        print(f"\n[Clicked at {capture.x}, {capture.y}] Error: {e}")
+                    finally:
+                        latency = time.monotonic() - capture.timestamp
+                        with self._cond:
+                            self.stats["max_latency"] = max(self.stats["max_latency"], latency)
+                            self._busy = False
+                            self._cond.notify_all()
+        except BaseException:
+            # スレッドの初期化に失敗した場合も、待機中のdrain()が戻れるようにキューを破棄する
+            with self._cond:
+                self.stats["failed"] += len(self._queue)
+                self._queue.clear()
+                self._busy = False
+                self._thread = None
+                self._cond.notify_all()
+            raise
@@ -0,0 +1,52 @@
+"""
+UIバックエンド
+
+UI操作（ウィンドウ列挙、子孫検索、プロパティ/パターン取得、入力、フォーカス、キャプチャ）を
+抽象化する。既定はuiautomationを使用するUIABackendで、最初のUI操作の時点で生成される
+（uiautomation / comtypesの読み込みとDPI設定は、UIに触れないコマンドでは行われない）。
+テストやベンチマークではFakeBackendをset_backend()または各コンポーネントの引数で渡す。
+"""
+
+from .base import UIBackend
+
+_backend = None
+
+
+class _DeferredBackend:
+    """最初に属性が参照されたときにプロセス全体のバックエンドを生成して委譲するプロキシ。"""
+
+    def __getattr__(self, name):
+        return getattr(_current_backend(), name)
+
+    def __repr__(self):
+        return f"<deferred backend: {_backend!r}>"
+
+
+_deferred = _DeferredBackend()
+
+
+def _current_backend():
+    global _backend
+    if _backend is None:
+        # uiautomationはWindows専用で読み込みも重いため、必要になるまでインポートしない
+        from .uia import UIABackend
+        _backend = UIABackend()
+    return _backend
+
+
+def get_backend():
+    """
+    現在のバックエンドを返す。
+
+    未設定の場合は、最初のUI操作でUIABackendを生成するプロキシを返す。
+    """
+    return _backend if _backend is not None else _deferred
+
+
+def set_backend(backend):
+    """プロセス全体で使用するバックエンドを設定する。"""
+    global _backend
+    _backend = backend
+
+
+__all__ = ['UIBackend', 'get_backend', 'set_backend']
@@ -0,0 +1,200 @@
+"""
+UIBackend - UI操作バックエンドのインターフェース
+
+ElementFinder / ActionExecutor / FocusManager / PathGenerator / スクリーンショットは
+uiautomationモジュールを直接呼ばず、このインターフェースを経由してUIを操作する。
+
+要素オブジェクトはバックエンドごとの実装でよいが、uiautomation.Controlと同名の
+読み取り専用プロパティ（Name, ControlTypeName, AutomationId, ClassName,
+BoundingRectangle, IsEnabled, IsOffscreen, NativeWindowHandle,
+IsKeyboardFocusable, HasKeyboardFocus）を持つこと。
+BoundingRectangleは left/top/right/bottom 属性と width()/height() メソッドを持つ。
+
+パターンは名前（"InvokePattern", "ValuePattern" など）で取得し、返されるオブジェクトは
+uiautomationのパターンと同名のメソッド・プロパティ（Invoke(), Value, SetValue() など）を持つ。
+"""
+
+
+# 検索パラメータで使用できるキー
+SEARCH_KEYS = ("ControlTypeName", "Name", "RegexName", "AutomationId", "ClassName", "searchDepth")
+
+MAX_SEARCH_DEPTH = 0xFFFFFFFF
+
+# スナップショット等で扱うパターン名（順序はビット位置として使用されるため変更しないこと）
+PATTERN_NAMES = (
+    "InvokePattern", "ValuePattern", "TogglePattern", "SelectionItemPattern", "SelectionPattern",
+    "ExpandCollapsePattern", "ScrollItemPattern", "TextPattern", "WindowPattern",
+)
+
+
+class ScreenImage:
+    """
+    キャプチャした画像（未エンコード）。
+
+    pixelsは上の行から順に並んだ1ピクセル4バイト（B, G, R, A）のbytes。
+    """
+
+    __slots__ = ("width", "height", "pixels")
+
+    def __init__(self, width, height, pixels):
+        self.width = width
+        self.height = height
+        self.pixels = pixels
+
+    def __repr__(self):
+        return f"<ScreenImage {self.width}x{self.height}>"
+
+
+class UIBackend:
+    """UI操作バックエンドの基底クラス。"""
+
+    name = "base"
+
+    # --- 初期化 ---
+    def set_dpi_awareness(self):
+        """正確な座標のためにHigh DPI Awarenessを有効化する（サポートされていなければ何もしない）。"""
+        pass
+
+    def thread_context(self):
+        """
+        ワーカースレッドでバックエンドを使用する間有効にするコンテキストマネージャを返す。
+
+        COMの初期化が必要なバックエンドはスレッドごとの初期化・終了処理を行う。
+        """
+        import contextlib
+        return contextlib.nullcontext()
+
+    # --- ウィンドウ列挙・検索 ---
+    def get_root(self):
+        """デスクトップ（ルート）要素を返す。"""
+        raise NotImplementedError
+
+    def find(self, parent, search_params, found_index=1, timeout=0):
+        """
+        parentの子孫から条件に一致する要素を検索する。
+
+        検索は起点を除く子孫を深さ優先の前順で走査し、searchDepth以内で
+        条件に一致したfound_index番目の要素を返す（uiautomationのControl検索と同じ）。
+
+        Args:
+            parent: 検索の起点。Noneの場合はデスクトップ
+            search_params: SEARCH_KEYSをキーとする検索条件。searchDepth省略時は全子孫
+            found_index: 一致した要素のうち何番目を返すか（1始まり）
+            timeout: 見つかるまで待機する最大秒数
+
+        Returns:
+            見つかった要素、またはNone
+        """
+        raise NotImplementedError
+
+    def exists(self, element):
+        """要素がまだUIツリー上に存在するかを返す。"""
+        raise NotImplementedError
+
+    # --- ツリー走査 ---
+    def get_children(self, element):
+        raise NotImplementedError
+
+    def get_parent(self, element):
+        raise NotImplementedError
+
+    def get_next_sibling(self, element):
+        raise NotImplementedError
+
+    def get_previous_sibling(self, element):
+        raise NotImplementedError
+
+    def get_top_level(self, element):
+        """要素が属するトップレベルウィンドウを返す。"""
+        raise NotImplementedError
+
+    def walk(self, element, max_depth=MAX_SEARCH_DEPTH):
+        """
+        前順の深さ優先走査で (要素, 深さ) を生成する。起点自身は深さ0で最初に生成される。
+        """
+        yield element, 0
+        stack = [(iter(self.get_children(element)), 1)]
+        while stack:
+            children, depth = stack[-1]
+            child = next(children, None)
+            if child is None:
+                stack.pop()
+                continue
+            yield child, depth
+            if depth < max_depth:
+                stack.append((iter(self.get_children(child)), depth + 1))
+
+    def same_element(self, element1, element2):
+        """2つの要素が同一のUI要素かどうかを返す。"""
+        raise NotImplementedError
+
+    def get_runtime_id(self, element):
+        """要素のRuntimeId（要素が存在する間は一意なintのタプル）を返す。"""
+        raise NotImplementedError
+
+    def element_from_point(self, x, y):
+        raise NotImplementedError
+
+    # --- パターン ---
+    def get_pattern(self, element, pattern_name):
+        """パターン名（例: "InvokePattern"）でパターンを取得する。未サポートならNone。"""
+        raise NotImplementedError
+
+    def get_supported_patterns(self, element):
+        """要素がサポートするパターン名（PATTERN_NAMESのうち）のリストを返す。"""
+        supported = []
+        for name in PATTERN_NAMES:
+            try:
+                if self.get_pattern(element, name):
+                    supported.append(name)
+            except Exception:
+                continue
+        return supported
+
+    # --- 入力 ---
+    def click(self, element, wait_time=None):
+        """要素の中央をクリックする。wait_timeがNoneの場合はバックエンドの既定待機時間。"""
+        raise NotImplementedError
+
+    def send_keys(self, keys, element=None):
+        """キーを送信する。elementを指定した場合はその要素（ウィンドウ）に送信する。"""
+        raise NotImplementedError
+
+    def set_clipboard_text(self, text):
+        raise NotImplementedError
+
+    def get_clipboard_text(self):
+        raise NotImplementedError
+
+    def get_cursor_pos(self):
+        raise NotImplementedError
+
+    def is_mouse_button_down(self):
+        """左または右のマウスボタンが押されているかを返す。"""
+        raise NotImplementedError
+
+    def input_source(self):
+        """クリック・ESCのイベントを待機する入力ソース（input_events.InputSource）を返す。"""
+        raise NotImplementedError
+
+    # --- フォーカス ---
+    def set_focus(self, element):
+        """UI Automationでフォーカスを設定する。失敗時は例外を送出する。"""
+        raise NotImplementedError
+
+    def set_native_focus(self, hwnd):
+        """ウィンドウハンドルに対してネイティブAPI（Win32 SetFocus）でフォーカスを設定する。"""
+        raise NotImplementedError
+
+    # --- キャプチャ ---
+    def grab_screen(self, rect=None):
+        """
+        画面の画像をエンコードせずに取得する（エンコードと保存は呼び出し側で別スレッドに任せる）。
+
+        Args:
+            rect: 取得する範囲（スクリーン座標の left/top/right/bottom を持つ矩形）。Noneの場合は画面全体
+
+        Returns:
+            ScreenImage
+        """
+        raise NotImplementedError
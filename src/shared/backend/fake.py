@@ -0,0 +1,525 @@
+"""
+FakeBackend - 決定的なインメモリのバックエンド
+
+JSONまたはプログラムで組み立てたコントロールツリー上で、ウィンドウ列挙・子孫検索・
+プロパティ/パターン取得・入力・フォーカス・キャプチャを再現する。
+Windowsやライブのデスクトップは不要で、同じツリーからは常に同じ結果になる。
+
+ツリーJSONの形式:
+    {"windows": [ノード, ...]}  または  ノード1つ（デスクトップ直下のウィンドウ）
+
+    ノード = {
+        "ControlType": "WindowControl", "Name": "...", "AutomationId": "...", "ClassName": "...",
+        "Rect": [left, top, right, bottom], "IsEnabled": true, "IsOffscreen": false,
+        "Patterns": {"ValuePattern": {"Value": "abc"}, "InvokePattern": {}},
+        "Children": [ノード, ...]
+    }
+
+レイテンシ注入:
+    latency={"find": 0.05, "property": 0.001} のように呼び出し種別ごとの遅延（秒）を指定する。
+    数値を1つだけ指定すると全種別に同じ遅延を適用する。
+    種別ごとの呼び出し回数は calls に記録される。
+
+入力イベント:
+    backend.events.post(InputEvent.click(x, y)) のようにクリック・ESCを投入すると、
+    input_source() を待機しているInspectorに順に渡される。
+"""
+
+import itertools
+import json
+import re
+import struct
+import time
+import zlib
+from collections import Counter
+
+from .base import UIBackend, ScreenImage, MAX_SEARCH_DEPTH
+from .input_events import ScriptedInputSource
+
+
+# 呼び出し種別（レイテンシと回数の集計単位）
+CALL_KINDS = ("find", "navigate", "property", "pattern", "input", "focus", "capture")
+
+
+def parse_latency(spec):
+    """
+    レイテンシ指定文字列を解析する。
+
+    "0.01" は全種別共通、"find=0.05,property=0.001" は種別ごとの遅延（秒）。
+    空またはNoneの場合はNoneを返す。
+    """
+    if not spec:
+        return None
+    if "=" not in spec:
+        return float(spec)
+    latency = {}
+    for item in spec.split(","):
+        kind, _, seconds = item.partition("=")
+        kind = kind.strip()
+        if kind not in CALL_KINDS:
+            raise ValueError(f"Unknown latency kind '{kind}' (expected one of: {', '.join(CALL_KINDS)})")
+        latency[kind] = float(seconds)
+    return latency
+
+
+class Rect:
+    """BoundingRectangle互換の矩形。"""
+
+    def __init__(self, left=0, top=0, right=0, bottom=0):
+        self.left = left
+        self.top = top
+        self.right = right
+        self.bottom = bottom
+
+    def width(self):
+        return self.right - self.left
+
+    def height(self):
+        return self.bottom - self.top
+
+    def contains(self, x, y):
+        return self.left <= x < self.right and self.top <= y < self.bottom
+
+
+class FakeElement:
+    """
+    インメモリツリーのノード。
+
+    小文字の属性（name, control_type など）は生の値で、テストやツリー構築用。
+    uiautomation互換の大文字プロパティ（Name, ControlTypeName など）は
+    1回の読み取りを1呼び出しとして数え、レイテンシを注入する。
+    """
+
+    def __init__(self, backend, control_type, name="", automation_id="", class_name="", rect=None,
+                 parent=None, enabled=True, offscreen=False, focusable=True, hwnd=0, patterns=None):
+        self.backend = backend
+        self.control_type = control_type
+        self.name = name
+        self.automation_id = automation_id
+        self.class_name = class_name
+        self.rect = rect or Rect()
+        self.enabled = enabled
+        self.offscreen = offscreen
+        self.focusable = focusable
+        self.hwnd = hwnd
+        self.patterns = patterns or {}  # パターン名 -> 状態の辞書
+        self.runtime_id = (42, next(backend._runtime_ids))
+        self.parent = parent
+        self.children = []
+        if parent is not None:
+            parent.children.append(self)
+
+    def __repr__(self):
+        return f"<FakeElement {self.control_type} Name='{self.name}'>"
+
+    def _read(self, value):
+        self.backend._call("property")
+        return value
+
+    @property
+    def Name(self):
+        return self._read(self.name)
+
+    @property
+    def ControlTypeName(self):
+        return self._read(self.control_type)
+
+    @property
+    def AutomationId(self):
+        return self._read(self.automation_id)
+
+    @property
+    def ClassName(self):
+        return self._read(self.class_name)
+
+    @property
+    def BoundingRectangle(self):
+        return self._read(self.rect)
+
+    @property
+    def IsEnabled(self):
+        return self._read(self.enabled)
+
+    @property
+    def IsOffscreen(self):
+        return self._read(self.offscreen)
+
+    @property
+    def NativeWindowHandle(self):
+        return self._read(self.hwnd)
+
+    @property
+    def IsKeyboardFocusable(self):
+        return self._read(self.focusable)
+
+    @property
+    def HasKeyboardFocus(self):
+        return self._read(self.backend.focused is self)
+
+
+class _FakeTextRange:
+    def __init__(self, pattern):
+        self._pattern = pattern
+
+    def GetText(self, max_length=-1):
+        text = self._pattern.state.get("Text", "")
+        return text if max_length < 0 else text[:max_length]
+
+
+class FakePattern:
+    """
+    パターンの共通実装。状態は要素のpatterns辞書に保持され、
+    Value / ToggleState / IsSelected などの読み取りはその辞書を参照する。
+    操作メソッドは状態を更新し、backend.actions に記録される。
+    """
+
+    def __init__(self, backend, element, name):
+        self.backend = backend
+        self.element = element
+        self.name = name
+        self.state = element.patterns[name]
+
+    def __getattr__(self, attr):
+        state = self.__dict__.get("state", {})
+        if attr in state:
+            self.backend._call("property")
+            return state[attr]
+        raise AttributeError(attr)
+
+    def _record(self, action, value=None):
+        self.backend._call("input")
+        self.backend.actions.append((action, self.element.name, value))
+
+    @property
+    def DocumentRange(self):
+        return _FakeTextRange(self)
+
+    def Invoke(self):
+        self._record("Invoke")
+
+    def SetValue(self, value):
+        self._record("SetValue", value)
+        self.state["Value"] = value
+
+    def Toggle(self):
+        self._record("Toggle")
+        self.state["ToggleState"] = 0 if self.state.get("ToggleState", 0) else 1
+
+    def Select(self):
+        self._record("Select")
+        # 兄弟の選択を解除（単一選択）
+        if self.element.parent is not None:
+            for sibling in self.element.parent.children:
+                state = sibling.patterns.get("SelectionItemPattern")
+                if state is not None:
+                    state["IsSelected"] = False
+        self.state["IsSelected"] = True
+
+    def Expand(self):
+        self._record("Expand")
+        self.state["ExpandCollapseState"] = 1
+
+    def Collapse(self):
+        self._record("Collapse")
+        self.state["ExpandCollapseState"] = 0
+
+    def ScrollIntoView(self):
+        self._record("ScrollIntoView")
+
+    def Close(self):
+        self._record("Close")
+        self.backend.remove_element(self.element)
+
+
+class FakeBackend(UIBackend):
+    """インメモリのコントロールツリーを操作するバックエンド。"""
+
+    name = "fake"
+
+    def __init__(self, latency=None, wait_on_miss=False):
+        """
+        FakeBackend初期化。
+
+        Args:
+            latency: 呼び出し種別ごとの遅延（秒）の辞書、または全種別共通の数値
+            wait_on_miss: Trueの場合、検索ミス時にtimeout秒だけ待機する（実環境の待ち時間を再現）
+        """
+        if isinstance(latency, (int, float)):
+            latency = {kind: latency for kind in CALL_KINDS}
+        self.latency = dict(latency or {})
+        self.wait_on_miss = wait_on_miss
+        self.calls = Counter()
+        self.actions = []   # (操作, 要素名, 値) の記録
+        self.version = 0    # 要素の追加・削除ごとに増える（grab_screenの画像の内容に反映される）
+        self.clipboard = ""
+        self.cursor = (0, 0)
+        self.mouse_down = False
+        self.events = ScriptedInputSource()  # input_source() が返す入力ソース（テストでイベントをpostする）
+        self.focused = None
+        self._next_hwnd = 0x10000
+        self._runtime_ids = itertools.count(1)
+        self.root = FakeElement(self, "PaneControl", "Desktop", class_name="#32769", rect=Rect(0, 0, 1920, 1080))
+
+    # --- ツリー構築 ---
+    @classmethod
+    def from_json(cls, path, **kwargs):
+        """JSONファイルからツリーを読み込んだFakeBackendを生成する。"""
+        backend = cls(**kwargs)
+        with open(path, "r", encoding="utf-8") as f:
+            backend.load_tree(json.load(f))
+        return backend
+
+    @classmethod
+    def from_file(cls, path, **kwargs):
+        """JSONまたはスナップショットファイル（形式は自動判定）からFakeBackendを生成する。"""
+        from src.shared.snapshot import is_snapshot_file
+
+        if is_snapshot_file(path):
+            return cls.from_snapshot(path, **kwargs)
+        return cls.from_json(path, **kwargs)
+
+    @classmethod
+    def from_snapshot(cls, path, **kwargs):
+        """スナップショットファイルからツリーを読み込んだFakeBackendを生成する。"""
+        from src.shared.snapshot import Snapshot
+
+        backend = cls(**kwargs)
+        with Snapshot(path) as snapshot:
+            elements = []
+            for index in range(snapshot.node_count):
+                node = snapshot.node(index)
+                parent = elements[snapshot.parent[index]] if index else None
+                elements.append(backend.add_element(
+                    parent, node["ControlType"], node["Name"],
+                    automation_id=node["AutomationId"],
+                    class_name=node["ClassName"],
+                    rect=Rect(*node["Rect"]),
+                    enabled=node["IsEnabled"],
+                    offscreen=node["IsOffscreen"],
+                    focusable=node["IsKeyboardFocusable"],
+                    patterns={name: {} for name in node["Patterns"]},
+                ))
+        return backend
+
+    def load_tree(self, data):
+        """JSON互換の辞書からウィンドウをデスクトップ直下に追加する。"""
+        nodes = data["windows"] if "windows" in data else [data]
+        for node in nodes:
+            self._load_node(self.root, node)
+
+    def _load_node(self, parent, node):
+        rect = node.get("Rect")
+        element = self.add_element(
+            parent,
+            node.get("ControlType", "PaneControl"),
+            name=node.get("Name", ""),
+            automation_id=node.get("AutomationId", ""),
+            class_name=node.get("ClassName", ""),
+            rect=Rect(*rect) if rect else None,
+            enabled=node.get("IsEnabled", True),
+            offscreen=node.get("IsOffscreen", False),
+            focusable=node.get("IsKeyboardFocusable", True),
+            hwnd=node.get("NativeWindowHandle", 0),
+            patterns={name: dict(state) for name, state in node.get("Patterns", {}).items()},
+        )
+        for child in node.get("Children", []):
+            self._load_node(element, child)
+        return element
+
+    def add_element(self, parent, control_type, name="", **props):
+        """
+        parent（Noneの場合はデスクトップ）の子として要素を追加する。
+
+        Args:
+            parent: 親要素
+            control_type: コントロール種別（例: "ButtonControl"）
+            name: Name
+            **props: FakeElementのキーワード引数（automation_id, class_name, rect, patterns など）
+        """
+        if control_type == "WindowControl" and not props.get("hwnd"):
+            props["hwnd"] = self._next_hwnd
+            self._next_hwnd += 1
+        self.version += 1
+        return FakeElement(self, control_type, name, parent=parent or self.root, **props)
+
+    def remove_element(self, element):
+        """要素をツリーから取り除く（ウィンドウを閉じる、項目が消える等）。"""
+        self.version += 1
+        if element.parent is not None:
+            element.parent.children.remove(element)
+            element.parent = None
+        if self.focused is not None and not self._attached(self.focused):
+            self.focused = None
+
+    def _attached(self, element):
+        while element is not None:
+            if element is self.root:
+                return True
+            element = element.parent
+        return False
+
+    def _call(self, kind):
+        self.calls[kind] += 1
+        delay = self.latency.get(kind)
+        if delay:
+            time.sleep(delay)
+
+    # --- 検索 ---
+    def get_root(self):
+        return self.root
+
+    def find(self, parent, search_params, found_index=1, timeout=0):
+        self._call("find")
+        origin = parent if parent is not None else self.root
+        params = dict(search_params)
+        max_depth = params.pop("searchDepth", MAX_SEARCH_DEPTH)
+        regex = params.pop("RegexName", None)
+        pattern = re.compile(regex) if regex is not None else None
+
+        count = 0
+        for element, depth in self.walk(origin, max_depth):
+            if depth == 0 or not self._matches(element, params, pattern):
+                continue
+            count += 1
+            if count == found_index:
+                return element
+
+        if timeout and self.wait_on_miss:
+            time.sleep(timeout)
+        return None
+
+    def _matches(self, element, params, pattern):
+        if "ControlTypeName" in params and element.ControlTypeName != params["ControlTypeName"]:
+            return False
+        if "Name" in params and element.Name != params["Name"]:
+            return False
+        if pattern is not None and not pattern.match(element.Name):
+            return False
+        if "AutomationId" in params and element.AutomationId != params["AutomationId"]:
+            return False
+        if "ClassName" in params and element.ClassName != params["ClassName"]:
+            return False
+        return True
+
+    def exists(self, element):
+        self._call("find")
+        return self._attached(element)
+
+    # --- ツリー走査 ---
+    def get_children(self, element):
+        self._call("navigate")
+        return list(element.children)
+
+    def get_parent(self, element):
+        self._call("navigate")
+        return element.parent
+
+    def _sibling(self, element, offset):
+        self._call("navigate")
+        if element.parent is None:
+            return None
+        siblings = element.parent.children
+        index = siblings.index(element) + offset
+        return siblings[index] if 0 <= index < len(siblings) else None
+
+    def get_next_sibling(self, element):
+        return self._sibling(element, 1)
+
+    def get_previous_sibling(self, element):
+        return self._sibling(element, -1)
+
+    def get_top_level(self, element):
+        self._call("navigate")
+        node = element
+        while node.parent is not None and node.parent is not self.root:
+            node = node.parent
+        return node if node.parent is self.root else None
+
+    def same_element(self, element1, element2):
+        self._call("navigate")
+        return element1 is element2
+
+    def get_runtime_id(self, element):
+        self._call("property")
+        return element.runtime_id
+
+    def element_from_point(self, x, y):
+        """座標を含む最も深い要素を返す（後の兄弟ほど手前にあるものとする）。"""
+        self._call("find")
+        node = self.root
+        while True:
+            hit = next((child for child in reversed(node.children)
+                        if not child.offscreen and child.rect.contains(x, y)), None)
+            if hit is None:
+                return node if node is not self.root else None
+            node = hit
+
+    # --- パターン ---
+    def get_pattern(self, element, pattern_name):
+        self._call("pattern")
+        if pattern_name not in element.patterns:
+            return None
+        return FakePattern(self, element, pattern_name)
+
+    def get_supported_patterns(self, element):
+        self._call("pattern")
+        return list(element.patterns)
+
+    # --- 入力 ---
+    def click(self, element, wait_time=None):
+        self._call("input")
+        self.actions.append(("Click", element.name, None))
+        self.focused = element if element.focusable else self.focused
+
+    def send_keys(self, keys, element=None):
+        self._call("input")
+        target = element if element is not None else self.focused
+        self.actions.append(("SendKeys", target.name if target is not None else "", keys))
+
+    def set_clipboard_text(self, text):
+        self._call("input")
+        self.clipboard = text
+
+    def get_clipboard_text(self):
+        self._call("input")
+        return self.clipboard
+
+    def get_cursor_pos(self):
+        return self.cursor
+
+    def is_mouse_button_down(self):
+        return self.mouse_down
+
+    def input_source(self):
+        return self.events
+
+    # --- フォーカス ---
+    def set_focus(self, element):
+        self._call("focus")
+        if not self._attached(element) or not element.enabled:
+            raise RuntimeError(f"Cannot set focus on {element!r}")
+        self.focused = element
+        self.actions.append(("SetFocus", element.name, None))
+
+    def set_native_focus(self, hwnd):
+        self._call("focus")
+        for element, _ in self.walk(self.root):
+            if element.hwnd == hwnd:
+                self.focused = element
+                self.actions.append(("SetFocus", element.name, None))
+                return
+
+    # --- キャプチャ ---
+    def grab_screen(self, rect=None):
+        """
+        デスクトップ（rect指定時はデスクトップと重なる範囲）の大きさの単色画像を返す。
+
+        色はツリーの変更回数と記録した操作の数から決まり、画面に変化がなければ同じ画像になる。
+        """
+        self._call("capture")
+        desktop = self.root.rect
+        rect = rect or desktop
+        width = max(1, min(rect.right, desktop.right) - max(rect.left, desktop.left))
+        height = max(1, min(rect.bottom, desktop.bottom) - max(rect.top, desktop.top))
+        state = zlib.crc32(struct.pack(">II", self.version, len(self.actions)))
+        return ScreenImage(width, height, struct.pack("<I", state | 0xFF000000) * (width * height))
@@ -0,0 +1,52 @@
+"""
+ElementRef - RuntimeIdによる要素の同一性
+
+UIAの要素オブジェクトは取得のたびに別のラッパーになるため、`==` では同じ要素か判定できず、
+ControlsAreSameはプロセス間の呼び出しになる。ElementRefは要素のRuntimeIdを最初に必要になった
+ときに1回だけ取得し、ハッシュ・比較をRuntimeIdで行う（dictのキー・setの要素として使用できる）。
+
+    target = ElementRef(backend, element)
+    seen = {ElementRef(backend, child) for child in children}
+    if target in seen: ...
+
+RuntimeIdを取得できない・空の要素（消えた要素等）は、同じオブジェクトとだけ等しいものとして扱う。
+"""
+
+
+class ElementRef:
+    """要素と、そのRuntimeId（初回参照時に取得）。"""
+
+    __slots__ = ("backend", "element", "_runtime_id")
+
+    def __init__(self, backend, element):
+        self.backend = backend
+        self.element = element
+        self._runtime_id = None
+
+    @classmethod
+    def of(cls, backend, element):
+        """elementがElementRefの場合はそのまま、そうでなければ包んで返す。"""
+        return element if isinstance(element, ElementRef) else cls(backend, element)
+
+    @property
+    def runtime_id(self):
+        if self._runtime_id is None:
+            try:
+                runtime_id = tuple(self.backend.get_runtime_id(self.element) or ())
+            except Exception:
+                runtime_id = ()
+            # 空のRuntimeId（取得できない要素）は、ラッパーが要素を保持している間は他のオブジェクトと
+            # 重複しないid()で代用する（空同士を等しいものとして扱わない）
+            self._runtime_id = runtime_id or ("object", id(self.element))
+        return self._runtime_id
+
+    def __eq__(self, other):
+        if not isinstance(other, ElementRef):
+            return NotImplemented
+        return self.element is other.element or self.runtime_id == other.runtime_id
+
+    def __hash__(self):
+        return hash(self.runtime_id)
+
+    def __repr__(self):
+        return f"ElementRef({self.runtime_id!r})"
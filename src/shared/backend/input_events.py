@@ -0,0 +1,209 @@
+"""
+入力イベント
+
+Inspectorのクリック・ESCの検出を、ポーリング（50msごとのGetAsyncKeyState / keyboard.is_pressed）
+ではなくイベントの待機で行うための入力ソース。
+
+    - InputSource:         イベントのキュー。next_event() は次のイベントまでブロックする（待機中はCPUを使わない）
+    - WindowsHookSource:   低レベルのマウス・キーボードフック（WH_MOUSE_LL / WH_KEYBOARD_LL）で
+                           ボタンの押下・ESCをキューに入れる（UIABackend.input_source()）
+    - ScriptedInputSource: 指定したイベントを順に返す（FakeBackend.input_source()、テスト用）
+
+例:
+    with backend.input_source() as events:
+        event = events.next_event()
+        if event.kind == CLICK:
+            control = backend.element_from_point(event.x, event.y)
+"""
+
+import queue
+import threading
+
+
+CLICK = "click"
+ESCAPE = "escape"
+
+
+class InputEvent:
+    """入力イベント（クリックはスクリーン座標とボタンを持つ）。"""
+
+    __slots__ = ("kind", "x", "y", "button")
+
+    def __init__(self, kind, x=0, y=0, button=None):
+        self.kind = kind
+        self.x = x
+        self.y = y
+        self.button = button
+
+    @classmethod
+    def click(cls, x, y, button="left"):
+        return cls(CLICK, x, y, button)
+
+    @classmethod
+    def escape(cls):
+        return cls(ESCAPE)
+
+    def __repr__(self):
+        if self.kind == CLICK:
+            return f"InputEvent.click({self.x}, {self.y}, {self.button!r})"
+        return f"InputEvent({self.kind!r})"
+
+
+class InputSource:
+    """入力イベントのキュー。start() でイベントの取得を始め、stop() で止める。"""
+
+    def __init__(self):
+        self._events = queue.SimpleQueue()
+        self._started = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def start(self):
+        self._started = True
+
+    def stop(self):
+        self._started = False
+
+    def post(self, event):
+        """イベントをキューに入れる（フックのスレッド等から呼ばれる）。"""
+        self._events.put(event)
+
+    def next_event(self, timeout=None):
+        """
+        次のイベントを返す。
+
+        Args:
+            timeout: 待機する最大秒数（Noneの場合は無期限）
+
+        Returns:
+            InputEvent: timeout秒以内にイベントがなければNone
+        """
+        if not self._started:
+            self.start()
+        try:
+            return self._events.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def clear(self):
+        """キューに溜まっているイベントを破棄する（対話モードの入力中のクリック等）。"""
+        while True:
+            try:
+                self._events.get_nowait()
+            except queue.Empty:
+                return
+
+
+class ScriptedInputSource(InputSource):
+    """指定したイベントを順に返す入力ソース（テスト用）。post() で後からイベントを追加できる。"""
+
+    def __init__(self, events=()):
+        super().__init__()
+        for event in events:
+            self.post(event)
+
+
+class WindowsHookSource(InputSource):
+    """低レベルのマウス・キーボードフックでボタンの押下とESCを取得する入力ソース（Windows）。"""
+
+    def __init__(self):
+        super().__init__()
+        self._thread = None
+        self._thread_id = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        ready = threading.Event()
+        errors = []
+        self._thread = threading.Thread(target=self._run, args=(ready, errors), name="InputHooks", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            self._thread.join()
+            self._thread = None
+            raise errors[0]
+        super().start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        import ctypes
+        WM_QUIT = 0x0012
+        ctypes.windll.user32.PostThreadMessageW(self._thread_id, WM_QUIT, 0, 0)
+        self._thread.join()
+        self._thread = None
+        super().stop()
+
+    def _run(self, ready, errors):
+        # フックは設定したスレッドのメッセージループで呼ばれるため、専用のスレッドで設定する
+        try:
+            self._hook_loop(ready)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            ready.set()
+
+    def _hook_loop(self, ready):
+        import ctypes
+        from ctypes import wintypes
+
+        WH_KEYBOARD_LL, WH_MOUSE_LL = 13, 14
+        WM_KEYDOWN, WM_SYSKEYDOWN = 0x0100, 0x0104
+        BUTTONS = {0x0201: "left", 0x0204: "right"}  # WM_LBUTTONDOWN, WM_RBUTTONDOWN
+        VK_ESCAPE = 0x1B
+
+        class MSLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [("pt", wintypes.POINT), ("mouseData", wintypes.DWORD), ("flags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_void_p)]
+
+        class KBDLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [("vkCode", wintypes.DWORD), ("scanCode", wintypes.DWORD), ("flags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_void_p)]
+
+        LRESULT = ctypes.c_ssize_t
+        HOOKPROC = ctypes.WINFUNCTYPE(LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        user32 = ctypes.windll.user32
+        kernel32 = ctypes.windll.kernel32
+        user32.SetWindowsHookExW.argtypes = [ctypes.c_int, HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD]
+        user32.SetWindowsHookExW.restype = ctypes.c_void_p
+        user32.CallNextHookEx.argtypes = [ctypes.c_void_p, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM]
+        user32.CallNextHookEx.restype = LRESULT
+        user32.UnhookWindowsHookEx.argtypes = [ctypes.c_void_p]
+        kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+        # フックの処理はキューに入れるだけにする（時間がかかるとOSがフックを外す）
+        def on_mouse(code, wparam, lparam):
+            if code == 0 and wparam in BUTTONS:
+                info = ctypes.cast(lparam, ctypes.POINTER(MSLLHOOKSTRUCT)).contents
+                self.post(InputEvent.click(info.pt.x, info.pt.y, BUTTONS[wparam]))
+            return user32.CallNextHookEx(None, code, wparam, lparam)
+
+        def on_key(code, wparam, lparam):
+            if code == 0 and wparam in (WM_KEYDOWN, WM_SYSKEYDOWN):
+                if ctypes.cast(lparam, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents.vkCode == VK_ESCAPE:
+                    self.post(InputEvent.escape())
+            return user32.CallNextHookEx(None, code, wparam, lparam)
+
+        mouse_proc, key_proc = HOOKPROC(on_mouse), HOOKPROC(on_key)  # 参照を保持する
+        module = kernel32.GetModuleHandleW(None)
+        self._thread_id = kernel32.GetCurrentThreadId()
+        hooks = [user32.SetWindowsHookExW(WH_MOUSE_LL, mouse_proc, module, 0),
+                 user32.SetWindowsHookExW(WH_KEYBOARD_LL, key_proc, module, 0)]
+        try:
+            if not all(hooks):
+                raise OSError(f"Failed to install input hooks (error {kernel32.GetLastError()})")
+            ready.set()
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+        finally:
+            for hook in hooks:
+                if hook:
+                    user32.UnhookWindowsHookEx(hook)
@@ -0,0 +1,132 @@
+"""
+UIABackend - uiautomationモジュールによるバックエンド実装（Windows）
+
+各メソッドはこれまでElementFinder / ActionExecutor などが直接行っていた
+uiautomation / Win32 APIの呼び出しをそのまま移したもの。
+"""
+
+import ctypes
+import uiautomation as auto
+
+from .base import UIBackend, ScreenImage, MAX_SEARCH_DEPTH
+
+
+class UIABackend(UIBackend):
+    """uiautomation（Microsoft UI Automation）を使用するバックエンド。"""
+
+    name = "uia"
+
+    def __init__(self):
+        self.set_dpi_awareness()
+
+    def set_dpi_awareness(self):
+        try:
+            auto.SetProcessDpiAwareness(2) # Process_PerMonitorDpiAware
+        except Exception:
+            pass # サポートされていない場合は無視（例: 古いWindows）
+
+    def thread_context(self):
+        # メインスレッド以外ではスレッドごとにCOMを初期化する必要がある
+        return auto.UIAutomationInitializerInThread()
+
+    def get_root(self):
+        return auto.GetRootControl()
+
+    def find(self, parent, search_params, found_index=1, timeout=0):
+        params = dict(search_params)
+        if parent is None:
+            # デスクトップ直下のウィンドウ検索
+            if params.get("ControlTypeName") == "WindowControl":
+                del params["ControlTypeName"]
+                target = auto.WindowControl(foundIndex=found_index, **params)
+            else:
+                target = auto.Control(foundIndex=found_index, **params)
+        else:
+            target = parent.Control(foundIndex=found_index, **params)
+        if target.Exists(maxSearchSeconds=timeout):
+            return target
+        return None
+
+    def exists(self, element):
+        return element.Exists(maxSearchSeconds=0)
+
+    def get_children(self, element):
+        return element.GetChildren()
+
+    def get_parent(self, element):
+        return element.GetParentControl()
+
+    def get_next_sibling(self, element):
+        return element.GetNextSiblingControl()
+
+    def get_previous_sibling(self, element):
+        return element.GetPreviousSiblingControl()
+
+    def get_top_level(self, element):
+        return element.GetTopLevelControl()
+
+    def walk(self, element, max_depth=MAX_SEARCH_DEPTH):
+        return auto.WalkControl(element, includeTop=True, maxDepth=max_depth)
+
+    def same_element(self, element1, element2):
+        return auto.ControlsAreSame(element1, element2)
+
+    def get_runtime_id(self, element):
+        return tuple(element.GetRuntimeId())
+
+    def element_from_point(self, x, y):
+        return auto.ControlFromPoint(x, y)
+
+    def get_pattern(self, element, pattern_name):
+        return element.GetPattern(getattr(auto.PatternId, pattern_name))
+
+    def click(self, element, wait_time=None):
+        if wait_time is not None:
+            element.Click(waitTime=wait_time)
+        else:
+            element.Click()
+
+    def send_keys(self, keys, element=None):
+        if element is not None:
+            # 特定のウィンドウ（要素）に送信
+            element.SendKeys(keys)
+        else:
+            auto.SendKeys(keys)
+
+    def set_clipboard_text(self, text):
+        auto.SetClipboardText(text)
+
+    def get_clipboard_text(self):
+        return auto.GetClipboardText()
+
+    def get_cursor_pos(self):
+        return auto.GetCursorPos()
+
+    def is_mouse_button_down(self):
+        # 左クリック (0x01) または右クリック (0x02) をチェック
+        user32 = ctypes.windll.user32
+        return bool((user32.GetAsyncKeyState(0x01) & 0x8000) or (user32.GetAsyncKeyState(0x02) & 0x8000))
+
+    def input_source(self):
+        from .input_events import WindowsHookSource
+        return WindowsHookSource()
+
+    def set_focus(self, element):
+        element.SetFocus()
+
+    def set_native_focus(self, hwnd):
+        ctypes.windll.user32.SetFocus(hwnd)
+
+    def grab_screen(self, rect=None):
+        root = auto.GetRootControl()
+        x = y = width = height = 0  # 0は仮想デスクトップ全体
+        if rect is not None:
+            # FromControlの座標はルート（仮想デスクトップの左上）からの相対位置
+            desktop = root.BoundingRectangle
+            x, y = rect.left - desktop.left, rect.top - desktop.top
+            width, height = rect.right - rect.left, rect.bottom - rect.top
+        bitmap = auto.Bitmap.FromControl(root, x, y, width, height)
+        if bitmap is None:
+            raise RuntimeError("Failed to capture the screen")
+        # GetAllPixelColorsはARGBの32ビット整数の配列（メモリ上はB, G, R, Aの順）
+        return ScreenImage(bitmap.Width, bitmap.Height, bytes(bitmap.GetAllPixelColors()))
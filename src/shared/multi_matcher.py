@@ -0,0 +1,232 @@
+"""
+MultiPathMatcher - 多数のRPAパスをまとめて照合する
+
+エイリアスの検証のように多数のパスを同じウィンドウで評価する場合、パスごとに検索すると
+同じサブツリーを何度も走査することになる。ここではすべてのパスを同時に進める:
+
+    1. 各パスの「現在のセグメント」を検索クエリにする。起点ノード・フォールバック段階・
+       セグメントが同じクエリは1つにまとめる（共通の接頭辞を持つパスは検索を共有する）。
+    2. クエリを主キー（(ControlType, Name) / AutomationId / ClassName / ControlType）で
+       バケットに振り分け、ノードを前順に1回走査する。各ノードは自身のキーで引いたバケットの
+       クエリ（= そのノードに一致し得るすべてのセグメント）とだけ照合される。
+    3. 見つかったパスは次のセグメントへ、見つからなかったパスは次のフォールバック段階へ進み、
+       未解決のクエリがなくなるまで走査を繰り返す（走査回数は最長のパスのセグメント数程度）。
+
+各クエリは範囲内の一致数を最後まで数えるため、foundIndexを明示していないセグメントに
+複数の一致があれば「あいまい」として報告できる。フォールバック手順は
+rpa_path.PathSegment.attempts() を使用するため、結果はSnapshotResolverと一致する。
+"""
+
+import re
+from itertools import islice
+
+from src.shared.backend.base import MAX_SEARCH_DEPTH
+from src.shared.resolver import Resolution
+from src.shared.rpa_path import compile_path
+
+
+class PathMatch(Resolution):
+    """MultiPathMatcherの照合結果。"""
+
+    __slots__ = ("ambiguous",)
+
+    def __init__(self, node=None, fallbacks=None, failed_segment=None, error=None, ambiguous=None):
+        """
+        Args:
+            ambiguous: foundIndex未指定で複数のノードに一致したセグメントの (文字列, 一致数) のリスト
+            その他はResolutionと同じ
+        """
+        super().__init__(node, fallbacks, failed_segment, error)
+        self.ambiguous = ambiguous or []
+
+
+class _PathState:
+    """照合途中のパス。"""
+
+    __slots__ = ("path", "segments", "index", "current", "fallbacks", "ambiguous")
+
+    def __init__(self, path, segments, root):
+        self.path = path
+        self.segments = segments
+        self.index = 0
+        self.current = root
+        self.fallbacks = []
+        self.ambiguous = []
+
+
+class _Query:
+    """1回の走査で評価する検索（起点ノード + 検索条件 + foundIndex）。"""
+
+    __slots__ = ("start", "end", "max_depth", "bucket", "key", "required", "regex", "found_index",
+                 "count", "result", "waiters")
+
+    def __init__(self, start, end, max_depth, regex, found_index):
+        self.start = start
+        self.end = end
+        self.max_depth = max_depth
+        self.bucket = None      # 振り分け先のバケット名（Noneは一致するノードがない）
+        self.key = None
+        self.required = ()      # バケットのキー以外で確認する (列, 文字列ID)
+        self.regex = regex
+        self.found_index = found_index
+        self.count = 0
+        self.result = None
+        self.waiters = []
+
+
+class MultiPathMatcher:
+    """スナップショットに対して多数のRPAパスを同時に照合する。"""
+
+    def __init__(self, snapshot):
+        """
+        Args:
+            snapshot: Snapshotインスタンス
+        """
+        self.snapshot = snapshot
+        self.passes = 0     # ノード走査の回数
+        self.queries = 0    # 評価したクエリの数（まとめた後）
+        self.tests = 0      # ノードとクエリの照合回数
+        self._regex_cache = {}
+
+    def match(self, paths, root=0):
+        """
+        すべてのパスを照合する。
+
+        Args:
+            paths: RPAパスのリスト（重複は1回だけ評価する）
+            root: 起点のノード番号（既定はウィンドウ）
+
+        Returns:
+            dict: パス -> PathMatch
+        """
+        results = {}
+        pending = []
+        for path in dict.fromkeys(paths):
+            try:
+                segments = compile_path(path)
+            except ValueError as e:
+                results[path] = PathMatch(error=str(e))
+                continue
+            if segments:
+                pending.append((_PathState(path, segments, root), 0))
+            else:
+                results[path] = PathMatch(root)
+
+        while pending:
+            # 同じ起点・段階・セグメントのパスは1つのクエリを共有する
+            queries = {}
+            for state, stage in pending:
+                segment = state.segments[state.index]
+                key = (state.current, stage, segment.text)
+                query = queries.get(key)
+                if query is None:
+                    query = queries[key] = self._query(state.current, segment, stage)
+                query.waiters.append(state)
+            self.queries += len(queries)
+            self._scan(queries.values())
+
+            pending = []
+            for (_, stage, _), query in queries.items():
+                for state in query.waiters:
+                    segment = state.segments[state.index]
+                    if query.result is None:
+                        if stage < 2:
+                            pending.append((state, stage + 1))
+                        else:
+                            results[state.path] = PathMatch(fallbacks=state.fallbacks, failed_segment=segment.text,
+                                                            ambiguous=state.ambiguous)
+                        continue
+                    state.fallbacks.append(stage)
+                    if query.count > 1 and not segment.indexed:
+                        state.ambiguous.append((segment.text, query.count))
+                    state.current = query.result
+                    state.index += 1
+                    if state.index == len(state.segments):
+                        results[state.path] = PathMatch(state.current, state.fallbacks, ambiguous=state.ambiguous)
+                    else:
+                        pending.append((state, 0))
+        return results
+
+    def _query(self, parent, segment, stage):
+        """セグメントの指定段階の検索条件をクエリに変換する。"""
+        snapshot = self.snapshot
+        search_params = segment.attempts()[stage][1]
+        max_depth = snapshot.depth[parent] + search_params.get("searchDepth", MAX_SEARCH_DEPTH)
+        query = _Query(parent + 1, parent + snapshot.subtree[parent], max_depth,
+                       search_params.get("RegexName"), segment.found_index)
+
+        ids = {}
+        for key in ("ControlTypeName", "Name", "AutomationId", "ClassName"):
+            if key in search_params:
+                string_id = snapshot.string_ids(search_params[key])
+                if string_id is None:
+                    # 文字列表にない値には一致するノードがない（走査対象にしない）
+                    return query
+                ids[key] = string_id
+
+        # 最も絞り込める条件を主キーにし、残りの完全一致条件はノードごとに確認する
+        columns = {"ControlTypeName": snapshot.control_type, "AutomationId": snapshot.automation_id,
+                   "ClassName": snapshot.class_name}
+        if "Name" in ids:
+            query.bucket, query.key = "name", (ids["ControlTypeName"], ids["Name"])
+            checked = ("ControlTypeName",)
+        elif "AutomationId" in ids:
+            query.bucket, query.key = "id", ids["AutomationId"]
+            checked = ("AutomationId",)
+        elif "ClassName" in ids:
+            query.bucket, query.key = "class", ids["ClassName"]
+            checked = ("ClassName",)
+        else:
+            query.bucket, query.key = "type", ids["ControlTypeName"]
+            checked = ("ControlTypeName",)
+        query.required = tuple((columns[key], string_id) for key, string_id in ids.items()
+                               if key in columns and key not in checked)
+        return query
+
+    def _scan(self, queries):
+        """ノードを前順に1回走査し、各ノードを一致し得るすべてのクエリと照合する。"""
+        queries = [query for query in queries if query.bucket is not None and query.start < query.end]
+        if not queries:
+            return
+        self.passes += 1
+        buckets = {"name": {}, "id": {}, "class": {}, "type": {}}
+        for query in queries:
+            buckets[query.bucket].setdefault(query.key, []).append(query)
+        by_name, by_id, by_class, by_type = (buckets["name"], buckets["id"], buckets["class"], buckets["type"])
+
+        snapshot = self.snapshot
+        depth = snapshot.depth
+        # 全クエリの検索範囲を合わせた区間だけを走査する
+        lo = min(query.start for query in queries)
+        hi = max(query.end for query in queries)
+        columns = islice(zip(snapshot.control_type, snapshot.name, snapshot.automation_id, snapshot.class_name), lo, hi)
+        tests = 0
+        for node, (type_id, name_id, id_id, class_id) in enumerate(columns, lo):
+            candidates = by_name.get((type_id, name_id))
+            for bucket, key in ((by_id, id_id), (by_class, class_id), (by_type, type_id)):
+                if key and bucket:
+                    more = bucket.get(key)
+                    if more:
+                        candidates = candidates + more if candidates else more
+            if not candidates:
+                continue
+            node_depth = depth[node]
+            for query in candidates:
+                tests += 1
+                if not query.start <= node < query.end or node_depth > query.max_depth:
+                    continue
+                if any(column[node] != string_id for column, string_id in query.required):
+                    continue
+                if query.regex is not None and not self._regex_match(query.regex, name_id):
+                    continue
+                query.count += 1
+                if query.count == query.found_index:
+                    query.result = node
+        self.tests += tests
+
+    def _regex_match(self, pattern, name_id):
+        key = (pattern, name_id)
+        result = self._regex_cache.get(key)
+        if result is None:
+            result = self._regex_cache[key] = re.match(pattern, self.snapshot.string(name_id)) is not None
+        return result
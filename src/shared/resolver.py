@@ -0,0 +1,177 @@
+"""
+SnapshotResolver - スナップショット上でのRPAパスのオフライン解決
+
+ライブのアプリケーションに対してfind_element_by_pathを実行する代わりに、
+スナップショットから構築したインデックスでパスを評価する。
+フォールバック手順はrpa_path.PathSegment.attempts()を共有するため、
+foundIndex / searchDepth / フォールバック段階はライブ検索と同じ結果になる（待機は発生しない）。
+
+インデックス:
+    (ControlType, Name) / ControlType / AutomationId / ClassName ごとのノード番号の昇順リストと、
+    親ごとの子ノード配列。ノードは前順で格納されているため、ノードiの子孫は
+    i+1 から i+subtree[i]-1 の連続範囲になり、各リストから二分探索で切り出せる。
+    リストの並びは前順なので、uiautomationの検索順（深さ優先の前順）と一致する。
+"""
+
+import re
+from bisect import bisect_left, bisect_right
+
+from src.shared.backend.base import MAX_SEARCH_DEPTH
+from src.shared.rpa_path import compile_path, window_matches
+
+
+class Resolution:
+    """パス解決の結果。"""
+
+    __slots__ = ("node", "fallbacks", "failed_segment", "error")
+
+    def __init__(self, node=None, fallbacks=None, failed_segment=None, error=None):
+        """
+        Args:
+            node: 見つかったノード番号（見つからなければNone）
+            fallbacks: セグメントごとに使用されたフォールバック段階（0/1/2）
+            failed_segment: 見つからなかったセグメントの文字列
+            error: パスの形式エラー
+        """
+        self.node = node
+        self.fallbacks = fallbacks or []
+        self.failed_segment = failed_segment
+        self.error = error
+
+    @property
+    def found(self):
+        return self.node is not None
+
+
+class SnapshotResolver:
+    """スナップショットに対してRPAパスを評価する。"""
+
+    def __init__(self, snapshot):
+        """
+        SnapshotResolver初期化（インデックスを構築する）。
+
+        Args:
+            snapshot: Snapshotインスタンス
+        """
+        self.snapshot = snapshot
+        node_count = snapshot.node_count
+        self.by_type_name = {}
+        self.by_type = {}
+        self.by_automation_id = {}
+        self.by_class = {}
+        self.children = [[] for _ in range(node_count)]
+        self._regex_cache = {}  # (正規表現, 名前ID) -> 一致したか
+
+        columns = zip(snapshot.control_type, snapshot.name, snapshot.automation_id, snapshot.class_name,
+                      snapshot.parent)
+        for index, (type_id, name_id, id_id, class_id, parent) in enumerate(columns):
+            self.by_type_name.setdefault((type_id, name_id), []).append(index)
+            self.by_type.setdefault(type_id, []).append(index)
+            if id_id:
+                self.by_automation_id.setdefault(id_id, []).append(index)
+            if class_id:
+                self.by_class.setdefault(class_id, []).append(index)
+            if parent >= 0:
+                self.children[parent].append(index)
+
+    # --- ウィンドウ ---
+    def matches_window(self, target_app):
+        """スナップショットのルート（ウィンドウ）がTargetAppに一致するかを返す（find_windowと同じ規則）。"""
+        return window_matches(target_app, self.snapshot.string(self.snapshot.name[0]))
+
+    # --- パス ---
+    def resolve(self, path_string, root=0):
+        """
+        パスを解決する。
+
+        Args:
+            path_string: RPAパス
+            root: 起点のノード番号（既定はウィンドウ）
+
+        Returns:
+            Resolution
+        """
+        try:
+            segments = compile_path(path_string)
+        except ValueError as e:
+            return Resolution(error=str(e))
+
+        current = root
+        fallbacks = []
+        for segment in segments:
+            target = None
+            for fallback, search_params, _ in segment.attempts():
+                target = self.find(current, search_params, segment.found_index)
+                if target is not None:
+                    break
+            if target is None:
+                return Resolution(fallbacks=fallbacks, failed_segment=segment.text)
+            fallbacks.append(fallback)
+            current = target
+        return Resolution(current, fallbacks)
+
+    def find(self, parent, search_params, found_index=1):
+        """
+        parentの子孫から条件に一致するfound_index番目のノードを返す（UIBackend.findと同じ意味）。
+        """
+        snapshot = self.snapshot
+        depth = snapshot.depth
+        start = parent + 1
+        end = parent + snapshot.subtree[parent]
+        max_depth = depth[parent] + search_params.get("searchDepth", MAX_SEARCH_DEPTH)
+
+        # 完全一致の条件を文字列IDに変換（文字列表にない値は一致するノードがない）
+        required = []
+        for key, column in (("ControlTypeName", snapshot.control_type), ("Name", snapshot.name),
+                            ("AutomationId", snapshot.automation_id), ("ClassName", snapshot.class_name)):
+            if key in search_params:
+                string_id = snapshot.string_ids(search_params[key])
+                if string_id is None:
+                    return None
+                required.append((key, column, string_id))
+        ids = {key: string_id for key, _, string_id in required}
+        regex = search_params.get("RegexName")
+
+        candidates = self._candidates(parent, start, end, max_depth, ids)
+        count = 0
+        for node in candidates:
+            if depth[node] > max_depth:
+                continue
+            if any(column[node] != string_id for _, column, string_id in required):
+                continue
+            if regex is not None and not self._regex_match(regex, snapshot.name[node]):
+                continue
+            count += 1
+            if count == found_index:
+                return node
+        return None
+
+    def _candidates(self, parent, start, end, max_depth, ids):
+        """条件に使えるインデックスのうち、範囲内の候補が最も少ないものを返す。"""
+        lists = []
+        if "ControlTypeName" in ids and "Name" in ids:
+            lists.append(self.by_type_name.get((ids["ControlTypeName"], ids["Name"]), []))
+        elif "ControlTypeName" in ids:
+            lists.append(self.by_type.get(ids["ControlTypeName"], []))
+        if "AutomationId" in ids:
+            lists.append(self.by_automation_id.get(ids["AutomationId"], []))
+        if "ClassName" in ids:
+            lists.append(self.by_class.get(ids["ClassName"], []))
+
+        best = range(start, end)
+        for nodes in lists:
+            lo = bisect_right(nodes, parent)
+            hi = bisect_left(nodes, end, lo)
+            if hi - lo < len(best):
+                best = nodes[lo:hi]
+        # 直下の子のみの検索では子ノード配列の方が小さいことがある
+        if max_depth == self.snapshot.depth[parent] + 1 and len(self.children[parent]) < len(best):
+            best = self.children[parent]
+        return best
+
+    def _regex_match(self, pattern, name_id):
+        key = (pattern, name_id)
+        result = self._regex_cache.get(key)
+        if result is None:
+            result = self._regex_cache[key] = re.match(pattern, self.snapshot.string(name_id)) is not None
+        return result
@@ -0,0 +1,175 @@
+"""
+RPAパスの解析
+
+RPAパス文字列（"Type(Name='..', foundIndex=N, searchDepth=N) -> ..."）をセグメントに分解し、
+各セグメントの検索条件とフォールバック手順を組み立てる。
+ライブ検索（ElementFinder）とスナップショット上のオフライン解決（SnapshotResolver）は
+同じ手順を使用するため、foundIndex / searchDepth / フォールバックの意味は常に一致する。
+"""
+
+import re
+from functools import lru_cache
+
+
+_SEGMENT_PATTERN = re.compile(r"(\w+)(?:\((.*)\))?")
+_NAME_PATTERN = re.compile(r"\bName='([^']*)'")
+_REGEX_NAME_PATTERN = re.compile(r"\bRegexName='([^']*)'")
+_ID_PATTERN = re.compile(r"\bAutomationId='([^']*)'")
+_CLASS_PATTERN = re.compile(r"\bClassName='([^']*)'")
+_INDEX_PATTERN = re.compile(r"\bfoundIndex=(\d+)")
+_DEPTH_PATTERN = re.compile(r"\bsearchDepth=(\d+)")
+
+# フォールバック段階ごとの最大待機秒数（0: 指定深度, 1: 深度+1, 2: 再帰検索）
+ATTEMPT_TIMEOUTS = (2, 1, 1)
+
+
+class PathSegment:
+    """パスの1セグメント。生成後は変更しないこと（コンパイル結果はキャッシュで共有される）。"""
+
+    __slots__ = ("text", "control_type", "conditions", "found_index", "search_depth", "indexed")
+
+    def __init__(self, text, control_type, conditions, found_index=1, search_depth=None, indexed=False):
+        """
+        Args:
+            text: セグメントの元の文字列
+            control_type: コントロール種別
+            conditions: (プロパティ名, 値) のタプル（Name, RegexName, AutomationId, ClassName）
+            found_index: foundIndex（1始まり）
+            search_depth: searchDepth（省略時はNone = 全子孫）
+            indexed: foundIndexがパスに明示されているか
+        """
+        self.text = text
+        self.control_type = control_type
+        self.conditions = conditions
+        self.found_index = found_index
+        self.search_depth = search_depth
+        self.indexed = indexed
+
+    def __repr__(self):
+        return f"PathSegment({self.text!r})"
+
+    def to_args(self):
+        """コンストラクタ引数のタプルを返す（コンパイルキャッシュへの保存用）。"""
+        return (self.text, self.control_type, self.conditions, self.found_index, self.search_depth, self.indexed)
+
+    def search_params(self):
+        """UIBackend.find に渡す検索条件の辞書を新しく生成して返す。"""
+        params = {"ControlTypeName": self.control_type}
+        params.update(self.conditions)
+        if self.search_depth is not None:
+            params["searchDepth"] = self.search_depth
+        return params
+
+    def attempts(self):
+        """
+        フォールバック手順を (段階, 検索条件, 最大待機秒数) の順に返す。
+
+        0: 指定どおりの条件
+        1: searchDepthを1増やす（省略時は1とみなして2）
+        2: searchDepthを外して全子孫を再帰検索
+        """
+        params = self.search_params()
+        depth = self.search_depth or 1
+        deeper = dict(params, searchDepth=depth + 1)
+        recursive = dict(params)
+        recursive.pop("searchDepth", None)
+        return ((0, params, ATTEMPT_TIMEOUTS[0]),
+                (1, deeper, ATTEMPT_TIMEOUTS[1]),
+                (2, recursive, ATTEMPT_TIMEOUTS[2]))
+
+
+def parse_segment(part):
+    """
+    1セグメントを解析する。
+
+    Raises:
+        ValueError: セグメントの形式が不正な場合
+    """
+    match = _SEGMENT_PATTERN.match(part)
+    if not match:
+        raise ValueError(f"Invalid path part format: {part}")
+
+    control_type = match.group(1)
+    props_str = match.group(2)
+    conditions = []
+    found_index = 1
+    search_depth = None
+    index_match = None
+
+    if props_str:
+        for key, pattern in (("Name", _NAME_PATTERN), ("RegexName", _REGEX_NAME_PATTERN),
+                             ("AutomationId", _ID_PATTERN), ("ClassName", _CLASS_PATTERN)):
+            prop_match = pattern.search(props_str)
+            if prop_match:
+                conditions.append((key, prop_match.group(1)))
+        index_match = _INDEX_PATTERN.search(props_str)
+        depth_match = _DEPTH_PATTERN.search(props_str)
+        if index_match:
+            found_index = int(index_match.group(1))
+        if depth_match:
+            search_depth = int(depth_match.group(1))
+
+    return PathSegment(part, control_type, tuple(conditions), found_index, search_depth, index_match is not None)
+
+
+# コンパイルキャッシュから読み込んだ解析結果（パス文字列 -> セグメントごとのコンストラクタ引数）
+_preloaded = {}
+
+
+@lru_cache(maxsize=4096)
+def compile_path(path_string):
+    """
+    パス文字列をセグメントのタプルにコンパイルする（結果はキャッシュされる）。
+
+    Raises:
+        ValueError: いずれかのセグメントの形式が不正な場合
+    """
+    preloaded = _preloaded.get(path_string)
+    if preloaded is not None:
+        return tuple(PathSegment(*args) for args in preloaded)
+    return tuple(parse_segment(part) for part in (p.strip() for p in path_string.split('->')) if part)
+
+
+def export_compiled(path_strings):
+    """
+    パスを解析し、コンパイルキャッシュに保存できる形式（組み込み型のみ）で返す。
+    形式が不正なパスは含めない（実行時に通常どおりエラーになる）。
+
+    Returns:
+        dict: パス文字列 -> セグメントごとのコンストラクタ引数のタプル
+    """
+    exported = {}
+    for path_string in path_strings:
+        if path_string in exported:
+            continue
+        try:
+            exported[path_string] = tuple(segment.to_args() for segment in compile_path(path_string))
+        except ValueError:
+            continue
+    return exported
+
+
+def preload_compiled(exported):
+    """export_compiledの結果を登録し、それらのパスの再解析を省略する（セグメントは初回参照時に生成）。"""
+    _preloaded.update(exported)
+
+
+def window_conditions(target_app):
+    """
+    TargetAppからウィンドウ検索条件の候補を順に返す（ElementFinder.find_windowと同じ規則）。
+
+    "regex:" で始まる場合はその正規表現のみ、それ以外は完全一致、次に部分一致の正規表現。
+    """
+    if target_app.startswith("regex:"):
+        return ({"RegexName": target_app[6:]},)
+    return ({"Name": target_app}, {"RegexName": f".*{re.escape(target_app)}.*"})
+
+
+def window_matches(target_app, window_name):
+    """ウィンドウ名がTargetAppに一致するかを返す（find_windowと同じ規則）。"""
+    for conditions in window_conditions(target_app):
+        if "Name" in conditions and window_name == conditions["Name"]:
+            return True
+        if "RegexName" in conditions and re.match(conditions["RegexName"], window_name):
+            return True
+    return False
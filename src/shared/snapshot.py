@@ -0,0 +1,363 @@
+"""
+UIツリースナップショット
+
+ウィンドウのコントロールツリーを1回の走査で取得し、コンパクトなバイナリ形式で保存する。
+保存したファイルはmmapで読み込み、列ごとの配列をコピーせずに参照する。
+
+ファイル形式（リトルエンディアン）:
+    ヘッダー: マジック(8バイト), バージョン, ノード数, 文字列数, メタデータ長, 予約（各uint32）
+    ノード列: COLUMNSの順に、ノード数分の配列（各列は8バイト境界に揃える）
+    文字列表: オフセット配列 uint32[文字列数 + 1] と UTF-8のバイト列（ID 0 は空文字列）
+    メタデータ: JSON（UTF-8）
+
+ノードは前順（深さ優先）で格納され、ノード0が対象ウィンドウ。
+ノードiの子孫は i+1 から i+subtree[i]-1 までの連続した範囲になるため、
+検索範囲は配列のスライスとして扱える。
+"""
+
+import datetime
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+from src.shared.backend.base import MAX_SEARCH_DEPTH, PATTERN_NAMES
+
+
+MAGIC = b"UISNAP\r\n"
+VERSION = 1
+HEADER = struct.Struct("<8sIIIII")
+
+# (列名, arrayの型コード)
+COLUMNS = (
+    ("parent", "i"),         # 親ノードのインデックス（ルートは-1）
+    ("subtree", "I"),        # 自身を含むサブツリーのノード数
+    ("depth", "H"),          # ウィンドウからの深さ
+    ("control_type", "I"),   # 以下4列は文字列表のID
+    ("name", "I"),
+    ("automation_id", "I"),
+    ("class_name", "I"),
+    ("left", "i"),
+    ("top", "i"),
+    ("right", "i"),
+    ("bottom", "i"),
+    ("patterns", "I"),       # PATTERN_NAMESのビットマスク
+    ("flags", "B"),          # FLAG_* のビットマスク
+)
+
+FLAG_ENABLED = 0x01
+FLAG_OFFSCREEN = 0x02
+FLAG_FOCUSABLE = 0x04
+
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _align(offset):
+    return (offset + 7) & ~7
+
+
+def is_snapshot_file(path):
+    """ファイルがスナップショット形式かどうかをマジックで判定する。"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class SnapshotBuilder:
+    """前順でノードを追加してスナップショットを組み立てる。"""
+
+    def __init__(self):
+        self.columns = {name: array(code) for name, code in COLUMNS}
+        self._strings = {"": 0}
+        self._stack = []  # 深さごとの祖先ノードのインデックス
+
+    def _intern(self, value):
+        value = value or ""
+        string_id = self._strings.get(value)
+        if string_id is None:
+            string_id = self._strings[value] = len(self._strings)
+        return string_id
+
+    @property
+    def node_count(self):
+        return len(self.columns["parent"])
+
+    def add(self, depth, control_type, name="", automation_id="", class_name="", rect=(0, 0, 0, 0),
+            enabled=True, offscreen=False, focusable=True, patterns=()):
+        """
+        ノードを追加する（前順で呼び出すこと）。
+
+        Args:
+            depth: ルート（ウィンドウ）からの深さ。最初のノードは0
+            rect: (left, top, right, bottom)
+            patterns: サポートするパターン名
+        """
+        index = self.node_count
+        if depth > len(self._stack) or (index == 0) != (depth == 0):
+            raise ValueError(f"Node {index} at depth {depth} is not in pre-order")
+
+        # 同じ深さ以上の祖先はここでサブツリーが閉じる
+        self._close(depth)
+        columns = self.columns
+        columns["parent"].append(self._stack[-1] if self._stack else -1)
+        columns["subtree"].append(0)
+        columns["depth"].append(depth)
+        columns["control_type"].append(self._intern(control_type))
+        columns["name"].append(self._intern(name))
+        columns["automation_id"].append(self._intern(automation_id))
+        columns["class_name"].append(self._intern(class_name))
+        left, top, right, bottom = rect
+        columns["left"].append(left)
+        columns["top"].append(top)
+        columns["right"].append(right)
+        columns["bottom"].append(bottom)
+        columns["patterns"].append(sum(1 << bit for bit, pattern in enumerate(PATTERN_NAMES) if pattern in patterns))
+        columns["flags"].append((FLAG_ENABLED if enabled else 0) | (FLAG_OFFSCREEN if offscreen else 0)
+                                | (FLAG_FOCUSABLE if focusable else 0))
+        self._stack.append(index)
+        return index
+
+    def _close(self, depth):
+        subtree = self.columns["subtree"]
+        while len(self._stack) > depth:
+            index = self._stack.pop()
+            subtree[index] = self.node_count - index
+
+    def to_bytes(self, metadata=None):
+        """スナップショットのファイル内容をバイト列で返す。"""
+        self._close(0)
+        strings = [s.encode("utf-8") for s in self._strings]  # 辞書は追加順 = ID順
+        offsets = array("I", [0])
+        for data in strings:
+            offsets.append(offsets[-1] + len(data))
+        meta = json.dumps(metadata or {}, ensure_ascii=False).encode("utf-8")
+
+        chunks = [HEADER.pack(MAGIC, VERSION, self.node_count, len(strings), len(meta), 0)]
+        position = HEADER.size
+        for name, _ in COLUMNS:
+            column = self.columns[name]
+            if not _LITTLE_ENDIAN:
+                column = array(column.typecode, column)
+                column.byteswap()
+            padding = _align(position) - position
+            chunks.append(b"\0" * padding)
+            chunks.append(column.tobytes())
+            position += padding + len(column) * column.itemsize
+        if not _LITTLE_ENDIAN:
+            offsets.byteswap()
+        padding = _align(position) - position
+        chunks.extend([b"\0" * padding, offsets.tobytes(), b"".join(strings), meta])
+        return b"".join(chunks)
+
+    def write(self, path, metadata=None):
+        """
+        スナップショットをファイルに書き出す（一時ファイル経由で置き換え）。
+
+        Returns:
+            int: 書き込んだバイト数
+        """
+        data = self.to_bytes(metadata)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, path)
+        return len(data)
+
+
+def walk_tree(backend, window, max_depth=MAX_SEARCH_DEPTH, patterns=True):
+    """
+    ウィンドウのツリーを1回の走査で取得してSnapshotBuilderに格納する。
+
+    Args:
+        backend: UIBackendインスタンス
+        window: 対象ウィンドウ（ルートとして格納される）
+        max_depth: 走査する最大深さ
+        patterns: Falseの場合はサポートパターンを取得しない（ノードごとのパターン問い合わせを省略）
+
+    Returns:
+        SnapshotBuilder
+    """
+    builder = SnapshotBuilder()
+    for element, depth in backend.walk(window, max_depth):
+        rect = element.BoundingRectangle
+        builder.add(
+            depth,
+            element.ControlTypeName,
+            element.Name,
+            element.AutomationId,
+            element.ClassName,
+            (rect.left, rect.top, rect.right, rect.bottom) if rect else (0, 0, 0, 0),
+            element.IsEnabled,
+            element.IsOffscreen,
+            element.IsKeyboardFocusable,
+            backend.get_supported_patterns(element) if patterns else (),
+        )
+    return builder
+
+
+def capture_snapshot(backend, window, path, max_depth=MAX_SEARCH_DEPTH, metadata=None):
+    """
+    ウィンドウのツリーを1回の走査で取得してスナップショットファイルに保存する。
+
+    Args:
+        backend: UIBackendインスタンス
+        window: 対象ウィンドウ（ルートとして保存される）
+        path: 出力ファイル
+        max_depth: 走査する最大深さ
+        metadata: 追加のメタデータ（target_appなど）
+
+    Returns:
+        int: 保存したノード数
+    """
+    builder = walk_tree(backend, window, max_depth)
+    info = {
+        "captured_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "backend": backend.name,
+        "max_depth": None if max_depth == MAX_SEARCH_DEPTH else max_depth,
+    }
+    info.update(metadata or {})
+    builder.write(path, info)
+    return builder.node_count
+
+
+class Snapshot:
+    """
+    mmapで読み込んだスナップショット（from_bytes でメモリ上のバイト列からも読み込める）。
+
+    各列（parent, depth, name など）はノードインデックスで参照できる配列で、
+    文字列列の値は文字列表のID。string(id) で初回参照時にデコードされる。
+    """
+
+    def __init__(self, path, data=None):
+        """
+        Args:
+            path: スナップショットファイル（dataを指定した場合は表示用の名前）
+            data: ファイルの代わりに読み込むバイト列（SnapshotBuilder.to_bytes の結果）
+        """
+        self.path = path
+        self._file = None
+        if data is not None:
+            self._mmap = data
+        else:
+            self._file = open(path, "rb")
+            try:
+                self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # 空ファイルはmmapできない
+                self._file.close()
+                raise ValueError(f"Not a snapshot file: {path}")
+        self._views = []
+        try:
+            self._load()
+        except Exception:
+            self.close()
+            raise
+
+    def _load(self):
+        if len(self._mmap) < HEADER.size:
+            raise ValueError(f"Not a snapshot file: {self.path}")
+        magic, version, node_count, string_count, meta_length, _ = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Not a snapshot file: {self.path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version} (expected {VERSION})")
+
+        self.node_count = node_count
+        self.string_count = string_count
+        position = HEADER.size
+        for name, code in COLUMNS:
+            position = _align(position)
+            column, position = self._column(position, code, node_count)
+            setattr(self, name, column)
+
+        position = _align(position)
+        self._string_offsets, position = self._column(position, "I", string_count + 1)
+        self._string_base = position
+        self._strings = [None] * string_count
+        self._string_index = None
+        position += self._string_offsets[string_count]
+        self.metadata = json.loads(bytes(self._mmap[position:position + meta_length]).decode("utf-8") or "{}")
+
+    def _column(self, position, code, count):
+        size = array(code).itemsize * count
+        if position + size > len(self._mmap):
+            raise ValueError(f"Truncated snapshot file: {self.path}")
+        if _LITTLE_ENDIAN:
+            view = memoryview(self._mmap)[position:position + size].cast(code)
+            self._views.append(view)
+            return view, position + size
+        column = array(code)
+        column.frombytes(self._mmap[position:position + size])
+        column.byteswap()
+        return column, position + size
+
+    def close(self):
+        """mmapとファイルを閉じる。以降、列の配列は参照できない。"""
+        for view in self._views:
+            view.release()
+        self._views = []
+        if self._file is not None:
+            if self._mmap is not None:
+                self._mmap.close()
+            self._file.close()
+        self._mmap = None
+
+    @classmethod
+    def from_bytes(cls, data, name="<memory>"):
+        """メモリ上のバイト列からスナップショットを読み込む（ファイルを介さない）。"""
+        return cls(name, data=data)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def __len__(self):
+        return self.node_count
+
+    def string(self, string_id):
+        """文字列表のIDを文字列に変換する。"""
+        value = self._strings[string_id]
+        if value is None:
+            start = self._string_base + self._string_offsets[string_id]
+            end = self._string_base + self._string_offsets[string_id + 1]
+            value = self._strings[string_id] = self._mmap[start:end].decode("utf-8")
+        return value
+
+    def string_ids(self, value):
+        """文字列表から値に一致するIDを返す（存在しなければNone）。"""
+        if self._string_index is None:
+            self._string_index = {self.string(i): i for i in range(self.string_count)}
+        return self._string_index.get(value)
+
+    def children(self, index):
+        """直接の子ノードのインデックスを順に生成する。"""
+        child = index + 1
+        end = index + self.subtree[index]
+        while child < end:
+            yield child
+            child += self.subtree[child]
+
+    def has_pattern(self, index, pattern_name):
+        return bool(self.patterns[index] & (1 << PATTERN_NAMES.index(pattern_name)))
+
+    def node(self, index):
+        """ノードの情報を辞書で返す（表示・変換用）。"""
+        flags = self.flags[index]
+        return {
+            "ControlType": self.string(self.control_type[index]),
+            "Name": self.string(self.name[index]),
+            "AutomationId": self.string(self.automation_id[index]),
+            "ClassName": self.string(self.class_name[index]),
+            "Rect": [self.left[index], self.top[index], self.right[index], self.bottom[index]],
+            "IsEnabled": bool(flags & FLAG_ENABLED),
+            "IsOffscreen": bool(flags & FLAG_OFFSCREEN),
+            "IsKeyboardFocusable": bool(flags & FLAG_FOCUSABLE),
+            "Patterns": [name for bit, name in enumerate(PATTERN_NAMES) if self.patterns[index] & (1 << bit)],
+        }
@@ -0,0 +1,133 @@
+import sys
+import os
+import time
+import asyncio
+import threading
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.automator.core.async_ui import AsyncUI
+from src.shared.backend.fake import FakeBackend
+
+WAITERS = 1000
+
+def build_backend():
+    backend = FakeBackend()
+    window = backend.add_element(backend.root, "WindowControl", "Async App")
+    backend.add_element(window, "EditControl", automation_id="input", patterns={"ValuePattern": {"Value": ""}})
+    backend.add_element(backend.root, "WindowControl", "Other App")
+    return backend, window
+
+async def heartbeat(gaps, stop):
+    """イベントループが止まっていないことを確認するため、10msごとの起床間隔を記録する"""
+    last = time.perf_counter()
+    while not stop.is_set():
+        await asyncio.sleep(0.01)
+        now = time.perf_counter()
+        gaps.append(now - last)
+        last = now
+
+async def run_checks():
+    backend, window = build_backend()
+    all_passed = True
+    threads_before = threading.active_count()
+    ui = AsyncUI(backend=backend, workers=2, aliases={"input": "EditControl(AutomationId='input')"}, poll_interval=0.05)
+
+    try:
+        # 1. 1000件の待機を少数のワーカースレッドで多重化し、イベントループを止めない
+        gaps, stop = [], asyncio.Event()
+        beat = asyncio.create_task(heartbeat(gaps, stop))
+        start = time.perf_counter()
+        waits = [asyncio.create_task(ui.wait_until("Async App", "ButtonControl(Name='Ready')", "enabled", timeout=5))
+                 for _ in range(WAITERS)]
+        await asyncio.sleep(0.3)
+        await ui.call(backend.add_element, window, "ButtonControl", "Ready", target_app="Async App")
+        elements = await asyncio.gather(*waits)
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await beat
+        extra_threads = threading.active_count() - threads_before
+        if (all(e is not None and e.Name == "Ready" for e in elements) and extra_threads <= 2 and elapsed < 3
+                and max(gaps) < 0.2):
+            print(f"PASS: {WAITERS} waits resolved in {elapsed:.2f}s on {extra_threads} worker threads "
+                  f"(max loop stall {max(gaps) * 1000:.0f} ms)")
+        else:
+            print(f"FAIL: {WAITERS} waits took {elapsed:.2f}s, {extra_threads} threads, max gap {max(gaps):.3f}s")
+            all_passed = False
+
+        # 2. タイムアウト、goneの条件、待たない検索
+        try:
+            await ui.wait_until("Async App", "ButtonControl(Name='Never')", timeout=0.2)
+            timed_out = False
+        except TimeoutError:
+            timed_out = True
+        ready = await ui.find("Async App", "ButtonControl(Name='Ready')")
+        missing = await ui.find("Async App", "ButtonControl(Name='Never')")
+        gone = asyncio.create_task(ui.wait_until("Async App", "ButtonControl(Name='Ready')", "gone", timeout=2))
+        await asyncio.sleep(0.1)
+        await ui.call(backend.remove_element, ready, target_app="Async App")
+        if timed_out and ready is not None and missing is None and await gone is True:
+            print("PASS: Timeout, immediate find and 'gone' condition behave as expected")
+        else:
+            print(f"FAIL: timed_out={timed_out}, ready={ready}, missing={missing}")
+            all_passed = False
+
+        # 3. アクション実行（エイリアス・変数置換）。Waitはワーカーを止めずに他の操作と並行する
+        variables = {"name": "Tanaka"}
+        wait_task = asyncio.create_task(ui.execute("", "", "Wait", "0.5"))
+        await asyncio.sleep(0.05)
+        before = time.perf_counter()
+        await ui.execute("Async App", "input", "Input", "{name}", variables)
+        await ui.execute("", "", "SetVariable", "done = 'yes'", variables)
+        during_wait = time.perf_counter() - before
+        await wait_task
+        edit = await ui.find("Async App", "input")
+        if (edit is not None and backend.get_pattern(edit, "ValuePattern").Value == "Tanaka"
+                and variables.get("done") == "yes" and during_wait < 0.4):
+            print(f"PASS: Actions ran while Wait was pending ({during_wait * 1000:.0f} ms)")
+        else:
+            print(f"FAIL: Action results {variables}, during wait {during_wait:.2f}s")
+            all_passed = False
+
+        # 4. 同じウィンドウの操作は常に同じワーカーで実行される
+        names = {await ui.call(lambda: threading.current_thread().name, target_app="Async App") for _ in range(5)}
+        if len(names) == 1:
+            print(f"PASS: Operations on one window stay on {names.pop()}")
+        else:
+            print(f"FAIL: Operations on one window ran on {names}")
+            all_passed = False
+
+        # 5. 取り消した待機はワーカーから取り除かれ、closeで残りの待機も取り消される
+        cancelled = asyncio.create_task(ui.wait_until("Async App", "ButtonControl(Name='Never')", timeout=10))
+        remaining = asyncio.create_task(ui.wait_until("Other App", "ButtonControl(Name='Never')", timeout=10))
+        await asyncio.sleep(0.1)
+        cancelled.cancel()
+        await asyncio.sleep(0.1)
+        pending = sum(s["pending"] for s in ui.stats().values())
+        await ui.close()
+        try:
+            await remaining
+            remaining_cancelled = False
+        except asyncio.CancelledError:
+            remaining_cancelled = True
+        if pending == 1 and remaining_cancelled and not any(worker.is_alive() for worker in ui.workers):
+            print("PASS: Cancelled waits are dropped and close() cancels the rest")
+        else:
+            print(f"FAIL: pending={pending}, remaining cancelled={remaining_cancelled}, "
+                  f"workers alive {[worker.is_alive() for worker in ui.workers]}")
+            all_passed = False
+    finally:
+        if any(worker.is_alive() for worker in ui.workers):
+            await ui.close()
+
+    return all_passed
+
+def verify_async_ui():
+    print("--- Testing Async UI ---")
+    try:
+        all_passed = asyncio.run(run_checks())
+        print(f"Async UI Verification: {'PASS' if all_passed else 'FAIL'}")
+    except Exception as e:
+        print(f"Async UI Verification: FAIL - {e!r}")
+
+if __name__ == "__main__":
+    verify_async_ui()
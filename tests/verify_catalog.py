@@ -0,0 +1,118 @@
+import sys
+import os
+import csv
+import json
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.automator.core.element_finder import ElementFinder
+from src.inspector.core.catalog import AliasCatalog
+from src.inspector.core.path_generator import PathGenerator
+from src.shared.backend.fake import FakeBackend
+from src.shared.snapshot import Snapshot, walk_tree
+
+def build_backend():
+    backend = FakeBackend()
+    window = backend.add_element(backend.root, "WindowControl", "Catalog App")
+    toolbar = backend.add_element(window, "ToolBarControl", "Tools", class_name="ToolBar")
+    for n in range(6):
+        backend.add_element(toolbar, "ButtonControl", "Tool" if n % 2 else "", class_name="ToolButton",
+                            patterns={"InvokePattern": {}})
+    form = backend.add_element(window, "PaneControl", "", class_name="Form")
+    for n in range(4):
+        row = backend.add_element(form, "GroupControl", "Row", class_name="Row")
+        backend.add_element(row, "TextControl", f"Label {n % 2}")
+        backend.add_element(row, "EditControl", "", automation_id="value", class_name="Edit")
+        backend.add_element(row, "CheckBoxControl", "Enabled", automation_id=f"enabled_{n}")
+    backend.add_element(window, "ButtonControl", "Save", automation_id="save", patterns={"InvokePattern": {}})
+    return backend, window
+
+def snapshot_of(backend, window):
+    return Snapshot.from_bytes(walk_tree(backend, window).to_bytes())
+
+def verify_catalog():
+    print("--- Testing Alias Catalog ---")
+    tree_file = "tests/temp_catalog_tree.json"
+    catalog_file = "tests/temp_catalog_alias.csv"
+    all_passed = True
+
+    try:
+        backend, window = build_backend()
+        elements = [element for element, _ in backend.walk(window)]
+        finder = ElementFinder(backend=backend)
+
+        # 1. AutomationIdが一意な要素のパスはクリックごとの生成（get_rpa_path）と同じで、元の要素に解決される
+        for mode in ("modern", "legacy"):
+            with snapshot_of(backend, window) as snapshot:
+                entries = AliasCatalog(mode=mode).build(snapshot)
+            generator = PathGenerator(mode=mode, backend=backend)
+            duplicated_id = lambda entry: elements[entry.node].automation_id == "value"
+            different = [entry.path for entry in entries
+                         if not duplicated_id(entry) and entry.path != generator.get_rpa_path(elements[entry.node])]
+            unresolved = [entry.path for entry in entries
+                          if finder.find_element_by_path(window, entry.path, wait=False) is not elements[entry.node]]
+            if len(entries) == len(elements) - 1 and not different and not unresolved:
+                print(f"PASS: {mode} catalog matches get_rpa_path and all {len(entries)} paths resolve")
+            else:
+                print(f"FAIL: {mode} catalog differs {different[:2]}, unresolved {unresolved[:2]}")
+                all_passed = False
+
+        # 2. ウィンドウ内で重複するAutomationIdはチェーンパスにする（AutomationIdだけでは最初の要素に解決される）
+        with snapshot_of(backend, window) as snapshot:
+            entries = AliasCatalog(mode="modern").build(snapshot)
+        paths = {entry.node: entry.path for entry in entries}
+        edits = [index for index, element in enumerate(elements) if element.automation_id == "value"]
+        last_edit = paths[edits[-1]]
+        if (last_edit.startswith("PaneControl(ClassName='Form', searchDepth=1) -> GroupControl(Name='Row', foundIndex=4")
+                and paths[len(elements) - 1] == "ButtonControl(AutomationId='save')"):
+            print("PASS: Duplicate AutomationIds fall back to chained paths")
+        else:
+            print(f"FAIL: Duplicate id path {last_edit}, unique id path {paths[len(elements) - 1]}")
+            all_passed = False
+
+        # 3. interactiveフィルタとエイリアス名
+        with snapshot_of(backend, window) as snapshot:
+            entries = AliasCatalog(element_filter="interactive").build(snapshot)
+        types = {elements[entry.node].control_type for entry in entries}
+        aliases = [entry.alias for entry in entries]
+        if (types == {"ButtonControl", "EditControl", "CheckBoxControl"} and len(set(aliases)) == len(aliases)
+                and aliases[:3] == ["Button", "Button_Tool", "Button_2"] and "Edit_value_4" in aliases
+                and aliases[-1] == "Button_Save"):
+            print(f"PASS: Interactive filter keeps {len(entries)} actionable elements with unique aliases")
+        else:
+            print(f"FAIL: Types {types}, aliases {aliases}")
+            all_passed = False
+
+        # 4. CLI（--catalog）でエイリアスCSVを書き出す
+        with open(tree_file, "w", encoding="utf-8") as f:
+            json.dump({"ControlType": "WindowControl", "Name": "Catalog App", "Children": [
+                {"ControlType": "ButtonControl", "Name": "OK", "Patterns": {"InvokePattern": {}}},
+                {"ControlType": "ButtonControl", "Name": "OK"},
+                {"ControlType": "PaneControl", "ClassName": "Panel",
+                 "Children": [{"ControlType": "EditControl", "AutomationId": "name"}]}]}, f)
+        proc = subprocess.run([sys.executable, "inspector.py", "--catalog", "Catalog App", "--fake-tree", tree_file,
+                               "--filter", "interactive", "--catalog-file", catalog_file],
+                              capture_output=True, text=True, encoding="utf-8")
+        rows = []
+        if os.path.exists(catalog_file):
+            with open(catalog_file, "r", encoding="utf-8-sig") as f:
+                rows = [(row["AliasName"], row["RPA_Path"]) for row in csv.DictReader(f)]
+        expected = [("Button_OK", "ButtonControl(Name='OK', searchDepth=1)"),
+                    ("Button_OK_2", "ButtonControl(Name='OK', foundIndex=2, searchDepth=1)"),
+                    ("Edit_name", "EditControl(AutomationId='name')")]
+        if proc.returncode == 0 and rows == expected and "Catalogued 3 of 4 elements" in proc.stdout:
+            print("PASS: CLI writes the alias CSV")
+        else:
+            print(f"FAIL: CLI exit {proc.returncode}, rows {rows}\n{proc.stdout}{proc.stderr}")
+            all_passed = False
+
+        print(f"Alias Catalog Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Alias Catalog Verification: FAIL - {e!r}")
+    finally:
+        for path in [tree_file, catalog_file]:
+            if os.path.exists(path): os.remove(path)
+
+if __name__ == "__main__":
+    verify_catalog()
@@ -0,0 +1,91 @@
+import sys
+import os
+import csv
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def verify_checkpoint_resume():
+    print("--- Testing Checkpoint and Resume ---")
+    
+    actions_file = "tests/temp_resume_actions.csv"
+    checkpoint_file = "tests/temp_resume_checkpoint.json"
+    flag_file = "tests/temp_resume_flag"
+    first_log = "tests/verify_resume_first.log"
+    second_log = "tests/verify_resume_second.log"
+    
+    # 3回目のループでフラグファイルがなければ失敗する（ゼロ除算）
+    rows = [
+        {"TargetApp": "", "Key": "", "Action": "SetVariable", "Value": "count = 0"},
+        {"TargetApp": "", "Key": "", "Action": "Loop", "Value": "5"},
+        {"TargetApp": "", "Key": "", "Action": "SetVariable", "Value": "count = {count} + 1"},
+        {"TargetApp": "", "Key": "", "Action": "If", "Value": "{count} == 3"},
+        {"TargetApp": "", "Key": "", "Action": "SetVariable", "Value": f"check = 1 / int(__import__('os').path.exists('{flag_file}'))"},
+        {"TargetApp": "", "Key": "", "Action": "EndIf", "Value": ""},
+        {"TargetApp": "", "Key": "", "Action": "EndLoop", "Value": ""},
+        {"TargetApp": "", "Key": "", "Action": "SetVariable", "Value": "done = 'YES'"},
+    ]
+    
+    try:
+        for path in [checkpoint_file, flag_file, first_log, second_log]:
+            if os.path.exists(path): os.remove(path)
+        with open(actions_file, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=["TargetApp", "Key", "Action", "Value"])
+            writer.writeheader()
+            writer.writerows(rows)
+        
+        base_cmd = [sys.executable, "automator.py", actions_file,
+                    "--checkpoint", checkpoint_file, "--checkpoint-interval", "1"]
+        
+        # 1回目: 失敗して終了し、チェックポイントが残る
+        first = subprocess.run(base_cmd + ["--log-file", first_log], capture_output=True)
+        if first.returncode == 0 or not os.path.exists(checkpoint_file):
+            print("FAIL: First run should fail and leave a checkpoint")
+            return False
+        print("PASS: First run failed and saved a checkpoint")
+        
+        # 2回目: 原因を解消して再開
+        open(flag_file, "w").close()
+        subprocess.run(base_cmd + ["--resume", "--log-file", second_log], check=True, capture_output=True)
+        
+        with open(second_log, "r", encoding="utf-8") as f:
+            log_content = f.read()
+        
+        checks = [
+            ("Resuming from checkpoint", True),
+            ("Set variable 'count' to '1'", False),  # 先頭からやり直していない
+            ("Set variable 'count' to '5'", True),
+            ("Set variable 'done' to 'YES'", True),
+        ]
+        all_passed = True
+        for text, expected in checks:
+            if (text in log_content) == expected:
+                print(f"PASS: {'Found' if expected else 'Not found'} '{text}'")
+            else:
+                print(f"FAIL: {'Missing' if expected else 'Unexpected'} '{text}'")
+                all_passed = False
+        
+        if os.path.exists(checkpoint_file):
+            print("FAIL: Checkpoint should be removed after successful completion")
+            all_passed = False
+        
+        if all_passed:
+            print("Checkpoint Resume Verification: PASS")
+            for path in [first_log, second_log]:
+                if os.path.exists(path): os.remove(path)
+        else:
+            print("Checkpoint Resume Verification: FAIL")
+            print("--- Log Content ---")
+            print(log_content)
+            print("-------------------")
+        return all_passed
+            
+    except subprocess.CalledProcessError as e:
+        print(f"Checkpoint Resume Verification: FAIL - Process error {e}")
+    except Exception as e:
+        print(f"Checkpoint Resume Verification: FAIL - {e}")
+    finally:
+        for path in [actions_file, checkpoint_file, flag_file]:
+            if os.path.exists(path): os.remove(path)
+
+if __name__ == "__main__":
+    verify_checkpoint_resume()
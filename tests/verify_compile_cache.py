@@ -0,0 +1,144 @@
+import sys
+import os
+import csv
+import json
+import shutil
+import logging
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from automator import Automator
+from src.automator.utils.compile_cache import CompileCache
+from src.shared import rpa_path
+from src.shared.backend.fake import FakeBackend
+
+def write_csv(path, fieldnames, rows):
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def load(actions_file, alias_file, cache):
+    app = Automator([actions_file], backend=FakeBackend())
+    from_cache = app.load_program([alias_file], cache=cache)
+    return app, from_cache
+
+def verify_compile_cache():
+    print("--- Testing Compile Cache ---")
+
+    actions_file = "tests/temp_cache_actions.csv"
+    alias_file = "tests/temp_cache_aliases.csv"
+    cache_dir = "tests/temp_compile_cache"
+    user_cache_home = "tests/temp_user_cache"
+    tree_file = "tests/temp_cache_tree.json"
+
+    aliases = [
+        {"AliasName": "ok", "RPA_Path": "PaneControl(Name='Main') -> ButtonControl(Name='OK')"},
+        {"AliasName": "edit", "RPA_Path": "EditControl(AutomationId='input', searchDepth=2)"},
+    ]
+    actions = [
+        {"TargetApp": "", "Key": "", "Action": "SetVariable", "Value": "status = OK"},
+        {"TargetApp": "", "Key": "", "Action": "LOOP", "Value": "2"},
+        {"TargetApp": "", "Key": "", "Action": "IF", "Value": "'{status}' == 'OK'"},
+        {"TargetApp": "", "Key": "", "Action": "If", "Value": "1 == 1"},
+        {"TargetApp": "", "Key": "", "Action": "EndIf", "Value": ""},
+        {"TargetApp": "", "Key": "", "Action": "Else", "Value": ""},
+        {"TargetApp": "", "Key": "", "Action": "SetVariable", "Value": "result = Fail"},
+        {"TargetApp": "", "Key": "", "Action": "endif", "Value": ""},
+        {"TargetApp": "", "Key": "", "Action": "EndLoop", "Value": ""},
+        {"TargetApp": "", "Key": "", "Action": "Else", "Value": ""},
+        {"TargetApp": "App", "Key": "ok", "Action": "Click", "Value": ""},
+        {"TargetApp": "App", "Key": "edit", "Action": "Input", "Value": "text"},
+    ]
+
+    try:
+        write_csv(alias_file, ["AliasName", "RPA_Path"], aliases)
+        write_csv(actions_file, ["TargetApp", "Key", "Action", "Value"], actions)
+        with open(tree_file, "w", encoding="utf-8") as f:
+            json.dump({"ControlType": "WindowControl", "Name": "App", "Children": [
+                {"ControlType": "PaneControl", "Name": "Main", "Children": [
+                    {"ControlType": "ButtonControl", "Name": "Changed", "Patterns": {"Invoke": {}}},
+                    {"ControlType": "EditControl", "Name": "Input", "AutomationId": "input", "Patterns": {"Value": {"Value": ""}}},
+                ]},
+            ]}, f)
+        cache = CompileCache(cache_dir)
+        all_passed = True
+
+        # 1. 初回はキャッシュを作成し、2回目はキャッシュから同じ内容を読み込む
+        first, first_hit = load(actions_file, alias_file, cache)
+        second, second_hit = load(actions_file, alias_file, cache)
+        if (not first_hit and second_hit and second.actions == first.actions and second.aliases == first.aliases
+                and second.reverse_aliases == first.reverse_aliases and len(os.listdir(cache_dir)) == 1):
+            print("PASS: Second load restored actions and aliases from the cache")
+        else:
+            print(f"FAIL: Cache hit {first_hit}/{second_hit}, files {os.listdir(cache_dir)}")
+            all_passed = False
+
+        # 2. ジャンプ表が逐次走査の結果と一致すること
+        expected = {(i, row["Action"]): second._scan_matching_end(i, row["Action"])
+                    for i, row in enumerate(second.actions) if row["Action"] in ("If", "Else", "Loop")}
+        if second._jump_cache == expected:
+            print(f"PASS: Cached jump table matches scanning ({len(expected)} entries)")
+        else:
+            print(f"FAIL: Jump table {second._jump_cache} != {expected}")
+            all_passed = False
+
+        # 3. エイリアスを解決済みのパスが解析済みとして登録されていること
+        path = aliases[0]["RPA_Path"]
+        if path in rpa_path._preloaded and rpa_path.compile_path(path)[1].conditions == (("Name", "OK"),):
+            print("PASS: Parsed paths were restored from the cache")
+        else:
+            print("FAIL: Parsed paths were not restored")
+            all_passed = False
+
+        # 4. ファイルを編集するとキーが変わり、再構築されること（キャッシュファイルは置き換え）
+        aliases[0]["RPA_Path"] = "ButtonControl(Name='Changed')"
+        write_csv(alias_file, ["AliasName", "RPA_Path"], aliases)
+        third, third_hit = load(actions_file, alias_file, cache)
+        fourth, fourth_hit = load(actions_file, alias_file, cache)
+        if (not third_hit and fourth_hit and fourth.actions[10]["Key"] == "ButtonControl(Name='Changed')"
+                and len(os.listdir(cache_dir)) == 1):
+            print("PASS: Edited source rebuilt the cache")
+        else:
+            print(f"FAIL: Rebuild hit {third_hit}/{fourth_hit}, key {fourth.actions[10]['Key']}")
+            all_passed = False
+        logging.shutdown()
+
+        # 5. CLI: 2回目の実行でもログ（エイリアス解決など）は同じ内容が出力されること
+        cmd = [sys.executable, "automator.py", actions_file, "--aliases", alias_file, "--cache-dir", cache_dir,
+               "--dry-run", "--fake-tree", tree_file, "--log-level", "DEBUG"]
+        shutil.rmtree(cache_dir)
+        outputs = [subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8").stdout for _ in range(2)]
+        if ("Using compile cache" not in outputs[0] and "Using compile cache" in outputs[1]
+                and all("Resolved alias 'ok'" in out and "Loading aliases from" in out for out in outputs)):
+            print("PASS: CLI reuses the cache and replays load logs")
+        else:
+            print(f"FAIL: CLI output:\n{outputs[1]}")
+            all_passed = False
+
+        # 6. CLI: --cache-dir を省略した場合はユーザーごとのキャッシュディレクトリに保存し、作業ディレクトリには書き込まない
+        env = dict(os.environ, LOCALAPPDATA=os.path.abspath(user_cache_home),
+                   XDG_CACHE_HOME=os.path.abspath(user_cache_home))
+        existed = os.path.exists(".automator_cache")
+        cmd = [sys.executable, "automator.py", actions_file, "--aliases", alias_file,
+               "--dry-run", "--fake-tree", tree_file]
+        subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8", env=env)
+        cached = [name for _, _, files in os.walk(user_cache_home) for name in files if name.endswith(".cache")]
+        if len(cached) == 1 and (existed or not os.path.exists(".automator_cache")):
+            print("PASS: Default cache is stored in the per-user cache directory")
+        else:
+            print(f"FAIL: Cache files {cached}, .automator_cache created {not existed and os.path.exists('.automator_cache')}")
+            all_passed = False
+
+        print(f"Compile Cache Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Compile Cache Verification: FAIL - {e}")
+    finally:
+        for path in [actions_file, alias_file, tree_file]:
+            if os.path.exists(path): os.remove(path)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        shutil.rmtree(user_cache_home, ignore_errors=True)
+
+if __name__ == "__main__":
+    verify_compile_cache()
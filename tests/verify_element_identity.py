@@ -0,0 +1,124 @@
+import sys
+import os
+import io
+import copy
+import contextlib
+from collections import Counter
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from inspector import Inspector
+from src.automator.core.element_finder import ElementFinder
+from src.inspector.core.path_generator import PathGenerator
+from src.shared.backend.fake import FakeBackend, Rect
+from src.shared.backend.identity import ElementRef
+from src.shared.backend.input_events import InputEvent
+
+class WrappingBackend(FakeBackend):
+    """UIAと同じく、取得のたびに別のラッパーオブジェクトを返すバックエンド"""
+
+    def __init__(self):
+        super().__init__()
+        self.runtime_id_reads = Counter()
+
+    def get_runtime_id(self, element):
+        self.runtime_id_reads[element.runtime_id] += 1
+        return super().get_runtime_id(element)
+
+    def get_parent(self, element):
+        parent = super().get_parent(element)
+        return copy.copy(parent) if parent is not None else None
+
+    def get_children(self, element):
+        return [copy.copy(child) for child in super().get_children(element)]
+
+    def walk(self, element, max_depth=50):
+        for child, depth in super().walk(element, max_depth):
+            yield copy.copy(child), depth
+
+    def element_from_point(self, x, y):
+        element = super().element_from_point(x, y)
+        return copy.copy(element) if element is not None else None
+
+def build_backend():
+    backend = WrappingBackend()
+    window = backend.add_element(backend.root, "WindowControl", "Identity App", rect=Rect(0, 0, 400, 300))
+    panel = window
+    for level in range(5):
+        backend.add_element(panel, "PaneControl", "", class_name="Filler")
+        panel = backend.add_element(panel, "PaneControl", "", class_name="Panel", rect=Rect(0, 0, 400, 300))
+    buttons = [backend.add_element(panel, "ButtonControl", "Button", rect=Rect(n * 100, 0, n * 100 + 80, 40))
+               for n in range(3)]
+    return backend, window, buttons
+
+def verify_element_identity():
+    print("--- Testing Element Identity ---")
+    all_passed = True
+
+    try:
+        # 1. 別のラッパーでも同じRuntimeIdなら等しく、dict/setのキーとして使える。RuntimeIdは1回だけ取得する
+        backend, window, buttons = build_backend()
+        first, second = ElementRef(backend, buttons[0]), ElementRef(backend, copy.copy(buttons[0]))
+        refs = {first, ElementRef(backend, buttons[1])}
+        reads = backend.runtime_id_reads[buttons[0].runtime_id]
+        lookups = [second in refs for _ in range(100)]
+        if (first == second and all(lookups) and ElementRef(backend, buttons[2]) not in refs
+                and reads == 1 and backend.runtime_id_reads[buttons[0].runtime_id] == 2):
+            print("PASS: Wrappers of the same element compare equal and hash by RuntimeId (fetched once)")
+        else:
+            print(f"FAIL: Equal {first == second}, reads {backend.runtime_id_reads}")
+            all_passed = False
+
+        # 2. RuntimeIdを取得できない・空の要素は同じオブジェクトとだけ等しい
+        class Gone:
+            pass
+        fallback = []
+        for label, get_runtime_id in (("error", lambda element: (_ for _ in ()).throw(RuntimeError("element is gone"))),
+                                      ("empty", lambda element: []), ("None", lambda element: None)):
+            broken = FakeBackend()
+            broken.get_runtime_id = get_runtime_id
+            gone = Gone()
+            if not (ElementRef(broken, gone) == ElementRef(broken, gone)
+                    and ElementRef(broken, gone) != ElementRef(broken, Gone())
+                    and len({ElementRef(broken, Gone()), ElementRef(broken, Gone())}) == 2):
+                fallback.append(label)
+        if not fallback:
+            print("PASS: Elements without a RuntimeId (error, empty, None) fall back to object identity")
+        else:
+            print(f"FAIL: Fallback identity for {fallback}")
+            all_passed = False
+
+        # 3. パス生成では系譜の各要素のRuntimeIdを、系譜と兄弟の読み取りで1回ずつしか取得しない
+        backend, window, buttons = build_backend()
+        path = PathGenerator(mode="legacy", backend=backend).get_rpa_path(copy.copy(buttons[2]))
+        lineage_reads = max(backend.runtime_id_reads.values())
+        found = ElementFinder(backend=backend).find_element_by_path(window, path, wait=False)
+        if ElementRef(backend, found) == ElementRef(backend, buttons[2]) and lineage_reads <= 2:
+            print(f"PASS: Path generated with at most {lineage_reads} RuntimeId reads per element")
+        else:
+            print(f"FAIL: Path {path}, reads {backend.runtime_id_reads}")
+            all_passed = False
+
+        # 4. 相対位置の検索とInspectorのデバウンスは、別のラッパーでも同じ要素として扱う
+        backend, window, buttons = build_backend()
+        finder = ElementFinder(backend=backend)
+        right = finder.get_relative_element(copy.copy(buttons[0]), window, "right")
+        for x in (10, 12, 110):
+            backend.events.post(InputEvent.click(x, 10))
+        backend.events.post(InputEvent.escape())
+        with contextlib.redirect_stdout(io.StringIO()):
+            inspector = Inspector(output="normal", backend=backend)
+            inspector.run()
+        if (ElementRef(backend, right) == ElementRef(backend, buttons[1])
+                and inspector.path_worker.stats["submitted"] == 2):
+            print("PASS: Relative search and click debounce compare wrappers by RuntimeId")
+        else:
+            print(f"FAIL: Right of Button 0 is {right}, {inspector.path_worker.stats['submitted']} clicks inspected")
+            all_passed = False
+
+        print(f"Element Identity Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Element Identity Verification: FAIL - {e!r}")
+
+if __name__ == "__main__":
+    verify_element_identity()
@@ -0,0 +1,117 @@
+import sys
+import os
+import io
+import logging
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from automator import Engine, AutomatorError
+from src.shared.backend.fake import FakeBackend
+
+def build_backend():
+    backend = FakeBackend()
+    window = backend.add_element(backend.root, "WindowControl", "Order Form")
+    backend.add_element(window, "EditControl", automation_id="customer", patterns={"ValuePattern": {"Value": ""}})
+    backend.add_element(window, "ButtonControl", "Submit", patterns={"InvokePattern": {}})
+    return backend
+
+def verify_engine():
+    print("--- Testing Engine API ---")
+
+    root = logging.getLogger()
+    host_stream = io.StringIO()
+    host_handler = logging.StreamHandler(host_stream)
+    saved = (list(root.handlers), root.level)
+    root.handlers = [host_handler]
+    root.setLevel(logging.WARNING)
+    all_passed = True
+    screenshots = set(os.listdir("errors")) if os.path.isdir("errors") else set()
+
+    try:
+        backend = build_backend()
+        engine = Engine(backend=backend)
+
+        # 1. Pythonのリスト（辞書・タプル）からプログラムを作成し、変数を渡して実行する
+        program = engine.compile([
+            {"TargetApp": "Order Form", "Key": "customer", "Action": "Input", "Value": "{name}"},
+            ("", "", "if", "'{name}' != ''"),
+            ("Order Form", "submit", "Click"),
+            ("", "", "SetVariable", "status = 'sent'"),
+            ("", "", "endif"),
+        ], aliases={"customer": "EditControl(AutomationId='customer')", "submit": "ButtonControl(Name='Submit')"})
+        result = engine.run(program, {"name": "Yamada"})
+        edit = backend.find(None, {"AutomationId": "customer", "searchDepth": 2})
+        if (result.status == "OK" and result.variables["status"] == "sent" and len(result.actions) == 3
+                and result.actions[0]["alias"] == "customer" and program.actions[1]["Action"] == "If"
+                and backend.get_pattern(edit, "ValuePattern").Value == "Yamada"):
+            print(f"PASS: Program built from lists ran ({len(result.actions)} actions, {result.elapsed_ms:.1f} ms)")
+        else:
+            print(f"FAIL: Result {result.to_dict()}")
+            all_passed = False
+
+        # 2. 同じプログラムを別の変数で再実行でき、変数は実行ごとに独立している
+        second = engine.run(program, {"name": "Sato"})
+        third = engine.run(program, {"name": ""})
+        if (second.status == "OK" and second.variables["name"] == "Sato" and "status" not in third.variables
+                and len(third.actions) == 1 and result.variables["name"] == "Yamada"):
+            print("PASS: Program reused with independent variables")
+        else:
+            print(f"FAIL: Reuse results {second.to_dict()} / {third.to_dict()}")
+            all_passed = False
+
+        # 3. アクションの失敗は例外ではなく結果として返される
+        failing = engine.compile([("Order Form", "ButtonControl(Name='Missing')", "Click"),
+                                  ("", "", "SetVariable", "after = 1")])
+        failed = engine.run(failing)
+        if (failed.status == "FAILED" and len(failed.errors) == 1 and failed.errors[0].startswith("Action 1:")
+                and "after" not in failed.variables and failed.actions[0]["status"] == "ERROR"):
+            print("PASS: Failed action reported in the result without exiting")
+        else:
+            print(f"FAIL: Failure result {failed.to_dict()}")
+            all_passed = False
+
+        # 4. 読み込みエラー・不正なアクションはAutomatorErrorを送出する（SystemExitではない）
+        raised = []
+        for call in (lambda: engine.load(["tests/temp_engine_missing.csv"]),
+                     lambda: engine.compile([("App", "Click")]),
+                     lambda: engine.compile([{"TargetApp": "App", "Key": "x"}])):
+            try:
+                call()
+            except AutomatorError as e:
+                raised.append(str(e))
+        if len(raised) == 3 and "File not found" in raised[0]:
+            print("PASS: Load and program errors raise AutomatorError")
+        else:
+            print(f"FAIL: Raised {raised}")
+            all_passed = False
+
+        # 5. 構造の誤り（EndIfがない）はエラーとして結果に含まれる
+        broken = engine.run(engine.compile([("", "", "If", "1 == 2"), ("", "", "SetVariable", "x = 1")]))
+        if broken.status == "FAILED" and broken.errors == ["Action 1: Missing matching EndIf/Else for If"]:
+            print("PASS: Structural errors are reported in the result")
+        else:
+            print(f"FAIL: Structural error result {broken.to_dict()}")
+            all_passed = False
+
+        # 6. ホストのロギング設定は変更されず、ログはホストのハンドラに届く
+        if root.handlers == [host_handler] and root.level == logging.WARNING and "Action failed" in host_stream.getvalue():
+            print("PASS: Host logging configuration left untouched")
+        else:
+            print(f"FAIL: Root handlers {root.handlers}, level {root.level}")
+            all_passed = False
+
+        print(f"Engine API Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Engine API Verification: FAIL - {e}")
+    finally:
+        root.handlers, level = saved
+        root.setLevel(level)
+        # 失敗したアクションのスクリーンショットを削除
+        if os.path.isdir("errors"):
+            for name in set(os.listdir("errors")) - screenshots:
+                os.remove(os.path.join("errors", name))
+            if not os.listdir("errors"):
+                os.rmdir("errors")
+
+if __name__ == "__main__":
+    verify_engine()
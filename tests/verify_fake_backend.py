@@ -0,0 +1,96 @@
+import sys
+import os
+import csv
+import json
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def verify_fake_backend():
+    print("--- Testing Fake Backend (Headless) ---")
+
+    tree_file = "tests/temp_fake_tree.json"
+    actions_file = "tests/temp_fake_actions.csv"
+    timing_file = "tests/temp_fake_timing.json"
+
+    tree = {
+        "windows": [{
+            "ControlType": "WindowControl", "Name": "Fake Order Form", "ClassName": "FakeWindow",
+            "Rect": [0, 0, 800, 600],
+            "Patterns": {"WindowPattern": {}},
+            "Children": [
+                {"ControlType": "EditControl", "AutomationId": "Customer", "Name": "Customer",
+                 "Patterns": {"ValuePattern": {"Value": ""}}},
+                {"ControlType": "ListControl", "Name": "Plans", "Children": [
+                    {"ControlType": "ListItemControl", "Name": "Basic",
+                     "Patterns": {"SelectionItemPattern": {"IsSelected": True}}},
+                    {"ControlType": "ListItemControl", "Name": "Premium",
+                     "Patterns": {"SelectionItemPattern": {"IsSelected": False}}},
+                ]},
+                {"ControlType": "ButtonControl", "Name": "Submit", "Patterns": {"InvokePattern": {}}},
+            ],
+        }]
+    }
+
+    window = "Fake Order Form"
+    rows = [
+        {"TargetApp": window, "Key": "EditControl(AutomationId='Customer', searchDepth=1)", "Action": "Input", "Value": "ACME"},
+        {"TargetApp": window, "Key": "EditControl(AutomationId='Customer', searchDepth=1)", "Action": "GetValue", "Value": "customer"},
+        {"TargetApp": window, "Key": "ListControl(Name='Plans', searchDepth=1)", "Action": "Select", "Value": "Premium"},
+        {"TargetApp": window, "Key": "ListControl(Name='Plans') -> ListItemControl(Name='Premium', searchDepth=1)", "Action": "GetProperty", "Value": "selected = IsSelected"},
+        {"TargetApp": window, "Key": "ButtonControl(Name='Submit', searchDepth=1)", "Action": "Click", "Value": ""},
+        {"TargetApp": window, "Key": "", "Action": "Exit", "Value": ""},
+    ]
+
+    try:
+        with open(tree_file, "w", encoding="utf-8") as f:
+            json.dump(tree, f)
+        with open(actions_file, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=["TargetApp", "Key", "Action", "Value"])
+            writer.writeheader()
+            writer.writerows(rows)
+
+        # uiautomationなしで実行できること（検索1回あたり50msのレイテンシを注入）
+        cmd = [sys.executable, "automator.py", actions_file, "--fake-tree", tree_file,
+               "--fake-latency", "find=0.05", "--timing-output", timing_file]
+        result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
+
+        all_passed = True
+        if result.returncode == 0:
+            print("PASS: Actions ran headless against the fake tree")
+        else:
+            print(f"FAIL: Run failed (exit code {result.returncode})")
+            print(result.stdout[-2000:])
+            print(result.stderr[-2000:])
+            all_passed = False
+
+        if "Got value: 'ACME'" in result.stdout and "Got IsSelected = 'True'" in result.stdout:
+            print("PASS: Input/GetValue and Select/GetProperty round-tripped through the fake patterns")
+        else:
+            print("FAIL: Pattern state was not updated by Input/Select")
+            all_passed = False
+
+        if "Closed Fake Order Form using WindowPattern.Close()" in result.stdout:
+            print("PASS: Exit closed the fake window")
+        else:
+            print("FAIL: Exit did not use WindowPattern.Close()")
+            all_passed = False
+
+        with open(timing_file, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        lookups = [r["duration_ms"] for r in records if r["phase"] == "window_lookup"]
+        if lookups and min(lookups) >= 50:
+            print(f"PASS: Injected latency is visible in window lookups (min {min(lookups)}ms)")
+        else:
+            print(f"FAIL: Window lookups did not include injected latency: {lookups}")
+            all_passed = False
+
+        print(f"Fake Backend Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Fake Backend Verification: FAIL - {e}")
+    finally:
+        for path in [tree_file, actions_file, timing_file]:
+            if os.path.exists(path): os.remove(path)
+
+if __name__ == "__main__":
+    verify_fake_backend()
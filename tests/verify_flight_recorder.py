@@ -0,0 +1,152 @@
+import sys
+import os
+import json
+import time
+import shutil
+import struct
+import logging
+import threading
+import subprocess
+import zlib
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from automator import Engine
+from src.automator.utils.flight_recorder import FlightRecorder
+from src.shared.backend.fake import FakeBackend, Rect
+
+DIRECTORY = "tests/temp_flight"
+
+def build_backend(**kwargs):
+    backend = FakeBackend(**kwargs)
+    window = backend.add_element(backend.root, "WindowControl", "Flight App", rect=Rect(0, 0, 640, 480))
+    backend.add_element(window, "ButtonControl", "OK", patterns={"InvokePattern": {}})
+    return backend
+
+def png_size(path):
+    """PNGの幅・高さを返し、画像データが展開できることを確認する"""
+    with open(path, "rb") as f:
+        data = f.read()
+    width, height = struct.unpack(">II", data[16:24])
+    idat_length = struct.unpack(">I", data[33:37])[0]
+    if len(zlib.decompress(data[41:41 + idat_length])) != height * (1 + width * 3):
+        raise ValueError(f"{path}: unexpected image data length")
+    return width, height
+
+def dumps():
+    """書き出されたディレクトリごとのファイル名"""
+    if not os.path.isdir(DIRECTORY):
+        return []
+    return [sorted(os.listdir(os.path.join(DIRECTORY, name))) for name in sorted(os.listdir(DIRECTORY))]
+
+def verify_flight_recorder():
+    print("--- Testing Flight Recorder ---")
+
+    logger = logging.getLogger("verify_flight_recorder")
+    logger.propagate = False
+    logger.addHandler(logging.NullHandler())
+    click = ("Flight App", "ButtonControl(Name='OK')", "Click")
+    missing = ("Flight App", "ButtonControl(Name='Missing')", "Click")
+    tree_file = "tests/temp_flight_tree.json"
+    actions_file = "tests/temp_flight_actions.csv"
+    errors_before = set(os.listdir("errors")) if os.path.isdir("errors") else set()
+    all_passed = True
+
+    try:
+        # 1. 失敗時に直近N枚（縮小済み）を書き出す。取得はバックグラウンドのスレッドで行う
+        backend = build_backend()
+        grab_threads = set()
+        grab = backend.grab_screen
+        def recording_grab(rect=None):
+            if rect is not None:  # エラー時のスクリーンショット（画面全体）は除く
+                grab_threads.add(threading.current_thread().name)
+            return grab(rect)
+        backend.grab_screen = recording_grab
+        recorder = FlightRecorder(backend=backend, frames=5, scale=4, directory=DIRECTORY, logger=logger)
+        engine = Engine(backend=backend, logger=logger, wait_time=0, flight_recorder=recorder)
+        program = engine.compile([click] * 8 + [("", "", "SetVariable", "x = 1"), missing])
+        result = engine.run(program, on_action=lambda event: recorder.flush())  # 取得を1件ずつ終えてから次へ
+        files = dumps()
+        expected = [f"{n:02d}_action_{index}_Click.png" for n, index in enumerate(range(4, 9), 1)]
+        if (result.status == "FAILED" and files == [expected] and grab_threads == {"FlightRecorder"}
+                and png_size(os.path.join(DIRECTORY, os.listdir(DIRECTORY)[0], expected[0])) == (160, 120)):
+            print(f"PASS: Last {len(expected)} downscaled frames saved on failure, captured off-thread")
+        else:
+            print(f"FAIL: Dumped {files}, grab threads {grab_threads}, result {result.to_dict()}")
+            all_passed = False
+        shutil.rmtree(DIRECTORY, ignore_errors=True)
+
+        # 2. 取得が遅くてもアクションは待たない（追いつかない要求は置き換えられる）
+        slow = build_backend(latency={"capture": 0.05})
+        recorder = FlightRecorder(backend=slow, frames=20, directory=DIRECTORY, logger=logger)
+        engine = Engine(backend=slow, logger=logger, wait_time=0, flight_recorder=recorder)
+        start = time.perf_counter()
+        engine.run(engine.compile([click] * 20))  # 終了時に取得を待つ
+        elapsed = time.perf_counter() - start
+        if elapsed < 20 * 0.05 and recorder.stats["replaced"] > 0 and recorder.stats["recorded"] < 20 and not dumps():
+            print(f"PASS: 20 actions in {elapsed * 1000:.0f} ms with 50 ms captures "
+                  f"({recorder.stats['recorded']} recorded, {recorder.stats['replaced']} replaced)")
+        else:
+            print(f"FAIL: Took {elapsed:.2f}s, stats {recorder.stats}")
+            all_passed = False
+
+        # 3. メモリの上限（圧縮後の合計サイズ）を超えた古い画像は破棄する
+        recorder = FlightRecorder(backend=backend, frames=10, max_bytes=1, directory=DIRECTORY, logger=logger)
+        engine = Engine(backend=backend, logger=logger, wait_time=0, flight_recorder=recorder)
+        engine.run(engine.compile([click] * 4), on_action=lambda event: recorder.flush())  # 要求の置き換えをなくす
+        if len(recorder.buffer) == 1 and recorder.buffer[0].index == 4 and recorder.stats["evicted"] == 3:
+            print("PASS: Memory cap keeps only the newest frame")
+        else:
+            print(f"FAIL: Buffer {[frame.index for frame in recorder.buffer]}, stats {recorder.stats}")
+            all_passed = False
+
+        # 4. ドライランでは取得しない
+        recorder = FlightRecorder(backend=backend, directory=DIRECTORY, logger=logger)
+        engine = Engine(backend=backend, logger=logger, wait_time=0, dry_run=True, flight_recorder=recorder)
+        engine.run(engine.compile([click, missing]))
+        recorder.close()
+        if recorder.stats["recorded"] == 0 and not dumps():
+            print("PASS: Dry-run records nothing")
+        else:
+            print(f"FAIL: Dry-run stats {recorder.stats}")
+            all_passed = False
+
+        # 5. CLIの --flight-recorder
+        with open(tree_file, "w", encoding="utf-8") as f:
+            json.dump({"ControlType": "WindowControl", "Name": "Flight App", "Rect": [0, 0, 800, 600],
+                       "Children": [{"ControlType": "ButtonControl", "Name": "OK", "Patterns": {"InvokePattern": {}}}]}, f)
+        with open(actions_file, "w", encoding="utf-8") as f:
+            f.write("TargetApp,Key,Action,Value\n" + "Flight App,ButtonControl(Name='OK'),Click,\n" * 4
+                    + "Flight App,ButtonControl(Name='Missing'),Click,\n")
+        proc = subprocess.run([sys.executable, "automator.py", actions_file, "--fake-tree", tree_file, "--wait-time", "0",
+                               "--flight-recorder", "3", "--flight-recorder-scale", "8"],
+                              capture_output=True, text=True, encoding="utf-8")
+        created = sorted(set(os.listdir("errors")) - errors_before) if os.path.isdir("errors") else []
+        flights = [name for name in created if name.endswith("_flight")]
+        frames = sorted(os.listdir(os.path.join("errors", flights[0]))) if flights else []
+        # 取得が追いつかない場合は置き換えられるため、枚数は3枚以下
+        if (proc.returncode == 1 and 1 <= len(frames) <= 3 and frames[-1].endswith("_Click.png")
+                and png_size(os.path.join("errors", flights[0], frames[-1])) == (100, 75)
+                and f"Flight recorder: {len(frames)} frames saved" in proc.stdout):
+            print(f"PASS: CLI saved {len(frames)} frames to errors/{flights[0]}")
+        else:
+            print(f"FAIL: CLI exit {proc.returncode}, created {created}, frames {frames}\n{proc.stdout[-500:]}")
+            all_passed = False
+
+        print(f"Flight Recorder Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Flight Recorder Verification: FAIL - {e!r}")
+    finally:
+        shutil.rmtree(DIRECTORY, ignore_errors=True)
+        for path in [tree_file, actions_file]:
+            if os.path.exists(path): os.remove(path)
+        # CLIが作成したスクリーンショットと書き出し先を削除
+        if os.path.isdir("errors"):
+            for name in set(os.listdir("errors")) - errors_before:
+                path = os.path.join("errors", name)
+                shutil.rmtree(path) if os.path.isdir(path) else os.remove(path)
+            if not os.listdir("errors"):
+                os.rmdir("errors")
+
+if __name__ == "__main__":
+    verify_flight_recorder()
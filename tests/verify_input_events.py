@@ -0,0 +1,114 @@
+import sys
+import os
+import io
+import csv
+import re
+import time
+import shutil
+import threading
+import contextlib
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from inspector import Inspector
+from src.inspector.utils.click_handler import ClickHandler
+from src.shared.backend.fake import FakeBackend, Rect
+from src.shared.backend.input_events import InputEvent, ScriptedInputSource, WindowsHookSource
+
+OUTPUT_DIR = "tests/temp_input_events"
+
+def build_backend():
+    backend = FakeBackend()
+    window = backend.add_element(backend.root, "WindowControl", "Input App", rect=Rect(0, 0, 400, 300))
+    buttons = [backend.add_element(window, "ButtonControl", f"Button {n}", rect=Rect(n * 100, 0, n * 100 + 80, 40))
+               for n in range(3)]
+    return backend, window, buttons
+
+def make_inspector(backend):
+    inspector = Inspector(output="csv", backend=backend)
+    inspector.output_handler.directory = OUTPUT_DIR
+    return inspector
+
+def verify_input_events():
+    print("--- Testing Input Events ---")
+    all_passed = True
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    try:
+        # 1. 入力ソースのイベントを順に処理し、同じ要素へのダブルクリックは1回として記録する
+        backend, window, buttons = build_backend()
+        for event in (InputEvent.click(10, 10), InputEvent.click(12, 10), InputEvent.click(110, 10, "right"),
+                      InputEvent.click(210, 10), InputEvent.escape(), InputEvent.click(10, 10)):
+            backend.events.post(event)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            inspector = make_inspector(backend)
+            inspector.run()
+        clicked = re.findall(r"\[Clicked at (\d+), \d+\]", output.getvalue())
+        with open(inspector.output_handler.path, newline="", encoding="utf-8-sig") as f:
+            rows = list(csv.DictReader(f))
+        if clicked == ["10", "110", "210"] and [row["Key"] for row in rows] == [
+                f"ButtonControl(Name='Button {n}', searchDepth=1)" for n in range(3)]:
+            print("PASS: Clicks are processed in order, a double click is recorded once, ESC finishes")
+        else:
+            print(f"FAIL: Clicked {clicked}, rows {rows}")
+            all_passed = False
+
+        # 2. イベントを待つ間はブロックし（CPUを使わない）、投入されたイベントをすぐに受け取る
+        backend, window, buttons = build_backend()
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            inspector = make_inspector(backend)
+            thread = threading.Thread(target=inspector.run)
+            thread.start()
+            time.sleep(0.1)
+            cpu_start, wall_start = time.process_time(), time.perf_counter()
+            time.sleep(0.5)
+            idle_cpu = (time.process_time() - cpu_start) / (time.perf_counter() - wall_start)
+            backend.events.post(InputEvent.click(10, 10))
+            backend.events.post(InputEvent.escape())
+            thread.join(timeout=5)
+        if not thread.is_alive() and idle_cpu < 0.05 and inspector.output_handler.count == 1:
+            print(f"PASS: Idle wait uses {idle_cpu * 100:.1f}% CPU and wakes on the next event")
+        else:
+            print(f"FAIL: Idle CPU {idle_cpu * 100:.1f}%, alive {thread.is_alive()}, "
+                  f"recorded {inspector.output_handler.count}")
+            all_passed = False
+
+        # 3. 対話モードのクリック待ちは、待機前に溜まったイベントを無視する
+        backend, window, buttons = build_backend()
+        events = ScriptedInputSource([InputEvent.click(10, 10)])
+        events.start()
+        handler = ClickHandler(backend=backend, events=events)
+        timer = threading.Timer(0.05, events.post, args=(InputEvent.click(110, 10),))
+        timer.start()
+        result = handler.wait_for_click()
+        timer.join()
+        if result is not None and result[0] is buttons[1] and result[1:] == (110, 10):
+            print("PASS: wait_for_click ignores events queued before it started waiting")
+        else:
+            print(f"FAIL: wait_for_click returned {result}")
+            all_passed = False
+
+        # 4. フックを設定できない環境ではstart()が例外を送出し、スレッドを残さない
+        if os.name != "nt":
+            source = WindowsHookSource()
+            try:
+                source.start()
+                print("FAIL: Hooks started outside Windows")
+                all_passed = False
+            except Exception as e:
+                if source._thread is None:
+                    print(f"PASS: Hook source reports {type(e).__name__} when hooks are unavailable")
+                else:
+                    print("FAIL: Hook thread left running")
+                    all_passed = False
+
+        print(f"Input Events Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Input Events Verification: FAIL - {e!r}")
+    finally:
+        shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    verify_input_events()
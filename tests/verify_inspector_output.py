@@ -8,10 +8,8 @@ import uiautomation as auto
 def verify_output():
     print("--- Testing CSV Output ---")
     inspector_csv = Inspector(output="csv")
-    inspector_csv.recorded_items = [
-        {"TargetApp": "TestApp", "Key": "TestKey1", "Action": "", "Value": ""},
-        {"TargetApp": "TestApp", "Key": "TestKey2", "Action": "", "Value": ""}
-    ]
+    inspector_csv.record({"TargetApp": "TestApp", "Key": "TestKey1", "Action": "", "Value": ""})
+    inspector_csv.record({"TargetApp": "TestApp", "Key": "TestKey2", "Action": "", "Value": ""})
     inspector_csv.finalize()
     
     # Check if file exists
@@ -24,9 +22,7 @@ def verify_output():
 
     print("\n--- Testing Clipboard Output ---")
     inspector_clip = Inspector(output="clipboard")
-    inspector_clip.recorded_items = [
-        {"TargetApp": "ClipApp", "Key": "ClipKey", "Action": "", "Value": ""}
-    ]
+    inspector_clip.record({"TargetApp": "ClipApp", "Key": "ClipKey", "Action": "", "Value": ""})
     inspector_clip.finalize()
     
     clip_text = auto.GetClipboardText()
@@ -52,6 +52,13 @@ class TestInteractiveInspector(unittest.TestCase):
         self.assertEqual(inspector.recorded_items[0]["RPA_Path"], "Path1")
         self.assertEqual(inspector.recorded_items[1]["AliasName"], "Alias2")
         self.assertEqual(inspector.recorded_items[1]["RPA_Path"], "Path2")
+
+        # Recorded items are streamed to the alias file
+        inspector.output_handler.close()
+        with open(inspector.output_handler.path, encoding="utf-8-sig") as f:
+            content = f.read()
+        os.remove(inspector.output_handler.path)
+        self.assertEqual(content.splitlines(), ["AliasName,RPA_Path", "Alias1,Path1", "Alias2,Path2"])
         
         print("Interactive Inspector Logic Verification: PASS")
 
@@ -0,0 +1,68 @@
+import sys
+import os
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.shared import backend as backend_module
+from src.shared.backend.fake import FakeBackend
+
+HEAVY_MODULES = ("uiautomation", "comtypes", "ctypes", "keyboard", "subprocess", "tempfile")
+
+def imported_modules(args):
+    result = subprocess.run([sys.executable, "-X", "importtime"] + args, capture_output=True, text=True, encoding="utf-8")
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "self [us]" not in line:
+            modules.add(line.rsplit("|", 1)[1].strip())
+    return result.returncode, modules
+
+def verify_lazy_imports():
+    print("--- Testing Lazy Imports ---")
+
+    actions_file = "tests/temp_lazy_actions.csv"
+    all_passed = True
+
+    try:
+        with open(actions_file, "w", encoding="utf-8") as f:
+            f.write("TargetApp,Key,Action,Value\n,,SetVariable,status = OK\n,,Wait,0\n")
+
+        # 1. UIに触れないコマンドでは重いモジュールを読み込まない
+        for args in (["automator.py", "--help"], ["inspector.py", "--help"], ["snapshot.py", "--help"],
+                     ["automator.py", actions_file, "--dry-run", "--no-cache"]):
+            returncode, modules = imported_modules(args)
+            heavy = sorted(name for name in modules if name.split(".")[0] in HEAVY_MODULES)
+            if returncode == 0 and not heavy:
+                print(f"PASS: {' '.join(args)} ({len(modules)} modules, no heavy imports)")
+            else:
+                print(f"FAIL: {' '.join(args)} exit {returncode}, heavy imports: {heavy}")
+                all_passed = False
+
+        # 2. get_backend() はUI操作までバックエンドを生成しない
+        proxy = backend_module.get_backend()
+        if "src.shared.backend.uia" not in sys.modules and backend_module._backend is None:
+            print("PASS: get_backend() did not create the UI Automation backend")
+        else:
+            print("FAIL: UI Automation backend was created eagerly")
+            all_passed = False
+
+        # 3. プロキシは最初の属性参照でプロセス全体のバックエンドに委譲する
+        fake = FakeBackend()
+        fake.add_element(fake.root, "WindowControl", "Lazy Window")
+        backend_module.set_backend(fake)
+        window = proxy.find(None, {"ControlTypeName": "WindowControl", "Name": "Lazy Window"})
+        if window is not None and proxy.name == "fake" and backend_module.get_backend() is fake:
+            print("PASS: Deferred backend forwards to the configured backend")
+        else:
+            print("FAIL: Deferred backend did not forward calls")
+            all_passed = False
+
+        print(f"Lazy Imports Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Lazy Imports Verification: FAIL - {e}")
+    finally:
+        backend_module.set_backend(None)
+        if os.path.exists(actions_file): os.remove(actions_file)
+
+if __name__ == "__main__":
+    verify_lazy_imports()
@@ -0,0 +1,111 @@
+import sys
+import os
+import io
+import json
+import logging
+import threading
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from automator import Engine
+from src.automator.utils.log_pipeline import configure_logging, LazyProperty
+from src.shared.backend.fake import FakeBackend
+
+class CountingElement:
+    """Nameを読んだ回数を数える要素"""
+    def __init__(self):
+        self.reads = 0
+
+    @property
+    def Name(self):
+        self.reads += 1
+        return "Counted"
+
+def verify_log_pipeline():
+    print("--- Testing Log Pipeline ---")
+
+    log_file = "tests/temp_log_pipeline.log"
+    json_file = "tests/temp_log_pipeline.jsonl"
+    actions_file = "tests/temp_log_pipeline_actions.csv"
+    tree_file = "tests/temp_log_pipeline_tree.json"
+    cli_json = "tests/temp_log_pipeline_cli.jsonl"
+    root = logging.getLogger()
+    saved = (list(root.handlers), root.level)
+    all_passed = True
+
+    try:
+        # 1. 書き込みはバックグラウンドのスレッドで行い、停止時にキューの残りをすべて書き出す
+        writer_threads = []
+        class RecordingHandler(logging.Handler):
+            def emit(self, record):
+                writer_threads.append(threading.current_thread().name)
+
+        stream = io.StringIO()
+        pipeline = configure_logging("INFO", log_file=log_file, json_file=json_file, stream=stream)
+        pipeline.listener.handlers += (RecordingHandler(),)
+        program = Engine(backend=FakeBackend(), wait_time=0).compile([
+            ("", "", "Loop", "200"), ("", "", "SetVariable", "x = 1"), ("", "", "EndLoop")])
+        result = Engine(backend=FakeBackend(), wait_time=0).run(program)
+        pipeline.stop()
+        with open(log_file, "r", encoding="utf-8") as f:
+            text_lines = f.read().splitlines()
+        with open(json_file, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        if (result.status == "OK" and len(text_lines) == len(records) == len(stream.getvalue().splitlines()) > 400
+                and writer_threads and threading.main_thread().name not in writer_threads):
+            print(f"PASS: {len(records)} records written off-thread and flushed on stop")
+        else:
+            print(f"FAIL: {len(text_lines)} text / {len(records)} JSON lines, writer threads {set(writer_threads)}")
+            all_passed = False
+
+        # 2. JSONLにはレベル・ロガー・スレッドとextraの項目（action_index）が含まれる
+        started = [r for r in records if r["message"].startswith("--- Action")]
+        if (started and {r["action_index"] for r in started} == {1, 2, 3} and started[-1]["level"] == "INFO"
+                and started[-1]["logger"] == "automator" and "thread" in started[-1] and "time" in started[-1]):
+            print("PASS: JSON records carry structured fields")
+        else:
+            print(f"FAIL: JSON record {started[-1] if started else records[:1]}")
+            all_passed = False
+
+        # 3. LazyPropertyはログが有効な場合だけプロパティを読む
+        configure_logging("INFO", stream=io.StringIO(), background=False)
+        element = CountingElement()
+        logger = logging.getLogger("automator")
+        logger.debug("Searching under %s...", LazyProperty(element, "Name"))
+        skipped = element.reads
+        logger.info("Clicking element '%s'...", LazyProperty(element, "Name"))
+        if skipped == 0 and element.reads == 1:
+            print("PASS: Lazy arguments are evaluated only for enabled records")
+        else:
+            print(f"FAIL: Property read {skipped} times while disabled, {element.reads} in total")
+            all_passed = False
+
+        # 4. CLIの --log-json（プロセス終了時に書き出される）
+        with open(tree_file, "w", encoding="utf-8") as f:
+            json.dump({"ControlType": "WindowControl", "Name": "App",
+                       "Children": [{"ControlType": "ButtonControl", "Name": "OK", "Patterns": {"Invoke": {}}}]}, f)
+        with open(actions_file, "w", encoding="utf-8") as f:
+            f.write("TargetApp,Key,Action,Value\nApp,ButtonControl(Name='OK'),Click,\n")
+        proc = subprocess.run([sys.executable, "automator.py", actions_file, "--fake-tree", tree_file,
+                               "--log-json", cli_json, "--wait-time", "0"], capture_output=True, text=True, encoding="utf-8")
+        with open(cli_json, "r", encoding="utf-8") as f:
+            cli_records = [json.loads(line) for line in f]
+        if proc.returncode == 0 and any(r["message"] == "Clicking element 'OK'..." for r in cli_records):
+            print(f"PASS: CLI wrote {len(cli_records)} JSON records")
+        else:
+            print(f"FAIL: CLI exit {proc.returncode}, records {cli_records}\n{proc.stdout}{proc.stderr}")
+            all_passed = False
+
+        print(f"Log Pipeline Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Log Pipeline Verification: FAIL - {e!r}")
+    finally:
+        configure_logging("INFO", stream=io.StringIO()).stop()
+        root.handlers, level = saved
+        root.setLevel(level)
+        for path in [log_file, json_file, actions_file, tree_file, cli_json]:
+            if os.path.exists(path): os.remove(path)
+
+if __name__ == "__main__":
+    verify_log_pipeline()
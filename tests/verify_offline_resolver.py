@@ -0,0 +1,96 @@
+import sys
+import os
+import json
+import logging
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.automator.core.element_finder import ElementFinder
+from src.shared.backend.fake import FakeBackend
+from src.shared.resolver import SnapshotResolver
+from src.shared.snapshot import Snapshot, capture_snapshot
+
+def verify_offline_resolver():
+    print("--- Testing Offline Path Resolution ---")
+
+    tree_file = "tests/temp_resolver_tree.json"
+    snapshot_file = "tests/temp_resolver.uisnap"
+
+    tree = {
+        "ControlType": "WindowControl", "Name": "Resolver Test",
+        "Children": [
+            {"ControlType": "PaneControl", "Name": "Main", "Children": [
+                {"ControlType": "GroupControl", "Name": "Form", "Children": [
+                    {"ControlType": "ButtonControl", "Name": "OK", "AutomationId": "ok1"},
+                    {"ControlType": "ButtonControl", "Name": "OK", "AutomationId": "ok2"},
+                    {"ControlType": "EditControl", "Name": "入力", "ClassName": "Edit"},
+                ]},
+                {"ControlType": "ButtonControl", "Name": "OK", "AutomationId": "ok3"},
+            ]},
+        ],
+    }
+
+    # (パス, 期待するAutomationIdまたはName, 期待するフォールバック段階)
+    cases = [
+        ("PaneControl(Name='Main', searchDepth=1) -> GroupControl(Name='Form', searchDepth=1) -> ButtonControl(Name='OK', foundIndex=2, searchDepth=1)", "ok2", [0, 0, 0]),
+        ("PaneControl(Name='Main', searchDepth=1) -> ButtonControl(Name='OK', searchDepth=1)", "ok3", [0, 0]),
+        ("PaneControl(Name='Main', searchDepth=1) -> EditControl(ClassName='Edit', searchDepth=1)", "入力", [0, 1]),
+        ("ButtonControl(Name='OK', foundIndex=3)", "ok3", [0]),
+        ("ButtonControl(RegexName='O.', foundIndex=2, searchDepth=3)", "ok2", [0]),
+        ("ButtonControl(AutomationId='ok1', searchDepth=1)", "ok1", [2]),
+        ("ButtonControl(Name='OK', foundIndex=4)", None, None),
+        ("ButtonControl(Name='Cancel')", None, None),
+    ]
+
+    try:
+        with open(tree_file, "w", encoding="utf-8") as f:
+            json.dump(tree, f, ensure_ascii=False)
+        backend = FakeBackend.from_json(tree_file)
+        window = backend.root.children[0]
+        capture_snapshot(backend, window, snapshot_file)
+
+        logger = logging.getLogger("verify_offline_resolver")
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        finder = ElementFinder(logger=logger, backend=backend)
+
+        all_passed = True
+        with Snapshot(snapshot_file) as snapshot:
+            resolver = SnapshotResolver(snapshot)
+            for path, expected, fallbacks in cases:
+                result = resolver.resolve(path)
+                live = finder.find_element_by_path(window, path)
+                if result.found:
+                    node = snapshot.node(result.node)
+                    actual = node["AutomationId"] or node["Name"]
+                else:
+                    actual = None
+                live_actual = (live.automation_id or live.name) if live is not None else None
+                ok = actual == expected and live_actual == expected and (fallbacks is None or result.fallbacks == fallbacks)
+                print(f"{'PASS' if ok else 'FAIL'}: {path} -> {actual} (live: {live_actual}, fallback: {result.fallbacks})")
+                all_passed = all_passed and ok
+
+            if resolver.matches_window("Resolver") and resolver.matches_window("regex:Resolver.*") and not resolver.matches_window("Other"):
+                print("PASS: TargetApp matching follows find_window rules")
+            else:
+                print("FAIL: TargetApp matching")
+                all_passed = False
+
+        cmd = [sys.executable, "snapshot.py", "resolve", snapshot_file, cases[0][0], cases[-1][0]]
+        result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
+        if result.returncode == 1 and result.stdout.count("FOUND") == 2 and "NOT FOUND" in result.stdout:
+            print("PASS: snapshot.py resolve reports found and missing paths")
+        else:
+            print(f"FAIL: snapshot.py resolve output: {result.stdout} {result.stderr}")
+            all_passed = False
+
+        print(f"Offline Resolver Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Offline Resolver Verification: FAIL - {e}")
+    finally:
+        for path in [tree_file, snapshot_file]:
+            if os.path.exists(path): os.remove(path)
+
+if __name__ == "__main__":
+    verify_offline_resolver()
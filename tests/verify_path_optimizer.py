@@ -0,0 +1,100 @@
+import sys
+import os
+import io
+import re
+import contextlib
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from inspector import Inspector
+from src.automator.core.element_finder import ElementFinder
+from src.inspector.core.path_generator import PathGenerator
+from src.inspector.core.path_optimizer import PathOptimizer
+from src.shared.backend.fake import FakeBackend
+
+def build_backend():
+    backend = FakeBackend()
+    window = backend.add_element(backend.root, "WindowControl", "Optimizer App")
+    main = backend.add_element(window, "PaneControl", "", automation_id="main")
+    ok = backend.add_element(main, "ButtonControl", "OK", automation_id="ok")
+    # AutomationIdを持つ祖先の下の深い階層（対象はClassNameしか持たない）
+    group = main
+    for level in range(10):
+        group = backend.add_element(group, "GroupControl", "", class_name="Nested")
+    deep = backend.add_element(group, "CustomControl", "", class_name="Canvas")
+    # 前順で手前にある大きなサブツリー
+    tree = backend.add_element(window, "TreeControl", "Folders")
+    for n in range(300):
+        backend.add_element(tree, "TreeItemControl", f"Folder {n}")
+    listbox = backend.add_element(window, "ListControl", "Rows")
+    rows = [backend.add_element(listbox, "ListItemControl", "Row", automation_id="row") for _ in range(20)]
+    return backend, window, ok, deep, rows
+
+def verify_path_optimizer():
+    print("--- Testing Path Optimizer ---")
+    all_passed = True
+
+    try:
+        backend, window, ok, deep, rows = build_backend()
+        finder = ElementFinder(backend=backend)
+        model = PathOptimizer(backend=backend, repeat=0)
+
+        # 1. コストモデルで、要素ごとに安い候補が選ばれる
+        expected = {
+            "ok": (ok, "automation_id", "ButtonControl(AutomationId='ok')"),
+            "deep": (deep, "anchored", "PaneControl(AutomationId='main') -> CustomControl(ClassName='Canvas')"),
+            "row": (rows[-1], "chained", "ListControl(Name='Rows', searchDepth=1) -> "
+                                         "ListItemControl(AutomationId='row', foundIndex=20, searchDepth=1)"),
+        }
+        for label, (element, strategy, path) in expected.items():
+            best = model.best(element)
+            if best and best.strategy == strategy and best.path == path and best.seconds is None:
+                print(f"PASS: {label}: {strategy} chosen (~{best.cost} elements)")
+            else:
+                print(f"FAIL: {label}: expected {strategy} {path}, got {best!r}")
+                all_passed = False
+
+        # 2. 有効な候補はすべて対象に解決される（重複するAutomationIdはfoundIndexで区別する）
+        candidates = model.candidates(rows[-1])
+        resolved = all(finder.find_element_by_path(window, c.path, wait=False) is rows[-1]
+                       for c in candidates if c.valid)
+        by_strategy = {c.strategy: c for c in candidates}
+        if (resolved and "foundIndex=20" in by_strategy["automation_id"].path
+                and by_strategy["chained"].cost < by_strategy["automation_id"].cost):
+            print(f"PASS: {len(candidates)} candidates resolve to the element, chained is cheapest")
+        else:
+            print(f"FAIL: Candidates {candidates}")
+            all_passed = False
+
+        # 3. 実測モードでは解決時間を計測し、最速の候補（誤差の範囲内）を選ぶ
+        measured = PathOptimizer(backend=backend, repeat=3)
+        candidates = measured.candidates(rows[-1])
+        valid = [c for c in candidates if c.valid]
+        if (valid and all(c.seconds is not None and c.seconds > 0 for c in valid)
+                and valid[0].seconds <= min(c.seconds for c in valid) * 1.2
+                and PathGenerator(backend=backend).get_rpa_path(rows[-1]) != valid[0].path):
+            print(f"PASS: Measured {len(valid)} candidates, fastest {valid[0].strategy} "
+                  f"in {valid[0].seconds * 1000:.3f} ms")
+        else:
+            print(f"FAIL: Measured candidates {candidates}")
+            all_passed = False
+
+        # 4. Inspectorのfastestモードは解決時間をパスの横に表示する
+        inspector = Inspector(mode="fastest", output="normal", backend=backend)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            inspector.inspect_element(ok, 0, 0)
+        line = next((l for l in output.getvalue().splitlines() if "RPA_Path:" in l), "")
+        # 同程度の速さの候補（AutomationId / Name）のどちらかが選ばれる
+        if re.search(r"RPA_Path: ButtonControl\((AutomationId|Name)='(ok|OK)'\)  \[\w+, resolved in [\d.]+ ms\]$", line):
+            print("PASS: Inspector prints the measured resolve time next to the path")
+        else:
+            print(f"FAIL: Inspector output {output.getvalue()!r}")
+            all_passed = False
+
+        print(f"Path Optimizer Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Path Optimizer Verification: FAIL - {e!r}")
+
+if __name__ == "__main__":
+    verify_path_optimizer()
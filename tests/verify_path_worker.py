@@ -0,0 +1,105 @@
+import sys
+import os
+import io
+import re
+import time
+import shutil
+import contextlib
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from inspector import Inspector
+from src.automator.core.element_finder import ElementFinder
+from src.inspector.utils.path_worker import PathWorker
+from src.shared.backend.fake import FakeBackend, Rect
+
+OUTPUT_DIR = "tests/temp_path_worker"
+CLICKS = 10
+
+def build_backend():
+    backend = FakeBackend(latency={"property": 0.0005, "navigate": 0.0005})
+    window = backend.add_element(backend.root, "WindowControl", "Worker App", rect=Rect(0, 0, 1000, 1000))
+    panel = window
+    for level in range(8):
+        for n in range(5):
+            backend.add_element(panel, "PaneControl", "", class_name="Filler")
+        panel = backend.add_element(panel, "PaneControl", "", class_name="Panel", rect=Rect(0, 0, 1000, 1000))
+    buttons = [backend.add_element(panel, "ButtonControl", f"Button {n}", rect=Rect(n * 50, 0, n * 50 + 40, 40))
+               for n in range(CLICKS)]
+    return backend, window, buttons
+
+def verify_path_worker():
+    print("--- Testing Path Worker ---")
+    all_passed = True
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    try:
+        # 1. クリックの検出側は要素をキューに入れてすぐに戻り、結果はクリックした順に出力される
+        backend, window, buttons = build_backend()
+        inspector = Inspector(output="csv", backend=backend)
+        inspector.output_handler.directory = OUTPUT_DIR
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            start = time.perf_counter()
+            submit_times = []
+            for n, button in enumerate(buttons):
+                x, y = n * 50 + 20, 20
+                begin = time.perf_counter()
+                control = backend.element_from_point(x, y)
+                inspector.path_worker.submit(control, x, y)
+                submit_times.append(time.perf_counter() - begin)
+            inspector.path_worker.drain()
+            inspect_time = time.perf_counter() - start
+            inspector.finalize()
+        clicked = [tuple(map(int, m)) for m in re.findall(r"\[Clicked at (\d+), (\d+)\]", output.getvalue())]
+        paths = re.findall(r"RPA_Path: (.+)", output.getvalue())
+        finder = ElementFinder(backend=backend)
+        resolved = [finder.find_element_by_path(window, path, wait=False) for path in paths]
+        if (clicked == [(n * 50 + 20, 20) for n in range(CLICKS)] and resolved == buttons
+                and max(submit_times) * 5 < inspect_time / CLICKS):
+            print(f"PASS: {CLICKS} clicks captured in at most {max(submit_times) * 1000:.2f} ms each, "
+                  f"inspected in click order ({inspect_time / CLICKS * 1000:.1f} ms each)")
+        else:
+            print(f"FAIL: Clicked {clicked}, resolved {resolved == buttons}, "
+                  f"capture {max(submit_times):.4f}s, inspection {inspect_time / CLICKS:.4f}s")
+            all_passed = False
+
+        # 2. 処理に時間のかかるクリックがあっても、後のクリックの結果が先に出ることはない
+        results = []
+        worker = PathWorker(lambda capture: (time.sleep(capture.control), results.append(capture.index)),
+                            backend=FakeBackend())
+        for delay in (0.05, 0, 0.02, 0):
+            worker.submit(delay, 0, 0)
+        worker.drain()
+        if results == [1, 2, 3, 4]:
+            print("PASS: Results complete in click order")
+        else:
+            print(f"FAIL: Completion order {results}")
+            all_passed = False
+
+        # 3. 解析に失敗したクリックがあってもワーカーは処理を続け、close() でキューを処理してから停止する
+        def handler(capture):
+            if capture.alias == "broken":
+                raise RuntimeError("element is gone")
+            results.append(capture.alias)
+        results = []
+        worker = PathWorker(handler, backend=FakeBackend())
+        with contextlib.redirect_stdout(io.StringIO()) as errors:
+            for alias in ("first", "broken", "last"):
+                worker.submit(None, 1, 2, alias=alias)
+            worker.close()
+        if (results == ["first", "last"] and worker.stats["failed"] == 1 and worker._thread is None
+                and "[Clicked at 1, 2] Error: element is gone" in errors.getvalue()):
+            print("PASS: A failing click is reported and the worker keeps going")
+        else:
+            print(f"FAIL: Results {results}, stats {worker.stats}")
+            all_passed = False
+
+        print(f"Path Worker Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Path Worker Verification: FAIL - {e!r}")
+    finally:
+        shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    verify_path_worker()
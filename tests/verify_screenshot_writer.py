@@ -0,0 +1,148 @@
+import sys
+import os
+import shutil
+import struct
+import logging
+import threading
+import zlib
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from automator import Engine
+from src.automator.utils.screenshot import ScreenshotWriter
+from src.shared.backend.fake import FakeBackend, Rect
+
+DIRECTORY = "tests/temp_screenshots"
+
+class ThreadRecorder(logging.Handler):
+    """保存ログを出力したスレッド名を記録する"""
+    def __init__(self):
+        super().__init__()
+        self.threads = []
+
+    def emit(self, record):
+        if record.getMessage().startswith("Screenshot saved"):
+            self.threads.append(record.threadName)
+
+def build_backend():
+    backend = FakeBackend()
+    window = backend.add_element(backend.root, "WindowControl", "Shot App", rect=Rect(100, 50, 740, 530))
+    backend.add_element(window, "ButtonControl", "OK", rect=Rect(120, 80, 200, 110), patterns={"InvokePattern": {}})
+    backend.add_element(window, "EditControl", automation_id="input", rect=Rect(120, 120, 420, 150),
+                        patterns={"ValuePattern": {"Value": ""}})
+    return backend
+
+def png_size(path):
+    """PNGの幅・高さを返し、画像データが展開できることを確認する"""
+    with open(path, "rb") as f:
+        data = f.read()
+    width, height = struct.unpack(">II", data[16:24])
+    idat_length = struct.unpack(">I", data[33:37])[0]
+    raw = zlib.decompress(data[41:41 + idat_length])
+    if len(raw) != height * (1 + width * 3):
+        raise ValueError(f"{path}: unexpected image data length {len(raw)}")
+    return width, height
+
+def saved_files():
+    return sorted(os.listdir(DIRECTORY)) if os.path.isdir(DIRECTORY) else []
+
+def verify_screenshot_writer():
+    print("--- Testing Screenshot Writer ---")
+
+    logger = logging.getLogger("verify_screenshot_writer")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    recorder = ThreadRecorder()
+    logger.addHandler(recorder)
+    all_passed = True
+
+    try:
+        # 1. エラー時のスクリーンショットはバックグラウンドのスレッドで保存される（既定は画面全体）
+        backend = build_backend()
+        writer = ScreenshotWriter(backend=backend, directory=DIRECTORY, logger=logger)
+        engine = Engine(backend=backend, logger=logger, force_run=True, wait_time=0, screenshots=writer)
+        result = engine.run(engine.compile([("Shot App", "ButtonControl(Name='Missing')", "Click")]))
+        files = saved_files()
+        if (len(result.errors) == 1 and len(files) == 1 and png_size(os.path.join(DIRECTORY, files[0])) == (1920, 1080)
+                and recorder.threads == ["ScreenshotWriter"]):
+            print(f"PASS: Error screenshot written off-thread ({files[0]})")
+        else:
+            print(f"FAIL: Files {files}, writer threads {recorder.threads}")
+            all_passed = False
+        shutil.rmtree(DIRECTORY)
+
+        # 2. 範囲の指定（要素が見つからない場合はウィンドウ、ウィンドウもない場合は画面全体）
+        sizes = {}
+        for region in ("window", "element"):
+            writer = ScreenshotWriter(backend=backend, directory=DIRECTORY, region=region, logger=logger)
+            engine = Engine(backend=backend, logger=logger, force_run=True, wait_time=0, screenshots=writer)
+            engine.run(engine.compile([("Shot App", "input", "Screenshot", f"{region}_found"),
+                                       ("Shot App", "ButtonControl(Name='Missing')", "Click"),
+                                       ("Missing App", "", "Click")], aliases={"input": "EditControl(AutomationId='input')"}))
+            for name in saved_files():
+                sizes[name.rsplit("_", 2)[0]] = png_size(os.path.join(DIRECTORY, name))
+            shutil.rmtree(DIRECTORY)
+        expected = {"window_found": (640, 480), "element_found": (300, 30), "error_action_2": (640, 480),
+                    "error_action_3": (1920, 1080)}
+        if sizes == expected:
+            print("PASS: Window and element regions captured with fallbacks")
+        else:
+            print(f"FAIL: Captured sizes {sizes}")
+            all_passed = False
+
+        # 3. 直前のエラー時スクリーンショットと同じ画像は保存しない（画面が変わった後は保存する）
+        writer = ScreenshotWriter(backend=backend, directory=DIRECTORY, skip_identical=True, logger=logger)
+        engine = Engine(backend=backend, logger=logger, force_run=True, wait_time=0, screenshots=writer)
+        failing = [("Shot App", "ButtonControl(Name='Missing')", "Click")] * 5
+        engine.run(engine.compile(failing + [("Shot App", "EditControl(AutomationId='input')", "Input", "changed")] + failing))
+        if len(saved_files()) == 2 and writer.stats["saved"] == 2 and writer.stats["skipped"] == 8:
+            print(f"PASS: Identical error screenshots skipped ({writer.stats['skipped']} of 10)")
+        else:
+            print(f"FAIL: Files {saved_files()}, stats {writer.stats}")
+            all_passed = False
+        shutil.rmtree(DIRECTORY)
+
+        # 4. 書き込み待ちの合計サイズが上限を超える場合は新しい画像を破棄する
+        frame_bytes = 1920 * 1080 * 4
+        writer = ScreenshotWriter(backend=backend, directory=DIRECTORY, max_pending_bytes=frame_bytes * 2, logger=logger)
+        release = threading.Event()
+        write = writer._write
+        writer._write = lambda *args: (release.wait(), write(*args))
+        paths = [writer.capture(f"burst_{n}") for n in range(4)]
+        dropped = writer.stats["dropped"]
+        release.set()
+        writer.close()
+        if (dropped == 2 and paths[2:] == [None, None] and len(saved_files()) == 2 and writer._pending_bytes == 0
+                and writer._thread is None):
+            print("PASS: Frames beyond the memory budget are dropped; close() drains and stops the writer")
+        else:
+            print(f"FAIL: Paths {paths}, stats {writer.stats}, files {saved_files()}")
+            all_passed = False
+        shutil.rmtree(DIRECTORY)
+
+        # 5. 形式と圧縮レベル、ドライラン
+        sizes = {}
+        for image_format, level in (("png", 0), ("png", 9), ("bmp", 6)):
+            writer = ScreenshotWriter(backend=backend, directory=DIRECTORY, image_format=image_format,
+                                      compression=level, logger=logger)
+            path = writer.capture(f"{image_format}{level}")
+            writer.flush()
+            with open(path, "rb") as f:
+                sizes[(image_format, level)] = (os.path.getsize(path), f.read(2))
+        dry = ScreenshotWriter(backend=backend, directory=DIRECTORY, logger=logger).capture("dry", dry_run=True)
+        if (sizes[("png", 9)][0] < sizes[("png", 0)][0] and sizes[("bmp", 6)] == (54 + frame_bytes, b"BM")
+                and dry is None and len(saved_files()) == 3):
+            print(f"PASS: PNG level 0/9 = {sizes[('png', 0)][0]:,}/{sizes[('png', 9)][0]:,} bytes, BMP written, dry-run skipped")
+        else:
+            print(f"FAIL: Sizes {sizes}, dry-run {dry}")
+            all_passed = False
+
+        print(f"Screenshot Writer Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Screenshot Writer Verification: FAIL - {e!r}")
+    finally:
+        logger.removeHandler(recorder)
+        shutil.rmtree(DIRECTORY, ignore_errors=True)
+
+if __name__ == "__main__":
+    verify_screenshot_writer()
@@ -0,0 +1,147 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.automator.core.element_finder import ElementFinder
+from src.inspector.core.path_generator import PathGenerator
+from src.inspector.core.segment_cache import SegmentCache
+from src.inspector.core.sibling_cache import SiblingCache
+from src.shared.backend.fake import FakeBackend
+
+DEPTH = 6
+LEAVES = 20
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def build_backend():
+    backend = FakeBackend()
+    window = backend.add_element(backend.root, "WindowControl", "Segment App")
+    panel = window
+    panels = []
+    for level in range(DEPTH):
+        for n in range(3):
+            backend.add_element(panel, "PaneControl", "Panel", class_name="Filler")
+        panel = backend.add_element(panel, "PaneControl", "Panel", class_name="Panel")
+        panels.append(panel)
+    leaves = [backend.add_element(panel, "ButtonControl", f"Button {n}") for n in range(LEAVES)]
+    return backend, window, panels, leaves
+
+def verify_segment_cache():
+    print("--- Testing Segment Cache ---")
+    all_passed = True
+
+    try:
+        # 1. 同じパネルの下を続けてクリックすると、祖先のセグメントは再利用され葉だけが計算される
+        backend, window, panels, leaves = build_backend()
+        results = {}
+        for label, segment_cache in (("uncached", SegmentCache(max_entries=0)), ("cached", SegmentCache())):
+            generator = PathGenerator(mode="legacy", backend=backend, segment_cache=segment_cache)
+            generator.get_rpa_path(leaves[0])
+            before = sum(backend.calls.values())
+            paths = [generator.get_rpa_path(leaf) for leaf in leaves[1:]]
+            results[label] = (paths, sum(backend.calls.values()) - before, segment_cache.stats)
+        uncached_calls, cached_calls = results["uncached"][1], results["cached"][1]
+        stats = results["cached"][2]
+        if (results["uncached"][0] == results["cached"][0] and stats["hits"] == DEPTH * (LEAVES - 1)
+                and cached_calls * 2 < uncached_calls):
+            print(f"PASS: {LEAVES - 1} clicks reuse {DEPTH} ancestor segments each, "
+                  f"backend calls {uncached_calls} -> {cached_calls}")
+        else:
+            print(f"FAIL: Same paths {results['uncached'][0] == results['cached'][0]}, stats {stats}, "
+                  f"calls {uncached_calls} -> {cached_calls}")
+            all_passed = False
+
+        # 2. 親の子の並びが変わったことをSiblingCacheが検出すると、その親の子のセグメントは作り直される
+        clock = FakeClock()
+        generator = PathGenerator(mode="legacy", backend=backend,
+                                  sibling_cache=SiblingCache(backend, ttl=2.0, clock=clock))
+        outer, inner = panels[2], panels[3]
+        generator.get_rpa_path(leaves[0])
+        backend.add_element(outer, "PaneControl", "Panel", class_name="Panel")
+        outer.children.insert(0, outer.children.pop())  # innerより前に同じ条件の要素を追加
+        clock.now = 5.0
+        generator.get_rpa_path(outer.children[1])  # outerの子を読み直す（変化を検出）
+        path = generator.get_rpa_path(leaves[1])
+        finder = ElementFinder(backend=backend)
+        if "ClassName='Panel', foundIndex=2" in path and finder.find_element_by_path(window, path, wait=False) is leaves[1]:
+            print("PASS: A changed sibling order invalidates the cached child segments")
+        else:
+            print(f"FAIL: Path after the change {path}")
+            all_passed = False
+
+        # 3. 祖先の前に兄弟が追加されると、兄弟のTTLが切れた後のクリックで祖先のセグメントも作り直される
+        backend, window, panels, leaves = build_backend()
+        clock = FakeClock()
+        generator = PathGenerator(mode="legacy", backend=backend,
+                                  sibling_cache=SiblingCache(backend, ttl=2.0, clock=clock))
+        generator.get_rpa_path(leaves[0])
+        ancestor = panels[1]
+        for n in range(2):
+            backend.add_element(ancestor.parent, "PaneControl", "Panel", class_name="Panel")
+            ancestor.parent.children.insert(0, ancestor.parent.children.pop())
+        clock.now = 5.0
+        path = generator.get_rpa_path(leaves[1])
+        fresh = PathGenerator(mode="legacy", backend=backend).get_rpa_path(leaves[1])
+        segment = path.split(" -> ")[1]
+        if (path == fresh and "foundIndex=3" in segment
+                and ElementFinder(backend=backend).find_element_by_path(window, path, wait=False) is leaves[1]):
+            print("PASS: A sibling inserted before an ancestor regenerates the ancestor segment")
+        else:
+            print(f"FAIL: Path {path}, expected {fresh}")
+            all_passed = False
+
+        # 4. 祖先の名前が変わると、兄弟のTTLが切れた後のクリックで祖先のセグメントも作り直される
+        backend = FakeBackend()
+        window = backend.add_element(backend.root, "WindowControl", "Editor")
+        document = backend.add_element(window, "DocumentControl", "Untitled")
+        pane = backend.add_element(document, "PaneControl", "Toolbar")
+        buttons = [backend.add_element(pane, "ButtonControl", f"Button {n}") for n in range(2)]
+        clock = FakeClock()
+        generator = PathGenerator(mode="legacy", backend=backend,
+                                  sibling_cache=SiblingCache(backend, ttl=2.0, clock=clock))
+        generator.get_rpa_path(buttons[0])
+        document.name = "Doc1"
+        clock.now = 5.0
+        path = generator.get_rpa_path(buttons[1])
+        if path == PathGenerator(mode="legacy", backend=backend).get_rpa_path(buttons[1]) and "Name='Doc1'" in path:
+            print("PASS: A renamed ancestor regenerates its segment")
+        else:
+            print(f"FAIL: Path after the rename {path}")
+            all_passed = False
+
+        # 5. 別の親の下に移動した要素のセグメントは使わない
+        backend, window, panels, leaves = build_backend()
+        generator = PathGenerator(mode="legacy", backend=backend)
+        generator.get_rpa_path(leaves[0])
+        moved, target = panels[-1], panels[0]
+        moved.parent.children.remove(moved)
+        moved.parent = target
+        target.children.append(moved)
+        path = generator.get_rpa_path(leaves[1])
+        found = ElementFinder(backend=backend).find_element_by_path(window, path, wait=False)
+        if found is leaves[1] and path.count(" -> ") == 2:
+            print("PASS: Re-parented elements are regenerated")
+        else:
+            print(f"FAIL: Path after the move {path}")
+            all_passed = False
+
+        # 6. invalidate() ですべて破棄する
+        generator.invalidate()
+        if len(generator.segment_cache) == 0 and not generator.sibling_cache._entries:
+            print("PASS: invalidate() clears segments and sibling snapshots")
+        else:
+            print(f"FAIL: {len(generator.segment_cache)} segments left")
+            all_passed = False
+
+        print(f"Segment Cache Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Segment Cache Verification: FAIL - {e!r}")
+
+if __name__ == "__main__":
+    verify_segment_cache()
@@ -0,0 +1,191 @@
+import sys
+import os
+import copy
+import json
+import time
+import shutil
+import logging
+import tempfile
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from automator import JobRunner
+from src.shared.backend.fake import FakeBackend
+
+class CopyingBackend(FakeBackend):
+    """UIAと同じく、検索のたびに別の要素オブジェクトを返すバックエンド"""
+
+    def find(self, *args, **kwargs):
+        element = super().find(*args, **kwargs)
+        return copy.copy(element) if element is not None else None
+
+def submit(*args):
+    cmd = [sys.executable, "automator.py", "submit", "--connection-file", "tests/temp_serve_conn.json"] + list(args)
+    return subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
+
+def json_lines(output):
+    return [json.loads(line) for line in output.splitlines() if line.startswith("{")]
+
+def verify_serve():
+    print("--- Testing Serve Mode ---")
+
+    tree_file = "tests/temp_serve_tree.json"
+    alias_file = "tests/temp_serve_aliases.csv"
+    actions_file = "tests/temp_serve_actions.csv"
+    fail_file = "tests/temp_serve_fail.csv"
+    wait_file = "tests/temp_serve_wait.csv"
+    conn_file = "tests/temp_serve_conn.json"
+    cache_dir = "tests/temp_serve_cache"
+    screenshot_dir = "tests/temp_serve_errors"
+    if sys.platform == "win32":
+        address = rf"\\.\pipe\automator-verify-{os.getpid()}"
+    else:
+        address = os.path.join(tempfile.gettempdir(), f"automator-verify-{os.getpid()}.sock")
+    server = None
+
+    try:
+        with open(tree_file, "w", encoding="utf-8") as f:
+            json.dump({"ControlType": "WindowControl", "Name": "App - Main", "Children": [
+                {"ControlType": "ButtonControl", "Name": "OK", "Patterns": {"Invoke": {}}},
+                {"ControlType": "EditControl", "AutomationId": "input", "Patterns": {"Value": {"Value": ""}}},
+            ]}, f)
+        with open(alias_file, "w", encoding="utf-8") as f:
+            f.write("AliasName,RPA_Path\nok,ButtonControl(Name='OK')\n")
+        with open(actions_file, "w", encoding="utf-8") as f:
+            f.write("TargetApp,Key,Action,Value\nApp,ok,Click,\n"
+                    "App,EditControl(AutomationId='input'),Input,{name}\n,,SetVariable,status = 'done'\n")
+        with open(fail_file, "w", encoding="utf-8") as f:
+            f.write("TargetApp,Key,Action,Value\nApp,ButtonControl(Name='Missing'),Click,\n")
+        with open(wait_file, "w", encoding="utf-8") as f:
+            f.write("TargetApp,Key,Action,Value\n,,Wait,0.6\n")
+        all_passed = True
+
+        server = subprocess.Popen([sys.executable, "automator.py", "serve", "--fake-tree", tree_file,
+                                   "--address", address, "--connection-file", conn_file, "--cache-dir", cache_dir,
+                                   "--screenshot-dir", screenshot_dir],
+                                  stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding="utf-8")
+        deadline = time.time() + 15
+        while not os.path.exists(conn_file) and time.time() < deadline and server.poll() is None:
+            time.sleep(0.05)
+
+        # 1. ジョブを投入し、アクションごとのイベントと結果（変数を含む）を受け取る
+        result = submit(actions_file, "--aliases", alias_file, "--var", "name=Taro", "--json")
+        messages = json_lines(result.stdout)
+        actions = [m for m in messages if m["type"] == "action"]
+        final = messages[-1] if messages else {}
+        if (result.returncode == 0 and messages and messages[0]["type"] == "accepted" and len(actions) == 3
+                and all(a["status"] == "OK" for a in actions) and actions[0]["alias"] == "ok"
+                and final.get("status") == "OK" and final["variables"] == {"name": "Taro", "status": "done"}):
+            print(f"PASS: Job streamed {len(actions)} action events and the final variables")
+        else:
+            print(f"FAIL: Job output (exit {result.returncode}):\n{result.stdout}{result.stderr}")
+            all_passed = False
+
+        # 2. 同じソースの2回目のジョブはプロセス内のコンパイルキャッシュを使用する
+        result = submit(actions_file, "--aliases", alias_file, "--var", "name=Hanako")
+        if result.returncode == 0 and "Using compile cache" in result.stdout and "Job 2 (default): OK" in result.stdout:
+            print("PASS: Second job reused the compile cache")
+        else:
+            print(f"FAIL: Second job output (exit {result.returncode}):\n{result.stdout}{result.stderr}")
+            all_passed = False
+
+        # 3. 失敗したジョブは終了コード1でエラー内容を返す
+        result = submit(fail_file)
+        screenshots = os.listdir(screenshot_dir) if os.path.isdir(screenshot_dir) else []
+        if (result.returncode == 1 and "FAILED" in result.stdout and "Action 1:" in result.stdout
+                and any(name.startswith("error_action_1_") for name in screenshots)):
+            print("PASS: Failed job exits with code 1 and saves its screenshot to --screenshot-dir")
+        else:
+            print(f"FAIL: Failed job output (exit {result.returncode}), screenshots {screenshots}:\n{result.stdout}{result.stderr}")
+            all_passed = False
+
+        # 4. 異なるレーンのジョブは並行して、同じレーンのジョブは順番に実行される
+        def run_pair(lanes):
+            start = time.perf_counter()
+            procs = [subprocess.Popen([sys.executable, "automator.py", "submit", "--connection-file", conn_file,
+                                       wait_file, "--lane", lane], stdout=subprocess.DEVNULL) for lane in lanes]
+            codes = [p.wait() for p in procs]
+            return time.perf_counter() - start, codes
+
+        parallel, parallel_codes = run_pair(["a", "b"])
+        serial, serial_codes = run_pair(["c", "c"])
+        if parallel_codes == [0, 0] and serial_codes == [0, 0] and serial >= 1.2 and parallel < serial - 0.3:
+            print(f"PASS: Lanes run in parallel ({parallel:.2f}s) and jobs in one lane serially ({serial:.2f}s)")
+        else:
+            print(f"FAIL: Lane timing parallel {parallel:.2f}s {parallel_codes}, serial {serial:.2f}s {serial_codes}")
+            all_passed = False
+
+        # 5. 状態の取得と停止（投入済みのジョブを終えてから停止し、接続ファイルを削除する）
+        status = json_lines(submit("--status", "--json").stdout)
+        lanes = status[0]["lanes"] if status else {}
+        result = submit("--shutdown")
+        server.wait(timeout=15)
+        if (lanes.get("default", {}).get("completed") == 3 and lanes.get("c", {}).get("completed") == 2
+                and result.returncode == 0 and server.returncode == 0 and not os.path.exists(conn_file)):
+            print("PASS: Status reported per-lane counts and the server shut down cleanly")
+        else:
+            print(f"FAIL: Status {status}, shutdown exit {result.returncode}, server exit {server.returncode}")
+            all_passed = False
+
+        # 6. サーバーが起動していない場合は終了コード2
+        result = submit(actions_file)
+        if result.returncode == 2 and "No automator server is running" in result.stderr:
+            print("PASS: Submit without a server exits with code 2")
+        else:
+            print(f"FAIL: Submit without a server exit {result.returncode}: {result.stderr}")
+            all_passed = False
+
+        # 7. ウィンドウはジョブ間で共有し、閉じられた場合は検索し直す
+        with open(tree_file, "r", encoding="utf-8") as f:
+            tree = json.load(f)
+        backend = FakeBackend()
+        backend.load_tree(tree)
+        runner = JobRunner(backend)
+        job = {"action_files": [actions_file], "aliases": [alias_file], "variables": {"name": "x"}, "log_level": "ERROR"}
+        runner(job, "test", lambda message: None)
+        finds = backend.calls["find"]
+        runner(job, "test", lambda message: None)
+        cached_finds = backend.calls["find"] - finds
+        window = runner.window_caches["test"].get("App")
+        backend.remove_element(window)
+        backend.load_tree(tree)  # 同じタイトルのウィンドウを開き直す
+        outcome = runner(job, "test", lambda message: None)
+        reopened = runner.window_caches["test"].get("App")
+        if (window is not None and cached_finds < finds and outcome["status"] == "OK"
+                and reopened is not window and backend.exists(reopened)):
+            print(f"PASS: Window cache shared across jobs and refreshed after close ({finds} -> {cached_finds} find calls)")
+        else:
+            print(f"FAIL: Window cache {runner.window_caches}, find calls {finds} -> {cached_finds}, {outcome}")
+            all_passed = False
+        logging.getLogger("automator.lane.test").handlers.clear()
+
+        # 8. ウィンドウのキャッシュはレーンごとに持ち、別のレーン（別のCOMアパートメント）の要素を渡さない
+        backend = CopyingBackend()
+        backend.load_tree(tree)
+        runner = JobRunner(backend)
+        outcomes = [runner(job, lane, lambda message: None) for lane in ("lane-a", "lane-b", "lane-a")]
+        windows = {lane: runner.window_caches.get(lane, {}).get("App") for lane in ("lane-a", "lane-b")}
+        if (all(outcome["status"] == "OK" for outcome in outcomes) and None not in windows.values()
+                and windows["lane-a"] is not windows["lane-b"]):
+            print("PASS: Each lane keeps its own window cache")
+        else:
+            print(f"FAIL: Window caches {runner.window_caches}, {outcomes}")
+            all_passed = False
+        for lane in ("lane-a", "lane-b"):
+            logging.getLogger(f"automator.lane.{lane}").handlers.clear()
+
+        print(f"Serve Mode Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Serve Mode Verification: FAIL - {e}")
+    finally:
+        if server and server.poll() is None:
+            server.kill()
+            server.wait()
+        for path in [tree_file, alias_file, actions_file, fail_file, wait_file, conn_file]:
+            if os.path.exists(path): os.remove(path)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        shutil.rmtree(screenshot_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    verify_serve()
@@ -0,0 +1,102 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.automator.core.element_finder import ElementFinder
+from src.inspector.core.path_generator import PathGenerator
+from src.inspector.core.sibling_cache import SiblingCache
+from src.shared.backend.fake import FakeBackend
+
+ITEMS = 60
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def build_backend():
+    backend = FakeBackend()
+    window = backend.add_element(backend.root, "WindowControl", "List App")
+    toolbar = backend.add_element(window, "ToolBarControl", "Tools")
+    for n in range(10):
+        backend.add_element(toolbar, "ButtonControl", "Tool" if n % 2 else "", class_name="ToolButton")
+    listbox = backend.add_element(window, "ListControl", "Items")
+    items = [backend.add_element(listbox, "ListItemControl", "Item" if n % 3 else f"Item {n}", class_name="Row")
+             for n in range(ITEMS)]
+    return backend, window, toolbar, listbox, items
+
+def verify_sibling_cache():
+    print("--- Testing Sibling Cache ---")
+    all_passed = True
+
+    try:
+        # 1. キャッシュの有無で同じパスが生成され、兄弟のプロパティ読み取りが減る
+        backend, window, toolbar, listbox, items = build_backend()
+        targets = items + list(toolbar.children)
+        results = {}
+        for label, ttl in (("uncached", 0), ("cached", 2.0)):
+            for mode in ("modern", "legacy"):
+                generator = PathGenerator(mode=mode, backend=backend, sibling_cache=SiblingCache(backend, ttl=ttl))
+                before = sum(backend.calls.values())
+                paths = [generator.get_rpa_path(item) for item in targets]
+                results[(label, mode)] = (paths, sum(backend.calls.values()) - before)
+        same = all(results[("uncached", mode)][0] == results[("cached", mode)][0] for mode in ("modern", "legacy"))
+        uncached_calls = results[("uncached", "legacy")][1]
+        cached_calls = results[("cached", "legacy")][1]
+        if same and cached_calls * 5 < uncached_calls and "foundIndex=40" in results[("cached", "legacy")][0][ITEMS - 1]:
+            print(f"PASS: Identical paths for {len(targets)} siblings, backend calls {uncached_calls} -> {cached_calls}")
+        else:
+            print(f"FAIL: Same paths {same}, calls {uncached_calls} -> {cached_calls}")
+            all_passed = False
+
+        # 2. 生成したパスで元の要素が見つかる
+        finder = ElementFinder(backend=backend)
+        paths = results[("cached", "modern")][0]
+        found = [finder.find_element_by_path(window, path, wait=False) for path in paths]
+        if all(element is target for element, target in zip(found, targets)):
+            print("PASS: Every generated path resolves back to its element")
+        else:
+            mismatches = [path for path, element, target in zip(paths, found, targets) if element is not target]
+            print(f"FAIL: {len(mismatches)} paths resolve elsewhere, e.g. {mismatches[:2]}")
+            all_passed = False
+
+        # 3. スナップショットにない要素は作り直して計算し、TTLを過ぎたスナップショットは読み直す
+        clock = FakeClock()
+        cache = SiblingCache(backend, ttl=2.0, clock=clock)
+        generator = PathGenerator(mode="legacy", backend=backend, sibling_cache=cache)
+        generator.get_rpa_path(items[1])
+        added = backend.add_element(listbox, "ListItemControl", "Item", class_name="Row")
+        new_path = generator.get_rpa_path(added)
+        refreshes = cache.stats["refreshes"]
+        listbox.children.remove(added)
+        listbox.children.insert(0, added)  # 先頭へ移動（TTL内はスナップショットの順番のまま）
+        stale_path = generator.get_rpa_path(items[1])
+        clock.now = 2.5
+        fresh_path = generator.get_rpa_path(items[1])
+        expected_new = f"foundIndex={ITEMS * 2 // 3 + 1}"
+        if (expected_new in new_path and refreshes == 1 and "foundIndex=1," in stale_path
+                and "foundIndex=2," in fresh_path):
+            print("PASS: Missing elements trigger a refresh and snapshots expire after the TTL")
+        else:
+            print(f"FAIL: New {new_path}, stale {stale_path}, fresh {fresh_path}, stats {cache.stats}")
+            all_passed = False
+
+        # 4. 保持する親の数には上限がある
+        cache = SiblingCache(backend, max_parents=2)
+        for parent in (window, toolbar, listbox):
+            cache.found_index(parent, parent.children[0], {"ControlTypeName": parent.children[0].control_type})
+        if len(cache._entries) == 2 and backend.get_runtime_id(window) not in cache._entries:
+            print("PASS: Least recently used parents are evicted")
+        else:
+            print(f"FAIL: Cached parents {list(cache._entries)}")
+            all_passed = False
+
+        print(f"Sibling Cache Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Sibling Cache Verification: FAIL - {e!r}")
+
+if __name__ == "__main__":
+    verify_sibling_cache()
@@ -0,0 +1,85 @@
+import sys
+import os
+import csv
+import json
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.shared.snapshot import Snapshot
+
+def verify_snapshot():
+    print("--- Testing UI Tree Snapshot ---")
+
+    tree_file = "tests/temp_snapshot_tree.json"
+    snapshot_file = "tests/temp_snapshot.uisnap"
+    actions_file = "tests/temp_snapshot_actions.csv"
+
+    tree = {
+        "ControlType": "WindowControl", "Name": "スナップショット検証", "ClassName": "SnapWindow",
+        "Rect": [10, 20, 810, 620],
+        "Children": [
+            {"ControlType": "PaneControl", "Name": "Toolbar", "Children": [
+                {"ControlType": "ButtonControl", "Name": "保存", "AutomationId": "Save",
+                 "Patterns": {"InvokePattern": {}}},
+                {"ControlType": "ButtonControl", "Name": "保存", "AutomationId": "SaveAs", "IsEnabled": False},
+            ]},
+            {"ControlType": "EditControl", "Name": "本文", "IsOffscreen": True,
+             "Patterns": {"ValuePattern": {"Value": ""}, "TextPattern": {}}},
+        ],
+    }
+
+    try:
+        with open(tree_file, "w", encoding="utf-8") as f:
+            json.dump(tree, f, ensure_ascii=False)
+
+        all_passed = True
+        cmd = [sys.executable, "snapshot.py", "capture", "スナップショット検証", "-o", snapshot_file, "--fake-tree", tree_file]
+        result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
+        if result.returncode == 0 and "Saved 5 nodes" in result.stdout:
+            print("PASS: Captured 5 nodes")
+        else:
+            print(f"FAIL: Capture failed: {result.stdout} {result.stderr}")
+            all_passed = False
+
+        with Snapshot(snapshot_file) as snapshot:
+            root = snapshot.node(0)
+            save_as = snapshot.node(3)
+            edit = snapshot.node(4)
+            checks = [
+                ("window properties", root["Name"] == "スナップショット検証" and root["Rect"] == [10, 20, 810, 620]),
+                ("parent links", list(snapshot.parent) == [-1, 0, 1, 1, 0]),
+                ("children", list(snapshot.children(0)) == [1, 4] and list(snapshot.children(1)) == [2, 3]),
+                ("interned strings", snapshot.name[2] == snapshot.name[3]),
+                ("flags", not save_as["IsEnabled"] and edit["IsOffscreen"]),
+                ("patterns", edit["Patterns"] == ["ValuePattern", "TextPattern"] and snapshot.has_pattern(2, "InvokePattern")),
+                ("metadata", snapshot.metadata.get("target_app") == "スナップショット検証"),
+            ]
+        for name, ok in checks:
+            print(f"{'PASS' if ok else 'FAIL'}: Snapshot {name}")
+            all_passed = all_passed and ok
+
+        # スナップショットをそのままフェイクバックエンドのツリーとして使用できる
+        with open(actions_file, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=["TargetApp", "Key", "Action", "Value"])
+            writer.writeheader()
+            writer.writerow({"TargetApp": "スナップショット検証",
+                             "Key": "PaneControl(Name='Toolbar', searchDepth=1) -> ButtonControl(Name='保存', foundIndex=2, searchDepth=1)",
+                             "Action": "GetProperty", "Value": "id = AutomationId"})
+        cmd = [sys.executable, "automator.py", actions_file, "--fake-tree", snapshot_file]
+        result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
+        if result.returncode == 0 and "Got AutomationId = 'SaveAs'" in result.stdout:
+            print("PASS: Automator resolved a path against the snapshot")
+        else:
+            print(f"FAIL: Automator could not use the snapshot: {result.stdout[-1000:]} {result.stderr[-1000:]}")
+            all_passed = False
+
+        print(f"Snapshot Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Snapshot Verification: FAIL - {e}")
+    finally:
+        for path in [tree_file, snapshot_file, actions_file]:
+            if os.path.exists(path): os.remove(path)
+
+if __name__ == "__main__":
+    verify_snapshot()
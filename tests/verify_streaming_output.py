@@ -0,0 +1,117 @@
+import sys
+import os
+import io
+import shutil
+import contextlib
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from inspector import Inspector, RECENT_ITEMS
+from src.inspector.utils.output_handler import OutputHandler
+from src.shared.backend.fake import FakeBackend
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+OUTPUT_DIR = "tests/temp_streaming_output"
+
+CRASH_SCRIPT = """
+import os, sys
+sys.path.insert(0, {root!r})
+from src.inspector.utils.output_handler import OutputHandler
+from src.shared.backend.fake import FakeBackend
+handler = OutputHandler("csv", backend=FakeBackend(), batch_size=10, flush_interval=3600, directory={directory!r})
+for n in range(25):
+    handler.record({{"TargetApp": "App", "Key": f"Key{{n}}", "Action": "", "Value": ""}})
+print(handler.path)
+sys.stdout.flush()
+os._exit(1)  # finalize() を呼ばずに強制終了
+"""
+
+def item(n):
+    return {"TargetApp": "Stream App", "Key": f"ButtonControl(Name='Button {n}')", "Action": "", "Value": ""}
+
+def read_lines(path):
+    with open(path, encoding="utf-8-sig") as f:
+        return f.read().splitlines()
+
+def verify_streaming_output():
+    print("--- Testing Streaming Output ---")
+    all_passed = True
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    try:
+        # 1. 強制終了しても、書き出し済みのバッチ（ヘッダーは1回のみ）がファイルに残る
+        result = subprocess.run([sys.executable, "-c", CRASH_SCRIPT.format(root=ROOT, directory=OUTPUT_DIR)],
+                                capture_output=True, text=True, cwd=ROOT)
+        path = result.stdout.strip()
+        lines = read_lines(path) if path and os.path.exists(path) else []
+        if result.returncode == 1 and lines[0] == "TargetApp,Key,Action,Value" and len(lines) == 21:
+            print(f"PASS: A killed session keeps {len(lines) - 1} of 25 items (flushed in batches of 10)")
+        else:
+            print(f"FAIL: Exit {result.returncode}, lines {lines}, stderr {result.stderr}")
+            all_passed = False
+
+        # 2. flush_intervalが経過していれば、poll() でバッチに満たないアイテムも書き出す
+        handler = OutputHandler("csv", backend=FakeBackend(), batch_size=10, flush_interval=3600,
+                                directory=OUTPUT_DIR)
+        handler.record(item(0))
+        before = len(read_lines(handler.path))
+        handler.flush_interval = 0
+        handler.poll()
+        after = len(read_lines(handler.path))
+        handler.close()
+        if before == 1 and after == 2:
+            print("PASS: poll() flushes a partial batch once the interval has passed")
+        else:
+            print(f"FAIL: Lines before poll {before}, after {after}")
+            all_passed = False
+
+        # 3. 長いセッションでもInspectorが保持するのは直近のアイテムだけ
+        backend = FakeBackend()
+        inspector = Inspector(output="alias", backend=backend)
+        inspector.output_handler.directory = OUTPUT_DIR
+        with contextlib.redirect_stdout(io.StringIO()):
+            for n in range(5000):
+                inspector.record(item(n))
+            inspector.finalize()
+        lines = read_lines(inspector.output_handler.path)
+        if (len(inspector.recorded_items) == RECENT_ITEMS and len(lines) == 5001
+                and lines[0] == "AliasName,RPA_Path" and lines[-1] == ",ButtonControl(Name='Button 4999')"):
+            print(f"PASS: 5000 items streamed to the alias file, {RECENT_ITEMS} kept in memory")
+        else:
+            print(f"FAIL: {len(inspector.recorded_items)} items in memory, {len(lines)} lines")
+            all_passed = False
+
+        # 4. clipboardは追記したファイルからコピーし、ファイルを削除する
+        backend = FakeBackend()
+        handler = OutputHandler("clipboard", backend=backend, directory=OUTPUT_DIR)
+        with contextlib.redirect_stdout(io.StringIO()):
+            handler.finalize([item(1), item(2)])
+        expected = ("TargetApp,Key,Action,Value\r\n"
+                    "Stream App,ButtonControl(Name='Button 1'),,\r\n"
+                    "Stream App,ButtonControl(Name='Button 2'),,\r\n")
+        if backend.clipboard == expected and not os.path.exists(handler.path):
+            print("PASS: Clipboard output is built from the streamed file")
+        else:
+            print(f"FAIL: Clipboard {backend.clipboard!r}, file left {os.path.exists(handler.path)}")
+            all_passed = False
+
+        # 5. 何も記録しなければファイルを作らない
+        handler = OutputHandler("csv", backend=FakeBackend(), directory=OUTPUT_DIR)
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            handler.finalize()
+        if handler.path is None and "No items recorded." in output.getvalue():
+            print("PASS: No file is created for an empty session")
+        else:
+            print(f"FAIL: Empty session created {handler.path}")
+            all_passed = False
+
+        print(f"Streaming Output Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Streaming Output Verification: FAIL - {e!r}")
+    finally:
+        shutil.rmtree(OUTPUT_DIR, ignore_errors=True)
+
+if __name__ == "__main__":
+    verify_streaming_output()
@@ -0,0 +1,74 @@
+import sys
+import os
+import csv
+import json
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def verify_timing():
+    print("--- Testing Timing Instrumentation ---")
+    
+    actions_file = "tests/temp_timing_actions.csv"
+    timing_file = "tests/temp_timing_records.json"
+    log_file = "tests/verify_timing.log"
+    
+    rows = [
+        {"TargetApp": "", "Key": "", "Action": "SetVariable", "Value": "count = 0"},
+        {"TargetApp": "", "Key": "", "Action": "Loop", "Value": "3"},
+        {"TargetApp": "", "Key": "", "Action": "SetVariable", "Value": "count = {count} + 1"},
+        {"TargetApp": "", "Key": "", "Action": "EndLoop", "Value": ""},
+        {"TargetApp": "", "Key": "", "Action": "Wait", "Value": "0.2"},
+    ]
+    
+    try:
+        with open(actions_file, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=["TargetApp", "Key", "Action", "Value"])
+            writer.writeheader()
+            writer.writerows(rows)
+        
+        cmd = [sys.executable, "automator.py", actions_file,
+               "--timing-output", timing_file, "--log-file", log_file]
+        subprocess.run(cmd, check=True, capture_output=True)
+        
+        with open(log_file, "r", encoding="utf-8") as f:
+            log_content = f.read()
+        with open(timing_file, "r", encoding="utf-8") as f:
+            records = json.load(f)
+        
+        all_passed = True
+        if "=== Timing Summary ===" in log_content and "p95(ms)" in log_content:
+            print("PASS: Summary table printed")
+        else:
+            print("FAIL: Summary table missing")
+            all_passed = False
+        
+        actions = [r for r in records if r["phase"] == "action"]
+        set_vars = [r for r in actions if r["action_type"] == "SetVariable"]
+        waits = [r for r in records if r["phase"] == "wait"]
+        if len(set_vars) == 4:
+            print("PASS: 4 SetVariable actions recorded")
+        else:
+            print(f"FAIL: Expected 4 SetVariable actions, got {len(set_vars)}")
+            all_passed = False
+        if len(waits) == 1 and waits[0]["duration_ms"] >= 200:
+            print(f"PASS: Wait phase recorded ({waits[0]['duration_ms']} ms)")
+        else:
+            print("FAIL: Wait phase missing or too short")
+            all_passed = False
+        
+        if all_passed:
+            print("Timing Verification: PASS")
+            if os.path.exists(log_file): os.remove(log_file)
+        else:
+            print("Timing Verification: FAIL")
+            
+    except subprocess.CalledProcessError as e:
+        print(f"Timing Verification: FAIL - Process error {e}")
+    except Exception as e:
+        print(f"Timing Verification: FAIL - {e}")
+    finally:
+        for path in [actions_file, timing_file]:
+            if os.path.exists(path): os.remove(path)
+
+if __name__ == "__main__":
+    verify_timing()
@@ -0,0 +1,63 @@
+import sys
+import os
+import csv
+import json
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+def verify_trace_export():
+    print("--- Testing Chrome Trace Export ---")
+    
+    actions_file = "tests/temp_trace_actions.csv"
+    trace_file = "tests/temp_trace.json"
+    
+    rows = [
+        {"TargetApp": "", "Key": "", "Action": "SetVariable", "Value": "a = 1"},
+        {"TargetApp": "", "Key": "", "Action": "Wait", "Value": "0.1"},
+    ]
+    
+    try:
+        with open(actions_file, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=["TargetApp", "Key", "Action", "Value"])
+            writer.writeheader()
+            writer.writerows(rows)
+        
+        cmd = [sys.executable, "automator.py", actions_file, "--trace", trace_file]
+        subprocess.run(cmd, check=True, capture_output=True)
+        
+        with open(trace_file, "r", encoding="utf-8") as f:
+            trace = json.load(f)
+        
+        events = [e for e in trace["traceEvents"] if e["ph"] == "X"]
+        names = [e["name"] for e in events]
+        print(f"Events: {names}")
+        
+        all_passed = True
+        for expected in ["#1 SetVariable", "#2 Wait", "body: Wait", "wait"]:
+            if expected in names:
+                print(f"PASS: Found span '{expected}'")
+            else:
+                print(f"FAIL: Missing span '{expected}'")
+                all_passed = False
+        
+        # waitスパンはアクションスパンの内側にネストされている
+        action = next(e for e in events if e["name"] == "#2 Wait")
+        wait = next(e for e in events if e["name"] == "wait")
+        if action["ts"] <= wait["ts"] and wait["ts"] + wait["dur"] <= action["ts"] + action["dur"]:
+            print("PASS: Wait span is nested inside the action span")
+        else:
+            print("FAIL: Wait span is not nested inside the action span")
+            all_passed = False
+        
+        print(f"Trace Export Verification: {'PASS' if all_passed else 'FAIL'}")
+            
+    except subprocess.CalledProcessError as e:
+        print(f"Trace Export Verification: FAIL - Process error {e}")
+    except Exception as e:
+        print(f"Trace Export Verification: FAIL - {e}")
+    finally:
+        for path in [actions_file, trace_file]:
+            if os.path.exists(path): os.remove(path)
+
+if __name__ == "__main__":
+    verify_trace_export()
@@ -0,0 +1,101 @@
+import sys
+import os
+import csv
+import json
+import subprocess
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from src.shared.backend.fake import FakeBackend
+from src.shared.multi_matcher import MultiPathMatcher
+from src.shared.resolver import SnapshotResolver
+from src.shared.snapshot import Snapshot, capture_snapshot
+
+def verify_validate_aliases():
+    print("--- Testing Alias Validation ---")
+
+    tree_file = "tests/temp_validate_tree.json"
+    snapshot_file = "tests/temp_validate.uisnap"
+    alias_file = "tests/temp_validate_aliases.csv"
+    report_file = "tests/temp_validate_report.csv"
+
+    tree = {
+        "ControlType": "WindowControl", "Name": "Validate Test",
+        "Children": [
+            {"ControlType": "PaneControl", "Name": "Main", "Children": [
+                {"ControlType": "GroupControl", "Name": "Form", "Children": [
+                    {"ControlType": "ButtonControl", "Name": "OK", "AutomationId": "ok1"},
+                    {"ControlType": "ButtonControl", "Name": "OK", "AutomationId": "ok2"},
+                    {"ControlType": "EditControl", "Name": "入力", "ClassName": "Edit"},
+                ]},
+                {"ControlType": "ButtonControl", "Name": "Close", "AutomationId": "close"},
+            ]},
+        ],
+    }
+
+    # (エイリアス, パス, 期待するステータス)
+    aliases = [
+        ("ok_second", "PaneControl(Name='Main', searchDepth=1) -> GroupControl(Name='Form', searchDepth=1) -> ButtonControl(Name='OK', foundIndex=2, searchDepth=1)", "OK"),
+        ("close", "PaneControl(Name='Main', searchDepth=1) -> ButtonControl(AutomationId='close', searchDepth=1)", "OK"),
+        ("ok_any", "PaneControl(Name='Main', searchDepth=1) -> ButtonControl(Name='OK')", "AMBIGUOUS"),
+        ("edit", "PaneControl(Name='Main', searchDepth=1) -> EditControl(ClassName='Edit', searchDepth=1)", "FALLBACK"),
+        ("regex", "ButtonControl(RegexName='Clo.*', searchDepth=1)", "FALLBACK"),
+        ("missing", "PaneControl(Name='Main') -> ButtonControl(Name='Cancel')", "UNRESOLVED"),
+        ("too_far", "ButtonControl(Name='OK', foundIndex=3)", "UNRESOLVED"),
+    ]
+
+    try:
+        with open(tree_file, "w", encoding="utf-8") as f:
+            json.dump(tree, f, ensure_ascii=False)
+        with open(alias_file, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["AliasName", "RPA_Path"])
+            writer.writerows((alias, path) for alias, path, _ in aliases)
+        backend = FakeBackend.from_json(tree_file)
+        capture_snapshot(backend, backend.root.children[0], snapshot_file)
+
+        all_passed = True
+
+        # 1. 一括照合の結果がパスごとの解決（SnapshotResolver）と一致すること
+        with Snapshot(snapshot_file) as snapshot:
+            resolver = SnapshotResolver(snapshot)
+            matcher = MultiPathMatcher(snapshot)
+            results = matcher.match([path for _, path, _ in aliases])
+            for alias, path, _ in aliases:
+                single = resolver.resolve(path)
+                multi = results[path]
+                ok = (multi.node, multi.fallbacks, multi.failed_segment) == (single.node, single.fallbacks, single.failed_segment)
+                print(f"{'PASS' if ok else 'FAIL'}: {alias} -> node {multi.node} (resolver: {single.node}, fallback: {multi.fallbacks})")
+                all_passed = all_passed and ok
+
+            # 共通の接頭辞を持つパスは検索を共有する（"Main" の検索はまとめて1クエリ）
+            if matcher.passes <= 4 and matcher.queries < sum(len(path.split("->")) for _, path, _ in aliases) * 3:
+                print(f"PASS: Matched in {matcher.passes} passes with {matcher.queries} shared queries")
+            else:
+                print(f"FAIL: Unexpected passes/queries: {matcher.passes}/{matcher.queries}")
+                all_passed = False
+
+        # 2. スナップショットとライブ（フェイク）ウィンドウの両方でレポートを確認
+        for source in (["--snapshot", snapshot_file, "--target-app", "Validate"],
+                       ["--target-app", "Validate Test", "--fake-tree", tree_file]):
+            cmd = [sys.executable, "snapshot.py", "validate-aliases", alias_file, "--output", report_file] + source
+            result = subprocess.run(cmd, capture_output=True, text=True, encoding="utf-8")
+            with open(report_file, "r", encoding="utf-8-sig") as f:
+                statuses = {row["AliasName"]: row["Status"] for row in csv.DictReader(f)}
+            expected = {alias: status for alias, _, status in aliases}
+            if (result.returncode == 1 and statuses == expected and "Unresolved (2)" in result.stdout
+                    and "Ambiguous (1)" in result.stdout and "Fallback only (2)" in result.stdout and "match:" in result.stdout):
+                print(f"PASS: validate-aliases report ({source[0]})")
+            else:
+                print(f"FAIL: validate-aliases ({source[0]}): {statuses}\n{result.stdout}{result.stderr}")
+                all_passed = False
+
+        print(f"Validate Aliases Verification: {'PASS' if all_passed else 'FAIL'}")
+
+    except Exception as e:
+        print(f"Validate Aliases Verification: FAIL - {e}")
+    finally:
+        for path in [tree_file, snapshot_file, alias_file, report_file]:
+            if os.path.exists(path): os.remove(path)
+
+if __name__ == "__main__":
+    verify_validate_aliases()